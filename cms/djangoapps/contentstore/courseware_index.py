@@ -7,6 +7,7 @@ from abc import ABCMeta, abstractmethod
 from datetime import timedelta
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import resolve
 from django.utils.translation import ugettext as _
 from django.utils.translation import ugettext_lazy
@@ -28,6 +29,9 @@ from xmodule.modulestore import ModuleStoreEnum
 # how far back from the trigger point to look back in order to index
 REINDEX_AGE = timedelta(0, 60)  # 60 seconds
 
+# Maximum number of items sent to the search engine in a single bulk index request.
+INDEX_BATCH_SIZE = 100
+
 log = logging.getLogger('edx.modulestore')
 
 
@@ -116,7 +120,12 @@ class SearchIndexerBase(object):
         searcher.remove(cls.DOCUMENT_TYPE, result_ids)
 
     @classmethod
-    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
+    def _indexed_edit_cache_key(cls, structure_key):
+        """ Cache key of the last edit time of the structure that has been indexed """
+        return u'{}.indexed_edit.{}'.format(cls.INDEX_NAME, structure_key)
+
+    @classmethod
+    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE, incremental=False):
         """
         Process course for indexing
 
@@ -132,6 +141,10 @@ class SearchIndexerBase(object):
             which items may need to be removed from the index
             If None, then a full reindex takes place
 
+        incremental (bool) - only things changed since the structure that was last
+            indexed will have their index updated, as for triggered_at. If the last
+            indexed structure is unknown, triggered_at is used instead
+
         Returns:
         Number of items that have been added to the index
         """
@@ -143,6 +156,11 @@ class SearchIndexerBase(object):
         structure_key = cls.normalize_structure_key(structure_key)
         location_info = cls._get_location_info(structure_key)
 
+        # Items last edited at or before indexed_until have already been indexed.
+        indexed_until = cache.get(cls._indexed_edit_cache_key(structure_key)) if incremental else None
+        if indexed_until is None and triggered_at is not None:
+            indexed_until = triggered_at - reindex_age
+
         # Wrap counter in dictionary - otherwise we seem to lose scope inside the embedded function `prepare_item_index`
         indexed_count = {
             "count": 0
@@ -154,11 +172,19 @@ class SearchIndexerBase(object):
         # list - those are ready to be destroyed
         indexed_items = set()
 
-        # items_index is a list of all the items index dictionaries.
-        # it is used to collect all indexes and index them using bulk API,
-        # instead of per item index API call.
+        # items_index is a list of the items index dictionaries.
+        # it is used to collect indexes and index them using bulk API,
+        # instead of per item index API call, in batches of INDEX_BATCH_SIZE.
         items_index = []
 
+        def flush_items_index():
+            """
+            Sends the collected items index dictionaries to the search engine
+            """
+            if items_index:
+                searcher.index(cls.DOCUMENT_TYPE, items_index)
+                del items_index[:]
+
         def get_item_location(item):
             """
             Gets the version agnostic item location
@@ -181,9 +207,10 @@ class SearchIndexerBase(object):
             item_content_groups - content groups assigned to indexed item
             """
             is_indexable = hasattr(item, "index_dictionary")
-            item_index_dictionary = item.index_dictionary() if is_indexable else None
+            # the index dictionary of a skipped item is not needed, and may be expensive to build
+            item_index_dictionary = item.index_dictionary() if is_indexable and not skip_index else None
             # if it's not indexable and it does not have children, then ignore
-            if not item_index_dictionary and not item.has_children:
+            if not (item_index_dictionary or (skip_index and is_indexable)) and not item.has_children:
                 return
 
             item_content_groups = None
@@ -211,9 +238,13 @@ class SearchIndexerBase(object):
             item_id = unicode(cls._id_modifier(item.scope_ids.usage_id))
             indexed_items.add(item_id)
             if item.has_children:
-                # determine if it's okay to skip adding the children herein based upon how recently any may have changed
-                skip_child_index = skip_index or \
-                    (triggered_at is not None and (triggered_at - item.subtree_edited_on) > reindex_age)
+                # determine if it's okay to skip adding the children herein based upon how recently any may have changed,
+                # unless the item itself changed, which may change the index of its descendants (e.g. their start date)
+                skip_child_index = skip_index or (
+                    indexed_until is not None and
+                    item.subtree_edited_on <= indexed_until and
+                    not (getattr(item, 'edited_on', None) and item.edited_on > indexed_until)
+                )
                 children_groups_usage = []
                 for child_item in item.get_children():
                     if modulestore.has_published_version(child_item):
@@ -242,11 +273,15 @@ class SearchIndexerBase(object):
                 item_index.update(cls.supplemental_fields(item))
                 items_index.append(item_index)
                 indexed_count["count"] += 1
-                return item_content_groups
             except Exception as err:  # pylint: disable=broad-except
                 # broad exception so that index operation does not fail on one item of many
                 log.warning('Could not index item: %s - %r', item.location, err)
                 error_list.append(_('Could not index item: {}').format(item.location))
+                return
+
+            if len(items_index) >= INDEX_BATCH_SIZE:
+                flush_items_index()
+            return item_content_groups
 
         try:
             with modulestore.branch_setting(ModuleStoreEnum.RevisionOption.published_only):
@@ -259,7 +294,7 @@ class SearchIndexerBase(object):
                 # Now index the content
                 for item in structure.get_children():
                     prepare_item_index(item, groups_usage_info=groups_usage_info)
-                searcher.index(cls.DOCUMENT_TYPE, items_index)
+                flush_items_index()
                 cls.remove_deleted_items(searcher, structure_key, indexed_items)
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
@@ -273,6 +308,11 @@ class SearchIndexerBase(object):
         if error_list:
             raise SearchIndexingError('Error(s) present during indexing', error_list)
 
+        # Record which edits have been indexed, for later incremental indexing
+        structure_edited_on = getattr(structure, 'subtree_edited_on', None)
+        if structure_edited_on:
+            cache.set(cls._indexed_edit_cache_key(structure_key), structure_edited_on, None)
+
         return indexed_count["count"]
 
     @classmethod
@@ -0,0 +1,140 @@
+"""
+Course-wide data used to build the course outline in Studio.
+
+The information of each block of the outline (see create_xblock_info) depends
+on the course's grading policy, user partitions and gating milestones, which
+are computed once for the whole outline by CourseOutlineData rather than for
+each block. The outline is cached for each version of the course.
+"""
+import hashlib
+from datetime import datetime
+
+from django.conf import settings
+from django.utils.translation import get_language
+from pytz import UTC
+
+from contentstore.utils import is_self_paced
+from models.settings.course_grading import CourseGradingModel
+from openedx.core.lib.gating import api as gating_api
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+from xmodule.partitions.partitions_service import get_all_partitions_for_course
+
+# Maximum number of seconds a course outline is cached. Outlines are cached
+# for less time when one of the blocks is released sooner, since that changes
+# its visibility state.
+OUTLINE_CACHE_TIMEOUT = 60 * 60
+
+
+class CourseOutlineData(object):
+    """
+    Data of a course shared by every block of its outline.
+    """
+    def __init__(self, course):
+        self.course = course
+        self.graders = CourseGradingModel.fetch(course.id).graders
+        self.is_self_paced = is_self_paced(course)
+        self.user_partitions = sorted(
+            get_all_partitions_for_course(course, active_only=True), key=lambda partition: partition.name
+        )
+        self.next_release_date = None
+
+        self.gating_prerequisites = []
+        self._prerequisite_ids = set()
+        self._required_content_milestones = {}
+        if course.enable_subsection_gating:
+            self.gating_prerequisites = gating_api.get_prerequisites(course.id)
+            self._prerequisite_ids = set(
+                milestone['content_id']
+                for milestone in gating_api.find_gating_milestones(course.id, None, 'fulfills')
+            )
+            for milestone in gating_api.find_gating_milestones(course.id, None, 'requires'):
+                self._required_content_milestones.setdefault(milestone['content_id'], milestone)
+
+    def is_prerequisite(self, usage_key):
+        """
+        Returns True if the given course content fulfills a gating prerequisite,
+        as gating_api.is_prerequisite does.
+        """
+        return unicode(usage_key) in self._prerequisite_ids
+
+    def get_required_content(self, usage_key):
+        """
+        Returns the prerequisite content usage key and minimum score of the given
+        gated course content, as gating_api.get_required_content does.
+        """
+        milestone = self._required_content_milestones.get(unicode(usage_key))
+        if milestone:
+            return (
+                milestone.get('namespace', '').replace(gating_api.GATING_NAMESPACE_QUALIFIER, ''),
+                milestone.get('requirements', {}).get('min_score')
+            )
+        return None, None
+
+    def add_release_date(self, release_date):
+        """
+        Records the release date of a block of the outline, after which the
+        visibility state of the outline changes.
+        """
+        if release_date > datetime.now(UTC) and (self.next_release_date is None or
+                                                 release_date < self.next_release_date):
+            self.next_release_date = release_date
+
+    def cache_key(self, outline_format):
+        """
+        Returns the key of the cached outline of the course in the given format,
+        or None if the outline can't be cached.
+
+        Besides the versions of the course, the outline depends on the data of
+        the course stored outside of the modulestore, and on the language it is
+        displayed in, but not on the user it is displayed to.
+        """
+        versions = _get_course_versions(self.course.id)
+        if not versions:
+            return None
+
+        dependencies = [
+            unicode(self.course.id),
+            versions.get(ModuleStoreEnum.BranchName.draft),
+            versions.get(ModuleStoreEnum.BranchName.published),
+            outline_format,
+            get_language(),
+            settings.FEATURES.get('ENABLE_SPECIAL_EXAMS'),
+            self.is_self_paced,
+            [
+                (
+                    partition.id,
+                    unicode(partition.name),
+                    [(group.id, unicode(group.name)) for group in partition.groups],
+                )
+                for partition in self.user_partitions
+            ],
+            sorted(self._prerequisite_ids),
+            sorted(
+                (content_id, milestone.get('namespace'), milestone.get('requirements'))
+                for content_id, milestone in self._required_content_milestones.iteritems()
+            ),
+        ]
+        return u'contentstore.outline.{}'.format(hashlib.md5(repr(dependencies)).hexdigest())
+
+    def cache_timeout(self):
+        """
+        Returns the number of seconds the outline may be cached, which is until
+        the next release of one of its blocks.
+        """
+        if self.next_release_date is None:
+            return OUTLINE_CACHE_TIMEOUT
+        seconds_to_release = (self.next_release_date - datetime.now(UTC)).total_seconds()
+        return max(0, min(OUTLINE_CACHE_TIMEOUT, int(seconds_to_release)))
+
+
+def _get_course_versions(course_key):
+    """
+    Returns the structure versions of each branch of the given course, or
+    None if the course isn't versioned, as in the old mongo modulestore.
+    """
+    store = modulestore()._get_modulestore_for_courselike(course_key)  # pylint: disable=protected-access
+    if store.get_modulestore_type() != ModuleStoreEnum.Type.split:
+        return None
+    index = store.get_course_index(course_key)
+    return index.get('versions') if index else None
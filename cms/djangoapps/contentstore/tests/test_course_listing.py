@@ -17,13 +17,17 @@ from common.test.utils import XssTestMixin
 from contentstore.tests.utils import AjaxEnabledTestClient
 from contentstore.utils import delete_course
 from contentstore.views.course import (
+    WAFFLE_NAMESPACE,
     AccessListFallback,
+    _accessible_course_overviews,
     _accessible_courses_iter,
     _accessible_courses_list_from_groups,
     _accessible_courses_summary_iter,
     get_courses_accessible_to_user
 )
 from course_action_state.models import CourseRerunState
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.core.djangoapps.waffle_utils import WaffleSwitchNamespace
 from student.roles import (
     CourseInstructorRole,
     CourseStaffRole,
@@ -472,3 +476,50 @@ class TestCourseListing(ModuleStoreTestCase, XssTestMixin):
             self.assertSetEqual(
                 set_of_course_keys(courses_in_progress), set_of_course_keys(unsucceeded_course_actions, 'course_key')
             )
+
+    def test_accessible_course_overviews(self):
+        """
+        Verify that the course overviews of the courses accessible through course and org roles
+        are listed in two queries.
+        """
+        courses = [
+            self._create_course_with_access_groups(CourseLocator('Org', 'Course', 'Run'), self.user),
+            self._create_course_with_access_groups(CourseLocator('AwesomeOrg', 'Course1', 'Run')),
+            self._create_course_with_access_groups(CourseLocator('AwesomeOrg', 'Course2', 'Run')),
+            self._create_course_with_access_groups(CourseLocator('OtherOrg', 'Course', 'Run')),
+        ]
+        for course in courses:
+            CourseOverview.get_from_id(course.id)
+        OrgStaffRole('AwesomeOrg').add_users(self.user)
+
+        with self.assertNumQueries(2):
+            course_overviews = list(_accessible_course_overviews(self.user))
+        self.assertEqual(
+            set(course_overview.id for course_overview in course_overviews),
+            set(course.id for course in courses[:3]),
+        )
+
+        GlobalStaff().add_users(self.user)
+        self.assertEqual(len(_accessible_course_overviews(self.user)), 4)
+        self.assertEqual(len(_accessible_course_overviews(self.user, org='otherorg')), 1)
+        self.assertEqual(len(_accessible_course_overviews(self.user, org='')), 0)
+
+    def test_course_overview_listing_paginated(self):
+        """
+        Verify that Studio home lists the courses from course overviews one page at a time.
+        """
+        for num in range(3):
+            course = self._create_course_with_access_groups(
+                CourseLocator('Org', 'Course' + str(num), 'Run'), self.user
+            )
+            CourseOverview.get_from_id(course.id)
+
+        with WaffleSwitchNamespace(name=WAFFLE_NAMESPACE).override_in_model(u'enable_course_overview_listing'):
+            with patch('contentstore.views.course.COURSES_PER_PAGE', 2):
+                first_page = self.client.get('/home')
+                last_page = self.client.get('/home', {'page': 2})
+
+        self.assertEqual(first_page.content.count('class="course-item"'), 2)
+        self.assertIn('Page 1 of 2', first_page.content)
+        self.assertEqual(last_page.content.count('class="course-item"'), 1)
+        self.assertIn('Page 2 of 2', last_page.content)
@@ -439,6 +439,61 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         indexed_count = self.reindex_course(store)
         self.assertEqual(indexed_count, 7)
 
+    def _test_incremental_index(self, store):
+        """ Make sure that an incremental index only indexes what changed since the course was last indexed """
+        self.publish_item(store, self.vertical.location)
+        chapter2 = ItemFactory.create(
+            parent_location=self.course.location,
+            category='chapter',
+            display_name='Week 2',
+            modulestore=store,
+            publish_item=True,
+            start=datetime(2015, 3, 1, tzinfo=UTC),
+        )
+        sequential2 = ItemFactory.create(
+            parent_location=chapter2.location,
+            category='sequential',
+            display_name='Lesson 2',
+            modulestore=store,
+            publish_item=True,
+        )
+        ItemFactory.create(
+            parent_location=sequential2.location,
+            category='vertical',
+            display_name='Subsection 2',
+            modulestore=store,
+            publish_item=True,
+        )
+        indexed_count = self.reindex_course(store)
+        self.assertEqual(indexed_count, 7)
+
+        # Nothing changed since the course was indexed, but the top level items are always indexed
+        indexed_count = CoursewareSearchIndexer.index(store, self.course.id, incremental=True)
+        self.assertEqual(indexed_count, 2)
+
+        # change the html unit
+        self.html_unit.display_name = "Changed Html Content"
+        self.update_item(store, self.html_unit)
+        self.publish_item(store, self.vertical.location)
+
+        # the changed subtree is indexed, but not the subtree of the second chapter
+        indexed_count = CoursewareSearchIndexer.index(store, self.course.id, incremental=True)
+        self.assertEqual(indexed_count, 5)
+        response = self.search(query_string="Changed Html Content")
+        self.assertEqual(response["total"], 1)
+
+    def _test_batched_index(self, store):
+        """ Make sure that items are sent to the search engine in batches """
+        self.publish_item(store, self.vertical.location)
+        search_engine_class = type(self.searcher)
+        with patch('contentstore.courseware_index.INDEX_BATCH_SIZE', 3):
+            with patch.object(search_engine_class, 'index', autospec=True, side_effect=search_engine_class.index) as index:
+                self.reindex_course(store)
+
+        self.assertEqual([len(call[0][2]) for call in index.call_args_list], [3, 1])
+        response = self.search()
+        self.assertEqual(response["total"], 4)
+
     def _test_course_about_property_index(self, store):
         """ Test that informational properties in the course object end up in the course_info index """
         display_name = "Help, I need somebody!"
@@ -570,6 +625,14 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     def test_time_based_index(self, store_type):
         self._perform_test_using_store(store_type, self._test_time_based_index)
 
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_incremental_index(self, store_type):
+        self._perform_test_using_store(store_type, self._test_incremental_index)
+
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_batched_index(self, store_type):
+        self._perform_test_using_store(store_type, self._test_batched_index)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_exception(self, store_type):
         self._perform_test_using_store(store_type, self._test_exception)
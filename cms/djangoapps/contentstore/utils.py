@@ -177,29 +177,33 @@ def is_currently_visible_to_students(xblock):
     return True
 
 
-def has_children_visible_to_specific_partition_groups(xblock):
+def has_children_visible_to_specific_partition_groups(xblock, course=None, user_partitions=None):
     """
     Returns True if this xblock has children that are limited to specific user partition groups.
     Note that this method is not recursive (it does not check grandchildren).
+
+    The optional course and user_partitions are passed to get_user_partition_info.
     """
     if not xblock.has_children:
         return False
 
     for child in xblock.get_children():
-        if is_visible_to_specific_partition_groups(child):
+        if is_visible_to_specific_partition_groups(child, course=course, user_partitions=user_partitions):
             return True
 
     return False
 
 
-def is_visible_to_specific_partition_groups(xblock):
+def is_visible_to_specific_partition_groups(xblock, course=None, user_partitions=None):
     """
     Returns True if this xblock has visibility limited to specific user partition groups.
+
+    The optional course and user_partitions are passed to get_user_partition_info.
     """
     if not xblock.group_access:
         return False
 
-    for partition in get_user_partition_info(xblock):
+    for partition in get_user_partition_info(xblock, course=course, user_partitions=user_partitions):
         if any(g["selected"] for g in partition["groups"]):
             return True
 
@@ -315,7 +319,7 @@ def get_split_group_display_name(xblock, course):
                 return group['name']
 
 
-def get_user_partition_info(xblock, schemes=None, course=None):
+def get_user_partition_info(xblock, schemes=None, course=None, user_partitions=None):
     """
     Retrieve user partition information for an XBlock for display in editors.
 
@@ -335,6 +339,9 @@ def get_user_partition_info(xblock, schemes=None, course=None):
             instead of loading the course.  This is useful if we're calling this function multiple
             times for the same course want to minimize queries to the modulestore.
 
+        user_partitions (list of UserPartition): The active partitions of the course sorted by name,
+            as returned by get_all_partitions_for_course.  If provided, they are not looked up again.
+
     Returns: list
 
     Example Usage:
@@ -375,20 +382,23 @@ def get_user_partition_info(xblock, schemes=None, course=None):
     ]
 
     """
-    course = course or modulestore().get_course(xblock.location.course_key)
+    if user_partitions is None:
+        course = course or modulestore().get_course(xblock.location.course_key)
 
-    if course is None:
-        log.warning(
-            "Could not find course %s to retrieve user partition information",
-            xblock.location.course_key
-        )
-        return []
+        if course is None:
+            log.warning(
+                "Could not find course %s to retrieve user partition information",
+                xblock.location.course_key
+            )
+            return []
+
+        user_partitions = sorted(get_all_partitions_for_course(course, active_only=True), key=lambda p: p.name)
 
     if schemes is not None:
         schemes = set(schemes)
 
     partitions = []
-    for p in sorted(get_all_partitions_for_course(course, active_only=True), key=lambda p: p.name):
+    for p in user_partitions:
 
         # Exclude disabled partitions, partitions with no groups defined
         # Also filter by scheme name if there's a filter defined.
@@ -14,8 +14,11 @@ import six
 from ccx_keys.locator import CCXLocator
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.core.urlresolvers import reverse
+from django.db.models import Q
 from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseNotFound
 from django.shortcuts import redirect
 from django.utils.translation import ugettext as _
@@ -37,6 +40,7 @@ from contentstore.course_group_config import (
 )
 from contentstore.course_info_model import delete_course_update, get_course_updates, update_course_updates
 from contentstore.courseware_index import CoursewareSearchIndexer, SearchIndexingError
+from contentstore.outline import CourseOutlineData
 from contentstore.push_notification import push_notification_enabled
 from contentstore.tasks import rerun_course
 from contentstore.utils import (
@@ -70,6 +74,7 @@ from openedx.core.lib.course_tabs import CourseTabPluginManager
 from openedx.core.lib.courses import course_image_url
 from student import auth
 from student.auth import has_course_author_access, has_studio_read_access, has_studio_write_access
+from student.models import CourseAccessRole
 from student.roles import CourseCreatorRole, CourseInstructorRole, CourseStaffRole, GlobalStaff, UserBasedRole
 from student.tasks import publish_course_notifications_task
 from util.course import get_link_for_about_page
@@ -110,6 +115,9 @@ __all__ = ['course_info_handler', 'course_handler', 'course_listing',
 
 WAFFLE_NAMESPACE = 'studio_home'
 
+# Number of courses listed on each page of Studio home, when they are listed from course overviews.
+COURSES_PER_PAGE = 100
+
 
 class AccessListFallback(Exception):
     """
@@ -333,19 +341,32 @@ def course_search_index_handler(request, course_key_string):
 def _course_outline_json(request, course_module):
     """
     Returns a JSON representation of the course module and recursively all of its children.
+
+    The representation is cached for the current versions of the course.
     """
     is_concise = request.GET.get('format') == 'concise'
+    outline_data = CourseOutlineData(course_module)
+    cache_key = outline_data.cache_key('concise' if is_concise else 'outline')
+    if cache_key:
+        course_outline = cache.get(cache_key)
+        if course_outline is not None:
+            return course_outline
+
     include_children_predicate = lambda xblock: not xblock.category == 'vertical'
     if is_concise:
         include_children_predicate = lambda xblock: xblock.has_children
-    return create_xblock_info(
+    course_outline = create_xblock_info(
         course_module,
         include_child_info=True,
         course_outline=False if is_concise else True,
         include_children_predicate=include_children_predicate,
         is_concise=is_concise,
-        user=request.user
+        user=request.user,
+        outline_data=outline_data
     )
+    if cache_key:
+        cache.set(cache_key, course_outline, outline_data.cache_timeout())
+    return course_outline
 
 
 def get_in_process_course_actions(request):
@@ -464,6 +485,81 @@ def _accessible_courses_list_from_groups(request):
     return courses_list.values(), in_process_course_actions
 
 
+def _accessible_course_overviews(user, org=None):
+    """
+    Returns the CourseOverviews of the courses available to the user, ordered by
+    display name, without loading the courses from the modulestore.
+
+    The course and org roles of the user are resolved in a single query. Only
+    the access of global staff, and of instructors and staff of a course or an
+    org is resolved, which is the only access to courses in Studio.
+
+    CCX courses, which cannot be edited in Studio, are left for the caller to
+    exclude, since their keys can't be matched in the query.
+
+    Arguments:
+        user: the user the courses are available to
+        org (string): for global staff users ONLY, this value will be used to limit
+            the courses returned, as in get_courses_accessible_to_user.
+    """
+    course_overviews = CourseOverview.objects.order_by('display_name', 'id')
+
+    if GlobalStaff().has_user(user):
+        if org is not None:
+            course_overviews = course_overviews.filter(org__iexact=org) if org else course_overviews.none()
+        return course_overviews
+
+    course_keys = set()
+    orgs = set()
+    course_access_roles = CourseAccessRole.objects.filter(
+        user=user, role__in=[CourseInstructorRole.ROLE, CourseStaffRole.ROLE]
+    ).values_list('org', 'course_id')
+    for role_org, course_key in course_access_roles:
+        if course_key:
+            course_keys.add(course_key)
+        elif role_org:
+            # Roles without a course are org-wide
+            orgs.add(role_org)
+
+    if not (course_keys or orgs):
+        return course_overviews.none()
+    return course_overviews.filter(Q(id__in=course_keys) | Q(org__in=orgs))
+
+
+def _paginated_accessible_course_overviews(request, org=None):
+    """
+    Returns the page of the CourseOverviews available to the user requested by
+    the `page` request parameter, and the pagination info of the listing.
+    """
+    paginator = Paginator(_accessible_course_overviews(request.user, org), COURSES_PER_PAGE)
+    try:
+        courses_page = paginator.page(request.GET.get('page', 1))
+    except PageNotAnInteger:
+        courses_page = paginator.page(1)
+    except EmptyPage:
+        courses_page = paginator.page(paginator.num_pages)
+
+    def page_url(page_number):
+        """
+        Returns the url of the given page of the listing.
+        """
+        query = request.GET.copy()
+        query['page'] = page_number
+        return u'?{}'.format(query.urlencode())
+
+    pagination = {
+        u'page_number': courses_page.number,
+        u'num_pages': paginator.num_pages,
+        u'previous_url': page_url(courses_page.previous_page_number()) if courses_page.has_previous() else None,
+        u'next_url': page_url(courses_page.next_page_number()) if courses_page.has_next() else None,
+    }
+    course_overviews = (
+        course_overview for course_overview in courses_page
+        if not isinstance(course_overview.id, CCXLocator)
+    )
+    return course_overviews, pagination
+
+
 def _accessible_libraries_iter(user):
     """
     List all libraries available to the logged in user by iterating through all libraries
@@ -487,7 +583,12 @@ def course_listing(request):
     else:
         org = None
         show_libraries = LIBRARIES_ENABLED
-    courses_iter, in_process_course_actions = get_courses_accessible_to_user(request, org)
+    courses_pagination = None
+    if WaffleSwitchNamespace(name=WAFFLE_NAMESPACE).is_enabled(u'enable_course_overview_listing'):
+        courses_iter, courses_pagination = _paginated_accessible_course_overviews(request, org)
+        in_process_course_actions = get_in_process_course_actions(request)
+    else:
+        courses_iter, in_process_course_actions = get_courses_accessible_to_user(request, org)
     user = request.user
     libraries = _accessible_libraries_iter(request.user) if show_libraries else []
 
@@ -530,6 +631,7 @@ def course_listing(request):
 
     return render_to_response(u'index.html', {
         u'courses': list(courses_iter),
+        u'courses_pagination': courses_pagination,
         u'in_process_course_actions': in_process_course_actions,
         u'libraries_enabled': show_libraries,
         u'libraries': [format_library_for_view(lib) for lib in libraries],
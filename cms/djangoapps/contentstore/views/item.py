@@ -34,6 +34,7 @@ from contentstore.utils import (
     is_currently_visible_to_students,
     is_self_paced
 )
+from contentstore.outline import CourseOutlineData
 from contentstore.views.helpers import (
     create_xblock,
     get_parent_xblock,
@@ -427,7 +428,8 @@ def xblock_outline_handler(request, usage_key_string):
                 root_xblock,
                 include_child_info=True,
                 course_outline=True,
-                include_children_predicate=lambda xblock: not xblock.category == 'vertical'
+                include_children_predicate=lambda xblock: not xblock.category == 'vertical',
+                outline_data=CourseOutlineData(store.get_course(usage_key.course_key)),
             ))
     else:
         return Http404
@@ -1067,7 +1069,7 @@ def _get_module_info(xblock, rewrite_static_links=True, include_ancestor_info=Fa
         return xblock_info
 
 
-def _get_gating_info(course, xblock):
+def _get_gating_info(course, xblock, outline_data=None):
     """
     Returns a dict containing gating information for the given xblock which
     can be added to xblock info responses.
@@ -1075,24 +1077,34 @@ def _get_gating_info(course, xblock):
     Arguments:
         course (CourseDescriptor): The course
         xblock (XBlock): The xblock
+        outline_data (CourseOutlineData): If provided, the gating milestones of
+            the course are read from it instead of the database
 
     Returns:
         dict: Gating information
     """
     info = {}
     if xblock.category == 'sequential' and course.enable_subsection_gating:
-        if not hasattr(course, 'gating_prerequisites'):
-            # Cache gating prerequisites on course module so that we are not
-            # hitting the database for every xblock in the course
-            setattr(course, 'gating_prerequisites', gating_api.get_prerequisites(course.id))  # pylint: disable=literal-used-as-attribute
-        info["is_prereq"] = gating_api.is_prerequisite(course.id, xblock.location)
+        if outline_data is not None:
+            gating_prerequisites = outline_data.gating_prerequisites
+            info["is_prereq"] = outline_data.is_prerequisite(xblock.location)
+            prereq, prereq_min_score = outline_data.get_required_content(xblock.location)
+        else:
+            if not hasattr(course, 'gating_prerequisites'):
+                # Cache gating prerequisites on course module so that we are not
+                # hitting the database for every xblock in the course
+                setattr(  # pylint: disable=literal-used-as-attribute
+                    course, 'gating_prerequisites', gating_api.get_prerequisites(course.id)
+                )
+            gating_prerequisites = course.gating_prerequisites
+            info["is_prereq"] = gating_api.is_prerequisite(course.id, xblock.location)
+            prereq, prereq_min_score = gating_api.get_required_content(
+                course.id,
+                xblock.location
+            )
         info["prereqs"] = [
-            p for p in course.gating_prerequisites if unicode(xblock.location) not in p['namespace']
+            p for p in gating_prerequisites if unicode(xblock.location) not in p['namespace']
         ]
-        prereq, prereq_min_score = gating_api.get_required_content(
-            course.id,
-            xblock.location
-        )
         info["prereq"] = prereq
         info["prereq_min_score"] = prereq_min_score
         if prereq:
@@ -1102,7 +1114,7 @@ def _get_gating_info(course, xblock):
 
 def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=False, include_child_info=False,
                        course_outline=False, include_children_predicate=NEVER, parent_xblock=None, graders=None,
-                       user=None, course=None, is_concise=False):
+                       user=None, course=None, is_concise=False, outline_data=None):
     """
     Creates the information needed for client-side XBlockInfo.
 
@@ -1118,6 +1130,9 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
 
     In addition, an optional include_children_predicate argument can be provided to define whether or
     not a particular xblock should have its children included.
+
+    When the information of many blocks of a course is created, e.g. for the course outline, the data
+    shared by the blocks can be computed only once by passing a CourseOutlineData as outline_data.
     """
     is_library_block = isinstance(xblock.location, LibraryUsageLocator)
     is_xblock_unit = is_unit(xblock, parent_xblock)
@@ -1126,6 +1141,11 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
     if (is_xblock_unit or course_outline) and not is_library_block:
         has_changes = modulestore().has_changes(xblock)
 
+    if outline_data is not None:
+        course = outline_data.course
+        if graders is None:
+            graders = outline_data.graders
+
     if graders is None:
         if not is_library_block:
             graders = CourseGradingModel.fetch(xblock.location.course_key).graders
@@ -1150,7 +1170,8 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
             include_children_predicate=include_children_predicate,
             user=user,
             course=course,
-            is_concise=is_concise
+            is_concise=is_concise,
+            outline_data=outline_data
         )
     else:
         child_info = None
@@ -1159,7 +1180,10 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
 
     if xblock.category != 'course' and not is_concise:
         visibility_state = _compute_visibility_state(
-            xblock, child_info, is_xblock_unit and has_changes, is_self_paced(course)
+            xblock,
+            child_info,
+            is_xblock_unit and has_changes,
+            outline_data.is_self_paced if outline_data is not None else is_self_paced(course)
         )
     else:
         visibility_state = None
@@ -1200,7 +1224,10 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
         group_display_name = get_split_group_display_name(xblock, course)
         xblock_info['display_name'] = group_display_name if group_display_name else xblock_info['display_name']
     else:
-        user_partitions = get_user_partition_info(xblock, course=course)
+        course_user_partitions = outline_data.user_partitions if outline_data is not None else None
+        user_partitions = get_user_partition_info(xblock, course=course, user_partitions=course_user_partitions)
+        if outline_data is not None:
+            outline_data.add_release_date(xblock.start)
         xblock_info.update({
             'edited_on': get_default_time_display(xblock.subtree_edited_on) if xblock.subtree_edited_on else None,
             'published': published,
@@ -1247,7 +1274,7 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
                 })
 
         # Update with gating info
-        xblock_info.update(_get_gating_info(course, xblock))
+        xblock_info.update(_get_gating_info(course, xblock, outline_data))
 
         if xblock.category == 'sequential':
             # Entrance exam subsection should be hidden. in_entrance_exam is
@@ -1279,7 +1306,7 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
                 xblock_info['staff_only_message'] = False
 
             xblock_info["has_partition_group_components"] = has_children_visible_to_specific_partition_groups(
-                xblock
+                xblock, course=course, user_partitions=course_user_partitions
             )
     return xblock_info
 
@@ -1418,7 +1445,7 @@ def _create_xblock_ancestor_info(xblock, course_outline=False, include_child_inf
 
 
 def _create_xblock_child_info(xblock, course_outline, graders, include_children_predicate=NEVER, user=None,
-                              course=None, is_concise=False):  # pylint: disable=line-too-long
+                              course=None, is_concise=False, outline_data=None):  # pylint: disable=line-too-long
     """
     Returns information about the children of an xblock, as well as about the primary category
     of xblock expected as children.
@@ -1439,7 +1466,8 @@ def _create_xblock_child_info(xblock, course_outline, graders, include_children_
                 graders=graders,
                 user=user,
                 course=course,
-                is_concise=is_concise
+                is_concise=is_concise,
+                outline_data=outline_data
             ) for child in xblock.get_children()
         ]
     return child_info
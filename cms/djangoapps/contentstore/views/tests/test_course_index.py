@@ -389,6 +389,29 @@ class TestCourseOutline(CourseTestCase):
         # Finally, validate the entire response for consistency
         self.assert_correct_json_response(json_response, is_concise)
 
+    def test_json_response_cached(self):
+        """
+        Verify that the outline of a course is cached until the course is edited.
+        """
+        with self.store.default_store(ModuleStoreEnum.Type.split):
+            course = CourseFactory.create()
+            chapter = ItemFactory.create(parent_location=course.location, category='chapter', display_name='Week 1')
+        outline_url = reverse_course_url('course_handler', course.id)
+
+        def get_chapter_display_name():
+            """ Returns the display name of the chapter in the outline """
+            json_response = json.loads(self.client.get(outline_url, HTTP_ACCEPT='application/json').content)
+            return json_response['child_info']['children'][0]['display_name']
+
+        self.assertEqual(get_chapter_display_name(), 'Week 1')
+        with mock.patch('contentstore.views.course.create_xblock_info') as mock_create_xblock_info:
+            self.assertEqual(get_chapter_display_name(), 'Week 1')
+        self.assertFalse(mock_create_xblock_info.called)
+
+        chapter.display_name = 'Week 2'
+        self.store.update_item(chapter, self.user.id)
+        self.assertEqual(get_chapter_display_name(), 'Week 2')
+
     def assert_correct_json_response(self, json_response, is_concise=False):
         """
         Asserts that the JSON response is syntactically consistent
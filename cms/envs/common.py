@@ -479,6 +479,11 @@ XBLOCK_FIELD_DATA_WRAPPERS = ()
 ############################ Modulestore Configuration ################################
 MODULESTORE_BRANCH = 'draft-preferred'
 
+# Local disk cache in which the contentserver keeps course assets too large for memcached,
+# e.g. {'DIRECTORY': '/edx/var/edxapp/asset_cache', 'MAX_SIZE': 10 * 1024 ** 3}
+# Assets larger than the optional 'MAX_PUT_SIZE' (20MB by default) are cached while their first full response is sent.
+CONTENTSERVER_DISK_CACHE = None
+
 MODULESTORE = {
     'default': {
         'ENGINE': 'xmodule.modulestore.mixed.MixedModuleStore',
@@ -35,6 +35,10 @@ class MakoLoader(object):
 
         self.module_directory = module_directory
 
+        # Compiled Mako templates, keyed by their absolute paths and names, so that
+        # each template is only compiled once per process.
+        self._mako_templates = {}
+
     def __call__(self, template_name, template_dirs=None):
         return self.load_template(template_name, template_dirs)
 
@@ -47,13 +51,18 @@ class MakoLoader(object):
 
         if source.startswith("## mako\n"):
             # This is a mako template
-            template = Template(filename=file_path,
-                                module_directory=module_directory,
-                                input_encoding='utf-8',
-                                output_encoding='utf-8',
-                                default_filters=['decode.utf8'],
-                                encoding_errors='replace',
-                                uri=template_name)
+            template = self._mako_templates.get((file_path, template_name))
+            if template is None:
+                template = Template(filename=file_path,
+                                    module_directory=module_directory,
+                                    input_encoding='utf-8',
+                                    output_encoding='utf-8',
+                                    default_filters=['decode.utf8'],
+                                    encoding_errors='replace',
+                                    uri=template_name)
+                # Recompile templates on every load during development, so that changes are picked up.
+                if not settings.DEBUG:
+                    self._mako_templates[(file_path, template_name)] = template
             return template, None
         else:
             # This is a regular template
@@ -76,6 +85,7 @@ class MakoLoader(object):
         return self.base_loader.load_template_source(template_name, template_dirs)
 
     def reset(self):
+        self._mako_templates.clear()
         self.base_loader.reset()
 
 
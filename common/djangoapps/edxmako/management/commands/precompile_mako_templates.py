@@ -0,0 +1,90 @@
+"""
+Management command to precompile the Mako templates of every lookup namespace
+and every theme, so that processes started afterwards find the compiled
+template modules on disk instead of compiling templates on their first render.
+"""
+
+import logging
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from mako.lookup import TemplateLookup
+
+from edxmako import LOOKUP
+from openedx.core.djangoapps.theming.helpers import get_theme_base_dirs, get_themes
+
+log = logging.getLogger(__name__)
+
+# Extensions of the files in template directories that are Mako templates.
+MAKO_TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml')
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms precompile_mako_templates --settings=aws
+        $ ./manage.py cms precompile_mako_templates --namespace main --settings=aws
+    """
+    help = 'Compiles the Mako templates of all themes into the Mako module directory.'
+
+    def add_arguments(self, parser):
+        """
+        Add arguments to the command parser.
+        """
+        parser.add_argument(
+            '--namespace',
+            dest='namespaces',
+            nargs='+',
+            default=None,
+            help='Template lookup namespaces to compile. Defaults to all of them.',
+        )
+
+    def handle(self, *args, **options):
+        namespaces = options['namespaces'] or sorted(LOOKUP.keys())
+        unknown_namespaces = set(namespaces) - set(LOOKUP.keys())
+        if unknown_namespaces:
+            raise CommandError('Unknown template namespaces: {}'.format(', '.join(sorted(unknown_namespaces))))
+
+        for namespace in namespaces:
+            lookup = LOOKUP[namespace]
+            compiled_count = failed_count = 0
+            for uri in get_template_uris(lookup.directories):
+                try:
+                    # Bypass the theme and microsite aware lookup, which depends on the current request.
+                    TemplateLookup.get_template(lookup, uri)
+                    compiled_count += 1
+                except Exception:  # pylint: disable=broad-except
+                    # Not every file in a template directory is a Mako template.
+                    log.debug('Unable to compile template %s', uri, exc_info=True)
+                    failed_count += 1
+
+            self.stdout.write(
+                'Compiled {compiled} templates ({failed} skipped) of namespace "{namespace}" into {directory}'.format(
+                    compiled=compiled_count,
+                    failed=failed_count,
+                    namespace=namespace,
+                    directory=lookup.template_args['module_directory'],
+                )
+            )
+
+
+def get_template_uris(directories):
+    """
+    Returns the uris, relative to one of the given lookup directories, of all
+    of the templates found in them. In the theme base directories, only the
+    templates of each theme are included.
+    """
+    theme_base_dirs = set(os.path.normpath(theme_base_dir) for theme_base_dir in get_theme_base_dirs())
+    uris = set()
+    for directory in directories:
+        if os.path.normpath(directory) in theme_base_dirs:
+            template_roots = [theme.path / 'templates' for theme in get_themes(directory)]
+        else:
+            template_roots = [directory]
+
+        for template_root in template_roots:
+            for dirpath, __, filenames in os.walk(template_root):
+                for filename in filenames:
+                    if filename.lower().endswith(MAKO_TEMPLATE_EXTENSIONS):
+                        uris.add(os.path.relpath(os.path.join(dirpath, filename), directory))
+    return sorted(uris)
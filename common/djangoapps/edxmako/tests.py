@@ -1,7 +1,12 @@
+import os
+import shutil
+import tempfile
 import unittest
+from StringIO import StringIO
 
 import ddt
 from django.conf import settings
+from django.core.management import call_command
 from django.core.urlresolvers import reverse
 from django.http import HttpResponse
 from django.test import TestCase
@@ -9,7 +14,7 @@ from django.test.client import RequestFactory
 from django.test.utils import override_settings
 from mock import Mock, patch
 
-from edxmako import LOOKUP, add_lookup
+from edxmako import LOOKUP, add_lookup, save_lookups
 from edxmako.request_context import get_template_request_context
 from edxmako.shortcuts import is_any_marketing_link_set, is_marketing_link_set, marketing_link, render_to_string
 from request_cache.middleware import RequestCache
@@ -76,6 +81,36 @@ class AddLookupTests(TestCase):
         self.assertTrue(dirs[0].endswith('management'))
 
 
+class PrecompileMakoTemplatesTests(TestCase):
+    """
+    Test the `precompile_mako_templates` management command.
+    """
+    def setUp(self):
+        super(PrecompileMakoTemplatesTests, self).setUp()
+        self.template_dir = tempfile.mkdtemp()
+        self.module_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.template_dir)
+        self.addCleanup(shutil.rmtree, self.module_dir)
+
+        os.makedirs(os.path.join(self.template_dir, 'nested'))
+        for path, content in (('valid.html', '<p>${1 + 1}</p>'), ('nested/valid.txt', '${"text"}'),
+                              ('invalid.html', '% if True:'), ('ignored.js', '${"js"}')):
+            with open(os.path.join(self.template_dir, path), 'w') as template_file:
+                template_file.write(content)
+
+    def test_precompile_templates(self):
+        with save_lookups(), override_settings(MAKO_MODULE_DIR=self.module_dir):
+            add_lookup('precompile_test', self.template_dir)
+            module_directory = LOOKUP['precompile_test'].template_args['module_directory']
+            out = StringIO()
+            call_command('precompile_mako_templates', namespaces=['precompile_test'], stdout=out)
+
+        self.assertIn('Compiled 2 templates (1 skipped)', out.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(module_directory, 'valid.html.py')))
+        self.assertTrue(os.path.exists(os.path.join(module_directory, 'nested', 'valid.txt.py')))
+        self.assertFalse(os.path.exists(os.path.join(module_directory, 'ignored.js.py')))
+
+
 class MakoRequestContextTest(TestCase):
     """
     Test MakoMiddleware.
@@ -274,6 +274,106 @@ def update_enrollment(user_id, course_id, mode=None, is_active=None, enrollment_
     return enrollment
 
 
+def get_enrollments_for_users(user_ids, course_id):
+    """Retrieves the enrollments of many users in a course.
+
+    Reads the enrollments in bulk, rather than one user at a time as get_enrollment does.
+
+    Args:
+        user_ids (list): The usernames of the users to get course enrollment information for.
+        course_id (str): The course to get enrollment information for.
+
+    Returns:
+        A list of serializable dictionaries of the course enrollments of the users who are enrolled in the course,
+        in the format returned by get_enrollment.
+
+    """
+    return _data_api().get_course_enrollments_for_users(user_ids, course_id)
+
+
+def add_enrollments(course_id, enrollments):
+    """Enrolls many users in a course.
+
+    Enrolls the users in bulk, all or none of them, as add_enrollment does for each of them. The course modes are
+    validated once for each distinct mode rather than for each user. Users who are already enrolled in the course
+    are left unchanged.
+
+    Arguments:
+        course_id (str): The course to enroll the users in.
+        enrollments (list): Dictionaries of the username of the 'user' to enroll and, optionally, the 'mode',
+            'is_active' and 'enrollment_attributes' of their enrollment, with the defaults of add_enrollment.
+
+    Returns:
+        A list of serializable dictionaries of the course enrollments, in the order of `enrollments` and in the
+        format returned by add_enrollment.
+
+    Example:
+        >>> add_enrollments("edX/DemoX/2014T2", [{"user": "Bob", "mode": "audit"}, {"user": "Alice"}])
+    """
+    default_mode = None
+    enrollments = [dict(enrollment) for enrollment in enrollments]
+    for enrollment in enrollments:
+        if enrollment.get('mode') is None:
+            if default_mode is None:
+                default_mode = _default_course_mode(course_id)
+            enrollment['mode'] = default_mode
+        enrollment.setdefault('is_active', True)
+    _validate_course_modes(course_id, enrollments)
+
+    course_enrollments = _data_api().create_course_enrollments(course_id, enrollments)
+    _set_bulk_enrollment_attributes(course_id, enrollments)
+    return course_enrollments
+
+
+def update_enrollments(course_id, enrollments, include_expired=False):
+    """Updates the enrollments of many users in a course.
+
+    Updates the enrollments in bulk, all or none of them, as update_enrollment does for each of them. The course
+    modes are validated once for each distinct mode rather than for each user.
+
+    Arguments:
+        course_id (str): The course associated with the updated enrollments.
+        enrollments (list): Dictionaries of the username of the 'user' of each enrollment and, optionally, its new
+            'mode', 'is_active' and 'enrollment_attributes'.
+
+    Keyword Arguments:
+        include_expired (bool): Boolean denoting whether expired course modes should be included.
+
+    Returns:
+        A list of serializable dictionaries representing the updated enrollments, in the order of `enrollments`.
+
+    Raises:
+        EnrollmentNotFoundError: if any of the users isn't enrolled in the course, in which case none of the
+            enrollments are updated.
+
+    """
+    log.info(u'Starting Update Enrollments process for %d users in course %s', len(enrollments), course_id)
+    _validate_course_modes(
+        course_id,
+        [enrollment for enrollment in enrollments if enrollment.get('mode') is not None],
+        include_expired=include_expired,
+    )
+
+    existing_usernames = set(
+        enrollment['user'] for enrollment in get_enrollments_for_users(
+            [enrollment['user'] for enrollment in enrollments], course_id
+        )
+    )
+    missing_usernames = set(enrollment['user'] for enrollment in enrollments) - existing_usernames
+    if missing_usernames:
+        msg = u"Course Enrollment not found for users {users} in course {course}".format(
+            users=u", ".join(sorted(missing_usernames)),
+            course=course_id,
+        )
+        log.warn(msg)
+        raise errors.EnrollmentNotFoundError(msg)
+
+    course_enrollments = _data_api().update_course_enrollments(course_id, enrollments)
+    _set_bulk_enrollment_attributes(course_id, enrollments)
+    log.info(u'Course Enrollments updated for %d users in course %s', len(enrollments), course_id)
+    return course_enrollments
+
+
 def get_course_enrollment_details(course_id, include_expired=False):
     """Get the course modes for course. Also get enrollment start and end date, invite only, etc.
 
@@ -456,6 +556,30 @@ def validate_course_mode(course_id, mode, is_active=None, include_expired=False)
         raise errors.CourseModeNotFoundError(msg, course_enrollment_info)
 
 
+def _validate_course_modes(course_id, enrollments, include_expired=False):
+    """Checks that the modes of the given enrollments are valid for the course.
+
+    Each distinct combination of mode and activation status of the enrollments is checked once, as
+    validate_course_mode does.
+
+    Raises:
+        CourseModeNotFound: raised if a course mode is not found.
+    """
+    for mode, is_active in set((enrollment['mode'], enrollment.get('is_active')) for enrollment in enrollments):
+        validate_course_mode(course_id, mode, is_active=is_active, include_expired=include_expired)
+
+
+def _set_bulk_enrollment_attributes(course_id, enrollments):
+    """Sets the 'enrollment_attributes' of the given enrollments, for those which have them."""
+    attributes = {
+        enrollment['user']: enrollment['enrollment_attributes']
+        for enrollment in enrollments
+        if enrollment.get('enrollment_attributes') is not None
+    }
+    if attributes:
+        _data_api().add_or_update_enrollment_attrs(course_id, attributes)
+
+
 def _data_api():
     """Returns a Data API.
     This relies on Django settings to find the appropriate data API.
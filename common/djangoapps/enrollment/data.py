@@ -5,6 +5,7 @@ source to be used throughout the API.
 import logging
 
 from django.contrib.auth.models import User
+from django.db import transaction
 from opaque_keys.edx.keys import CourseKey
 
 from enrollment.errors import (
@@ -18,6 +19,7 @@ from enrollment.serializers import CourseEnrollmentSerializer, CourseSerializer
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.lib.exceptions import CourseNotFoundError
 from student.models import (
+    BULK_QUERY_CHUNK_SIZE,
     AlreadyEnrolledError,
     CourseEnrollment,
     CourseEnrollmentAttribute,
@@ -25,6 +27,7 @@ from student.models import (
     EnrollmentClosedError,
     NonExistentCourseError
 )
+from util.query import chunks
 
 log = logging.getLogger(__name__)
 
@@ -195,6 +198,152 @@ def add_or_update_enrollment_attr(user_id, course_id, attributes):
         CourseEnrollmentAttribute.add_enrollment_attr(enrollment, attributes)
 
 
+def get_course_enrollments_for_users(usernames, course_id):
+    """Retrieve the aggregated data of the enrollments of many users in a course.
+
+    The enrollments are read in bulk, rather than with a query per user.
+
+    Args:
+        usernames (list): The names of the users to retrieve course enrollment information for.
+        course_id (str): The course to retrieve course enrollment information for.
+
+    Returns:
+        A serializable list of dictionaries representing the course enrollments of the users
+        who have one, active or not.
+
+    """
+    course_key = CourseKey.from_string(course_id)
+    enrollments = _get_enrollments_by_username(set(usernames), course_key)
+    return _serialize_enrollments(enrollments.values(), course_key)
+
+
+def create_course_enrollments(course_id, enrollments):
+    """Create new course enrollments for many users.
+
+    Creates the enrollments in bulk in a single transaction, as create_course_enrollment does for each
+    of them. Users who are already enrolled in the course are left unchanged.
+
+    Args:
+        course_id (str): The course to create the course enrollments for.
+        enrollments (list): Dictionaries of the name of the 'user' to enroll, and the (optional) 'mode'
+            and 'is_active' of their enrollment.
+
+    Returns:
+        A serializable list of dictionaries representing the course enrollments, in the order of
+        `enrollments`.
+
+    Raises:
+        UserNotFoundError
+        CourseNotFoundError
+        CourseEnrollmentFullError
+        CourseEnrollmentClosedError
+        CourseEnrollmentExistsError
+
+    """
+    course_key = CourseKey.from_string(course_id)
+    users = _get_users(enrollment['user'] for enrollment in enrollments)
+    existing_enrollments = _get_enrollments_by_username(users.keys(), course_key)
+
+    new_enrollments = []
+    deactivations = []
+    for enrollment in enrollments:
+        username = enrollment['user']
+        existing_enrollment = existing_enrollments.get(username)
+        if existing_enrollment is not None and existing_enrollment.is_active:
+            continue
+        new_enrollments.append((users[username], enrollment.get('mode')))
+        if enrollment.get('is_active') is False:
+            deactivations.append((users[username], None, False))
+
+    try:
+        with transaction.atomic():
+            for course_enrollment in CourseEnrollment.bulk_enroll(new_enrollments, course_key, check_access=True):
+                existing_enrollments[course_enrollment.username] = course_enrollment
+            for course_enrollment in CourseEnrollment.bulk_update_enrollments(course_key, deactivations):
+                existing_enrollments[course_enrollment.username] = course_enrollment
+    except NonExistentCourseError as err:
+        raise CourseNotFoundError(err.message)
+    except EnrollmentClosedError as err:
+        raise CourseEnrollmentClosedError(err.message)
+    except CourseFullError as err:
+        raise CourseEnrollmentFullError(err.message)
+    except AlreadyEnrolledError as err:
+        raise CourseEnrollmentExistsError(err.message, None)
+
+    return _serialize_enrollments(
+        [existing_enrollments[enrollment['user']] for enrollment in enrollments], course_key
+    )
+
+
+def update_course_enrollments(course_id, enrollments):
+    """Modify the course enrollments of many users.
+
+    Updates the enrollments in bulk in a single transaction, as update_course_enrollment does for each
+    of them.
+
+    Args:
+        course_id (str): The course of the course enrollments.
+        enrollments (list): Dictionaries of the name of the 'user' of each enrollment, and the (optional)
+            'mode' and 'is_active' to modify.
+
+    Returns:
+        A serializable list of dictionaries representing the modified course enrollments, in the order of
+        `enrollments`, with None for users who aren't enrolled in the course.
+
+    Raises:
+        UserNotFoundError
+
+    """
+    course_key = CourseKey.from_string(course_id)
+    users = _get_users(enrollment['user'] for enrollment in enrollments)
+    existing_enrollments = _get_enrollments_by_username(users.keys(), course_key)
+
+    changes = [
+        (users[enrollment['user']], enrollment.get('mode'), enrollment.get('is_active'))
+        for enrollment in enrollments
+        if enrollment['user'] in existing_enrollments
+    ]
+    with transaction.atomic():
+        for course_enrollment in CourseEnrollment.bulk_update_enrollments(course_key, changes):
+            existing_enrollments[course_enrollment.username] = course_enrollment
+
+    serialized_enrollments = _serialize_enrollments(existing_enrollments.values(), course_key)
+    serialized_by_username = {enrollment['user']: enrollment for enrollment in serialized_enrollments}
+    return [serialized_by_username.get(enrollment['user']) for enrollment in enrollments]
+
+
+def add_or_update_enrollment_attrs(course_id, attributes):
+    """Set the enrollment attributes of the enrollments of many users in the course provided.
+
+    Args:
+        course_id (str): The Course to set enrollment attributes for.
+        attributes (dict): Lists of the attributes to be set, keyed by the names of the users.
+
+    Example:
+        >>>add_or_update_enrollment_attrs(
+            "course-v1-edX-DemoX-1T2015",
+            {
+                "Bob": [
+                    {
+                        "namespace": "credit",
+                        "name": "provider_id",
+                        "value": "hogwarts",
+                    },
+                ],
+            }
+        )
+    """
+    course_key = CourseKey.from_string(course_id)
+    users = _get_users(attributes.keys())
+    enrollments = _get_enrollments_by_username(users.keys(), course_key)
+    enrollments_data = [
+        (enrollments[username], user_attributes)
+        for username, user_attributes in attributes.iteritems()
+        if not _invalid_attribute(user_attributes) and username in enrollments
+    ]
+    CourseEnrollmentAttribute.bulk_add_enrollment_attrs(enrollments_data)
+
+
 def get_enrollment_attributes(user_id, course_id):
     """Retrieve enrollment attributes for given user for provided course.
 
@@ -236,6 +385,57 @@ def _get_user(user_id):
         raise UserNotFoundError(msg)
 
 
+def _get_users(usernames):
+    """Retrieve the users with the provided usernames in bulk
+
+    Args:
+        usernames(iterable): usernames of the users to retrieve
+
+    Returns: dict of the users keyed by username
+
+    Raises:
+        UserNotFoundError: if any of the users doesn't exist
+    """
+    usernames = set(usernames)
+    users = {}
+    for chunk in chunks(usernames, BULK_QUERY_CHUNK_SIZE):
+        users.update((user.username, user) for user in User.objects.filter(username__in=chunk))
+
+    missing_usernames = usernames.difference(users)
+    if missing_usernames:
+        msg = u"No users with usernames '{usernames}' found.".format(usernames=u"', '".join(sorted(missing_usernames)))
+        log.warn(msg)
+        raise UserNotFoundError(msg)
+    return users
+
+
+def _get_enrollments_by_username(usernames, course_key):
+    """Retrieve the enrollments of the users with the provided usernames in a course in bulk
+
+    Returns: dict of the enrollments keyed by username
+    """
+    enrollments = {}
+    for chunk in chunks(usernames, BULK_QUERY_CHUNK_SIZE):
+        enrollments.update(
+            (enrollment.username, enrollment)
+            for enrollment in CourseEnrollment.objects.filter(
+                course_id=course_key, user__username__in=chunk
+            ).select_related('user')
+        )
+    return enrollments
+
+
+def _serialize_enrollments(enrollments, course_key):
+    """Serialize enrollments in a course, reading the overview of the course once for all of them."""
+    try:
+        course_overview = CourseOverview.get_from_id(course_key)
+    except (CourseOverview.DoesNotExist, IOError):
+        course_overview = None
+    for enrollment in enrollments:
+        enrollment._course_overview = course_overview  # pylint: disable=protected-access
+    return CourseEnrollmentSerializer(enrollments, many=True).data
+
+
 def _update_enrollment(enrollment, is_active=None, mode=None):
     enrollment.update_enrollment(is_active=is_active, mode=mode)
     enrollment.save()
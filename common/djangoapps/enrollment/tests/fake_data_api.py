@@ -49,6 +49,35 @@ def update_course_enrollment(student_id, course_id, mode=None, is_active=None):
     return enrollment
 
 
+def get_course_enrollments_for_users(student_ids, course_id):
+    """Stubbed out Enrollment data request."""
+    enrollments = [_get_fake_enrollment(student_id, course_id) for student_id in student_ids]
+    return [dict(enrollment, user=enrollment['student']) for enrollment in enrollments if enrollment]
+
+
+def create_course_enrollments(course_id, enrollments):
+    """Stubbed out Enrollment creation request."""
+    return [
+        add_enrollment(
+            enrollment['user'],
+            course_id,
+            mode=enrollment.get('mode', 'honor'),
+            is_active=enrollment.get('is_active', True),
+        )
+        for enrollment in enrollments
+    ]
+
+
+def update_course_enrollments(course_id, enrollments):
+    """Stubbed out Enrollment data request."""
+    return [
+        update_course_enrollment(
+            enrollment['user'], course_id, mode=enrollment.get('mode'), is_active=enrollment.get('is_active')
+        )
+        for enrollment in enrollments
+    ]
+
+
 def get_course_enrollment_info(course_id, include_expired=False):
     """Stubbed out Enrollment data request."""
     return _get_fake_course_info(course_id, include_expired)
@@ -96,6 +125,12 @@ def add_or_update_enrollment_attr(user_id, course_id, attributes):
         })
 
 
+def add_or_update_enrollment_attrs(course_id, attributes):
+    """Add or update enrollment attribute array"""
+    for user_id, user_attributes in attributes.iteritems():
+        add_or_update_enrollment_attr(user_id, course_id, user_attributes)
+
+
 # pylint: disable=unused-argument
 def get_enrollment_attributes(user_id, course_id):
     """Retrieve enrollment attribute array"""
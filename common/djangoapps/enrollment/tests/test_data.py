@@ -3,10 +3,13 @@ Test the Data Aggregation Layer for Course Enrollments.
 
 """
 import datetime
+import os
+import time
 import unittest
 
 import ddt
 from django.conf import settings
+from django.contrib.auth.models import User
 from mock import patch
 from nose.tools import raises
 from pytz import UTC
@@ -295,3 +298,166 @@ class EnrollmentDataTest(ModuleStoreTestCase):
 
         if not include_expired:
             self.assertNotIn('verified', result_slugs)
+
+
+@unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+class BulkEnrollmentDataTest(ModuleStoreTestCase):
+    """
+    Test the bulk reads and writes of course enrollments.
+
+    """
+    def setUp(self):
+        super(BulkEnrollmentDataTest, self).setUp()
+        self.course = CourseFactory.create()
+        for mode_slug in ('audit', 'verified', 'credit'):
+            CourseModeFactory.create(course_id=self.course.id, mode_slug=mode_slug, mode_display_name=mode_slug)
+        self.users = [UserFactory.create() for __ in range(3)]
+
+    def assert_enrollments(self, expected_enrollments):
+        """Asserts that the users' enrollments in the course have the expected (mode, is_active)."""
+        for user, (mode, is_active) in zip(self.users, expected_enrollments):
+            self.assertEqual(CourseEnrollment.enrollment_mode_for_user(user, self.course.id), (mode, is_active))
+
+    def test_create_course_enrollments(self):
+        CourseEnrollment.enroll(self.users[0], self.course.id, mode='audit')
+        CourseEnrollment.enroll(self.users[1], self.course.id, mode='audit')
+        CourseEnrollment.unenroll(self.users[1], self.course.id)
+
+        with patch('student.models.ENROLL_STATUS_CHANGE.send') as mock_signal:
+            enrollments = data.create_course_enrollments(
+                unicode(self.course.id),
+                [
+                    {'user': self.users[0].username, 'mode': 'verified', 'is_active': True},
+                    {'user': self.users[1].username, 'mode': 'verified', 'is_active': True},
+                    {'user': self.users[2].username, 'mode': 'verified', 'is_active': False},
+                ]
+            )
+
+        # The existing active enrollment is left unchanged.
+        self.assert_enrollments([('audit', True), ('verified', True), ('verified', False)])
+        self.assertEqual(
+            [(enrollment['user'], enrollment['mode'], enrollment['is_active']) for enrollment in enrollments],
+            [
+                (self.users[0].username, 'audit', True),
+                (self.users[1].username, 'verified', True),
+                (self.users[2].username, 'verified', False),
+            ]
+        )
+        self.assertEqual(enrollments[0]['course_details']['course_id'], unicode(self.course.id))
+        # Both users are enrolled, then the last one is unenrolled.
+        self.assertEqual(mock_signal.call_count, 3)
+
+    def test_create_course_enrollments_for_full_course(self):
+        course = CourseFactory.create(max_student_enrollments_allowed=2)
+
+        with self.assertRaises(CourseEnrollmentFullError):
+            data.create_course_enrollments(
+                unicode(course.id), [{'user': user.username, 'mode': 'honor'} for user in self.users]
+            )
+
+        # None of the users are enrolled.
+        self.assertFalse(CourseEnrollment.objects.filter(course_id=course.id).exists())
+
+    def test_create_course_enrollments_for_non_existent_user(self):
+        with self.assertRaises(UserNotFoundError):
+            data.create_course_enrollments(
+                unicode(self.course.id),
+                [{'user': self.users[0].username, 'mode': 'audit'}, {'user': 'some_fake_user', 'mode': 'audit'}],
+            )
+        self.assertFalse(CourseEnrollment.objects.filter(course_id=self.course.id).exists())
+
+    def test_update_course_enrollments(self):
+        for user in self.users[:2]:
+            CourseEnrollment.enroll(user, self.course.id, mode='audit')
+
+        with patch('student.models.UNENROLL_DONE.send') as mock_unenroll_signal:
+            enrollments = data.update_course_enrollments(
+                unicode(self.course.id),
+                [
+                    {'user': self.users[0].username, 'mode': 'verified'},
+                    {'user': self.users[1].username, 'is_active': False},
+                    {'user': self.users[2].username, 'mode': 'verified'},
+                ]
+            )
+
+        self.assert_enrollments([('verified', True), ('audit', False), (None, None)])
+        self.assertEqual(enrollments[0]['mode'], 'verified')
+        self.assertFalse(enrollments[1]['is_active'])
+        self.assertIsNone(enrollments[2])
+        self.assertEqual(mock_unenroll_signal.call_count, 1)
+        # The changes are recorded in the enrollment history.
+        self.assertEqual(
+            CourseEnrollment.objects.get(user=self.users[0], course_id=self.course.id).history.first().mode,
+            'verified'
+        )
+
+    def test_get_course_enrollments_for_users(self):
+        for user in self.users[:2]:
+            CourseEnrollment.enroll(user, self.course.id, mode='audit')
+
+        enrollments = data.get_course_enrollments_for_users(
+            [user.username for user in self.users], unicode(self.course.id)
+        )
+
+        self.assertEqual(
+            sorted(enrollment['user'] for enrollment in enrollments),
+            sorted(user.username for user in self.users[:2])
+        )
+
+    def test_add_or_update_enrollment_attrs(self):
+        for user in self.users:
+            CourseEnrollment.enroll(user, self.course.id, mode='credit')
+        attributes = {
+            user.username: [{"namespace": "credit", "name": "provider_id", "value": user.username}]
+            for user in self.users
+        }
+
+        data.add_or_update_enrollment_attrs(unicode(self.course.id), attributes)
+        attributes[self.users[0].username][0]['value'] = 'hogwarts'
+        data.add_or_update_enrollment_attrs(unicode(self.course.id), attributes)
+
+        for user in self.users:
+            self.assertEqual(
+                data.get_enrollment_attributes(user.username, unicode(self.course.id)), attributes[user.username]
+            )
+
+
+@unittest.skipUnless(os.environ.get('BENCHMARK_BULK_ENROLLMENT'), 'Set BENCHMARK_BULK_ENROLLMENT to run the benchmark.')
+@unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+class BulkEnrollmentBenchmark(ModuleStoreTestCase):
+    """
+    Compares the throughput of enrolling many users in a course one at a
+    time with create_course_enrollment and in bulk with
+    create_course_enrollments.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_USERS = 1000
+
+    def _create_users(self, prefix):
+        """Creates NUM_USERS users in bulk and returns their usernames."""
+        usernames = [u'{}_{}'.format(prefix, index) for index in xrange(self.NUM_USERS)]
+        User.objects.bulk_create([
+            User(username=username, email=u'{}@example.com'.format(username)) for username in usernames
+        ])
+        return usernames
+
+    def test_benchmark(self):
+        course_id = unicode(CourseFactory.create().id)
+        timings = {}
+
+        usernames = self._create_users('single')
+        start = time.time()
+        for username in usernames:
+            data.create_course_enrollment(username, course_id, 'honor', True)
+        timings['create_course_enrollment'] = time.time() - start
+
+        usernames = self._create_users('bulk')
+        start = time.time()
+        data.create_course_enrollments(course_id, [{'user': username, 'mode': 'honor'} for username in usernames])
+        timings['create_course_enrollments'] = time.time() - start
+
+        print u'\nEnrolled {} users:'.format(self.NUM_USERS)
+        for name, timing in sorted(timings.iteritems()):
+            print u'    {:<30}{:.4f}s ({:.0f} enrollments/s)'.format(name, timing, self.NUM_USERS / timing)
@@ -1184,6 +1184,113 @@ def cross_domain_config(func):
     )
 
 
+@attr(shard=3)
+@override_settings(EDX_API_KEY=EnrollmentTestMixin.API_KEY)
+@ddt.ddt
+@unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+class EnrollmentBulkViewTest(ModuleStoreTestCase, APITestCase):
+    """
+    Test the bulk enrollment end-point.
+    """
+    def setUp(self):
+        super(EnrollmentBulkViewTest, self).setUp()
+        self.course = CourseFactory.create()
+        for mode_slug in (CourseMode.AUDIT, CourseMode.VERIFIED):
+            CourseModeFactory.create(course_id=self.course.id, mode_slug=mode_slug, mode_display_name=mode_slug)
+        self.users = [UserFactory.create() for __ in range(3)]
+        self.url = reverse('bulkcourseenrollments', kwargs={'course_id': unicode(self.course.id)})
+
+    def post_enrollments(self, enrollments, expected_status=status.HTTP_200_OK, as_server=True):
+        """Posts the enrollments and verifies the response's status code."""
+        extra = {'HTTP_X_EDX_API_KEY': EnrollmentTestMixin.API_KEY} if as_server else {}
+        response = self.client.post(
+            self.url, json.dumps({'enrollments': enrollments}), content_type='application/json', **extra
+        )
+        self.assertEqual(response.status_code, expected_status)
+        return response
+
+    def assert_enrollments(self, expected_enrollments):
+        """Asserts that the users' enrollments in the course have the expected (mode, is_active)."""
+        for user, (mode, is_active) in zip(self.users, expected_enrollments):
+            self.assertEqual(CourseEnrollment.enrollment_mode_for_user(user, self.course.id), (mode, is_active))
+
+    def test_enroll_and_update(self):
+        CourseEnrollment.enroll(self.users[0], self.course.id, mode=CourseMode.AUDIT)
+        CourseEnrollment.enroll(self.users[1], self.course.id, mode=CourseMode.AUDIT)
+
+        with patch('enrollment.views.audit_log') as mock_audit_log:
+            response = self.post_enrollments([
+                {'user': self.users[0].username, 'mode': CourseMode.VERIFIED},
+                {'user': self.users[1].username, 'mode': CourseMode.AUDIT, 'is_active': False},
+                {'user': self.users[2].username},
+            ])
+
+        self.assert_enrollments([
+            (CourseMode.VERIFIED, True),
+            (CourseMode.AUDIT, False),
+            (CourseMode.AUDIT, True),
+        ])
+        self.assertEqual(
+            [(enrollment['user'], enrollment['mode'], enrollment['is_active']) for enrollment in response.data],
+            [
+                (self.users[0].username, CourseMode.VERIFIED, True),
+                (self.users[1].username, CourseMode.AUDIT, False),
+                (self.users[2].username, CourseMode.AUDIT, True),
+            ]
+        )
+        self.assertEqual(mock_audit_log.call_count, 3)
+
+    def test_get_enrollments(self):
+        for user in self.users[:2]:
+            CourseEnrollment.enroll(user, self.course.id, mode=CourseMode.AUDIT)
+
+        response = self.client.get(
+            self.url,
+            {'users': u','.join(user.username for user in self.users)},
+            HTTP_X_EDX_API_KEY=EnrollmentTestMixin.API_KEY,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(enrollment['user'] for enrollment in response.data),
+            sorted(user.username for user in self.users[:2])
+        )
+
+    def test_global_staff(self):
+        staff_user = AdminFactory.create(password='edx')
+        self.client.login(username=staff_user.username, password='edx')
+        self.post_enrollments([{'user': self.users[0].username}], as_server=False)
+        self.assert_enrollments([(CourseMode.AUDIT, True)])
+
+    def test_user_not_allowed(self):
+        self.client.login(username=self.users[0].username, password='test')
+        self.post_enrollments([{'user': self.users[0].username}], status.HTTP_403_FORBIDDEN, as_server=False)
+        self.assert_enrollments([(None, None)])
+
+    @ddt.data(
+        [],
+        [{'mode': CourseMode.AUDIT}],
+        [{'user': 'Bob', 'is_active': 'yes'}],
+        [{'user': 'Bob'}, {'user': 'Bob'}],
+    )
+    def test_invalid_enrollments(self, enrollments):
+        self.post_enrollments(enrollments, status.HTTP_400_BAD_REQUEST)
+
+    def test_unavailable_mode(self):
+        self.post_enrollments(
+            [{'user': self.users[0].username}, {'user': self.users[1].username, 'mode': CourseMode.PROFESSIONAL}],
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assert_enrollments([(None, None), (None, None)])
+
+    def test_non_existent_user(self):
+        self.post_enrollments(
+            [{'user': self.users[0].username}, {'user': 'some_fake_user'}],
+            status.HTTP_406_NOT_ACCEPTABLE,
+        )
+        self.assert_enrollments([(None, None)])
+
+
 @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
 class EnrollmentCrossDomainTest(ModuleStoreTestCase):
     """Test cross-domain calls to the enrollment end-points. """
@@ -5,7 +5,7 @@ URLs for the Enrollment API
 from django.conf import settings
 from django.conf.urls import patterns, url
 
-from .views import EnrollmentCourseDetailView, EnrollmentListView, EnrollmentView
+from .views import EnrollmentBulkView, EnrollmentCourseDetailView, EnrollmentListView, EnrollmentView
 
 urlpatterns = patterns(
     'enrollment.views',
@@ -22,6 +22,11 @@ urlpatterns = patterns(
         name='courseenrollment'
     ),
     url(r'^enrollment$', EnrollmentListView.as_view(), name='courseenrollments'),
+    url(
+        r'^enrollments/{course_key}$'.format(course_key=settings.COURSE_ID_PATTERN),
+        EnrollmentBulkView.as_view(),
+        name='bulkcourseenrollments'
+    ),
     url(
         r'^course/{course_key}$'.format(course_key=settings.COURSE_ID_PATTERN),
         EnrollmentCourseDetailView.as_view(),
@@ -6,6 +6,7 @@ consist primarily of authentication, request validation, and serialization.
 import logging
 
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 from django.utils.decorators import method_decorator
 from edx_rest_framework_extensions.authentication import JwtAuthentication
 from opaque_keys import InvalidKeyError
@@ -17,7 +18,12 @@ from rest_framework.views import APIView
 
 from course_modes.models import CourseMode
 from enrollment import api
-from enrollment.errors import CourseEnrollmentError, CourseEnrollmentExistsError, CourseModeNotFoundError
+from enrollment.errors import (
+    CourseEnrollmentError,
+    CourseEnrollmentExistsError,
+    CourseModeNotFoundError,
+    UserNotFoundError
+)
 from openedx.core.djangoapps.cors_csrf.authentication import SessionAuthenticationCrossDomainCsrf
 from openedx.core.djangoapps.cors_csrf.decorators import ensure_csrf_cookie_cross_domain
 from openedx.core.djangoapps.embargo import api as embargo_api
@@ -39,6 +45,8 @@ log = logging.getLogger(__name__)
 REQUIRED_ATTRIBUTES = {
     "credit": ["credit:provider_id"],
 }
+# Maximum number of enrollments read or changed by a request of EnrollmentBulkView.
+MAX_BULK_ENROLLMENTS = 1000
 
 
 class EnrollmentCrossDomainSessionAuth(SessionAuthenticationAllowInactiveUser, SessionAuthenticationCrossDomainCsrf):
@@ -700,3 +708,288 @@ class EnrollmentListView(APIView, ApiKeyPermissionMixIn):
                     actual_activation=current_enrollment['is_active'] if current_enrollment else None,
                     user_id=user.id
                 )
+
+
+@can_disable_rate_limit
+class EnrollmentBulkView(APIView, ApiKeyPermissionMixIn):
+    """
+        **Use Cases**
+
+            * Get the enrollments of many users in a course.
+
+            * Enroll many users in a course, or modify the mode or activation
+              of their enrollments.
+
+              This is a server-to-server API for integrations that enroll many
+              learners at a time, such as the ecommerce service. It is
+              available to requests made with an API key, or by global staff.
+              Each request handles the enrollments of at most
+              MAX_BULK_ENROLLMENTS users, all or none of which are changed.
+
+        **Example Requests**
+
+            GET /api/enrollment/v1/enrollments/{course_id}?users=bob,alice
+
+            POST /api/enrollment/v1/enrollments/{course_id} {
+
+                "enrollments": [
+                    {"user": "bob", "mode": "verified"},
+                    {
+                        "user": "alice",
+                        "mode": "credit",
+                        "enrollment_attributes":[{"namespace": "credit","name": "provider_id","value": "hogwarts",},]
+                    },
+                    {"user": "carol", "is_active": false}
+                ]
+
+            }
+
+            **GET Parameters**
+
+              * users: A comma-separated list of the usernames of the users.
+
+            **POST Parameters**
+
+              * enrollments: A list of the enrollments to create or modify,
+                each with the following values.
+
+                * user: The username of the user.
+
+                * mode: Optional. The course mode of the enrollment. If it
+                  differs from the mode of an existing enrollment, the mode of
+                  the enrollment is modified. New enrollments default to the
+                  default course mode.
+
+                * is_active: Optional. A Boolean value indicating whether the
+                  enrollment is active. New enrollments are active by default.
+
+                * enrollment_attributes: Optional. A list of the attributes of
+                  the enrollment, as for the POST /api/enrollment/v1/enrollment
+                  request.
+
+        **Response Values**
+
+            If the request is successful, an HTTP 200 "OK" response is
+            returned along with a list of the enrollments, in the format of
+            the GET /api/enrollment/v1/enrollment request. Users who are not
+            enrolled in the course are omitted from the response to a GET
+            request.
+
+            If the user making the request is not allowed to manage bulk
+            enrollments, an HTTP 403 "Forbidden" response is returned.
+
+            If any of the users does not exist, an HTTP 406 "Not Acceptable"
+            response is returned and none of the enrollments are changed.
+            Invalid requests, such as requests for unavailable course modes or
+            enrollments in closed or full courses, return an HTTP 400 "Bad
+            Request" response, and none of the enrollments are changed.
+    """
+    authentication_classes = (JwtAuthentication, OAuth2AuthenticationAllowInactiveUser,
+                              SessionAuthenticationAllowInactiveUser,)
+    permission_classes = ApiKeyHeaderPermissionIsAuthenticated,
+    throttle_classes = EnrollmentUserThrottle,
+
+    def get(self, request, course_id=None):
+        """Gets the enrollments of the users named by the 'users' GET parameter in a course."""
+        if not self._has_bulk_permissions(request):
+            return self._forbidden_response()
+
+        error_response = self._validate_course_id(course_id)
+        if error_response:
+            return error_response
+
+        usernames = [username for username in request.GET.get('users', '').split(',') if username]
+        if len(usernames) > MAX_BULK_ENROLLMENTS:
+            return self._too_many_enrollments_response()
+
+        try:
+            return Response(api.get_enrollments_for_users(usernames, course_id))
+        except CourseEnrollmentError:
+            return Response(
+                status=status.HTTP_400_BAD_REQUEST,
+                data={
+                    "message": u"An error occurred while retrieving enrollments in course '{course_id}'".format(
+                        course_id=course_id
+                    )
+                }
+            )
+
+    def post(self, request, course_id=None):
+        """Enrolls many users in a course, or modifies their enrollments.
+
+        As server-to-server calls of EnrollmentListView.post, the enrollments of users who are enrolled in the course
+        are modified when their mode or activation changes, and the other users are enrolled with `add_enrollments()`.
+        """
+        if not self._has_bulk_permissions(request):
+            return self._forbidden_response()
+
+        enrollments = request.data.get('enrollments')
+        error_response = self._validate_course_id(course_id) or self._validate_enrollments(enrollments)
+        if error_response:
+            return error_response
+
+        current_enrollments = {
+            enrollment['user']: enrollment
+            for enrollment in api.get_enrollments_for_users(
+                [enrollment['user'] for enrollment in enrollments], course_id
+            )
+        }
+        updated_enrollments = []
+        added_enrollments = []
+        for enrollment in enrollments:
+            username = enrollment['user']
+            mode = enrollment.get('mode')
+            is_active = enrollment.get('is_active')
+            current_enrollment = current_enrollments.get(username)
+            mode_changed = current_enrollment and mode is not None and current_enrollment['mode'] != mode
+            active_changed = (
+                current_enrollment and is_active is not None and current_enrollment['is_active'] != is_active
+            )
+            enrollment_attributes = enrollment.get('enrollment_attributes')
+            missing_attrs = []
+            if enrollment_attributes:
+                actual_attrs = [
+                    u"{namespace}:{name}".format(**attr)
+                    for attr in enrollment_attributes
+                ]
+                missing_attrs = set(REQUIRED_ATTRIBUTES.get(mode, [])) - set(actual_attrs)
+
+            if mode_changed or active_changed:
+                if mode_changed and active_changed and not is_active:
+                    msg = (
+                        u"Enrollment mode mismatch for user {}: active mode={}, requested mode={}. Won't deactivate."
+                    ).format(username, current_enrollment["mode"], mode)
+                    log.warning(msg)
+                    return Response(status=status.HTTP_400_BAD_REQUEST, data={"message": msg})
+
+                if len(missing_attrs) > 0:
+                    msg = u"Missing enrollment attributes for user {}: requested mode={} required attributes={}".format(
+                        username, mode, REQUIRED_ATTRIBUTES.get(mode)
+                    )
+                    log.warning(msg)
+                    return Response(status=status.HTTP_400_BAD_REQUEST, data={"message": msg})
+
+                updated_enrollments.append(enrollment)
+            else:
+                added_enrollments.append(enrollment)
+
+        try:
+            with transaction.atomic():
+                responses = {}
+                if updated_enrollments:
+                    for response in api.update_enrollments(course_id, updated_enrollments):
+                        responses[response['user']] = response
+                if added_enrollments:
+                    for response in api.add_enrollments(course_id, added_enrollments):
+                        responses[response['user']] = response
+        except CourseModeNotFoundError as error:
+            return Response(
+                status=status.HTTP_400_BAD_REQUEST,
+                data={
+                    "message": (
+                        u"A requested course mode is expired or otherwise unavailable for course run [{course_id}]."
+                    ).format(course_id=course_id),
+                    "course_details": error.data
+                })
+        except CourseNotFoundError:
+            return Response(
+                status=status.HTTP_400_BAD_REQUEST,
+                data={
+                    "message": u"No course '{course_id}' found for enrollment".format(course_id=course_id)
+                }
+            )
+        except UserNotFoundError as error:
+            return Response(status=status.HTTP_406_NOT_ACCEPTABLE, data={'message': error.message})
+        except CourseEnrollmentError:
+            log.exception("An error occurred while creating or updating %d course enrollments in course run [%s]",
+                          len(enrollments), course_id)
+            return Response(
+                status=status.HTTP_400_BAD_REQUEST,
+                data={
+                    "message": (
+                        u"An error occurred while creating or updating the course enrollments in course '{course_id}'"
+                    ).format(course_id=course_id)
+                }
+            )
+
+        if self.has_api_key_permissions(request):
+            for enrollment in enrollments:
+                response = responses[enrollment['user']]
+                audit_log(
+                    'enrollment_change_requested',
+                    course_id=course_id,
+                    requested_mode=enrollment.get('mode'),
+                    actual_mode=response['mode'],
+                    requested_activation=enrollment.get('is_active'),
+                    actual_activation=response['is_active'],
+                    username=enrollment['user'],
+                )
+
+        return Response([responses[enrollment['user']] for enrollment in enrollments])
+
+    def _has_bulk_permissions(self, request):
+        """Returns whether the request may read and change the enrollments of other users."""
+        return self.has_api_key_permissions(request) or GlobalStaff().has_user(request.user)
+
+    def _validate_course_id(self, course_id):
+        """Returns an error response if the given course ID is invalid, otherwise None."""
+        try:
+            CourseKey.from_string(course_id)
+        except InvalidKeyError:
+            return Response(
+                status=status.HTTP_400_BAD_REQUEST,
+                data={
+                    "message": u"No course '{course_id}' found for enrollment".format(course_id=course_id)
+                }
+            )
+        return None
+
+    def _validate_enrollments(self, enrollments):
+        """Returns an error response if the given enrollments of a POST request are invalid, otherwise None."""
+        if not isinstance(enrollments, list) or not enrollments:
+            return Response(
+                status=status.HTTP_400_BAD_REQUEST,
+                data={"message": u"A list of enrollments must be specified."}
+            )
+        if len(enrollments) > MAX_BULK_ENROLLMENTS:
+            return self._too_many_enrollments_response()
+
+        usernames = set()
+        for enrollment in enrollments:
+            if not isinstance(enrollment, dict) or not enrollment.get('user'):
+                return Response(
+                    status=status.HTTP_400_BAD_REQUEST,
+                    data={"message": u"The user of each enrollment must be specified."}
+                )
+            if enrollment['user'] in usernames:
+                return Response(
+                    status=status.HTTP_400_BAD_REQUEST,
+                    data={"message": u"Multiple enrollments of user '{}' specified.".format(enrollment['user'])}
+                )
+            usernames.add(enrollment['user'])
+
+            is_active = enrollment.get('is_active')
+            if is_active is not None and not isinstance(is_active, bool):
+                return Response(
+                    status=status.HTTP_400_BAD_REQUEST,
+                    data={
+                        'message': (u"'{value}' is an invalid enrollment activation status.").format(value=is_active)
+                    }
+                )
+        return None
+
+    def _forbidden_response(self):
+        """Returns the response to requests which may not manage bulk enrollments."""
+        return Response(
+            status=status.HTTP_403_FORBIDDEN,
+            data={"message": u"User does not have permission to manage bulk enrollments."}
+        )
+
+    def _too_many_enrollments_response(self):
+        """Returns the response to requests for more than MAX_BULK_ENROLLMENTS enrollments."""
+        return Response(
+            status=status.HTTP_400_BAD_REQUEST,
+            data={
+                "message": u"At most {} enrollments may be requested at a time.".format(MAX_BULK_ENROLLMENTS)
+            }
+        )
@@ -5,6 +5,7 @@ from django.contrib.staticfiles.storage import staticfiles_storage
 from django.contrib.staticfiles import finders
 from django.conf import settings
 
+from openedx.core.djangoapps.contentserver.caching import get_cached_asset_index
 from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore import ModuleStoreEnum
@@ -162,6 +163,8 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
     course_id: The course identifier used to distinguish static content for this course in studio
     static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
     """
+    # The course's asset index, loaded when the first course asset url is replaced.
+    course_asset_index = []
 
     def replace_static_url(original, prefix, quote, rest):
         """
@@ -193,7 +196,11 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
                 # Mongo-backed database
                 base_url = AssetBaseUrlConfig.get_base_url()
                 excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
+                if not course_asset_index:
+                    course_asset_index.append(get_cached_asset_index(course_id))
+                url = StaticContent.get_canonicalized_asset_path(
+                    course_id, rest, base_url, excluded_exts, asset_index=course_asset_index[0]
+                )
 
                 if AssetLocator.CANONICAL_NAMESPACE in url:
                     url = url.replace('block@', 'block/', 1)
@@ -13,6 +13,7 @@ from nose.tools import assert_equals, assert_false, assert_true  # pylint: disab
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from PIL import Image
 
+from openedx.core.djangoapps.contentserver.caching import del_cached_content, get_cached_asset_index
 from static_replace import (
     _url_replace_regex,
     make_static_urls_absolute,
@@ -116,9 +117,11 @@ def test_storage_url_not_exists(mock_storage):
 
 @patch('static_replace.StaticContent', autospec=True)
 @patch('static_replace.modulestore', autospec=True)
+@patch('static_replace.get_cached_asset_index')
 @patch('static_replace.AssetBaseUrlConfig.get_base_url')
 @patch('static_replace.AssetExcludedExtensionsConfig.get_excluded_extensions')
-def test_mongo_filestore(mock_get_excluded_extensions, mock_get_base_url, mock_modulestore, mock_static_content):
+def test_mongo_filestore(mock_get_excluded_extensions, mock_get_base_url, mock_get_cached_asset_index,
+                         mock_modulestore, mock_static_content):
 
     mock_modulestore.return_value = Mock(MongoModuleStore)
     mock_static_content.get_canonicalized_asset_path.return_value = "c4x://mock_url"
@@ -134,7 +137,10 @@ def test_mongo_filestore(mock_get_excluded_extensions, mock_get_base_url, mock_m
         replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY, course_id=COURSE_KEY)
     )
 
-    mock_static_content.get_canonicalized_asset_path.assert_called_once_with(COURSE_KEY, 'file.png', u'', ['foobar'])
+    mock_static_content.get_canonicalized_asset_path.assert_called_once_with(
+        COURSE_KEY, 'file.png', u'', ['foobar'], asset_index=mock_get_cached_asset_index.return_value
+    )
+    mock_get_cached_asset_index.assert_called_once_with(COURSE_KEY)
 
 
 @patch('static_replace.settings', autospec=True)
@@ -766,3 +772,38 @@ class CanonicalContentTest(SharedModuleStoreTestCase):
             print expected
             print asset_path
             self.assertIsNotNone(re.match(expected, asset_path))
+
+    @ddt.data('split', 'old')
+    def test_canonical_asset_path_with_asset_index(self, prefix):
+        exts = ['.html', '.tm']
+        course_key = self.courses[prefix].id
+        asset_index = contentstore().get_asset_index_for_course(course_key)
+        names = [
+            u'{}_ünlöck.png', u'{}_lock.png', u'special/{}_ünlöck.png', u'weird {}_ünlöck.png',
+            u'{}_excluded.html', u'{}_missing.png', u'{}_ünlöck.png?foo=/static/{}_lock.png',
+        ]
+        for name in names:
+            start = u'/static/' + name.format(prefix, prefix)
+            expected = StaticContent.get_canonicalized_asset_path(course_key, start, u'dev', exts)
+            with check_mongo_calls(0):
+                asset_path = StaticContent.get_canonicalized_asset_path(
+                    course_key, start, u'dev', exts, asset_index=asset_index
+                )
+            self.assertEqual(asset_path, expected)
+
+    def test_cached_asset_index(self):
+        course_key = self.courses['split'].id
+        asset_key = StaticContent.compute_location(course_key, u'split_lock.png')
+        del_cached_content(asset_key)
+
+        with check_mongo_calls(1):
+            asset_index = get_cached_asset_index(course_key)
+        self.assertEqual(asset_index, contentstore().get_asset_index_for_course(course_key))
+        self.assertTrue(asset_index[u'split_lock.png'][1])
+        with check_mongo_calls(0):
+            self.assertIs(get_cached_asset_index(course_key), asset_index)
+
+        # Changing an asset invalidates the index, in this and other processes.
+        del_cached_content(asset_key)
+        with check_mongo_calls(1):
+            self.assertEqual(get_cached_asset_index(course_key), asset_index)
@@ -0,0 +1,197 @@
+"""
+Data of the user's enrollments listed in the course list of the dashboard.
+
+Listing an enrollment on the dashboard needs the certificate, course modes,
+verification status, redeemed registration codes, etc. of its course. Rather
+than looking them up course by course, DashboardCourseData reads each of them
+for all of the user's enrollments at once, when first used.
+
+The rendered course list may also be cached for each user, with the
+student.cache_dashboard_course_list waffle switch. The cached list is keyed
+by the user's enrollment status hash, so it isn't used once the user enrolls,
+unenrolls or changes mode, and otherwise expires after a few minutes.
+"""
+import hashlib
+from collections import defaultdict
+
+from django.utils.translation import get_language
+from lazy import lazy
+
+from bulk_email.models import BulkEmailFlag, CourseAuthorization  # pylint: disable=import-error
+from certificates.models import GeneratedCertificate, certificate_status  # pylint: disable=import-error
+from course_modes.models import CourseMode
+from openedx.core.djangoapps.theming import helpers as theming_helpers
+from openedx.core.djangoapps.waffle_utils import WaffleSwitchNamespace
+from shoppingcart.models import CourseRegistrationCode
+from student.helpers import check_verify_status_by_course
+from student.models import CourseEnrollment, CourseEnrollmentAttribute
+
+# Namespace
+WAFFLE_NAMESPACE = u'student'
+
+# Switches
+CACHE_DASHBOARD_COURSE_LIST = u'cache_dashboard_course_list'
+
+# Maximum number of seconds the rendered course list of a user is cached.
+# Changes of the user's certificates, grades or verification status are shown
+# once it expires.
+COURSE_LIST_CACHE_TIMEOUT = 5 * 60
+
+
+def waffle():
+    """
+    Returns the namespaced, cached, audited Waffle class for Student.
+    """
+    return WaffleSwitchNamespace(name=WAFFLE_NAMESPACE, log_prefix=u'Student: ')
+
+
+def course_list_cache_key(user, orgs_to_include, orgs_to_exclude):
+    """
+    Returns the key of the cached dashboard course list of the user, listing
+    the courses of the given orgs in the current site, theme and language.
+    """
+    site = theming_helpers.get_current_site()
+    dependencies = [
+        user.id,
+        CourseEnrollment.generate_enrollment_status_hash(user),
+        site.id if site else None,
+        unicode(theming_helpers.get_current_theme()),
+        get_language(),
+        sorted(orgs_to_include or []),
+        sorted(orgs_to_exclude or []),
+    ]
+    return u'student.dashboard.course_list.{}'.format(hashlib.md5(repr(dependencies)).hexdigest())
+
+
+class DashboardCourseData(object):
+    """
+    Data of the courses of the given enrollments of a user, each read for
+    every enrollment at once.
+    """
+    def __init__(self, user, course_enrollments):
+        self.user = user
+        self.course_enrollments = course_enrollments
+        self.course_ids = [enrollment.course_id for enrollment in course_enrollments]
+
+    @lazy
+    def _course_modes(self):
+        """
+        The all and unexpired course modes of each course.
+        """
+        return CourseMode.all_and_unexpired_modes_for_courses(self.course_ids)
+
+    @lazy
+    def course_modes_by_course(self):
+        """
+        Dict of the unexpired course modes of each course, by slug.
+        """
+        __, unexpired_course_modes = self._course_modes
+        return {
+            course_id: {mode.slug: mode for mode in modes}
+            for course_id, modes in unexpired_course_modes.iteritems()
+        }
+
+    @lazy
+    def _certificates(self):
+        """
+        The user's certificate of each course.
+        """
+        return {
+            certificate.course_id: certificate
+            for certificate in GeneratedCertificate.objects.filter(user=self.user)  # pylint: disable=no-member
+        }
+
+    def certificate_status(self, course_id):
+        """
+        Returns the status of the user's certificate in the course, as
+        certificate_status_for_student does.
+        """
+        return certificate_status(self._certificates.get(course_id))
+
+    @lazy
+    def course_ids_with_certs(self):
+        """
+        Set of the courses in which the user has a certificate.
+        """
+        return set(self._certificates)
+
+    @lazy
+    def verify_status_by_course(self):
+        """
+        The verification status of each course, as returned by check_verify_status_by_course.
+        """
+        return check_verify_status_by_course(self.user, self.course_enrollments)
+
+    @lazy
+    def _enrollment_ids_with_orders(self):
+        """
+        Set of the ids of the enrollments that were purchased in an ecommerce order.
+        """
+        return set(
+            CourseEnrollmentAttribute.objects.filter(
+                enrollment__in=self.course_enrollments,
+                namespace='order',
+                name='order_number',
+            ).values_list('enrollment_id', flat=True)
+        )
+
+    def is_refundable(self, enrollment):
+        """
+        Returns whether the enrollment can be refunded, as enrollment.refundable does.
+
+        Enrollments without an order can't be refunded, so the ecommerce
+        service is only asked about the orders of the other enrollments.
+        """
+        if getattr(enrollment, 'can_refund', None) is None and enrollment.id not in self._enrollment_ids_with_orders:
+            return False
+        return enrollment.refundable(user_already_has_certs_for=self.course_ids_with_certs)
+
+    def is_paid_course(self, enrollment):
+        """
+        Returns whether the enrolled course is paid, as enrollment.is_paid_course does.
+        """
+        selectable_modes = {
+            slug: mode
+            for slug, mode in self.course_modes_by_course[enrollment.course_id].iteritems()
+            if slug not in CourseMode.CREDIT_MODES
+        } or {CourseMode.DEFAULT_MODE_SLUG: CourseMode.DEFAULT_MODE}
+        return (
+            CourseMode.is_white_label(enrollment.course_id, modes_dict=selectable_modes) or
+            CourseMode.is_professional_slug(enrollment.mode)
+        )
+
+    @lazy
+    def _redeemed_registration_codes(self):
+        """
+        The registration codes redeemed by the user, by course.
+        """
+        codes_by_course = defaultdict(list)
+        redeemed_codes = CourseRegistrationCode.objects.filter(
+            course_id__in=self.course_ids,
+            registrationcoderedemption__redeemed_by=self.user,
+        ).select_related('invoice_item__invoice')
+        for registration_code in redeemed_codes:
+            codes_by_course[registration_code.course_id].append(registration_code)
+        return codes_by_course
+
+    def redeemed_registration_codes(self, course_id):
+        """
+        Returns the registration codes redeemed by the user in the course.
+        """
+        return self._redeemed_registration_codes.get(course_id, [])
+
+    @lazy
+    def email_enabled_course_ids(self):
+        """
+        Set of the courses for which bulk email is enabled, as checked by BulkEmailFlag.feature_enabled.
+        """
+        if not BulkEmailFlag.is_enabled():
+            return frozenset()
+        if not BulkEmailFlag.current().require_course_email_auth:
+            return frozenset(self.course_ids)
+        return frozenset(
+            CourseAuthorization.objects.filter(
+                course_id__in=self.course_ids,
+                email_enabled=True,
+            ).values_list('course_id', flat=True)
+        )
@@ -14,7 +14,7 @@ import hashlib
 import json
 import logging
 import uuid
-from collections import OrderedDict, defaultdict, namedtuple
+from collections import Counter, OrderedDict, defaultdict, namedtuple
 from datetime import datetime, timedelta
 from functools import total_ordering
 from importlib import import_module
@@ -28,7 +28,7 @@ from django.contrib.auth.models import User
 from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.core.cache import cache
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
-from django.db import IntegrityError, models
+from django.db import IntegrityError, models, router, transaction
 from django.db.models import Count
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import Signal, receiver
@@ -55,7 +55,7 @@ from openedx.core.djangoapps.xmodule_django.models import CourseKeyField, NoneTo
 from track import contexts
 from util.milestones_helpers import is_entrance_exams_enabled
 from util.model_utils import emit_field_changed_events, get_changed_fields_dict
-from util.query import use_read_replica_if_available
+from util.query import chunks, use_read_replica_if_available
 
 UNENROLL_DONE = Signal(providing_args=["course_enrollment", "skip_refund"])
 ENROLL_STATUS_CHANGE = Signal(providing_args=["event", "user", "course_id", "mode", "cost", "currency"])
@@ -973,6 +973,10 @@ class CourseEnrollmentManager(models.Manager):
 # is used to cache the state in the request cache.
 CourseEnrollmentState = namedtuple('CourseEnrollmentState', 'mode, is_active')
 
+# Maximum number of values in the IN clauses of the queries of bulk enrollments,
+# which is limited by some database backends (e.g. sqlite3).
+BULK_QUERY_CHUNK_SIZE = 500
+
 
 class CourseEnrollment(models.Model):
     """
@@ -1302,6 +1306,221 @@ class CourseEnrollment(models.Model):
 
         return enrollment
 
+    @classmethod
+    def bulk_enroll(cls, enrollments, course_key, check_access=False):
+        """
+        Enroll many users in a course, as enroll does for each of them, with
+        the enrollments written in bulk in a single transaction.
+
+        `enrollments` is a list of (user, mode) tuples, where a mode of None is
+               the default mode of the course.
+
+        `course_key` is our usual course_id string (e.g. "edX/Test101/2013_Fall)
+
+        `check_access`: if True, we check that an accessible course exists,
+                that none of the users are enrolled yet, that its enrollment is
+                open to each of them and that it has room for all of them, as
+                enroll does.
+
+        Returns the list of CourseEnrollment objects, in the order of
+        `enrollments`.
+
+        Exceptions that can be raised: NonExistentCourseError,
+        EnrollmentClosedError, CourseFullError, AlreadyEnrolledError. Then none
+        of the users are enrolled.
+        """
+        default_mode = None
+        course = None
+        try:
+            course = CourseOverview.get_from_id(course_key)
+        except CourseOverview.DoesNotExist:
+            # As in enroll, allow enrolling in courses announced before the start of content creation.
+            if check_access:
+                log.warning(u"Failed to enroll users in non-existent course %s", unicode(course_key))
+                raise NonExistentCourseError
+
+        if check_access:
+            for user_ids in chunks([user.id for user, __ in enrollments], BULK_QUERY_CHUNK_SIZE):
+                enrolled_usernames = list(
+                    cls.objects.filter(course_id=course_key, user_id__in=user_ids, is_active=True).values_list(
+                        'user__username', flat=True
+                    )
+                )
+                if enrolled_usernames:
+                    log.warning(
+                        u"Users %s attempted to enroll in %s, but they were already enrolled",
+                        u", ".join(enrolled_usernames),
+                        course_key.to_deprecated_string()
+                    )
+                    raise AlreadyEnrolledError
+
+        changes = []
+        for user, mode in enrollments:
+            if check_access and cls.is_enrollment_closed(user, course):
+                log.warning(
+                    u"User %s failed to enroll in course %s because enrollment is closed",
+                    user.username,
+                    course_key.to_deprecated_string()
+                )
+                raise EnrollmentClosedError
+            if mode is None:
+                if default_mode is None:
+                    default_mode = _default_course_mode(unicode(course_key))
+                mode = default_mode
+            changes.append((user, mode, True))
+
+        if check_access and course.max_student_enrollments_allowed is not None and changes:
+            num_enrolled = cls.objects.num_enrolled_in_exclude_admins(course_key)
+            if num_enrolled + len(changes) > course.max_student_enrollments_allowed:
+                log.warning(
+                    u"Course %s has reached its maximum enrollment of %d learners. %d users failed to enroll.",
+                    course_key.to_deprecated_string(),
+                    course.max_student_enrollments_allowed,
+                    len(changes),
+                )
+                raise CourseFullError
+
+        enrollments = cls.bulk_update_enrollments(course_key, changes)
+        for enrollment in enrollments:
+            enrollment.send_signal(EnrollStatusChange.enroll)
+        return enrollments
+
+    @classmethod
+    def bulk_update_enrollments(cls, course_key, changes, skip_refund=False):
+        """
+        Create or update the enrollments of many users in a course, as
+        get_or_create_enrollment and update_enrollment do for each of them.
+
+        The enrollments are written in bulk in a single transaction: with a
+        query per distinct (mode, is_active) of the updated enrollments and
+        a bulk insert of the new ones. The model signals are still sent for
+        each enrollment, since their receivers (e.g. the enrollment history
+        and the forum roles) depend on them, while the analytics events and
+        enrollment signals are sent once all the enrollments are written.
+
+        Arguments:
+            course_key (CourseKey): The course of the enrollments.
+            changes (list): (user, mode, is_active) tuples, where a mode or
+                is_active of None leaves the enrollment's value unchanged.
+                New enrollments start in the default mode and inactive.
+            skip_refund (bool): Passed on to the UNENROLL_DONE signal.
+
+        Returns:
+            list of CourseEnrollment objects, in the order of `changes`.
+        """
+        existing_enrollments = {}
+        for user_ids in chunks([user.id for user, __, __ in changes], BULK_QUERY_CHUNK_SIZE):
+            for enrollment in cls.objects.filter(course_id=course_key, user_id__in=user_ids):
+                existing_enrollments[enrollment.user_id] = enrollment
+
+        enrollments = []
+        new_enrollments = []
+        changed_enrollments = []
+        enrollments_by_user = {}
+        for user, mode, is_active in changes:
+            enrollment = enrollments_by_user.get(user.id)
+            if enrollment is None:
+                enrollment = existing_enrollments.get(user.id)
+                if enrollment is None:
+                    enrollment = cls(
+                        user=user, course_id=course_key, mode=CourseMode.DEFAULT_MODE_SLUG, is_active=False
+                    )
+                    new_enrollments.append(enrollment)
+                else:
+                    enrollment.user = user
+                enrollments_by_user[user.id] = enrollment
+            enrollments.append(enrollment)
+
+            activation_changed = is_active is not None and enrollment.is_active != is_active
+            mode_changed = mode is not None and enrollment.mode != mode
+            if activation_changed:
+                enrollment.is_active = is_active
+            if mode_changed:
+                enrollment.mode = mode
+            if activation_changed or mode_changed:
+                changed_enrollments.append((enrollment, activation_changed, mode_changed))
+
+        saved_enrollments = new_enrollments + [
+            enrollment for enrollment, __, __ in changed_enrollments if enrollment.pk is not None
+        ]
+        new_user_ids = set(enrollment.user_id for enrollment in new_enrollments)
+        using = router.db_for_write(cls)
+        with transaction.atomic(using=using):
+            for enrollment in saved_enrollments:
+                pre_save.send(sender=cls, instance=enrollment, raw=False, using=using, update_fields=None)
+
+            updated_ids = defaultdict(set)
+            for enrollment, __, __ in changed_enrollments:
+                if enrollment.pk is not None:
+                    updated_ids[(enrollment.mode, enrollment.is_active)].add(enrollment.pk)
+            for (mode, is_active), ids in updated_ids.iteritems():
+                for chunk in chunks(ids, BULK_QUERY_CHUNK_SIZE):
+                    cls.objects.filter(pk__in=chunk).update(mode=mode, is_active=is_active)
+
+            if new_enrollments:
+                cls.objects.bulk_create(new_enrollments)
+                # bulk_create doesn't set the primary keys of the new rows with MySQL.
+                created_ids = {}
+                for user_ids in chunks(new_user_ids, BULK_QUERY_CHUNK_SIZE):
+                    created_ids.update(
+                        cls.objects.filter(course_id=course_key, user_id__in=user_ids).values_list('user_id', 'id')
+                    )
+                for enrollment in new_enrollments:
+                    enrollment.pk = created_ids[enrollment.user_id]
+
+            for enrollment in saved_enrollments:
+                post_save.send(
+                    sender=cls,
+                    instance=enrollment,
+                    created=enrollment.user_id in new_user_ids,
+                    raw=False,
+                    using=using,
+                    update_fields=None,
+                )
+
+        cache.delete_many([cls.enrollment_status_hash_cache_key(enrollment.user) for enrollment in saved_enrollments])
+        for enrollment in saved_enrollments:
+            cls._update_enrollment_in_request_cache(
+                enrollment.user,
+                course_key,
+                CourseEnrollmentState(enrollment.mode, enrollment.is_active),
+            )
+
+        cls._emit_bulk_update_events(changed_enrollments, skip_refund)
+        return enrollments
+
+    @classmethod
+    def _emit_bulk_update_events(cls, changed_enrollments, skip_refund):
+        """
+        Emits the events and signals of enrollments updated in bulk, as
+        update_enrollment does for each of them, with the enrollment metrics
+        sent once per mode.
+        """
+        metric_counts = Counter()
+        for enrollment, activation_changed, mode_changed in changed_enrollments:
+            if activation_changed:
+                if enrollment.is_active:
+                    enrollment.emit_event(EVENT_NAME_ENROLLMENT_ACTIVATED)
+                    metric_counts[("common.student.enrollment", enrollment.mode)] += 1
+                else:
+                    UNENROLL_DONE.send(sender=None, course_enrollment=enrollment, skip_refund=skip_refund)
+                    enrollment.emit_event(EVENT_NAME_ENROLLMENT_DEACTIVATED)
+                    enrollment.send_signal(EnrollStatusChange.unenroll)
+                    metric_counts[("common.student.unenrollment", enrollment.mode)] += 1
+            if mode_changed:
+                enrollment.emit_event(EVENT_NAME_ENROLLMENT_MODE_CHANGED)
+
+        if changed_enrollments:
+            course_id = changed_enrollments[0][0].course_id
+            for (metric, mode), count in metric_counts.iteritems():
+                dog_stats_api.increment(
+                    metric,
+                    value=count,
+                    tags=[u"org:{}".format(course_id.org),
+                          u"offering:{}".format(course_id.offering),
+                          u"mode:{}".format(mode)]
+                )
+
     @classmethod
     def enroll_by_email(cls, email, course_id, mode=None, ignore_errors=True):
         """
@@ -2323,6 +2542,24 @@ class CourseEnrollmentAttribute(models.Model):
         ]
         cls.objects.bulk_create(attributes)
 
+    @classmethod
+    def bulk_add_enrollment_attrs(cls, enrollments_data):
+        """Replace the enrollment attributes of many enrollments, as
+        add_enrollment_attr does for each of them, in bulk.
+
+        Args:
+            enrollments_data(list): (enrollment, data_list) tuples of a 'CourseEnrollment' and the list of
+                dictionaries containing the data of its attributes to save
+        """
+        for enrollment_ids in chunks([enrollment.id for enrollment, __ in enrollments_data], BULK_QUERY_CHUNK_SIZE):
+            cls.objects.filter(enrollment_id__in=enrollment_ids).delete()
+        attributes = [
+            cls(enrollment=enrollment, namespace=data['namespace'], name=data['name'], value=data['value'])
+            for enrollment, data_list in enrollments_data
+            for data in data_list
+        ]
+        cls.objects.bulk_create(attributes)
+
     @classmethod
     def get_enrollment_attributes(cls, enrollment):
         """Retrieve list of all enrollment attributes.
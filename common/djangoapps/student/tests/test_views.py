@@ -17,9 +17,11 @@ from mock import patch
 from pyquery import PyQuery as pq
 
 from student.cookies import get_user_info_cookie_data
+from student.dashboard_data import CACHE_DASHBOARD_COURSE_LIST, waffle
 from student.helpers import DISABLE_UNENROLL_CERT_STATES
 from student.models import CourseEnrollment, LogoutViewConfiguration, UserProfile
 from student.tests.factories import CourseEnrollmentFactory, UserFactory
+from student.views import _render_course_list
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
@@ -48,7 +50,7 @@ class TestStudentDashboardUnenrollments(SharedModuleStoreTestCase):
         self.cert_status = None
         self.client.login(username=self.user.username, password=PASSWORD)
 
-    def mock_cert(self, _user, _course_overview, _course_mode):
+    def mock_cert(self, _user, _course_overview, _course_mode, cert_status=None):  # pylint: disable=unused-argument
         """ Return a preset certificate status. """
         if self.cert_status is not None:
             return {
@@ -304,3 +306,37 @@ class StudentDashboardTests(SharedModuleStoreTestCase):
         response = self.client.get(reverse('dashboard'))
         self.assertEqual('Share on Twitter' in response.content, set_marketing or set_social_sharing)
         self.assertEqual('Share on Facebook' in response.content, set_marketing or set_social_sharing)
+
+    def test_course_list_cached(self):
+        """
+        Verify that the rendered course list is cached for the user, until
+        their enrollments change, when the waffle switch is on.
+        """
+        first_course = CourseFactory.create(emit_signals=True)
+        CourseEnrollmentFactory(course_id=first_course.id, user=self.user)
+
+        with waffle().override(CACHE_DASHBOARD_COURSE_LIST):
+            with patch('student.views._render_course_list', wraps=_render_course_list) as mock_render:
+                response = self.client.get(self.path)
+                self.assertIn(first_course.display_name, response.content)
+                self.client.get(self.path)
+                self.assertEqual(mock_render.call_count, 1)
+
+                second_course = CourseFactory.create(emit_signals=True)
+                CourseEnrollmentFactory(course_id=second_course.id, user=self.user)
+                response = self.client.get(self.path)
+                self.assertEqual(mock_render.call_count, 2)
+                self.assertIn(first_course.display_name, response.content)
+                self.assertIn(second_course.display_name, response.content)
+
+    def test_course_list_not_cached_by_default(self):
+        """
+        Verify that the course list is rendered on each visit when the waffle switch is off.
+        """
+        course = CourseFactory.create(emit_signals=True)
+        CourseEnrollmentFactory(course_id=course.id, user=self.user)
+
+        with patch('student.views._render_course_list', wraps=_render_course_list) as mock_render:
+            self.client.get(self.path)
+            self.client.get(self.path)
+        self.assertEqual(mock_render.call_count, 2)
@@ -19,6 +19,7 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import AnonymousUser, User
 from django.contrib.auth.views import password_reset_confirm
 from django.core import mail
+from django.core.cache import cache
 from django.core.context_processors import csrf
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 from django.core.urlresolvers import NoReverseMatch, reverse, reverse_lazy
@@ -53,11 +54,10 @@ import dogstats_wrapper as dog_stats_api
 import openedx.core.djangoapps.external_auth.views
 import third_party_auth
 import track.views
-from bulk_email.models import BulkEmailFlag, Optout  # pylint: disable=import-error
+from bulk_email.models import Optout  # pylint: disable=import-error
 from certificates.api import get_certificate_url, has_html_certificates_enabled  # pylint: disable=import-error
 from certificates.models import (  # pylint: disable=import-error
     CertificateStatuses,
-    GeneratedCertificate,
     certificate_status_for_student
 )
 from course_modes.models import CourseMode
@@ -88,13 +88,19 @@ from openedx.core.djangolib.markup import HTML
 from openedx.features.course_experience import course_home_url_name
 from openedx.features.enterprise_support.api import get_dashboard_consent_notification
 from shoppingcart.api import order_history
-from shoppingcart.models import CourseRegistrationCode, DonationConfiguration
+from shoppingcart.models import DonationConfiguration
 from student.cookies import delete_logged_in_cookies, set_logged_in_cookies, set_user_info_cookie
+from student.dashboard_data import (
+    CACHE_DASHBOARD_COURSE_LIST,
+    COURSE_LIST_CACHE_TIMEOUT,
+    DashboardCourseData,
+    course_list_cache_key,
+    waffle
+)
 from student.forms import AccountCreationForm, PasswordResetFormNoActive, get_registration_extension_form
 from student.helpers import (
     DISABLE_UNENROLL_CERT_STATES,
     auth_pipeline_urls,
-    check_verify_status_by_course,
     destroy_oauth_tokens,
     get_next_url_for_login_page
 )
@@ -220,7 +226,7 @@ def process_survey_link(survey_link, user):
     return survey_link.format(UNIQUE_ID=unique_id_for_user(user))
 
 
-def cert_info(user, course_overview, course_mode):
+def cert_info(user, course_overview, course_mode, cert_status=None):
     """
     Get the certificate info needed to render the dashboard section for the given
     student and course.
@@ -229,6 +235,8 @@ def cert_info(user, course_overview, course_mode):
         user (User): A user.
         course_overview (CourseOverview): A course.
         course_mode (str): The enrollment mode (honor, verified, audit, etc.)
+        cert_status (dict): The status of the user's certificate, if already
+            read. Otherwise it is read from the database.
 
     Returns:
         dict: Empty dict if certificates are disabled or hidden, or a dictionary with keys:
@@ -243,12 +251,9 @@ def cert_info(user, course_overview, course_mode):
     """
     if not course_overview.may_certify():
         return {}
-    return _cert_info(
-        user,
-        course_overview,
-        certificate_status_for_student(user, course_overview.id),
-        course_mode
-    )
+    if cert_status is None:
+        cert_status = certificate_status_for_student(user, course_overview.id)
+    return _cert_info(user, course_overview, cert_status, course_mode)
 
 
 def reverification_info(statuses):
@@ -667,21 +672,13 @@ def dashboard(request):
     # sort the enrollment pairs by the enrollment date
     course_enrollments.sort(key=lambda x: x.created, reverse=True)
 
-    # Retrieve the course modes for each course
-    enrolled_course_ids = [enrollment.course_id for enrollment in course_enrollments]
-    __, unexpired_course_modes = CourseMode.all_and_unexpired_modes_for_courses(enrolled_course_ids)
-    course_modes_by_course = {
-        course_id: {
-            mode.slug: mode
-            for mode in modes
-        }
-        for course_id, modes in unexpired_course_modes.iteritems()
-    }
+    # The data of the enrolled courses is read for every course at once.
+    course_data = DashboardCourseData(user, course_enrollments)
 
     # Check to see if the student has recently enrolled in a course.
     # If so, display a notification message confirming the enrollment.
     enrollment_message = _create_recent_enrollment_message(
-        course_enrollments, course_modes_by_course
+        course_enrollments, course_data.course_modes_by_course
     )
 
     course_optouts = Optout.objects.filter(user=user).values_list('course_id', flat=True)
@@ -725,56 +722,6 @@ def dashboard(request):
         staff_access = True
         errored_courses = modulestore().get_errored_courses()
 
-    show_courseware_links_for = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if has_access(request.user, 'load', enrollment.course_overview)
-        and has_access(request.user, 'view_courseware_with_prerequisites', enrollment.course_overview)
-    )
-
-    # Find programs associated with course runs being displayed. This information
-    # is passed in the template context to allow rendering of program-related
-    # information on the dashboard.
-    meter = ProgramProgressMeter(user, enrollments=course_enrollments)
-    inverted_programs = meter.invert_programs()
-
-    # Construct a dictionary of course mode information
-    # used to render the course list.  We re-use the course modes dict
-    # we loaded earlier to avoid hitting the database.
-    course_mode_info = {
-        enrollment.course_id: complete_course_mode_info(
-            enrollment.course_id, enrollment,
-            modes=course_modes_by_course[enrollment.course_id]
-        )
-        for enrollment in course_enrollments
-    }
-
-    # Determine the per-course verification status
-    # This is a dictionary in which the keys are course locators
-    # and the values are one of:
-    #
-    # VERIFY_STATUS_NEED_TO_VERIFY
-    # VERIFY_STATUS_SUBMITTED
-    # VERIFY_STATUS_APPROVED
-    # VERIFY_STATUS_MISSED_DEADLINE
-    #
-    # Each of which correspond to a particular message to display
-    # next to the course on the dashboard.
-    #
-    # If a course is not included in this dictionary,
-    # there is no verification messaging to display.
-    verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
-    cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview, enrollment.mode)
-        for enrollment in course_enrollments
-    }
-
-    # only show email settings for Mongo course and when bulk email is turned on
-    show_email_settings_for = frozenset(
-        enrollment.course_id for enrollment in course_enrollments if (
-            BulkEmailFlag.feature_enabled(enrollment.course_id)
-        )
-    )
-
     # Verification Attempts
     # Used to generate the "you must reverify for course x" banner
     verification_status, verification_error_codes = SoftwareSecurePhotoVerification.user_status(user)
@@ -784,31 +731,6 @@ def dashboard(request):
     statuses = ["approved", "denied", "pending", "must_reverify"]
     reverifications = reverification_info(statuses)
 
-    user_already_has_certs_for = GeneratedCertificate.course_ids_with_certs_for_user(request.user)
-    show_refund_option_for = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if enrollment.refundable(
-            user_already_has_certs_for=user_already_has_certs_for
-        )
-    )
-
-    block_courses = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if is_course_blocked(
-            request,
-            CourseRegistrationCode.objects.filter(
-                course_id=enrollment.course_id,
-                registrationcoderedemption__redeemed_by=request.user
-            ),
-            enrollment.course_id
-        )
-    )
-
-    enrolled_courses_either_paid = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if enrollment.is_paid_course()
-    )
-
     # If there are *any* denied reverifications that have not been toggled off,
     # we'll display the banner
     denied_banner = any(item.display for item in reverifications["denied"])
@@ -816,13 +738,6 @@ def dashboard(request):
     # Populate the Order History for the side-bar.
     order_history_list = order_history(user, course_org_filter=course_org_filter, org_filter_out_set=org_filter_out_set)
 
-    # get list of courses having pre-requisites yet to be completed
-    courses_having_prerequisites = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if enrollment.course_overview.pre_requisite_courses
-    )
-    courses_requirements_not_met = get_pre_requisite_courses_not_completed(user, courses_having_prerequisites)
-
     if 'notlive' in request.GET:
         redirect_message = _("The course you are looking for does not start until {date}.").format(
             date=request.GET['notlive']
@@ -848,28 +763,17 @@ def dashboard(request):
         'sidebar_account_activation_message': sidebar_account_activation_message,
         'staff_access': staff_access,
         'errored_courses': errored_courses,
-        'show_courseware_links_for': show_courseware_links_for,
-        'all_course_modes': course_mode_info,
-        'cert_statuses': cert_statuses,
-        'credit_statuses': _credit_statuses(user, course_enrollments),
-        'show_email_settings_for': show_email_settings_for,
         'reverifications': reverifications,
         'verification_status': verification_status,
-        'verification_status_by_course': verify_status_by_course,
         'verification_errors': verification_errors,
-        'show_refund_option_for': show_refund_option_for,
-        'block_courses': block_courses,
         'denied_banner': denied_banner,
         'billing_email': settings.PAYMENT_SUPPORT_EMAIL,
         'user': user,
         'logout_url': reverse('logout'),
         'platform_name': platform_name,
-        'enrolled_courses_either_paid': enrolled_courses_either_paid,
         'provider_states': [],
         'order_history_list': order_history_list,
-        'courses_requirements_not_met': courses_requirements_not_met,
         'nav_hidden': True,
-        'inverted_programs': inverted_programs,
         'show_program_listing': ProgramsApiConfig.is_enabled(),
         'disable_courseware_js': True,
         'display_course_modes_on_dashboard': enable_verified_certificates and display_course_modes_on_dashboard,
@@ -883,11 +787,131 @@ def dashboard(request):
             'ecommerce_payment_page': ecommerce_service.payment_page_url(),
         })
 
+    # The rendered course list may be cached for the user until their enrollments change.
+    course_list_html = u''
+    if course_enrollments:
+        cache_key = None
+        course_list_html = None
+        if waffle().is_enabled(CACHE_DASHBOARD_COURSE_LIST):
+            cache_key = course_list_cache_key(user, course_org_filter, org_filter_out_set)
+            course_list_html = cache.get(cache_key)
+        if course_list_html is None:
+            course_list_html = _render_course_list(request, course_data, context)
+            if cache_key:
+                cache.set(cache_key, course_list_html, COURSE_LIST_CACHE_TIMEOUT)
+    context['course_list_html'] = course_list_html
+
     response = render_to_response('dashboard.html', context)
     set_user_info_cookie(response, request)
     return response
 
 
+def _render_course_list(request, course_data, context):
+    """
+    Renders the list of the user's enrolled courses on the dashboard.
+
+    Arguments:
+        request: The request object.
+        course_data (DashboardCourseData): The data of the user's enrolled courses.
+        context (dict): The context of the dashboard.
+
+    Returns:
+        unicode: The rendered course list.
+    """
+    user = request.user
+    course_enrollments = course_data.course_enrollments
+
+    show_courseware_links_for = frozenset(
+        enrollment.course_id for enrollment in course_enrollments
+        if has_access(user, 'load', enrollment.course_overview)
+        and has_access(user, 'view_courseware_with_prerequisites', enrollment.course_overview)
+    )
+
+    # Find programs associated with course runs being displayed. This information
+    # is passed in the template context to allow rendering of program-related
+    # information on the dashboard.
+    meter = ProgramProgressMeter(user, enrollments=course_enrollments)
+    inverted_programs = meter.invert_programs()
+
+    # Construct a dictionary of course mode information
+    # used to render the course list.  We re-use the course modes dict
+    # we loaded earlier to avoid hitting the database.
+    course_mode_info = {
+        enrollment.course_id: complete_course_mode_info(
+            enrollment.course_id, enrollment,
+            modes=course_data.course_modes_by_course[enrollment.course_id]
+        )
+        for enrollment in course_enrollments
+    }
+
+    cert_statuses = {
+        enrollment.course_id: cert_info(
+            user,
+            enrollment.course_overview,
+            enrollment.mode,
+            cert_status=course_data.certificate_status(enrollment.course_id),
+        )
+        for enrollment in course_enrollments
+    }
+
+    show_refund_option_for = frozenset(
+        enrollment.course_id for enrollment in course_enrollments
+        if course_data.is_refundable(enrollment)
+    )
+
+    block_courses = frozenset(
+        enrollment.course_id for enrollment in course_enrollments
+        if is_course_blocked(
+            request,
+            course_data.redeemed_registration_codes(enrollment.course_id),
+            enrollment.course_id
+        )
+    )
+
+    enrolled_courses_either_paid = frozenset(
+        enrollment.course_id for enrollment in course_enrollments
+        if course_data.is_paid_course(enrollment)
+    )
+
+    # get list of courses having pre-requisites yet to be completed
+    courses_having_prerequisites = frozenset(
+        enrollment.course_id for enrollment in course_enrollments
+        if enrollment.course_overview.pre_requisite_courses
+    )
+    courses_requirements_not_met = get_pre_requisite_courses_not_completed(user, courses_having_prerequisites)
+
+    course_list_context = dict(context)
+    course_list_context.update({
+        'show_courseware_links_for': show_courseware_links_for,
+        'all_course_modes': course_mode_info,
+        'cert_statuses': cert_statuses,
+        'credit_statuses': _credit_statuses(user, course_enrollments),
+        # only show email settings for Mongo course and when bulk email is turned on
+        'show_email_settings_for': course_data.email_enabled_course_ids,
+        # Determine the per-course verification status
+        # This is a dictionary in which the keys are course locators
+        # and the values are one of:
+        #
+        # VERIFY_STATUS_NEED_TO_VERIFY
+        # VERIFY_STATUS_SUBMITTED
+        # VERIFY_STATUS_APPROVED
+        # VERIFY_STATUS_MISSED_DEADLINE
+        #
+        # Each of which correspond to a particular message to display
+        # next to the course on the dashboard.
+        #
+        # If a course is not included in this dictionary,
+        # there is no verification messaging to display.
+        'verification_status_by_course': course_data.verify_status_by_course,
+        'show_refund_option_for': show_refund_option_for,
+        'block_courses': block_courses,
+        'enrolled_courses_either_paid': enrolled_courses_either_paid,
+        'courses_requirements_not_met': courses_requirements_not_met,
+        'inverted_programs': inverted_programs,
+    })
+    return render_to_string('dashboard/_dashboard_course_list.html', course_list_context, request=request)
+
+
 def get_verification_error_reasons_for_display(verification_error_codes):
     verification_errors = []
     verification_error_map = {
@@ -3,9 +3,12 @@ Unit tests for stub XQueue implementation.
 """
 
 import mock
+import os
+import time
 import unittest
 import json
 import requests
+from capa.xqueue_interface import AsyncXQueueDispatcher, XQueueInterface, make_xheader
 from ..xqueue import StubXQueueService
 
 
@@ -115,6 +118,41 @@ class StubXQueueServiceTest(unittest.TestCase):
             self.assertFalse(self.post.called)
             self.assertTrue(logger.error.called)
 
+    def test_batch_request(self):
+        callback_url = 'http://127.0.0.1:8000/test_callback'
+        header = make_xheader(callback_url, 'test_queuekey', 'test_queue')
+        batch_url = "http://127.0.0.1:{0}/xqueue/submit_batch/".format(self.server.port)
+
+        resp = requests.post(batch_url, data={
+            'xqueue_submissions': json.dumps([
+                {'xqueue_header': header, 'xqueue_body': json.dumps({'submission': 'first'})},
+                {'xqueue_header': 'not json', 'xqueue_body': json.dumps({'submission': 'second'})},
+            ]),
+        })
+
+        self.assertEqual(resp.status_code, 200)
+        replies = json.loads(resp.text)['content']
+        self.assertEqual([reply['return_code'] for reply in replies], [0, 1])
+        self.assertEqual(self.server.submission_count, 1)
+        self._check_grade_response(
+            callback_url, json.dumps(json.loads(header)), json.dumps({'correct': True, 'score': 1, 'msg': '<div></div>'})
+        )
+
+    def test_xqueue_interface_batch(self):
+        self.server.config['send_grades'] = False
+        xqueue_interface = XQueueInterface("http://127.0.0.1:{0}".format(self.server.port), {})
+        header = make_xheader('http://127.0.0.1:8000/test_callback', 'test_queuekey', 'test_queue')
+        submissions = [(header, json.dumps({'submission': index})) for index in range(3)]
+
+        self.assertEqual(xqueue_interface.send_batch_to_queue(submissions), [(0, '')] * 3)
+        self.assertTrue(xqueue_interface.supports_batch_submit)
+
+        # Falls back to posting submissions one at a time if the XQueue doesn't support batches.
+        self.server.config['batch_submit'] = False
+        self.assertEqual(xqueue_interface.send_batch_to_queue(submissions), [(0, '')] * 3)
+        self.assertFalse(xqueue_interface.supports_batch_submit)
+        self.assertEqual(self.server.submission_count, 6)
+
     def _post_submission(self, callback_url, lms_key, queue_name, xqueue_body):
         """
         Post a submission to the stub XQueue implementation.
@@ -165,3 +203,38 @@ class StubXQueueServiceTest(unittest.TestCase):
 
         # Check that the POST request was made with the correct params
         self.post.assert_called_with(callback_url, data=expected_callback_dict)
+
+
+@unittest.skipUnless(os.environ.get('BENCHMARK_XQUEUE_DISPATCH'), 'Set BENCHMARK_XQUEUE_DISPATCH to run the benchmark.')
+class XQueueDispatchBenchmark(unittest.TestCase):
+    """
+    Compares the time taken to submit to an XQueue stub with the latency of
+    a remote XQueue, synchronously and with the AsyncXQueueDispatcher.
+    """
+    NUM_SUBMISSIONS = 500
+    SUBMIT_DELAY = 0.02  # seconds
+
+    def setUp(self):
+        super(XQueueDispatchBenchmark, self).setUp()
+        self.server = StubXQueueService()
+        self.server.config.update({'submit_delay': self.SUBMIT_DELAY, 'send_grades': False})
+        self.addCleanup(self.server.shutdown)
+        self.url = "http://127.0.0.1:{0}".format(self.server.port)
+        self.header = make_xheader('http://127.0.0.1:8000/test_callback', 'test_queuekey', 'test_queue')
+
+    def test_benchmark(self):
+        for name, xqueue_interface in (
+                ('synchronous', XQueueInterface(self.url, {})),
+                ('async dispatcher', AsyncXQueueDispatcher(XQueueInterface(self.url, {}))),
+        ):
+            start = time.time()
+            for index in xrange(self.NUM_SUBMISSIONS):
+                xqueue_interface.send_to_queue(self.header, json.dumps({'submission': index}))
+            submitted = time.time() - start
+            if isinstance(xqueue_interface, AsyncXQueueDispatcher):
+                xqueue_interface.flush()
+            delivered = time.time() - start
+
+            print '\n{}: {} submissions accepted in {:.2f}s, delivered in {:.2f}s ({:.0f}/s)'.format(
+                name, self.NUM_SUBMISSIONS, submitted, delivered, self.NUM_SUBMISSIONS / delivered,
+            )
@@ -5,13 +5,21 @@ Configuration values:
     "default" (dict): Default response to be sent to LMS as a grade for a submission
     "<submission>" (dict): Grade response to return for submissions containing the text <submission>
     "register_submission_url" (str): URL to send grader payloads when we receive a submission
+    "submit_delay" (float): Seconds to wait before answering a submission request, to simulate
+        the latency of XQueue when benchmarking
+    "batch_submit" (bool): Whether to accept several submissions per request at xqueue/submit_batch.
+        Defaults to True.
+    "send_grades" (bool): Whether to post grade responses back to the LMS. Defaults to True.
 
 If no grade response is configured, a default response will be returned.
+
+The service counts the submissions it receives in `submission_count`.
 """
 
 import copy
 import json
-from threading import Timer
+import time
+from threading import Lock, Timer
 
 from requests import post
 
@@ -26,7 +34,6 @@ class StubXQueueHandler(StubHttpRequestHandler):
     DEFAULT_RESPONSE_DELAY = 2
     DEFAULT_GRADE_RESPONSE = {'correct': True, 'score': 1, 'msg': ''}
 
-    @require_params('POST', 'xqueue_body', 'xqueue_header')
     def do_POST(self):
         """
         Handle a POST request from the client
@@ -34,6 +41,50 @@ class StubXQueueHandler(StubHttpRequestHandler):
         Sends back an immediate success/failure response.
         It then POSTS back to the client with grading results.
         """
+        submit_delay = self.server.config.get('submit_delay')
+        if submit_delay:
+            time.sleep(submit_delay)
+
+        if 'xqueue/submit_batch' in self.path:
+            self._handle_batch_submission()
+        else:
+            self._handle_submission()
+
+    @require_params('POST', 'xqueue_submissions')
+    def _handle_batch_submission(self):
+        """
+        Handle a POST request with several submissions.
+
+        Sends back the list of the responses to each submission.
+        """
+        if not self.server.config.get('batch_submit', True):
+            self.send_response(404)
+            return
+
+        try:
+            submissions = json.loads(self.post_dict['xqueue_submissions'])
+        except ValueError:
+            self._send_immediate_response(False, message="XQueue could not decode batch request")
+            return
+
+        replies = []
+        for submission in submissions:
+            success, message = self._queue_submission(
+                submission.get('xqueue_header'), submission.get('xqueue_body')
+            )
+            replies.append({'return_code': 0 if success else 1, 'content': message})
+
+        self.send_response(
+            200,
+            content=json.dumps({'return_code': 0, 'content': replies}),
+            headers={'Content-type': 'text/plain'},
+        )
+
+    @require_params('POST', 'xqueue_body', 'xqueue_header')
+    def _handle_submission(self):
+        """
+        Handle a POST request with a single submission.
+        """
         msg = "XQueue received POST request {0} to path {1}".format(self.post_dict, self.path)
         self.log_message(msg)
 
@@ -64,6 +115,9 @@ class StubXQueueHandler(StubHttpRequestHandler):
                 # Send an immediate response of success
                 # The grade request is formed correctly
                 self._send_immediate_response(True)
+                self.server.count_submission()
+                if not self.server.config.get('send_grades', True):
+                    return
 
                 # Wait a bit before POSTing back to the callback url with the
                 # grade result configured by the server
@@ -81,6 +135,23 @@ class StubXQueueHandler(StubHttpRequestHandler):
         else:
             self._send_immediate_response(False, message="Invalid request URL")
 
+    def _queue_submission(self, xqueue_header_json, xqueue_body_json):
+        """
+        Schedule the grade response of a submission of a batch.
+        Returns a (success, message) tuple.
+        """
+        try:
+            xqueue_header = json.loads(xqueue_header_json)
+            callback_url = xqueue_header['lms_callback_url']
+        except (KeyError, TypeError, ValueError):
+            return False, "XQueue received invalid grade request"
+
+        self.server.count_submission()
+        if self.server.config.get('send_grades', True):
+            delay = self.server.config.get('response_delay', self.DEFAULT_RESPONSE_DELAY)
+            Timer(delay, lambda: self._send_grade_response(callback_url, xqueue_header, xqueue_body_json)).start()
+        return True, ""
+
     def _send_immediate_response(self, success, message=""):
         """
         Send an immediate success/failure message
@@ -204,7 +275,19 @@ class StubXQueueService(StubHttpService):
     """
 
     HANDLER_CLASS = StubXQueueHandler
-    NON_QUEUE_CONFIG_KEYS = ['default', 'register_submission_url']
+    NON_QUEUE_CONFIG_KEYS = ['default', 'register_submission_url', 'submit_delay', 'batch_submit', 'send_grades']
+
+    def __init__(self, *args, **kwargs):
+        self.submission_count = 0
+        self._submission_count_lock = Lock()
+        super(StubXQueueService, self).__init__(*args, **kwargs)
+
+    def count_submission(self):
+        """
+        Increments the number of submissions received, which may be done from several request threads.
+        """
+        with self._submission_count_lock:
+            self.submission_count += 1
 
     @property
     def queue_responses(self):
@@ -2,11 +2,16 @@
 """
 Utility library for working with the edx-milestones app
 """
+from collections import defaultdict
+
 from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.translation import ugettext as _
+from lazy import lazy
 from milestones import api as milestones_api
 from milestones.exceptions import InvalidMilestoneRelationshipTypeException
-from milestones.models import MilestoneRelationshipType
+from milestones.models import CourseContentMilestone, Milestone, MilestoneRelationshipType, UserMilestone
 from milestones.services import MilestonesService
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
@@ -336,8 +341,8 @@ def add_course_content_milestone(course_id, content_id, relationship, milestone)
 def get_course_content_milestones(course_id, content_id, relationship, user_id=None):
     """
     Client API operation adapter/wrapper
-    Uses the request cache to store all of a user's
-    milestones
+    Uses the request cache to store the milestones of the course
+    and those fulfilled by the user
     """
     if not settings.FEATURES.get('MILESTONES_APP'):
         return []
@@ -345,18 +350,69 @@ def get_course_content_milestones(course_id, content_id, relationship, user_id=N
     if user_id is None:
         return milestones_api.get_course_content_milestones(course_id, content_id, relationship)
 
-    request_cache_dict = request_cache.get_cache(REQUEST_CACHE_NAME)
-    if user_id not in request_cache_dict:
-        request_cache_dict[user_id] = {}
+    return get_user_course_milestones(course_id, user_id).unfulfilled_milestones(relationship, content_id)
 
-    if relationship not in request_cache_dict[user_id]:
-        request_cache_dict[user_id][relationship] = milestones_api.get_course_content_milestones(
-            course_key=course_id,
-            relationship=relationship,
-            user={"id": user_id}
-        )
 
-    return [m for m in request_cache_dict[user_id][relationship] if m['content_id'] == unicode(content_id)]
+def get_user_course_milestones(course_id, user_id):
+    """
+    Returns the UserCourseMilestones of the user in the course, which is
+    cached for the rest of the request.
+    """
+    request_cache_dict = request_cache.get_cache(REQUEST_CACHE_NAME)
+    cache_key = (user_id, unicode(course_id))
+    if cache_key not in request_cache_dict:
+        request_cache_dict[cache_key] = UserCourseMilestones(course_id, user_id)
+    return request_cache_dict[cache_key]
+
+
+class UserCourseMilestones(object):
+    """
+    Snapshot of the milestones of the content of a course, and of the
+    milestones fulfilled by a user.
+
+    The content milestones of each relationship and the user's milestones are
+    each read in a single query when first used, so that the milestones of
+    every block of the course are then checked in memory.
+    """
+    def __init__(self, course_id, user_id):
+        self.course_id = course_id
+        self.user_id = user_id
+        self._content_milestones = {}
+
+    def content_milestones(self, relationship, content_id=None):
+        """
+        Returns the milestones of the given relationship to the given content,
+        or to any content of the course if content_id is None.
+        """
+        if relationship not in self._content_milestones:
+            milestones = milestones_api.get_course_content_milestones(self.course_id, None, relationship)
+            milestones_by_content = defaultdict(list)
+            for milestone in milestones:
+                milestones_by_content[milestone['content_id']].append(milestone)
+            self._content_milestones[relationship] = (milestones, dict(milestones_by_content))
+
+        milestones, milestones_by_content = self._content_milestones[relationship]
+        if content_id is None:
+            return milestones
+        return milestones_by_content.get(unicode(content_id), [])
+
+    @lazy
+    def fulfilled_milestone_ids(self):
+        """
+        Set of the ids of the milestones fulfilled by the user.
+        """
+        return set(milestone['id'] for milestone in milestones_api.get_user_milestones({'id': self.user_id}))
+
+    def unfulfilled_milestones(self, relationship, content_id=None):
+        """
+        Returns the content milestones of the given relationship that the user
+        hasn't fulfilled, as milestones_api.get_course_content_milestones does
+        for the user.
+        """
+        return [
+            milestone for milestone in self.content_milestones(relationship, content_id)
+            if milestone['id'] not in self.fulfilled_milestone_ids
+        ]
 
 
 def remove_course_content_user_milestones(course_key, content_key, user, relationship):
@@ -430,3 +486,27 @@ def get_service():
     if not settings.FEATURES.get('MILESTONES_APP', False):
         return None
     return MilestonesService()
+
+
+@receiver(post_save, sender=UserMilestone)
+@receiver(post_delete, sender=UserMilestone)
+def _clear_user_course_milestones(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Clears the cached milestones of a user when one of their milestones is
+    fulfilled or removed during the request.
+    """
+    request_cache_dict = request_cache.get_cache(REQUEST_CACHE_NAME)
+    for cache_key in [cache_key for cache_key in request_cache_dict if cache_key[0] == instance.user_id]:
+        del request_cache_dict[cache_key]
+
+
+@receiver(post_save, sender=Milestone)
+@receiver(post_delete, sender=Milestone)
+@receiver(post_save, sender=CourseContentMilestone)
+@receiver(post_delete, sender=CourseContentMilestone)
+def _clear_course_milestones(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Clears every cached milestone when the milestones of any content change
+    during the request.
+    """
+    request_cache.clear_cache(REQUEST_CACHE_NAME)
@@ -7,3 +7,12 @@ def use_read_replica_if_available(queryset):
     If there is a database called 'read_replica', use that database for the queryset.
     """
     return queryset.using("read_replica") if "read_replica" in settings.DATABASES else queryset
+
+
+def chunks(items, chunk_size):
+    """
+    Yields the values from items in chunks of size chunk_size, e.g. to keep
+    the number of parameters of "IN" queries under the limit of sqlite3.
+    """
+    items = list(items)
+    return (items[i:i + chunk_size] for i in xrange(0, len(items), chunk_size))
@@ -3,9 +3,12 @@ Tests for the milestones helpers library, which is the integration point for the
 """
 
 import ddt
+from milestones import api as milestones_api
 from milestones.exceptions import InvalidCourseKeyException, InvalidUserException
+from milestones.tests.utils import MilestonesTestCaseMixin
 from mock import patch
 
+from student.tests.factories import UserFactory
 from util import milestones_helpers
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
@@ -125,3 +128,77 @@ class MilestonesHelpersTestCase(ModuleStoreTestCase):
             milestones_helpers.any_unfulfilled_milestones(None, self.user)
         with self.assertRaises(InvalidUserException):
             milestones_helpers.any_unfulfilled_milestones(self.course.id, None)
+
+
+@patch.dict('django.conf.settings.FEATURES', {'MILESTONES_APP': True})
+class UserCourseMilestonesTestCase(MilestonesTestCaseMixin, ModuleStoreTestCase):
+    """
+    Tests for the milestones of users in courses cached for the request.
+    """
+    def setUp(self):
+        super(UserCourseMilestonesTestCase, self).setUp()
+        self.course = CourseFactory.create()
+        self.user = UserFactory.create()
+        self.content_keys = [
+            self.course.id.make_usage_key('sequential', 'sequential_{}'.format(index)) for index in range(3)
+        ]
+        self.milestones = []
+        for content_key in self.content_keys:
+            milestone = milestones_api.add_milestone({
+                'name': 'Test Milestone',
+                'namespace': unicode(content_key),
+                'description': 'Testing Milestones Helpers Library',
+            })
+            milestones_api.add_course_content_milestone(self.course.id, content_key, 'requires', milestone)
+            self.milestones.append(milestone)
+
+    def get_unfulfilled_milestone_ids(self):
+        """
+        Returns the ids of the user's unfulfilled milestones of each content.
+        """
+        return [
+            [
+                milestone['id'] for milestone in milestones_helpers.get_course_content_milestones(
+                    self.course.id, content_key, 'requires', self.user.id
+                )
+            ]
+            for content_key in self.content_keys
+        ]
+
+    def test_milestones_read_once(self):
+        milestones_api.add_user_milestone({'id': self.user.id}, self.milestones[0])
+        expected_milestone_ids = [[], [self.milestones[1]['id']], [self.milestones[2]['id']]]
+
+        with patch.object(
+            milestones_api, 'get_course_content_milestones', wraps=milestones_api.get_course_content_milestones
+        ) as mock_content_milestones:
+            with patch.object(
+                milestones_api, 'get_user_milestones', wraps=milestones_api.get_user_milestones
+            ) as mock_user_milestones:
+                self.assertEqual(self.get_unfulfilled_milestone_ids(), expected_milestone_ids)
+
+        self.assertEqual(mock_content_milestones.call_count, 1)
+        self.assertEqual(mock_user_milestones.call_count, 1)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_unfulfilled_milestone_ids(), expected_milestone_ids)
+
+    def test_cache_cleared_on_fulfillment(self):
+        self.get_unfulfilled_milestone_ids()
+
+        milestone_ids = [[milestone['id']] for milestone in self.milestones]
+
+        milestones_helpers.add_user_milestone({'id': self.user.id}, self.milestones[1])
+        self.assertEqual(self.get_unfulfilled_milestone_ids(), [milestone_ids[0], [], milestone_ids[2]])
+
+        milestones_helpers.remove_user_milestone({'id': self.user.id}, self.milestones[1])
+        self.assertEqual(self.get_unfulfilled_milestone_ids(), milestone_ids)
+
+    def test_cache_cleared_on_content_change(self):
+        self.get_unfulfilled_milestone_ids()
+
+        milestones_api.remove_course_content_milestone(self.course.id, self.content_keys[2], self.milestones[2])
+        self.assertEqual(
+            self.get_unfulfilled_milestone_ids(),
+            [[self.milestones[0]['id']], [self.milestones[1]['id']], []],
+        )
@@ -0,0 +1,108 @@
+"""
+Tests for the interface to XQueue.
+"""
+import json
+import unittest
+
+from mock import Mock, patch
+
+from capa.xqueue_interface import UNEXPECTED_STATUS_CODE_MSG, AsyncXQueueDispatcher, XQueueInterface, make_xheader
+
+
+def batch_reply(submissions):
+    """
+    Returns the reply of an XQueue accepting all of the submissions in the given batch payload.
+    """
+    return (0, [{'return_code': 0, 'content': ''} for __ in json.loads(submissions['xqueue_submissions'])])
+
+
+class XQueueInterfaceBatchTest(unittest.TestCase):
+    """
+    Tests for XQueueInterface.send_batch_to_queue.
+    """
+    def setUp(self):
+        super(XQueueInterfaceBatchTest, self).setUp()
+        self.xqueue_interface = XQueueInterface('http://example.com/xqueue', {'username': 'lms', 'password': 'pw'})
+        self.header = make_xheader('http://example.com/callback', 'key', 'test_queue')
+        self.submissions = [(self.header, 'body1'), (self.header, 'body2')]
+
+    def test_batch(self):
+        with patch.object(self.xqueue_interface, '_http_post', side_effect=lambda url, data: batch_reply(data)) as post:
+            self.assertEqual(self.xqueue_interface.send_batch_to_queue(self.submissions), [(0, '')] * 2)
+
+        self.assertEqual(post.call_count, 1)
+        self.assertEqual(post.call_args[0][0], 'http://example.com/xqueue/xqueue/submit_batch/')
+
+    def test_login_required(self):
+        replies = [(1, 'login_required'), (0, 'logged in'), batch_reply({'xqueue_submissions': '[{}, {}]'})]
+        with patch.object(self.xqueue_interface, '_http_post', side_effect=replies) as post:
+            self.assertEqual(self.xqueue_interface.send_batch_to_queue(self.submissions), [(0, '')] * 2)
+
+        self.assertEqual(post.call_args_list[1][0][0], 'http://example.com/xqueue/xqueue/login/')
+
+    def test_batch_not_supported(self):
+        replies = [(1, UNEXPECTED_STATUS_CODE_MSG % 404), (0, 'queued'), (0, 'queued'), (0, 'queued')]
+        with patch.object(self.xqueue_interface, '_http_post', side_effect=replies) as post:
+            self.assertEqual(self.xqueue_interface.send_batch_to_queue(self.submissions), [(0, 'queued')] * 2)
+            self.assertFalse(self.xqueue_interface.supports_batch_submit)
+
+            # The batch endpoint isn't tried again.
+            self.assertEqual(self.xqueue_interface.send_batch_to_queue(self.submissions[:1]), [(0, 'queued')])
+
+        self.assertEqual(
+            [call[0][0] for call in post.call_args_list],
+            ['http://example.com/xqueue/xqueue/submit_batch/'] + ['http://example.com/xqueue/xqueue/submit/'] * 3,
+        )
+
+    def test_batch_error(self):
+        with patch.object(self.xqueue_interface, '_http_post', return_value=(1, 'cannot connect to server')):
+            self.assertEqual(
+                self.xqueue_interface.send_batch_to_queue(self.submissions),
+                [(1, 'cannot connect to server')] * 2,
+            )
+        self.assertTrue(self.xqueue_interface.supports_batch_submit)
+
+
+class AsyncXQueueDispatcherTest(unittest.TestCase):
+    """
+    Tests for AsyncXQueueDispatcher.
+    """
+    def setUp(self):
+        super(AsyncXQueueDispatcherTest, self).setUp()
+        self.xqueue_interface = Mock()
+        self.xqueue_interface.send_batch_to_queue.side_effect = lambda submissions: [(0, '')] * len(submissions)
+        self.xqueue_interface.send_to_queue.return_value = (0, 'sent')
+        self.header = make_xheader('http://example.com/callback', 'key', 'test_queue')
+
+    def test_send_to_queue(self):
+        dispatcher = AsyncXQueueDispatcher(self.xqueue_interface, batch_size=3)
+        for index in range(7):
+            self.assertEqual(
+                dispatcher.send_to_queue(self.header, 'body{}'.format(index)),
+                (0, AsyncXQueueDispatcher.QUEUED_MSG),
+            )
+        self.assertTrue(dispatcher.flush(timeout=10))
+
+        sent_bodies = [
+            body
+            for call in self.xqueue_interface.send_batch_to_queue.call_args_list
+            for __, body in call[0][0]
+        ]
+        self.assertEqual(sent_bodies, ['body{}'.format(index) for index in range(7)])
+        self.assertTrue(all(len(call[0][0]) <= 3 for call in self.xqueue_interface.send_batch_to_queue.call_args_list))
+        self.assertFalse(self.xqueue_interface.send_to_queue.called)
+
+    def test_files_sent_synchronously(self):
+        dispatcher = AsyncXQueueDispatcher(self.xqueue_interface)
+        files = [Mock()]
+        self.assertEqual(dispatcher.send_to_queue(self.header, 'body', files), (0, 'sent'))
+        self.xqueue_interface.send_to_queue.assert_called_once_with(self.header, 'body', files)
+
+    def test_full_queue_sent_synchronously(self):
+        dispatcher = AsyncXQueueDispatcher(self.xqueue_interface, max_pending=1)
+        with patch.object(dispatcher, '_start_worker_if_needed'):
+            self.assertEqual(dispatcher.send_to_queue(self.header, 'body1'), (0, AsyncXQueueDispatcher.QUEUED_MSG))
+            self.assertEqual(dispatcher.send_to_queue(self.header, 'body2'), (0, 'sent'))
+            self.assertFalse(dispatcher.flush(timeout=0.01))
+
+        self.xqueue_interface.send_to_queue.assert_called_once_with(self.header, 'body2')
@@ -1,9 +1,14 @@
 #
 #  LMS Interface to external queueing system (xqueue)
 #
+import atexit
 import hashlib
 import json
 import logging
+import os
+import Queue
+import threading
+import time
 
 import requests
 
@@ -19,6 +24,15 @@ XQUEUE_TIMEOUT = 35  # seconds
 CONNECT_TIMEOUT = 3.05  # seconds
 READ_TIMEOUT = 10  # seconds
 
+UNEXPECTED_STATUS_CODE_MSG = 'unexpected HTTP status code [%d]'
+
+# Maximum number of submissions posted to xqueue in a single request by the AsyncXQueueDispatcher.
+XQUEUE_BATCH_SIZE = 20
+# Maximum number of submissions waiting to be sent by an AsyncXQueueDispatcher.
+XQUEUE_MAX_PENDING_SUBMISSIONS = 1000
+# Time to wait at process exit for the pending submissions to be sent.
+XQUEUE_EXIT_FLUSH_TIMEOUT = 10  # seconds
+
 
 def make_hashkey(seed):
     """
@@ -75,6 +89,8 @@ class XQueueInterface(object):
         self.auth = django_auth
         self.session = requests.Session()
         self.session.auth = requests_auth
+        # Whether xqueue accepts several submissions in a request, until it answers otherwise.
+        self.supports_batch_submit = True
 
     def send_to_queue(self, header, body, files_to_upload=None):
         """
@@ -91,12 +107,7 @@ class XQueueInterface(object):
         """
 
         # log the send to xqueue
-        header_info = json.loads(header)
-        queue_name = header_info.get('queue_name', u'')
-        dog_stats_api.increment(XQUEUE_METRIC_NAME, tags=[
-            u'action:send_to_queue',
-            u'queue:{}'.format(queue_name)
-        ])
+        self._log_send_to_queue(header)
 
         # Attempt to send to queue
         (error, msg) = self._send_to_queue(header, body, files_to_upload)
@@ -116,6 +127,46 @@ class XQueueInterface(object):
 
         return (error, msg)
 
+    def send_batch_to_queue(self, submissions):
+        """
+        Submit several requests without files to xqueue.
+
+        submissions: List of (header, body) tuples, in the format of the arguments of 'send_to_queue'
+
+        The submissions are posted in a single request if xqueue supports it,
+        and one at a time otherwise.
+
+        Returns a list of (error_code, msg) tuples, one for each submission.
+        """
+        if self.supports_batch_submit:
+            (error, content) = self._send_batch_to_queue(submissions)
+            if error and (content == 'login_required'):
+                (error, content) = self._login()
+                if error != 0:
+                    log.debug("Failed to login to queue: %s", content)
+                    return [(error, content)] * len(submissions)
+                (error, content) = self._send_batch_to_queue(submissions)
+
+            if not error or content != UNEXPECTED_STATUS_CODE_MSG % 404:
+                for header, __ in submissions:
+                    self._log_send_to_queue(header)
+                if error:
+                    return [(error, content)] * len(submissions)
+                return [(reply['return_code'], reply['content']) for reply in content]
+
+            log.info(u'XQueue at %s does not support batch submissions', self.url)
+            self.supports_batch_submit = False
+
+        return [self.send_to_queue(header, body) for header, body in submissions]
+
+    def _log_send_to_queue(self, header):
+        header_info = json.loads(header)
+        queue_name = header_info.get('queue_name', u'')
+        dog_stats_api.increment(XQUEUE_METRIC_NAME, tags=[
+            u'action:send_to_queue',
+            u'queue:{}'.format(queue_name)
+        ])
+
     def _login(self):
         payload = {
             'username': self.auth['username'],
@@ -135,6 +186,15 @@ class XQueueInterface(object):
 
         return self._http_post(self.url + '/xqueue/submit/', payload, files=files)
 
+    def _send_batch_to_queue(self, submissions):
+        payload = {
+            'xqueue_submissions': json.dumps([
+                {'xqueue_header': header, 'xqueue_body': body}
+                for header, body in submissions
+            ]),
+        }
+        return self._http_post(self.url + '/xqueue/submit_batch/', payload)
+
     def _http_post(self, url, data, files=None):
         try:
             response = self.session.post(
@@ -149,6 +209,120 @@ class XQueueInterface(object):
             return (1, 'failed to read from the server')
 
         if response.status_code not in [200]:
-            return (1, 'unexpected HTTP status code [%d]' % response.status_code)
+            return (1, UNEXPECTED_STATUS_CODE_MSG % response.status_code)
 
         return parse_xreply(response.text)
+
+
+class AsyncXQueueDispatcher(object):
+    """
+    Sends submissions to xqueue from a background thread, so that the
+    requests making them don't wait on xqueue, posting them in batches with
+    'XQueueInterface.send_batch_to_queue'.
+
+    It can be used in place of an XQueueInterface. Submissions with files are
+    sent synchronously, since the uploaded files don't outlive the request.
+
+    At most max_pending submissions wait to be sent. Beyond that, submissions
+    are sent synchronously, so that a slow xqueue slows down the requests
+    submitting to it rather than growing the queue.
+
+    A submission that fails to be sent in the background remains queued for
+    the learner until the xqueue wait time expires and it can be resubmitted.
+    """
+    QUEUED_MSG = 'Submission queued for delivery'
+
+    def __init__(self, xqueue_interface, max_pending=XQUEUE_MAX_PENDING_SUBMISSIONS, batch_size=XQUEUE_BATCH_SIZE):
+        self.xqueue_interface = xqueue_interface
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self._queue = Queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._worker = None
+        self._worker_pid = None
+
+    def send_to_queue(self, header, body, files_to_upload=None):
+        """
+        Queue a request to xqueue.
+
+        Takes the same arguments as 'XQueueInterface.send_to_queue', and
+        returns (0, QUEUED_MSG) if the request was queued.
+        """
+        if files_to_upload:
+            return self.xqueue_interface.send_to_queue(header, body, files_to_upload)
+
+        self._start_worker_if_needed()
+        try:
+            self._queue.put_nowait((header, body))
+        except Queue.Full:
+            dog_stats_api.increment(XQUEUE_METRIC_NAME, tags=[u'action:dispatcher_full'])
+            log.warning(u'XQueue dispatcher is full, sending the submission synchronously')
+            return self.xqueue_interface.send_to_queue(header, body)
+
+        dog_stats_api.histogram(XQUEUE_METRIC_NAME + '.dispatcher.pending', self._queue.qsize())
+        return (0, self.QUEUED_MSG)
+
+    def flush(self, timeout=None):
+        """
+        Wait until the queued submissions have been sent, for at most timeout
+        seconds if it isn't None. Returns whether they were all sent.
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.time() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _start_worker_if_needed(self):
+        """
+        Start the background thread, again if the process was forked since it
+        was started, as threads don't survive a fork.
+        """
+        pid = os.getpid()
+        if self._worker_pid == pid and self._worker.is_alive():
+            return
+
+        with self._lock:
+            if self._worker_pid != pid:
+                # Submissions queued before a fork are sent by the parent process.
+                self._queue = Queue.Queue(maxsize=self.max_pending)
+                atexit.register(self.flush, XQUEUE_EXIT_FLUSH_TIMEOUT)
+            if self._worker_pid != pid or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, args=(self._queue,), name='xqueue-dispatcher')
+                self._worker.daemon = True
+                self._worker.start()
+                self._worker_pid = pid
+
+    def _run(self, queue):
+        """
+        Send the submissions of the given queue in batches, as they are queued.
+        """
+        while True:
+            submissions = [queue.get()]
+            while len(submissions) < self.batch_size:
+                try:
+                    submissions.append(queue.get_nowait())
+                except Queue.Empty:
+                    break
+
+            try:
+                self._send(submissions)
+            finally:
+                for __ in submissions:
+                    queue.task_done()
+
+    def _send(self, submissions):
+        dog_stats_api.histogram(XQUEUE_METRIC_NAME + '.dispatcher.batch_size', len(submissions))
+        try:
+            results = self.xqueue_interface.send_batch_to_queue(submissions)
+        except Exception:  # pylint: disable=broad-except
+            log.exception(u'Failed to send %d queued submissions to xqueue', len(submissions))
+            results = [(1, 'unexpected error')] * len(submissions)
+
+        for (header, __), (error, msg) in zip(submissions, results):
+            if error:
+                dog_stats_api.increment(XQUEUE_METRIC_NAME, tags=[u'action:dispatch_failed'])
+                log.error(u'Failed to send queued submission to xqueue with header %s: %s', header, msg)
@@ -222,7 +222,7 @@ class StaticContent(object):
         return any(path.lower().endswith(excluded_ext.lower()) for excluded_ext in excluded_exts)
 
     @staticmethod
-    def get_canonicalized_asset_path(course_key, path, base_url, excluded_exts, encode=True):
+    def get_canonicalized_asset_path(course_key, path, base_url, excluded_exts, encode=True, asset_index=None):
         """
         Returns a fully-qualified path to a piece of static content.
 
@@ -232,6 +232,8 @@ class StaticContent(object):
         Args:
             course_key: key to the course which owns this asset
             path: the path to said content
+            asset_index: optional result of ContentStore.get_asset_index_for_course for course_key,
+                used instead of looking up assets of that course one at a time
 
         Returns:
             string: fully-qualified path to asset
@@ -246,13 +248,23 @@ class StaticContent(object):
         # Check the status of the asset to see if this can be served via CDN aka publicly.
         serve_from_cdn = False
         content_digest = None
-        try:
-            content = AssetManager.find(asset_key, as_stream=True)
-            serve_from_cdn = not getattr(content, "locked", True)
-            content_digest = getattr(content, "content_digest", None)
-        except (ItemNotFoundError, NotFoundError):
-            # If we can't find the item, just treat it as if it's locked.
-            serve_from_cdn = False
+        use_asset_index = (
+            asset_index is not None and
+            asset_key.block_type == 'asset' and
+            asset_key.course_key == course_key.for_branch(None)
+        )
+        if use_asset_index:
+            if asset_key.path in asset_index:
+                content_digest, locked, __ = asset_index[asset_key.path]
+                serve_from_cdn = not locked
+        else:
+            try:
+                content = AssetManager.find(asset_key, as_stream=True)
+                serve_from_cdn = not getattr(content, "locked", True)
+                content_digest = getattr(content, "content_digest", None)
+            except (ItemNotFoundError, NotFoundError):
+                # If we can't find the item, just treat it as if it's locked.
+                serve_from_cdn = False
 
         # Do a generic check to see if anything about this asset disqualifies it from being CDN'd.
         is_excluded = False
@@ -268,7 +280,7 @@ class StaticContent(object):
         for query_name, query_val in query_params:
             if query_val.startswith("/static/"):
                 new_val = StaticContent.get_canonicalized_asset_path(
-                    course_key, query_val, base_url, excluded_exts, encode=False)
+                    course_key, query_val, base_url, excluded_exts, encode=False, asset_index=asset_index)
                 updated_query_params.append((query_name, new_val))
             else:
                 # Make sure we're encoding Unicode strings down to their byte string
@@ -373,6 +385,13 @@ class ContentStore(object):
         '''
         raise NotImplementedError
 
+    def get_asset_index_for_course(self, course_key):
+        """
+        Returns a dict keyed by the name of each static asset of a course, read in a single query.
+        Its values are (content_digest, locked, content_type) tuples.
+        """
+        raise NotImplementedError
+
     def delete_all_course_assets(self, course_key):
         """
         Delete all of the assets which use this course_key as an identifier
@@ -209,6 +209,19 @@ class MongoContentStore(ContentStore):
             course_key, start=start, maxresults=maxresults, get_thumbnails=False, sort=sort, filter_params=filter_params
         )
 
+    @autoretry_read()
+    def get_asset_index_for_course(self, course_key):
+        """
+        See :meth:`.ContentStore.get_asset_index_for_course`
+        """
+        query = query_for_course(course_key, 'asset')
+        fields = ['_id', 'content_son', 'md5', 'locked', 'contentType']
+        asset_index = {}
+        for asset in self.fs_files.find(query, fields):
+            asset_id = asset.get('content_son', asset['_id'])
+            asset_index[asset_id['name']] = (asset.get('md5'), asset.get('locked', False), asset.get('contentType'))
+        return asset_index
+
     def remove_redundant_content_for_courses(self):
         """
         Finds and removes all redundant files (Mac OS metadata files with filename ".DS_Store"
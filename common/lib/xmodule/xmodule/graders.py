@@ -12,6 +12,7 @@ import sys
 from collections import OrderedDict
 from datetime import datetime
 
+import numpy
 from contracts import contract
 from pytz import UTC
 
@@ -242,6 +243,14 @@ class CourseGrader(object):
         '''Given a grade sheet, return a dict containing grading information'''
         raise NotImplementedError
 
+    def grade_percents(self, score_matrix):
+        '''
+        Given the scores of many learners in a ScoreMatrix, return a numpy array
+        of the percent grade of each learner, equal to the 'percent' that grade()
+        returns for the learner's grade sheet. No breakdowns are computed.
+        '''
+        raise NotImplementedError
+
 
 class WeightedSubsectionsGrader(CourseGrader):
     """
@@ -287,6 +296,12 @@ class WeightedSubsectionsGrader(CourseGrader):
             'grade_breakdown': grade_breakdown
         }
 
+    def grade_percents(self, score_matrix):
+        total_percents = numpy.zeros(score_matrix.num_learners)
+        for subgrader, __, weight in self.subgraders:
+            total_percents += subgrader.grade_percents(score_matrix) * weight
+        return total_percents
+
 
 class AssignmentFormatGrader(CourseGrader):
     """
@@ -445,6 +460,153 @@ class AssignmentFormatGrader(CourseGrader):
             # No grade_breakdown here
         }
 
+    def grade_percents(self, score_matrix):
+        earned, possible = score_matrix.scores_for_format(self.type)
+        num_learners, num_sections = possible.shape
+
+        # As in a grade sheet, sections with nothing possible are missing, and
+        # placeholder sections of 0% are added after the others, up to min_count.
+        present = possible > 0
+        percents = numpy.zeros((num_learners, num_sections + self.min_count))
+        percents[:, :num_sections][present] = earned[present] / possible[present]
+        num_present = present.sum(axis=1)
+        placeholders = numpy.arange(self.min_count) < (self.min_count - num_present)[:, numpy.newaxis]
+        included = numpy.hstack((present, placeholders))
+
+        # Drop the lowest scores, the last ones first among equal scores, as
+        # total_with_drops does in grade().
+        num_scores = included.sum(axis=1)
+        if self.drop_count > 0:
+            sort_keys = numpy.where(included, percents, numpy.inf)
+            positions = numpy.tile(numpy.arange(percents.shape[1]), (num_learners, 1))
+            lowest = numpy.lexsort((-positions, sort_keys))[:, :self.drop_count]
+            included[numpy.arange(num_learners)[:, numpy.newaxis], lowest] = False
+
+        # Sum the scores in section order, so that they are rounded as in grade().
+        total_percents = numpy.zeros(num_learners)
+        for column in range(percents.shape[1]):
+            total_percents += numpy.where(included[:, column], percents[:, column], 0.0)
+
+        divisors = num_scores - self.drop_count
+        averaged = divisors > 0
+        total_percents[averaged] /= divisors[averaged]
+        return total_percents
+
+
+class ScoreMatrix(object):
+    """
+    The graded subsection scores of many learners in a course, to compute
+    their grades at once with CourseGrader.grade_percents.
+
+    The scores of each section format are given as a pair of 2-d numpy arrays
+    of the earned and possible scores, with a row for each learner and a column
+    for each graded subsection of the format, in course order. As when grade
+    sheets are built, a subsection with no possible score is missing from the
+    learner's grade sheet.
+    """
+    def __init__(self, num_learners, scores_by_format):
+        """
+        :param num_learners: The number of learners, i.e. rows, in the matrix
+        :type num_learners: int
+
+        :param scores_by_format: The (earned, possible) arrays of each section format
+        :type scores_by_format: dict
+        """
+        self.num_learners = num_learners
+        self._scores_by_format = scores_by_format
+
+    @classmethod
+    def from_grade_sheets(cls, grade_sheets):
+        """
+        Returns the ScoreMatrix of the given grade sheets, as passed to
+        CourseGrader.grade, one for each learner.
+        """
+        section_lists_by_format = {}
+        for grade_sheet in grade_sheets:
+            for section_format, scores in grade_sheet.iteritems():
+                section_lists_by_format.setdefault(section_format, []).append(list(scores))
+
+        scores_by_format = {}
+        for section_format, section_lists in section_lists_by_format.iteritems():
+            sections = _merge_section_orders(section_lists)
+            columns = {location: column for column, location in enumerate(sections)}
+            earned = numpy.zeros((len(grade_sheets), len(columns)))
+            possible = numpy.zeros((len(grade_sheets), len(columns)))
+            for row, grade_sheet in enumerate(grade_sheets):
+                for location, score in grade_sheet.get(section_format, {}).iteritems():
+                    earned[row, columns[location]] = score.graded_total.earned
+                    possible[row, columns[location]] = score.graded_total.possible
+            scores_by_format[section_format] = (earned, possible)
+        return cls(len(grade_sheets), scores_by_format)
+
+    def scores_for_format(self, section_format):
+        """
+        Returns the (earned, possible) arrays of the subsections of the given format.
+        """
+        if section_format not in self._scores_by_format:
+            return numpy.zeros((self.num_learners, 0)), numpy.zeros((self.num_learners, 0))
+        return self._scores_by_format[section_format]
+
+
+def _merge_section_orders(section_lists):
+    """
+    Returns the sections of the given lists in a single order that keeps the
+    order of the sections of each list, e.g. the course order of the sections
+    of the grade sheets of many learners, each missing some of them.
+    """
+    first_seen = OrderedDict()
+    for sections in section_lists:
+        previous = None
+        for section in sections:
+            predecessors = first_seen.setdefault(section, set())
+            if previous is not None:
+                predecessors.add(previous)
+            previous = section
+
+    merged = []
+    placed = set()
+    while len(merged) < len(first_seen):
+        section = next(
+            section for section, predecessors in first_seen.iteritems()
+            if section not in placed and predecessors <= placed
+        )
+        merged.append(section)
+        placed.add(section)
+    return merged
+
+
+def round_grade_percents(percents):
+    """
+    Rounds the percent grades of many learners to whole percents, as the
+    course grade of a learner is rounded, i.e. round(percent * 100 + 0.05) / 100.
+    """
+    scaled = percents * 100 + 0.05
+    rounded = numpy.floor(scaled)
+    # Python's round() rounds halves away from zero, unlike numpy.round.
+    rounded += (scaled - rounded) >= 0.5
+    return rounded / 100
+
+
+def letter_grades(percents, grade_cutoffs):
+    """
+    Returns the letter grade of each of the given rounded percent grades,
+    as defined by the course's grade_cutoffs, or None for grades below
+    every cutoff, and whether each grade passes the lowest non-zero cutoff.
+    """
+    letters = numpy.empty(len(percents), dtype=object)
+    graded = numpy.zeros(len(percents), dtype=bool)
+    for letter in sorted(grade_cutoffs, key=lambda x: grade_cutoffs[x], reverse=True):
+        reached = ~graded & (percents >= grade_cutoffs[letter])
+        letters[reached] = letter
+        graded |= reached
+
+    nonzero_cutoffs = [cutoff for cutoff in grade_cutoffs.values() if cutoff > 0]
+    if nonzero_cutoffs:
+        passed = percents >= min(nonzero_cutoffs)
+    else:
+        passed = numpy.zeros(len(percents), dtype=bool)
+    return letters.tolist(), passed
+
 
 def _iter_graded(scores):
     """
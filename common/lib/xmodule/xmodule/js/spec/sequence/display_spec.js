@@ -64,5 +64,35 @@
                 });
             });
         });
+
+        describe('Lazy units', function() {
+            beforeEach(function() {
+                $('#sequence_workflow')
+                    .attr({'data-position': '1', 'data-ajax-url': '/sequence'})
+                    .append('<div id="seq_contents_0" class="seq_contents" data-lazy="false">&lt;p&gt;101&lt;/p&gt;</div>')
+                    .append('<div id="seq_contents_1" class="seq_contents" data-lazy="true"></div>');
+                spyOn($, 'postWithPrefix').and.returnValue($.Deferred().resolve({
+                    html: '<p>102</p>',
+                    resources: [],
+                    request_token: 'unit-token'
+                }).promise());
+            });
+
+            it('renders units rendered with the sequence', function() {
+                this.sequence = new Sequence($('.xblock-student_view-sequential'));
+                expect($.postWithPrefix).not.toHaveBeenCalled();
+                expect(this.sequence.content_container.html()).toEqual('<p>101</p>');
+            });
+
+            it('loads units when selected', function() {
+                this.sequence = new Sequence($('.xblock-student_view-sequential'));
+                this.sequence.render(2);
+                expect($.postWithPrefix).toHaveBeenCalledWith('/sequence/render_unit', {position: 2});
+                expect(this.sequence.content_container.html()).toEqual('<p>102</p>');
+                expect(local.XBlock.initializeBlocks).toHaveBeenCalledWith(
+                    this.sequence.content_container, 'unit-token'
+                );
+            });
+        });
     });
 }).call(this);
@@ -279,9 +279,11 @@ class LibraryContentModule(LibraryContentFields, XModule, StudioEditableModule):
             self._publish_event,
         )
 
-        # Save our selections to the user state, to ensure consistency:
+        # Save our selections to the user state, to ensure consistency. The
+        # user state is only written when the selections change.
         selected = block_keys['selected']
-        self.selected = list(selected)  # TODO: this doesn't save from the LMS "Progress" page.
+        if any(block_keys[changed] for changed in ('invalid', 'overlimit', 'added')):
+            self.selected = list(selected)  # TODO: this doesn't save from the LMS "Progress" page.
         # Cache the results
         self._selected_set = selected  # pylint: disable=attribute-defined-outside-init
 
@@ -290,10 +292,17 @@ class LibraryContentModule(LibraryContentFields, XModule, StudioEditableModule):
     def _get_selected_child_blocks(self):
         """
         Generator returning XBlock instances of the children selected for the
-        current user.
+        current user, in the order of the children.
+
+        The children are loaded once per module, through the cached children
+        of the descriptor, however many times they are rendered or listed.
         """
-        for block_type, block_id in self.selected_children():
-            yield self.runtime.get_block(self.location.course_key.make_usage_key(block_type, block_id))
+        selected = self.selected_children()
+        for child_key in self.children:  # pylint: disable=no-member
+            if (child_key.block_type, child_key.block_id) in selected:
+                child = self.get_child(child_key)
+                if child is not None:
+                    yield child
 
     def student_view(self, context):
         fragment = Fragment()
@@ -341,8 +341,14 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
 
         draft_course = get_course(ModuleStoreEnum.BranchName.draft)
         published_course = get_course(ModuleStoreEnum.BranchName.published)
+        subtree_changes = self._get_subtree_changes_cache(xblock.location.course_key, draft_course, published_course)
 
         def has_changes_subtree(block_key):
+            if block_key not in subtree_changes:
+                subtree_changes[block_key] = compare_subtree(block_key)
+            return subtree_changes[block_key]
+
+        def compare_subtree(block_key):
             draft_block = get_block(draft_course, block_key)
             if draft_block is None:  # temporary fix for bad pointers TNL-1141
                 return True
@@ -364,6 +370,27 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
 
         return has_changes_subtree(BlockKey.from_usage_key(xblock.location))
 
+    def _get_subtree_changes_cache(self, course_key, draft_structure, published_structure):
+        """
+        Returns the dict in which has_changes records whether the subtree of each block
+        differs between the given draft and published structures.
+
+        Saved structures never change, so the comparisons are shared for the rest of the
+        request by every has_changes call on the same pair of structure versions, e.g. for
+        each block of the course outline. Structures being edited in a bulk operation
+        haven't been saved yet, so their comparisons are not shared.
+        """
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        if self.request_cache is None or (
+                bulk_write_record.active and not
+                {draft_structure['_id'], published_structure['_id']} <= bulk_write_record.structures_in_db
+        ):
+            return {}
+
+        return self.request_cache.data.setdefault('has_changes_cache', {}).setdefault(
+            (draft_structure['_id'], published_structure['_id']), {}
+        )
+
     def publish(self, location, user_id, blacklist=None, **kwargs):
         """
         Publishes the subtree under location from the draft branch to the published branch
@@ -6,6 +6,8 @@ xModule implementation of a learning sequence
 import collections
 from datetime import datetime
 from django.utils.timezone import UTC
+from django.utils.translation import get_language
+import hashlib
 import json
 import logging
 from pkg_resources import resource_string
@@ -33,6 +35,19 @@ except ImportError:
 # OBSOLETE: This obsoletes 'type'
 class_priority = ['video', 'problem']
 
+# Scopes of the fields whose values differ between the users of a block. Units
+# with blocks having values for such fields are rendered for each user rather
+# than cached.
+USER_STATE_SCOPES = (Scope.user_state, Scope.user_state_summary, Scope.preferences)
+
+# Maximum number of seconds the rendered fragment of a unit is cached.
+UNIT_FRAGMENT_CACHE_TIMEOUT = 60 * 60
+
+# Stand-ins for the values specific to the user and request a unit is rendered
+# for, in the cached fragments of units.
+USERNAME_PLACEHOLDER = u'$$SEQUENCE_UNIT_USERNAME$$'
+REQUEST_TOKEN_PLACEHOLDER = u'$$SEQUENCE_UNIT_REQUEST_TOKEN$$'
+
 # Make '_' a no-op so we can scrape strings. Using lambda instead of
 #  `django.utils.translation.ugettext_noop` because Django cannot be imported in this file
 _ = lambda text: text
@@ -158,6 +173,7 @@ class ProctoringFields(object):
 @XBlock.wants('verification')
 @XBlock.wants('milestones')
 @XBlock.wants('credit')
+@XBlock.wants('partitions')
 @XBlock.needs('user')
 @XBlock.needs('bookmarks')
 class SequenceModule(SequenceFields, ProctoringFields, XModule):
@@ -202,6 +218,8 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
             else:
                 self.position = 1
             return json.dumps({'success': True})
+        elif dispatch == 'render_unit':
+            return json.dumps(self._render_unit_for_ajax(data.get('position', u'')))
 
         raise NotFoundError('Unexpected dispatch type')
 
@@ -340,6 +358,10 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
         Updates the given fragment with rendered student views of the given
         display_items.  Returns a list of dict objects with information about
         the given display_items.
+
+        When context['lazy_load_units'] is set, only the student view of the
+        current item is rendered, and the others are loaded by the client
+        when selected, with the render_unit dispatch.
         """
         bookmarks_service = self.runtime.service(self, "bookmarks")
         context["username"] = self.runtime.service(self, "user").get_current_user().opt_attrs['edx-platform.username']
@@ -347,27 +369,190 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
             self.get_parent().display_name_with_default,
             self.display_name_with_default
         ]
+        lazy_load_units = self._lazy_load_units(context)
         contents = []
-        for item in display_items:
+        for index, item in enumerate(display_items):
             is_bookmarked = bookmarks_service.is_bookmarked(usage_key=item.scope_ids.usage_id)
             context["bookmarked"] = is_bookmarked
 
-            rendered_item = item.render(STUDENT_VIEW, context)
-            fragment.add_frag_resources(rendered_item)
-
             iteminfo = {
-                'content': rendered_item.content,
+                'content': u'',
+                'lazy': lazy_load_units and index != self.position - 1,
                 'page_title': getattr(item, 'tooltip_title', ''),
                 'type': item.get_icon_class(),
                 'id': item.scope_ids.usage_id.to_deprecated_string(),
                 'bookmarked': is_bookmarked,
                 'path': " > ".join(display_names + [item.display_name_with_default]),
             }
+            if not iteminfo['lazy']:
+                rendered_item = self._render_unit(item, context)
+                fragment.add_frag_resources(rendered_item)
+                iteminfo['content'] = rendered_item.content
 
             contents.append(iteminfo)
 
         return contents
 
+    def _lazy_load_units(self, context):
+        """
+        Returns whether the units of this sequence other than the current one
+        are loaded when selected, rather than rendered with the sequence.
+
+        Units of time limited sequences are always rendered with the sequence,
+        as are the units viewed by staff masquerading as a specific student,
+        since they are checked against the special exam and hidden content
+        views of the sequence.
+        """
+        return (
+            context.get('lazy_load_units', False) and
+            not self.is_time_limited and
+            not context.get('specific_masquerade', False)
+        )
+
+    def _render_unit_for_ajax(self, position):
+        """
+        Returns the rendered student view of the unit at the given position
+        of this sequence, with its resources, as loaded by the client when the
+        unit is selected.
+        """
+        display_items = self.get_display_items()
+        if not position.isdigit() or not 1 <= int(position) <= len(display_items):
+            raise NotFoundError('Unexpected unit position')
+        if self.is_time_limited or not self._can_user_view_content(self._get_course()):
+            raise NotFoundError('Units of this sequence are not viewable')
+
+        item = display_items[int(position) - 1]
+        bookmarks_service = self.runtime.service(self, "bookmarks")
+        context = {
+            'username': self.runtime.service(self, "user").get_current_user().opt_attrs['edx-platform.username'],
+            'bookmarked': bookmarks_service.is_bookmarked(usage_key=item.scope_ids.usage_id),
+        }
+        rendered_item = self._render_unit(item, context)
+        return {
+            'html': rendered_item.content,
+            'resources': [
+                (hashlib.md5(repr(tuple(resource))).hexdigest(), resource._asdict())  # pylint: disable=protected-access
+                for resource in rendered_item.resources
+            ],
+            'request_token': getattr(self.runtime, 'request_token', None),
+        }
+
+    def _render_unit(self, item, context):
+        """
+        Returns the rendered student view of the given item of this sequence.
+
+        When the runtime's cache_unit_fragments is set, the rendered views of
+        units without user state are shared between the users of the same
+        user partition groups, for each version of the course.
+        """
+        cache_unit_fragments = getattr(self.runtime, 'cache_unit_fragments', False)
+        cache_key = self._unit_fragment_cache_key(item, context) if cache_unit_fragments else None
+        if cache_key is None:
+            return item.render(STUDENT_VIEW, context)
+
+        username = context['username']
+        request_token = getattr(self.runtime, 'request_token', None) or REQUEST_TOKEN_PLACEHOLDER
+        cached_fragment = self.runtime.cache.get(cache_key)
+        if cached_fragment is None:
+            cached_fragment = item.render(STUDENT_VIEW, dict(context, username=USERNAME_PLACEHOLDER))
+            cached_fragment.content = cached_fragment.content.replace(request_token, REQUEST_TOKEN_PLACEHOLDER)
+            if not self._unit_fragment_depends_on_user(item, cached_fragment):
+                self.runtime.cache.set(cache_key, cached_fragment, UNIT_FRAGMENT_CACHE_TIMEOUT)
+
+        rendered_item = Fragment(
+            cached_fragment.content.replace(USERNAME_PLACEHOLDER, username).replace(
+                REQUEST_TOKEN_PLACEHOLDER, request_token
+            )
+        )
+        rendered_item.add_frag_resources(cached_fragment)
+        return rendered_item
+
+    def _unit_fragment_cache_key(self, item, context):
+        """
+        Returns the key of the cached student view of the given item of this
+        sequence, or None if it can't be shared with other users.
+
+        The view is shared when none of the blocks of the item has values
+        for user state fields, and none of their children are hidden from
+        the user, for instance because of their start dates or group access,
+        since the view then only depends on the version of the course and the
+        groups of the user.
+        """
+        course_version = getattr(item, 'course_version', None)
+        if course_version is None or self.runtime.user_is_staff or getattr(item, 'edxnotes', False):
+            return None
+
+        stack = [item]
+        while stack:
+            block = stack.pop()
+            if self._has_user_state(block):
+                return None
+            if block.has_children:
+                children = block.get_children()
+                if len(children) != len(block.children):
+                    return None
+                stack.extend(children)
+
+        dependencies = [
+            unicode(item.location),
+            unicode(course_version),
+            self._get_user_partition_groups(),
+            context.get('bookmarked', False),
+            get_language(),
+        ]
+        return u'seq_module.unit.{}'.format(hashlib.md5(repr(dependencies)).hexdigest())
+
+    def _unit_fragment_depends_on_user(self, item, fragment):
+        """
+        Returns whether the given rendered student view of the given item of
+        this sequence is specific to the runtime user, and so can't be shared
+        with other users.
+
+        This is the case when rendering the view set values for user state
+        fields of the blocks of the item, or when the view contains the
+        anonymous id of the user, as html blocks put in place of %%USER_ID%%.
+        """
+        rendered_data = [fragment.content] + [resource.data for resource in fragment.resources]
+        stack = [item]
+        while stack:
+            block = stack.pop()
+            if self._has_user_state(block):
+                return True
+            anonymous_student_id = getattr(block.runtime, 'anonymous_student_id', None)
+            if anonymous_student_id and any(anonymous_student_id in data for data in rendered_data):
+                return True
+            if block.has_children:
+                stack.extend(block.get_children())
+        return False
+
+    @staticmethod
+    def _has_user_state(block):
+        """
+        Returns whether the given block has values for any of its user state
+        fields.
+        """
+        return any(
+            field.scope in USER_STATE_SCOPES and field.is_set_on(block)
+            for field in block.fields.itervalues()
+        )
+
+    def _get_user_partition_groups(self):
+        """
+        Returns the ids of the groups of the runtime user in each of the user
+        partitions of the course, as (partition id, group id) pairs.
+        """
+        partitions_service = self.runtime.service(self, 'partitions')
+        if not partitions_service:
+            return []
+        user = self.runtime.service(self, 'user')._django_user  # pylint: disable=protected-access
+        groups = []
+        for partition in partitions_service.course_partitions:
+            if not partition.active:
+                continue
+            group = partitions_service.get_group(user, partition, assign=False)
+            groups.append((partition.id, group.id if group else None))
+        return sorted(groups)
+
     def _locations_in_subtree(self, node):
         """
         The usage keys for all descendants of an XBlock/XModule as a flat list.
@@ -2,14 +2,17 @@
 Grading tests
 """
 
+import random
 import unittest
+from collections import OrderedDict
 from datetime import datetime, timedelta
 
 import ddt
+import numpy
 from pytz import UTC
 from xmodule import graders
 from xmodule.graders import (
-    AggregatedScore, ProblemScore, ShowCorrectness, aggregate_scores
+    AggregatedScore, ProblemScore, ScoreMatrix, ShowCorrectness, aggregate_scores, letter_grades, round_grade_percents
 )
 
 
@@ -319,6 +322,106 @@ class GraderTest(unittest.TestCase):
         self.assertIn(expected_error_message, error.exception.message)
 
 
+@ddt.ddt
+class GradePercentsTest(unittest.TestCase):
+    """
+    Tests that the grades of many learners computed at once match their grades
+    computed one at a time.
+    """
+    common_fields = dict(graded=True, first_attempted=None)
+
+    def setUp(self):
+        super(GradePercentsTest, self).setUp()
+        self.random = random.Random(42)
+
+    def random_grade_sheet(self, num_sections_by_format):
+        """
+        Returns a grade sheet of random scores, in which some sections are missing.
+        Few distinct scores are used, so that some scores are equal.
+        """
+        grade_sheet = {}
+        for section_format, num_sections in num_sections_by_format.iteritems():
+            grade_sheet[section_format] = OrderedDict()
+            for index in range(num_sections):
+                if self.random.random() < 0.2:
+                    continue
+                possible = self.random.choice([1.0, 3.0, 7.0, 10.0])
+                earned = self.random.choice([0, 1, possible / 3, possible])
+                grade_sheet[section_format][index] = GraderTest.MockGrade(
+                    AggregatedScore(tw_earned=earned, tw_possible=possible, **self.common_fields),
+                    display_name=u'{} {}'.format(section_format, index),
+                )
+        return grade_sheet
+
+    @ddt.data(
+        # Fewer, as many and more sections than min_count, with and without drops.
+        {'Homework': 3, 'Lab': 0, 'Exam': 1},
+        {'Homework': 12, 'Lab': 7, 'Exam': 1},
+        {'Homework': 20, 'Lab': 15, 'Exam': 2},
+    )
+    def test_matches_grade(self, num_sections_by_format):
+        grader = graders.grader_from_conf([
+            {'type': 'Homework', 'min_count': 12, 'drop_count': 2, 'weight': 0.3},
+            {'type': 'Lab', 'min_count': 7, 'drop_count': 3, 'weight': 0.15},
+            {'type': 'Quiz', 'min_count': 0, 'drop_count': 1, 'weight': 0.05},
+            {'type': 'Exam', 'min_count': 1, 'drop_count': 0, 'weight': 0.5},
+        ])
+        grade_sheets = [self.random_grade_sheet(num_sections_by_format) for __ in range(200)]
+
+        percents = grader.grade_percents(ScoreMatrix.from_grade_sheets(grade_sheets))
+
+        self.assertEqual(percents.tolist(), [grader.grade(grade_sheet)['percent'] for grade_sheet in grade_sheets])
+
+    def test_more_drops_than_scores(self):
+        grader = graders.AssignmentFormatGrader('Homework', 1, 3)
+        grade_sheets = [self.random_grade_sheet({'Homework': 2}) for __ in range(20)]
+
+        percents = grader.grade_percents(ScoreMatrix.from_grade_sheets(grade_sheets))
+
+        self.assertEqual(percents.tolist(), [grader.grade(grade_sheet)['percent'] for grade_sheet in grade_sheets])
+
+    def test_empty_matrix(self):
+        grader = graders.AssignmentFormatGrader('Homework', 2, 0)
+        self.assertEqual(grader.grade_percents(ScoreMatrix(3, {})).tolist(), [0.0, 0.0, 0.0])
+
+    def test_round_grade_percents(self):
+        raw_percents = [self.random.random() for __ in range(500)]
+        expected_percents = [round(percent * 100 + 0.05) / 100 for percent in raw_percents]
+        self.assertEqual(round_grade_percents(numpy.array(raw_percents)).tolist(), expected_percents)
+
+        percents = round_grade_percents(numpy.array([0.0, 0.494, 0.495, 0.795, 0.9, 1.0]))
+        self.assertEqual(percents.tolist(), [0.0, 0.49, 0.5, 0.8, 0.9, 1.0])
+
+    @ddt.data(
+        (
+            {'A': 0.9, 'B': 0.8, 'Pass': 0.5},
+            [None, None, 'Pass', 'Pass', 'B', 'A', 'A'],
+            [False, False, True, True, True, True, True],
+        ),
+        (
+            {'Pass': 0.5},
+            [None, None, 'Pass', 'Pass', 'Pass', 'Pass', 'Pass'],
+            [False, False, True, True, True, True, True],
+        ),
+        (
+            {'Pass': 0},
+            ['Pass', 'Pass', 'Pass', 'Pass', 'Pass', 'Pass', 'Pass'],
+            [False, False, False, False, False, False, False],
+        ),
+        (
+            {},
+            [None, None, None, None, None, None, None],
+            [False, False, False, False, False, False, False],
+        ),
+    )
+    @ddt.unpack
+    def test_letter_grades(self, grade_cutoffs, expected_letters, expected_passed):
+        percents = numpy.array([0.0, 0.49, 0.5, 0.79, 0.8, 0.9, 1.0])
+        letters, passed = letter_grades(percents, grade_cutoffs)
+        self.assertEqual(letters, expected_letters)
+        self.assertEqual(passed.tolist(), expected_passed)
+
+
 @ddt.ddt
 class ShowCorrectnessTest(unittest.TestCase):
     """
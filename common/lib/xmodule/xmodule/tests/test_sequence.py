@@ -2,14 +2,19 @@
 Tests for sequence module.
 """
 # pylint: disable=no-member
+import json
 from datetime import timedelta
+from django.core.cache.backends.locmem import LocMemCache
 from django.utils.timezone import now
 from freezegun import freeze_time
 from mock import Mock, patch
-from xmodule.seq_module import SequenceModule
+from xblock.fragment import Fragment
+from xmodule.exceptions import NotFoundError
+from xmodule.seq_module import SequenceModule, USERNAME_PLACEHOLDER
 from xmodule.tests import get_test_system
 from xmodule.tests.helpers import StubUserService
 from xmodule.tests.xml import factories as xml, XModuleXmlImportTest
+from xmodule.vertical_block import VerticalBlock
 from xmodule.x_module import STUDENT_VIEW
 
 TODAY = now()
@@ -178,3 +183,102 @@ class SequenceBlockTestCase(XModuleXmlImportTest):
             )
             self.assertIn("hidden_content.html", html)
             self.assertIn(progress_url, html)
+
+    def test_lazy_load_units(self):
+        html = self._get_rendered_student_view(
+            self.sequence_3_1,
+            requested_child='last',
+            extra_context=dict(lazy_load_units=True),
+        )
+        self._assert_view_at_position(html, expected_position=3)
+        # Only the current unit is rendered.
+        self.assertEqual(html.count("'lazy': True"), 2)
+        self.assertEqual(html.count("'lazy': False"), 1)
+        self.assertEqual(html.count("'content': u''"), 2)
+
+    def test_lazy_load_units_time_limited(self):
+        self.sequence_3_1.is_time_limited = True
+        with patch.object(SequenceModule, '_time_limited_student_view', return_value=None):
+            html = self._get_rendered_student_view(self.sequence_3_1, extra_context=dict(lazy_load_units=True))
+        self.assertNotIn("'lazy': True", html)
+
+    def test_render_unit(self):
+        seq_module = self.sequence_3_1._xmodule  # pylint: disable=protected-access
+        unit = self.sequence_3_1.get_children()[1]
+        with patch.object(SequenceModule, '_get_course', return_value=self.course):
+            response = json.loads(seq_module.handle_ajax('render_unit', {'position': u'2'}))
+            self.assertIn(unicode(unit.location), response['html'])
+            self.assertEqual(response['resources'], [])
+
+            with self.assertRaises(NotFoundError):
+                seq_module.handle_ajax('render_unit', {'position': u'4'})
+
+    def test_unit_fragment_cache_key(self):
+        seq_module = self.sequence_3_1._xmodule  # pylint: disable=protected-access
+        unit = seq_module.get_display_items()[0]
+        # Units of unversioned courses, as in the XML modulestore, aren't cached.
+        self.assertIsNone(seq_module._unit_fragment_cache_key(unit, {}))  # pylint: disable=protected-access
+
+        with patch.object(type(unit), 'course_version', 'version', create=True):
+            cache_key = seq_module._unit_fragment_cache_key(unit, {})  # pylint: disable=protected-access
+            self.assertIsNotNone(cache_key)
+            self.assertNotEqual(
+                cache_key,
+                seq_module._unit_fragment_cache_key(unit, {'bookmarked': True}),  # pylint: disable=protected-access
+            )
+            with patch.object(seq_module.runtime, 'user_is_staff', True):
+                self.assertIsNone(seq_module._unit_fragment_cache_key(unit, {}))  # pylint: disable=protected-access
+
+    def _render_with_cached_unit_fragments(self, student_view):
+        """
+        Renders the student view of sequence_3_1 twice, with the given student
+        view for its units and unit fragment caching enabled, and returns the
+        mock of the units' student view and the key of the cached fragment of
+        the current unit.
+        """
+        runtime = self.sequence_3_1.xmodule_runtime
+        runtime.cache = LocMemCache('seq_module', {})
+        runtime.cache_unit_fragments = True
+        seq_module = self.sequence_3_1._xmodule  # pylint: disable=protected-access
+        unit = seq_module.get_display_items()[0]
+
+        with patch.object(type(unit), 'course_version', 'version', create=True):
+            with patch.object(VerticalBlock, 'student_view', side_effect=student_view) as mock_student_view:
+                for __ in range(2):
+                    html = self._get_rendered_student_view(self.sequence_3_1, extra_context=dict(lazy_load_units=True))
+                    self.assertIn('unit for ', html)
+            bookmarked = runtime.service(seq_module, 'bookmarks').is_bookmarked.return_value
+            cache_key = seq_module._unit_fragment_cache_key(  # pylint: disable=protected-access
+                unit, {'bookmarked': bookmarked}
+            )
+
+        self.assertIsNotNone(cache_key)
+        return mock_student_view, cache_key
+
+    def test_unit_fragments_cached(self):
+        def student_view(context):
+            """
+            Renders the unit for the username in the context.
+            """
+            return Fragment(u'unit for {}'.format(context['username']))
+
+        mock_student_view, cache_key = self._render_with_cached_unit_fragments(student_view)
+        self.assertEqual(mock_student_view.call_count, 1)
+        self.assertEqual(
+            self.sequence_3_1.xmodule_runtime.cache.get(cache_key).content,
+            u'unit for {}'.format(USERNAME_PLACEHOLDER),
+        )
+
+    def test_unit_fragments_with_user_id_not_cached(self):
+        anonymous_student_id = self.sequence_3_1.xmodule_runtime.anonymous_student_id
+
+        def student_view(context):  # pylint: disable=unused-argument
+            """
+            Renders the unit for the anonymous id of the user, as html blocks
+            do in place of %%USER_ID%%.
+            """
+            return Fragment(u'unit for {}'.format(anonymous_student_id))
+
+        mock_student_view, cache_key = self._render_with_cached_unit_fragments(student_view)
+        self.assertEqual(mock_student_view.call_count, 2)
+        self.assertIsNone(self.sequence_3_1.xmodule_runtime.cache.get(cache_key))
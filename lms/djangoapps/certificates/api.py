@@ -174,6 +174,53 @@ def generate_user_certificates(student, course_key, course=None, insecure=False,
     return cert.status
 
 
+def generate_user_certificates_in_bulk(students, course_key, course=None, insecure=False, generation_mode='batch',
+                                       forced_grade=None):
+    """
+    It will add add-cert requests for several students into the xqueue.
+
+    The certificates are decided as by `generate_user_certificates`, but
+    the enrollments, grades and existing certificates of the students are
+    read, and their certificate records written, in bulk. It emits an
+    `edx.certificate.created` event for each passing certificate.
+
+    Args:
+        students (list of User)
+        course_key (CourseKey)
+
+    Keyword Arguments:
+        See `generate_user_certificates`.
+
+    Returns:
+        dict: The status of the certificate of each student, keyed by user
+            id. Students whose certificate could not be requested are left out.
+    """
+    xqueue = XQueueCertInterface()
+    if insecure:
+        xqueue.use_https = False
+    if course is None:
+        course = modulestore().get_course(course_key, depth=0)
+    generate_pdf = not has_html_certificates_enabled(course_key, course)
+    certs = xqueue.add_certs(
+        students,
+        course_key,
+        course=course,
+        generate_pdf=generate_pdf,
+        forced_grade=forced_grade
+    )
+
+    for cert in certs.itervalues():
+        if CertificateStatuses.is_passing_status(cert.status):
+            emit_certificate_event('created', cert.user, course_key, course, {
+                'user_id': cert.user.id,
+                'course_id': unicode(course_key),
+                'certificate_id': cert.verify_uuid,
+                'enrollment_mode': cert.mode,
+                'generation_mode': generation_mode
+            })
+    return {user_id: cert.status for user_id, cert in certs.iteritems()}
+
+
 def regenerate_user_certificates(student, course_key, course=None,
                                  forced_grade=None, template_file=None, insecure=False):
     """
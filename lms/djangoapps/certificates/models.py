@@ -338,6 +338,14 @@ class GeneratedCertificate(models.Model):
         signal iff we are saving a record of a learner passing the course.
         """
         super(GeneratedCertificate, self).save(*args, **kwargs)
+        self.send_cert_awarded_signal()
+
+    def send_cert_awarded_signal(self):
+        """
+        Fire the COURSE_CERT_AWARDED signal iff this is a record of a
+        learner passing the course. Used when the certificate is saved
+        without calling save(), as in bulk operations.
+        """
         if CertificateStatuses.is_passing_status(self.status):
             COURSE_CERT_AWARDED.send_robust(
                 sender=self.__class__,
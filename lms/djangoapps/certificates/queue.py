@@ -7,20 +7,24 @@ from uuid import uuid4
 import lxml.html
 from django.conf import settings
 from django.core.urlresolvers import reverse
+from django.db import IntegrityError, connection, models, transaction
 from django.test.client import RequestFactory
+from django.utils.timezone import now
 from lxml.etree import ParserError, XMLSyntaxError
 from requests.auth import HTTPBasicAuth
 
-from capa.xqueue_interface import XQueueInterface, make_hashkey, make_xheader
+from capa.xqueue_interface import XQUEUE_BATCH_SIZE, XQueueInterface, make_hashkey, make_xheader
 from certificates.models import CertificateStatuses as status
 from certificates.models import (
     CertificateStatuses,
     CertificateWhitelist,
     ExampleCertificate,
     GeneratedCertificate,
+    certificate_status,
     certificate_status_for_student
 )
 from course_modes.models import CourseMode
+from lms.djangoapps.grades.models import PersistentCourseGrade
 from lms.djangoapps.grades.new.course_grade_factory import CourseGradeFactory
 from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification
 from student.models import CourseEnrollment, UserProfile
@@ -28,6 +32,27 @@ from xmodule.modulestore.django import modulestore
 
 LOGGER = logging.getLogger(__name__)
 
+# Statuses of the existing certificate of a student for which a new certificate can be requested.
+ADD_CERT_VALID_STATUSES = [
+    status.generating,
+    status.unavailable,
+    status.deleted,
+    status.error,
+    status.notpassing,
+    status.downloadable,
+    status.auditing,
+    status.audit_passing,
+    status.audit_notpassing,
+]
+
+# Number of students whose certificates are read and written together by `XQueueCertInterface.add_certs`.
+CERTIFICATE_GENERATION_BATCH_SIZE = 500
+
+# Fields of existing certificates updated by `XQueueCertInterface.add_certs`,
+# and the number of certificates updated per query.
+ADD_CERT_UPDATED_FIELDS = ('mode', 'grade', 'name', 'download_url', 'status', 'key', 'verify_uuid')
+CERTIFICATE_UPDATE_BATCH_SIZE = 50
+
 
 class XQueueAddToQueueError(Exception):
     """An error occurred when adding a certificate task to the queue. """
@@ -66,6 +91,9 @@ class XQueueCertInterface(object):
                    view which will save the certificate
                    download URL.
 
+       add_certs:  Add new certificates for several students,
+                   reading and writing their records in bulk.
+
        regen_cert: Regenerate an existing certificate.
                    For a user that already has a certificate
                    this will delete the existing one and
@@ -180,7 +208,6 @@ class XQueueCertInterface(object):
 
         raise NotImplementedError
 
-    # pylint: disable=too-many-statements
     def add_cert(self, student, course_id, course=None, forced_grade=None, template_file=None, generate_pdf=True):
         """
         Request a new certificate for a student.
@@ -225,33 +252,8 @@ class XQueueCertInterface(object):
             )
             return None
 
-        valid_statuses = [
-            status.generating,
-            status.unavailable,
-            status.deleted,
-            status.error,
-            status.notpassing,
-            status.downloadable,
-            status.auditing,
-            status.audit_passing,
-            status.audit_notpassing,
-        ]
-
         cert_status = certificate_status_for_student(student, course_id)['status']
-        cert = None
-
-        if cert_status not in valid_statuses:
-            LOGGER.warning(
-                (
-                    u"Cannot create certificate generation task for user %s "
-                    u"in the course '%s'; "
-                    u"the certificate status '%s' is not one of %s."
-                ),
-                student.id,
-                unicode(course_id),
-                cert_status,
-                unicode(valid_statuses)
-            )
+        if not self._can_add_cert(student, course_id, cert_status):
             return None
 
         # The caller can optionally pass a course in to avoid
@@ -270,8 +272,218 @@ class XQueueCertInterface(object):
         is_whitelisted = self.whitelist.filter(user=student, course_id=course_id, whitelist=True).exists()
         course_grade = CourseGradeFactory().create(student, course)
         enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
-        mode_is_verified = enrollment_mode in GeneratedCertificate.VERIFIED_CERTS_MODES
         user_is_verified = SoftwareSecurePhotoVerification.user_is_verified(student)
+        is_restricted = self.restricted.filter(user=student).exists()
+
+        cert, __ = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)  # pylint: disable=no-member
+        generation = self._update_cert(
+            cert,
+            student,
+            course_id,
+            profile_name,
+            course_grade,
+            enrollment_mode,
+            is_whitelisted,
+            user_is_verified,
+            is_restricted,
+            forced_grade=forced_grade,
+            template_file=template_file,
+        )
+        if generation is None:
+            cert.save()
+            return cert
+
+        # Finally, generate the certificate and send it off.
+        grade_contents, template_pdf = generation
+        return self._generate_cert(cert, course, student, grade_contents, template_pdf, generate_pdf)
+
+    def add_certs(self, students, course_id, course=None, forced_grade=None, template_file=None, generate_pdf=True):
+        """
+        Request new certificates for several students in a course.
+
+        Each certificate is decided as by `add_cert`, but the enrollments,
+        ID verifications, whitelist entries, profiles and existing certificates
+        of the students are read, and their certificates written, in bulk for
+        each batch of CERTIFICATE_GENERATION_BATCH_SIZE students. Course grades
+        are read from storage for the whole batch, and only computed for the
+        students whose grade is not persisted or was computed with another
+        grading policy.
+
+        Returns a dict of the certificate of each student, keyed by user id.
+        Students for whom `add_cert` would return None, or whose grade could
+        not be computed, are left out.
+        """
+        if hasattr(course_id, 'ccx'):
+            LOGGER.warning(
+                (
+                    u"Cannot create certificate generation tasks in the course '%s'; "
+                    u"certificates are not allowed for CCX courses."
+                ),
+                unicode(course_id)
+            )
+            return {}
+
+        if course is None:
+            course = modulestore().get_course(course_id, depth=0)
+
+        students = list(students)
+        certs = {}
+        for start in range(0, len(students), CERTIFICATE_GENERATION_BATCH_SIZE):
+            certs.update(self._add_certs_batch(
+                students[start:start + CERTIFICATE_GENERATION_BATCH_SIZE],
+                course,
+                forced_grade,
+                template_file,
+                generate_pdf,
+            ))
+        return certs
+
+    def _add_certs_batch(self, students, course, forced_grade, template_file, generate_pdf):
+        """
+        Request new certificates for a batch of students. See `add_certs`.
+        """
+        course_id = course.id
+        user_ids = [student.id for student in students]
+
+        existing_certs = {
+            cert.user_id: cert
+            for cert in GeneratedCertificate.objects.filter(user_id__in=user_ids, course_id=course_id)  # pylint: disable=no-member
+        }
+        students = [
+            student for student in students
+            if student.id not in existing_certs or
+            self._can_add_cert(student, course_id, certificate_status(existing_certs[student.id])['status'])
+        ]
+        if not students:
+            return {}
+
+        user_ids = [student.id for student in students]
+        profile_names = dict(UserProfile.objects.filter(user_id__in=user_ids).values_list('user_id', 'name'))
+        whitelisted_user_ids = set(
+            self.whitelist.filter(
+                user_id__in=user_ids, course_id=course_id, whitelist=True
+            ).values_list('user_id', flat=True)
+        )
+        restricted_user_ids = set(self.restricted.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+        verified_user_ids = set(
+            SoftwareSecurePhotoVerification.verified_query().filter(
+                user_id__in=user_ids
+            ).values_list('user_id', flat=True)
+        )
+        CourseEnrollment.bulk_fetch_enrollment_states(students, course_id)
+        PersistentCourseGrade.prefetch(course_id, students)
+
+        created_date = now()
+        certs = []
+        xqueue_tasks = []
+        for student, course_grade, error in CourseGradeFactory().iter(students, course=course):
+            if error:
+                # The error was logged when grading the student.
+                continue
+
+            cert = existing_certs.get(student.id)
+            if cert is None:
+                cert = GeneratedCertificate(user=student, course_id=course_id, created_date=created_date)
+
+            enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
+            generation = self._update_cert(
+                cert,
+                student,
+                course_id,
+                profile_names.get(student.id, u''),
+                course_grade,
+                enrollment_mode,
+                student.id in whitelisted_user_ids,
+                student.id in verified_user_ids,
+                student.id in restricted_user_ids,
+                forced_grade=forced_grade,
+                template_file=template_file,
+            )
+            if generation is not None:
+                grade_contents, template_pdf = generation
+                contents = self._prepare_cert_generation(
+                    cert, course, student, grade_contents, template_pdf, generate_pdf
+                )
+                if generate_pdf:
+                    xqueue_tasks.append((cert, contents))
+            certs.append(cert)
+
+        try:
+            with transaction.atomic():
+                _bulk_save_certs(certs)
+        except IntegrityError:
+            # Another process created the certificate of one of the
+            # students since they were read, so fall back to adding the
+            # certificates one by one.
+            LOGGER.warning(
+                u"Certificates were created concurrently in the course '%s'; adding certificates one by one.",
+                unicode(course_id)
+            )
+            certs = [
+                self.add_cert(student, course_id, course, forced_grade, template_file, generate_pdf)
+                for student in students
+            ]
+            return {cert.user_id: cert for cert in certs if cert is not None}
+
+        for cert in certs:
+            cert.send_cert_awarded_signal()
+
+        errors = self._send_batch_to_xqueue([(contents, cert.key) for cert, contents in xqueue_tasks])
+        for (cert, __), exc in zip(xqueue_tasks, errors):
+            if exc is None:
+                self._log_cert_task_sent(cert)
+            else:
+                self._set_cert_error(cert, exc)
+                GeneratedCertificate.objects.filter(  # pylint: disable=no-member
+                    user_id=cert.user_id, course_id=course_id
+                ).update(status=cert.status, error_reason=cert.error_reason, modified_date=now())
+
+        return {cert.user_id: cert for cert in certs}
+
+    def _can_add_cert(self, student, course_id, cert_status):
+        """
+        Return whether a new certificate can be requested for the student
+        given the status of their current certificate, logging it if not.
+        """
+        if cert_status in ADD_CERT_VALID_STATUSES:
+            return True
+
+        LOGGER.warning(
+            (
+                u"Cannot create certificate generation task for user %s "
+                u"in the course '%s'; "
+                u"the certificate status '%s' is not one of %s."
+            ),
+            student.id,
+            unicode(course_id),
+            cert_status,
+            unicode(ADD_CERT_VALID_STATUSES)
+        )
+        return False
+
+    def _update_cert(
+            self,
+            cert,
+            student,
+            course_id,
+            profile_name,
+            course_grade,
+            enrollment_mode,
+            is_whitelisted,
+            user_is_verified,
+            is_restricted,
+            forced_grade=None,
+            template_file=None,
+    ):
+        """
+        Update the mode, grade and name of the student's certificate, and
+        set its status if the student should not receive a certificate.
+        The certificate is not saved.
+
+        Returns a (grade_contents, template_pdf) tuple if the certificate
+        should be generated, otherwise None.
+        """
+        mode_is_verified = enrollment_mode in GeneratedCertificate.VERIFIED_CERTS_MODES
         cert_mode = enrollment_mode
         is_eligible_for_certificate = is_whitelisted or CourseMode.is_eligible_for_certificate(enrollment_mode)
         unverified = False
@@ -308,8 +520,6 @@ class XQueueCertInterface(object):
             mode_is_verified
         )
 
-        cert, created = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)  # pylint: disable=no-member
-
         cert.mode = cert_mode
         cert.user = student
         cert.grade = course_grade.percent
@@ -356,17 +566,15 @@ class XQueueCertInterface(object):
         cutoff = settings.AUDIT_CERT_CUTOFF_DATE
         if (cutoff and cert.created_date >= cutoff) and not is_eligible_for_certificate:
             cert.status = CertificateStatuses.audit_passing if passing else CertificateStatuses.audit_notpassing
-            cert.save()
             LOGGER.info(
                 u"Student %s with enrollment mode %s is not eligible for a certificate.",
                 student.id,
                 enrollment_mode
             )
-            return cert
+            return None
         # If they are not passing, short-circuit and don't generate cert
         elif not passing:
             cert.status = status.notpassing
-            cert.save()
 
             LOGGER.info(
                 (
@@ -378,14 +586,13 @@ class XQueueCertInterface(object):
                 unicode(course_id),
                 cert.status
             )
-            return cert
+            return None
 
         # Check to see whether the student is on the the embargoed
         # country restricted list. If so, they should not receive a
         # certificate -- set their status to restricted and log it.
-        if self.restricted.filter(user=student).exists():
+        if is_restricted:
             cert.status = status.restricted
-            cert.save()
 
             LOGGER.info(
                 (
@@ -398,11 +605,10 @@ class XQueueCertInterface(object):
                 cert.status,
                 unicode(course_id)
             )
-            return cert
+            return None
 
         if unverified:
             cert.status = status.unverified
-            cert.save()
             LOGGER.info(
                 (
                     u"User %s has a verified enrollment in course %s "
@@ -412,20 +618,37 @@ class XQueueCertInterface(object):
                 student.id,
                 unicode(course_id),
             )
-            return cert
+            return None
 
-        # Finally, generate the certificate and send it off.
-        return self._generate_cert(cert, course, student, grade_contents, template_pdf, generate_pdf)
+        return grade_contents, template_pdf
 
     def _generate_cert(self, cert, course, student, grade_contents, template_pdf, generate_pdf):
         """
         Generate a certificate for the student. If `generate_pdf` is True,
         sends a request to XQueue.
         """
+        contents = self._prepare_cert_generation(cert, course, student, grade_contents, template_pdf, generate_pdf)
+        cert.save()
+
+        if generate_pdf:
+            try:
+                self._send_to_xqueue(contents, cert.key)
+            except XQueueAddToQueueError as exc:
+                self._set_cert_error(cert, exc)
+                cert.save()
+            else:
+                self._log_cert_task_sent(cert)
+        return cert
+
+    def _prepare_cert_generation(self, cert, course, student, grade_contents, template_pdf, generate_pdf):
+        """
+        Set the key and status of a certificate about to be generated for
+        the student, and return the contents of its XQueue task. The
+        certificate is not saved.
+        """
         course_id = unicode(course.id)
 
-        key = make_hashkey(random.random())
-        cert.key = key
+        cert.key = make_hashkey(random.random())
         contents = {
             'action': 'create',
             'username': student.username,
@@ -440,35 +663,37 @@ class XQueueCertInterface(object):
         else:
             cert.status = status.downloadable
             cert.verify_uuid = uuid4().hex
+        return contents
 
-        cert.save()
+    def _set_cert_error(self, cert, exc):
+        """
+        Mark a certificate whose task could not be added to the XQueue
+        as errored. The certificate is not saved.
+        """
+        cert.status = ExampleCertificate.STATUS_ERROR
+        cert.error_reason = unicode(exc)
+        LOGGER.critical(
+            (
+                u"Could not add certificate task to XQueue.  "
+                u"The course was '%s' and the student was '%s'."
+                u"The certificate task status has been marked as 'error' "
+                u"and can be re-submitted with a management command."
+            ), unicode(cert.course_id), cert.user_id
+        )
 
-        if generate_pdf:
-            try:
-                self._send_to_xqueue(contents, key)
-            except XQueueAddToQueueError as exc:
-                cert.status = ExampleCertificate.STATUS_ERROR
-                cert.error_reason = unicode(exc)
-                cert.save()
-                LOGGER.critical(
-                    (
-                        u"Could not add certificate task to XQueue.  "
-                        u"The course was '%s' and the student was '%s'."
-                        u"The certificate task status has been marked as 'error' "
-                        u"and can be re-submitted with a management command."
-                    ), course_id, student.id
-                )
-            else:
-                LOGGER.info(
-                    (
-                        u"The certificate status has been set to '%s'.  "
-                        u"Sent a certificate grading task to the XQueue "
-                        u"with the key '%s'. "
-                    ),
-                    cert.status,
-                    key
-                )
-        return cert
+    def _log_cert_task_sent(self, cert):
+        """
+        Log that the task of a certificate was added to the XQueue.
+        """
+        LOGGER.info(
+            (
+                u"The certificate status has been set to '%s'.  "
+                u"Sent a certificate grading task to the XQueue "
+                u"with the key '%s'. "
+            ),
+            cert.status,
+            cert.key
+        )
 
     def add_example_cert(self, example_cert):
         """Add a task to create an example certificate.
@@ -547,6 +772,52 @@ class XQueueCertInterface(object):
                 If not provided, use the default end-point for student-generated
                 certificates.
 
+        """
+        xheader = self._make_xheader(key, task_identifier, callback_url_path)
+
+        (error, msg) = self.xqueue_interface.send_to_queue(
+            header=xheader, body=json.dumps(contents))
+        if error:
+            exc = XQueueAddToQueueError(error, msg)
+            LOGGER.critical(unicode(exc))
+            raise exc
+
+    def _send_batch_to_xqueue(self, tasks, callback_url_path='/update_certificate'):
+        """Create new tasks on the XQueue, posting several of them per request
+        when the XQueue supports it.
+
+        Arguments:
+            tasks (list): (contents, key) tuples, as the arguments of
+                `_send_to_xqueue`.
+
+        Keyword Arguments:
+            callback_url_path (str): The path of the callback URL.
+
+        Returns:
+            list: For each task, the XQueueAddToQueueError that occurred
+                when adding it to the queue, or None.
+
+        """
+        submissions = [
+            (self._make_xheader(key, None, callback_url_path), json.dumps(contents))
+            for contents, key in tasks
+        ]
+        errors = []
+        for start in range(0, len(submissions), XQUEUE_BATCH_SIZE):
+            for error, msg in self.xqueue_interface.send_batch_to_queue(submissions[start:start + XQUEUE_BATCH_SIZE]):
+                if error:
+                    exc = XQueueAddToQueueError(error, msg)
+                    LOGGER.critical(unicode(exc))
+                    errors.append(exc)
+                else:
+                    errors.append(None)
+        return errors
+
+    def _make_xheader(self, key, task_identifier, callback_url_path):
+        """Return the XQueue header of a certificate task.
+
+        See `_send_to_xqueue` for the arguments.
+
         """
         callback_url = u'{protocol}://{base_url}{path}'.format(
             protocol=("https" if self.use_https else "http"),
@@ -573,11 +844,44 @@ class XQueueCertInterface(object):
             )
         )
 
-        xheader = make_xheader(callback_url, key, settings.CERT_QUEUE)
+        return make_xheader(callback_url, key, settings.CERT_QUEUE)
 
-        (error, msg) = self.xqueue_interface.send_to_queue(
-            header=xheader, body=json.dumps(contents))
-        if error:
-            exc = XQueueAddToQueueError(error, msg)
-            LOGGER.critical(unicode(exc))
-            raise exc
+
+def _bulk_save_certs(certs):
+    """
+    Saves the given certificates, creating the new ones with a single query
+    and updating the fields set by `XQueueCertInterface.add_certs` on the
+    existing ones with a query per CERTIFICATE_UPDATE_BATCH_SIZE certificates.
+    Does not send any signal.
+    """
+    GeneratedCertificate.objects.bulk_create([cert for cert in certs if cert.pk is None])  # pylint: disable=no-member
+
+    existing_certs = [cert for cert in certs if cert.pk is not None]
+    for start in range(0, len(existing_certs), CERTIFICATE_UPDATE_BATCH_SIZE):
+        _bulk_update_certs(existing_certs[start:start + CERTIFICATE_UPDATE_BATCH_SIZE])
+
+
+def _bulk_update_certs(certs):
+    """
+    Saves the fields set by `XQueueCertInterface.add_certs` on the given existing certificates with a single query.
+    """
+    GeneratedCertificate.objects.filter(id__in=[cert.id for cert in certs]).update(  # pylint: disable=no-member
+        modified_date=now(),
+        **{
+            field_name: models.Case(
+                *[
+                    models.When(
+                        id=cert.id,
+                        then=models.Value(
+                            GeneratedCertificate._meta.get_field(field_name).get_db_prep_save(  # pylint: disable=protected-access
+                                getattr(cert, field_name), connection=connection
+                            )
+                        ),
+                    )
+                    for cert in certs
+                ],
+                output_field=models.CharField()
+            )
+            for field_name in ADD_CERT_UPDATED_FIELDS
+        }
+    )
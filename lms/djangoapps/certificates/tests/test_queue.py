@@ -23,6 +23,9 @@ from certificates.models import CertificateStatuses, ExampleCertificate, Example
 from certificates.queue import XQueueCertInterface
 from certificates.tests.factories import CertificateWhitelistFactory, GeneratedCertificateFactory
 from course_modes.models import CourseMode
+from lms.djangoapps.grades.models import PersistentCourseGrade
+from lms.djangoapps.grades.new.course_data import CourseData
+from lms.djangoapps.grades.new.course_grade_factory import CourseGradeFactory
 from lms.djangoapps.grades.tests.utils import mock_passing_grade
 from lms.djangoapps.verify_student.tests.factories import SoftwareSecurePhotoVerificationFactory
 from student.tests.factories import CourseEnrollmentFactory, UserFactory
@@ -275,6 +278,170 @@ class XQueueCertInterfaceAddCertificateTest(ModuleStoreTestCase):
         )
 
 
+def mock_send_batch_to_queue(errors=None):
+    """
+    Mock the XQueue method for sending several tasks to the queue, which
+    fails to add the tasks of the usernames in `errors`.
+    """
+    def send_batch_to_queue(submissions):
+        """
+        Return the reply of the XQueue to the given submissions.
+        """
+        return [
+            (1, 'Kaboom!') if json.loads(body)['username'] in (errors or []) else (0, None)
+            for __, body in submissions
+        ]
+    return patch.object(XQueueInterface, 'send_batch_to_queue', side_effect=send_batch_to_queue)
+
+
+@attr(shard=1)
+@override_settings(CERT_QUEUE='certificates')
+class XQueueCertInterfaceAddCertificatesTest(ModuleStoreTestCase):
+    """Test adding the certificates of several students to the queue at once. """
+
+    def setUp(self):
+        super(XQueueCertInterfaceAddCertificatesTest, self).setUp()
+        self.course = CourseFactory.create()
+        self.xqueue = XQueueCertInterface()
+
+    def create_student(self, mode='honor'):
+        """Create a student enrolled in the course with the given mode. """
+        student = UserFactory.create()
+        CourseEnrollmentFactory(user=student, course_id=self.course.id, is_active=True, mode=mode)
+        return student
+
+    def assert_certificate(self, student, expected_status, expected_mode='honor'):
+        """Assert the status and mode of the student's certificate. """
+        certificate = GeneratedCertificate.objects.get(user=student, course_id=self.course.id)  # pylint: disable=no-member
+        self.assertEqual(certificate.status, expected_status)
+        self.assertEqual(certificate.mode, expected_mode)
+
+    def test_add_certs(self):
+        honor_student = self.create_student()
+        verified_student = self.create_student('verified')
+        SoftwareSecurePhotoVerificationFactory.create(user=verified_student, status='approved')
+        unverified_student = self.create_student('verified')
+        restricted_student = self.create_student()
+        restricted_student.profile.allow_certificate = False
+        restricted_student.profile.save()
+        regenerated_student = self.create_student()
+        GeneratedCertificateFactory(
+            user=regenerated_student, course_id=self.course.id, status=CertificateStatuses.downloadable, grade='0.5'
+        )
+        deleting_student = self.create_student()
+        GeneratedCertificateFactory(user=deleting_student, course_id=self.course.id, status=CertificateStatuses.deleting)
+
+        students = [
+            honor_student, verified_student, unverified_student,
+            restricted_student, regenerated_student, deleting_student,
+        ]
+        with mock_passing_grade():
+            with mock_send_batch_to_queue() as mock_send:
+                certs = self.xqueue.add_certs(students, self.course.id)
+
+        self.assertEqual(
+            {user_id: cert.status for user_id, cert in certs.iteritems()},
+            {
+                honor_student.id: CertificateStatuses.generating,
+                verified_student.id: CertificateStatuses.generating,
+                unverified_student.id: CertificateStatuses.unverified,
+                restricted_student.id: CertificateStatuses.restricted,
+                regenerated_student.id: CertificateStatuses.generating,
+            }
+        )
+        self.assert_certificate(honor_student, CertificateStatuses.generating)
+        self.assert_certificate(verified_student, CertificateStatuses.generating, 'verified')
+        self.assert_certificate(unverified_student, CertificateStatuses.unverified, 'verified')
+        self.assert_certificate(restricted_student, CertificateStatuses.restricted)
+        self.assert_certificate(regenerated_student, CertificateStatuses.generating)
+        self.assert_certificate(deleting_student, CertificateStatuses.deleting)
+        self.assertEqual(
+            GeneratedCertificate.objects.get(user=regenerated_student, course_id=self.course.id).grade,  # pylint: disable=no-member
+            '0.75'
+        )
+
+        # The tasks of the generated certificates were sent to the queue in a single batch.
+        self.assertEqual(mock_send.call_count, 1)
+        submissions = mock_send.call_args[0][0]
+        self.assertEqual(
+            sorted(json.loads(body)['username'] for __, body in submissions),
+            sorted([honor_student.username, verified_student.username, regenerated_student.username]),
+        )
+        students_by_username = {student.username: student for student in students}
+        for header, body in submissions:
+            student = students_by_username[json.loads(body)['username']]
+            self.assertEqual(json.loads(header)['lms_key'], certs[student.id].key)
+            if student == verified_student:
+                self.assertIn('-verified.pdf', json.loads(body)['template_pdf'])
+
+    def test_add_certs_not_passing(self):
+        whitelisted_student = self.create_student()
+        CertificateWhitelistFactory(course_id=self.course.id, user=whitelisted_student)
+        student = self.create_student()
+
+        with mock_send_batch_to_queue():
+            self.xqueue.add_certs([whitelisted_student, student], self.course.id)
+
+        self.assert_certificate(whitelisted_student, CertificateStatuses.generating)
+        self.assert_certificate(student, CertificateStatuses.notpassing)
+
+    def test_add_certs_html_view(self):
+        student = self.create_student()
+        with mock_passing_grade():
+            with mock_send_batch_to_queue() as mock_send:
+                certs = self.xqueue.add_certs([student], self.course.id, generate_pdf=False)
+
+        self.assertFalse(mock_send.called)
+        self.assert_certificate(student, CertificateStatuses.downloadable)
+        self.assertTrue(certs[student.id].verify_uuid)
+
+    def test_add_certs_xqueue_error(self):
+        student = self.create_student()
+        failed_student = self.create_student()
+        with mock_passing_grade():
+            with mock_send_batch_to_queue(errors=[failed_student.username]):
+                certs = self.xqueue.add_certs([student, failed_student], self.course.id)
+
+        self.assertEqual(certs[failed_student.id].status, CertificateStatuses.error)
+        self.assert_certificate(student, CertificateStatuses.generating)
+        self.assert_certificate(failed_student, CertificateStatuses.error)
+        self.assertIn('Kaboom!', GeneratedCertificate.objects.get(  # pylint: disable=no-member
+            user=failed_student, course_id=self.course.id
+        ).error_reason)
+
+    @override_settings(AUDIT_CERT_CUTOFF_DATE=datetime.now(pytz.UTC) - timedelta(days=1))
+    def test_add_certs_audit(self):
+        student = self.create_student('audit')
+        with mock_passing_grade():
+            with mock_send_batch_to_queue():
+                self.xqueue.add_certs([student], self.course.id)
+
+        self.assert_certificate(student, CertificateStatuses.audit_passing, 'audit')
+
+    def test_add_certs_reads_persisted_grades(self):
+        student = self.create_student()
+        PersistentCourseGrade.update_or_create(
+            user_id=student.id,
+            course_id=self.course.id,
+            course_version='',
+            grading_policy_hash=CourseData(student, course=self.course).grading_policy_hash,
+            percent_grade=0.9,
+            letter_grade='Pass',
+            passed=True,
+        )
+
+        with patch.object(CourseGradeFactory, '_update') as mock_update:
+            with mock_send_batch_to_queue():
+                self.xqueue.add_certs([student], self.course.id)
+
+        self.assertFalse(mock_update.called)
+        self.assert_certificate(student, CertificateStatuses.generating)
+        self.assertEqual(
+            GeneratedCertificate.objects.get(user=student, course_id=self.course.id).grade,  # pylint: disable=no-member
+            '0.9'
+        )
+
+
 @attr(shard=1)
 @override_settings(CERT_QUEUE='certificates')
 class XQueueCertInterfaceExampleCertificateTest(TestCase):
@@ -351,3 +518,33 @@ class XQueueCertInterfaceExampleCertificateTest(TestCase):
 
         self.assertEqual(expected_header, actual_header)
         self.assertEqual(expected_body, actual_body)
+
+
+@attr(shard=1)
+@override_settings(CERT_QUEUE='certificates')
+class XQueueCertInterfaceBatchTest(TestCase):
+    """Tests for sending several certificate tasks to the XQueue at once. """
+
+    def setUp(self):
+        super(XQueueCertInterfaceBatchTest, self).setUp()
+        self.xqueue = XQueueCertInterface()
+
+    def test_send_batch_to_xqueue(self):
+        tasks = [({'action': 'create', 'username': 'user{}'.format(index)}, 'key{}'.format(index)) for index in range(3)]
+        with patch.object(XQueueInterface, 'send_batch_to_queue') as mock_send:
+            mock_send.return_value = [(0, None), (1, 'Kaboom!'), (0, None)]
+            errors = self.xqueue._send_batch_to_xqueue(tasks)  # pylint: disable=protected-access
+
+        self.assertEqual(mock_send.call_count, 1)
+        submissions = mock_send.call_args[0][0]
+        self.assertEqual(
+            [(json.loads(header)['lms_key'], json.loads(body)['username']) for header, body in submissions],
+            [('key0', 'user0'), ('key1', 'user1'), ('key2', 'user2')],
+        )
+        self.assertEqual(
+            json.loads(submissions[0][0])['lms_callback_url'],
+            'https://edx.org/update_certificate?key=key0',
+        )
+        self.assertIsNone(errors[0])
+        self.assertEqual(errors[1].error_msg, 'Kaboom!')
+        self.assertIsNone(errors[2])
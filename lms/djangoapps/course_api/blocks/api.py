@@ -6,7 +6,7 @@ from lms.djangoapps.course_blocks.api import COURSE_BLOCK_ACCESS_TRANSFORMERS, g
 from lms.djangoapps.course_blocks.transformers.hidden_content import HiddenContentTransformer
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 
-from .serializers import BlockDictSerializer, BlockSerializer
+from .serializers import BlockStructureSerializer
 from .transformers.blocks_api import BlocksAPITransformer
 from .transformers.milestones import MilestonesAndSpecialExamsTransformer
 
@@ -22,6 +22,7 @@ def get_blocks(
         student_view_data=None,
         return_type='dict',
         block_types_filter=None,
+        stream=False,
 ):
     """
     Return a serialized representation of the course blocks.
@@ -48,6 +49,8 @@ def get_blocks(
             the format for returning the blocks.
         block_types_filter (list): Optional list of block type names used to filter
             the final result of returned blocks.
+        stream (bool): If True, returns an iterator over chunks of the JSON
+            encoding of the blocks, instead of the blocks.
     """
     # create ordered list of transformers, adding BlocksAPITransformer at end.
     transformers = BlockStructureTransformers()
@@ -86,10 +89,11 @@ def get_blocks(
         'requested_fields': requested_fields or [],
     }
 
-    if return_type == 'dict':
-        serializer = BlockDictSerializer(blocks, context=serializer_context, many=False)
-    else:
-        serializer = BlockSerializer(blocks, context=serializer_context, many=True)
+    serializer = BlockStructureSerializer(blocks, context=serializer_context)
+    if stream:
+        return serializer.iter_json(return_type)
 
     # return serialized data
-    return serializer.data
+    if return_type == 'dict':
+        return serializer.dict_data
+    return serializer.list_data
@@ -1,9 +1,13 @@
 """
 Serializers for Course Blocks related return objects.
 """
+from itertools import izip
+
 from django.conf import settings
+from django.utils.http import RFC3986_SUBDELIMS, urlquote
 from rest_framework import serializers
 from rest_framework.reverse import reverse
+from rest_framework.utils.encoders import JSONEncoder
 
 from .transformers import SUPPORTED_FIELDS
 
@@ -94,3 +98,189 @@ class BlockDictSerializer(serializers.Serializer):  # pylint: disable=abstract-m
             unicode(block_key): BlockSerializer(block_key, context=self.context).data
             for block_key in structure
         }
+
+
+class BlockStructureSerializer(object):
+    """
+    Serializes all of the blocks in a BlockStructure to the same
+    representation as BlockSerializer, without instantiating a DRF serializer
+    for each block.
+
+    The blocks are serialized in chunks, and each requested field is read for
+    all of the blocks in a chunk before moving on to the next field. URLs are
+    reversed once per course and the key of each block substituted in them.
+    The serialized blocks can also be encoded to JSON chunk by chunk, so that
+    large structures can be streamed.
+    """
+    # Number of blocks serialized at a time.
+    CHUNK_SIZE = 500
+
+    def __init__(self, block_structure, context):
+        self.block_structure = block_structure
+        self.request = context['request']
+        requested_fields = set(context['requested_fields'])
+        self.supported_fields = [
+            supported_field for supported_field in SUPPORTED_FIELDS
+            if supported_field.requested_field_name in requested_fields
+        ]
+        self.include_lti_url = settings.FEATURES.get("ENABLE_LTI_PROVIDER") and 'lti_url' in requested_fields
+        self.include_children = 'children' in requested_fields
+
+    @property
+    def list_data(self):
+        """
+        Returns the serialized blocks as a list, like BlockSerializer with many=True.
+        """
+        return list(self.iter_blocks())
+
+    @property
+    def dict_data(self):
+        """
+        Returns the serialized blocks keyed by their usage key, like BlockDictSerializer.
+        """
+        return {
+            'root': unicode(self.block_structure.root_block_usage_key),
+            'blocks': {block['id']: block for block in self.iter_blocks()},
+        }
+
+    def iter_json(self, return_type='dict'):
+        """
+        Yields the JSON encoding of the list_data or dict_data, depending on
+        the given return_type, in chunks.
+        """
+        encode = JSONEncoder().encode
+        if return_type == 'dict':
+            yield u'{{"root": {}, "blocks": {{'.format(encode(unicode(self.block_structure.root_block_usage_key)))
+        else:
+            yield u'['
+
+        separator = u''
+        for blocks in self._iter_chunks():
+            if return_type == 'dict':
+                encoded_blocks = [u'{}: {}'.format(encode(block['id']), encode(block)) for block in blocks]
+            else:
+                encoded_blocks = [encode(block) for block in blocks]
+            yield separator + u', '.join(encoded_blocks)
+            separator = u', '
+
+        yield u'}}' if return_type == 'dict' else u']'
+
+    def iter_blocks(self):
+        """
+        Yields the serialized representation of each block in the structure.
+        """
+        for blocks in self._iter_chunks():
+            for block in blocks:
+                yield block
+
+    def _iter_chunks(self):
+        """
+        Yields lists of the serialized representations of at most CHUNK_SIZE blocks.
+        """
+        block_keys = list(self.block_structure)
+        for start in xrange(0, len(block_keys), self.CHUNK_SIZE):
+            yield self._serialize_blocks(block_keys[start:start + self.CHUNK_SIZE])
+
+    def _serialize_blocks(self, block_keys):
+        """
+        Returns the serialized representations of the given blocks.
+        """
+        block_ids = [unicode(block_key) for block_key in block_keys]
+        columns = [
+            ('id', block_ids),
+            ('block_id', [unicode(block_key.block_id) for block_key in block_keys]),
+            ('lms_web_url', self._reverse_for_blocks(
+                'jump_to',
+                block_keys,
+                lambda block_key: {'course_id': unicode(block_key.course_key), 'location': unicode(block_key)},
+            )),
+            ('student_view_url', self._reverse_for_blocks(
+                'courseware.views.views.render_xblock',
+                block_keys,
+                lambda block_key: {'usage_key_string': unicode(block_key)},
+            )),
+        ]
+        if self.include_lti_url:
+            columns.append(('lti_url', self._reverse_for_blocks(
+                'lti_provider_launch',
+                block_keys,
+                lambda block_key: {'course_id': unicode(block_key.course_key), 'usage_id': unicode(block_key)},
+            )))
+        for supported_field in self.supported_fields:
+            columns.append((supported_field.serializer_field_name, self._get_field_values(block_keys, supported_field)))
+        if self.include_children:
+            get_children = self.block_structure.get_children
+            columns.append((
+                'children',
+                [[unicode(child) for child in get_children(block_key)] or None for block_key in block_keys],
+            ))
+
+        blocks = [{} for __ in block_keys]
+        for field_name, values in columns:
+            for block, value in izip(blocks, values):
+                # only return fields that have data
+                if value is not None:
+                    block[field_name] = value
+        return blocks
+
+    def _get_field_values(self, block_keys, supported_field):
+        """
+        Returns the values of the given supported field for the given blocks,
+        as BlockSerializer._get_field would.
+        """
+        block_structure = self.block_structure
+        transformer = supported_field.transformer
+        field_name = supported_field.block_field_name
+
+        if transformer is None:
+            values = [block_structure.get_xblock_field(block_key, field_name) for block_key in block_keys]
+        elif field_name is None:
+            values = []
+            for block_key in block_keys:
+                try:
+                    values.append(block_structure.get_transformer_block_data(block_key, transformer).fields)
+                except KeyError:
+                    values.append(None)
+        else:
+            values = [
+                block_structure.get_transformer_block_field(block_key, transformer, field_name)
+                for block_key in block_keys
+            ]
+
+        default = supported_field.default_value
+        return [default if value is None else value for value in values]
+
+    def _reverse_for_blocks(self, view_name, block_keys, get_kwargs):
+        """
+        Returns the URL of the given view for each of the given blocks, with
+        the kwargs returned by get_kwargs for the block.
+
+        The URL is only reversed for the first block of each course. The URLs
+        of the other blocks are built by substituting their quoted key for the
+        quoted key of that block, unless it could not be found exactly once in
+        its URL.
+        """
+        url_templates = {}
+        urls = []
+        for block_key in block_keys:
+            url_template = url_templates.get(block_key.course_key)
+            if url_template is not None:
+                urls.append(url_template[0] + _quote_url_part(unicode(block_key)) + url_template[1])
+                continue
+
+            url = reverse(view_name, kwargs=get_kwargs(block_key), request=self.request)
+            urls.append(url)
+            if block_key.course_key not in url_templates:
+                quoted_block_key = _quote_url_part(unicode(block_key))
+                if isinstance(url, basestring) and url.count(quoted_block_key) == 1:
+                    url_templates[block_key.course_key] = url.split(quoted_block_key)
+                else:
+                    url_templates[block_key.course_key] = None
+        return urls
+
+
+def _quote_url_part(value):
+    """
+    Quotes the given value as django's reverse quotes the arguments of a URL.
+    """
+    return urlquote(value, safe=RFC3986_SUBDELIMS + str('/~:@'))
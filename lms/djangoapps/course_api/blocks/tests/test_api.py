@@ -2,6 +2,7 @@
 Tests for Blocks api.py
 """
 
+import json
 from itertools import product
 
 import ddt
@@ -50,6 +51,21 @@ class TestGetBlocks(SharedModuleStoreTestCase):
         blocks = get_blocks(self.request, self.course.location)
         self.assertIn(unicode(self.html_block.location), blocks['blocks'])
 
+    def test_stream(self):
+        for return_type in ('dict', 'list'):
+            blocks = get_blocks(
+                self.request, self.course.location, self.user, requested_fields=['children'], return_type=return_type,
+            )
+            streamed_blocks = get_blocks(
+                self.request,
+                self.course.location,
+                self.user,
+                requested_fields=['children'],
+                return_type=return_type,
+                stream=True,
+            )
+            self.assertEquals(json.loads(u''.join(streamed_blocks)), blocks)
+
     def test_access_before_api_transformer_order(self):
         """
         Tests the order of transformers: access checks are made before the api
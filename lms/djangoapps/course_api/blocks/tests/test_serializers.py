@@ -1,7 +1,15 @@
 """
 Tests for Course Blocks serializers
 """
-from mock import MagicMock
+import json
+import os
+import time
+from unittest import skipUnless
+
+import ddt
+from django.test.client import RequestFactory
+from mock import MagicMock, patch
+from rest_framework.utils.encoders import JSONEncoder
 
 from lms.djangoapps.course_blocks.api import COURSE_BLOCK_ACCESS_TRANSFORMERS, get_course_blocks
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
@@ -9,9 +17,9 @@ from student.roles import CourseStaffRole
 from student.tests.factories import UserFactory
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
-from xmodule.modulestore.tests.factories import ToyCourseFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, ToyCourseFactory
 
-from ..serializers import BlockDictSerializer, BlockSerializer
+from ..serializers import BlockDictSerializer, BlockSerializer, BlockStructureSerializer
 from ..transformers.blocks_api import BlocksAPITransformer
 from .helpers import deserialize_usage_key
 
@@ -231,3 +239,114 @@ class TestBlockDictSerializer(TestBlockSerializerBase):
             self.assert_extended_block(serialized_block)
             self.assert_staff_fields(serialized_block)
         self.assertEquals(len(serializer.data['blocks']), 29)
+
+
+@ddt.ddt
+class TestBlockStructureSerializer(TestBlockSerializerBase):
+    """
+    Tests that the BlockStructureSerializer class serializes blocks exactly
+    like the BlockSerializer and BlockDictSerializer classes.
+    """
+    def setUp(self):
+        super(TestBlockStructureSerializer, self).setUp()
+        # Use a real request, so that the URLs are reversed.
+        self.serializer_context['request'] = RequestFactory().get('/')
+
+    def assert_same_serialization(self, context):
+        """
+        Verifies the BlockStructureSerializer output for the given context.
+        """
+        serializer = BlockStructureSerializer(context['block_structure'], context=context)
+        expected_list_data = BlockSerializer(context['block_structure'], many=True, context=context).data
+        expected_dict_data = BlockDictSerializer(context['block_structure'], context=context).data
+
+        self.assertEquals(serializer.list_data, expected_list_data)
+        self.assertEquals(serializer.dict_data, expected_dict_data)
+        self.assertEquals(
+            json.loads(u''.join(serializer.iter_json('list'))),
+            json.loads(JSONEncoder().encode(expected_list_data)),
+        )
+        self.assertEquals(
+            json.loads(u''.join(serializer.iter_json('dict'))),
+            json.loads(JSONEncoder().encode(expected_dict_data)),
+        )
+
+    @ddt.data(1, 5, 500)
+    def test_basic(self, chunk_size):
+        with patch.object(BlockStructureSerializer, 'CHUNK_SIZE', chunk_size):
+            self.assert_same_serialization(self.serializer_context)
+
+    def test_additional_requested_fields(self):
+        self.add_additional_requested_fields()
+        self.assert_same_serialization(self.serializer_context)
+        for serialized_block in BlockStructureSerializer(self.block_structure, self.serializer_context).list_data:
+            self.assert_extended_block(serialized_block)
+
+    def test_staff_fields(self):
+        context = self.create_staff_context()
+        context['request'] = RequestFactory().get('/')
+        self.add_additional_requested_fields(context)
+        self.assert_same_serialization(context)
+
+
+@skipUnless(os.environ.get('BENCHMARK_BLOCK_SERIALIZERS'), 'Set BENCHMARK_BLOCK_SERIALIZERS to run the benchmark.')
+class BlockSerializerBenchmark(SharedModuleStoreTestCase):
+    """
+    Compares the time taken by BlockDictSerializer and BlockStructureSerializer
+    to serialize a large course with all of the fields requested by the mobile
+    apps.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_CHAPTERS = 10
+    NUM_SEQUENTIALS = 10
+    NUM_VERTICALS = 3
+    NUM_PROBLEMS = 3
+    NUM_RUNS = 3
+
+    @classmethod
+    def setUpClass(cls):
+        super(BlockSerializerBenchmark, cls).setUpClass()
+        cls.course = CourseFactory.create()
+        with cls.store.bulk_operations(cls.course.id):
+            for __ in xrange(cls.NUM_CHAPTERS):
+                chapter = ItemFactory.create(parent=cls.course, category='chapter')
+                for __ in xrange(cls.NUM_SEQUENTIALS):
+                    sequential = ItemFactory.create(parent=chapter, category='sequential', graded=True)
+                    for __ in xrange(cls.NUM_VERTICALS):
+                        vertical = ItemFactory.create(parent=sequential, category='vertical')
+                        for __ in xrange(cls.NUM_PROBLEMS):
+                            ItemFactory.create(parent=vertical, category='problem')
+
+    def test_benchmark(self):
+        user = UserFactory.create()
+        transformers = BlockStructureTransformers(
+            COURSE_BLOCK_ACCESS_TRANSFORMERS + [BlocksAPITransformer(['problem'], [])]
+        )
+        block_structure = get_course_blocks(user, self.course.location, transformers)
+        context = {
+            'request': RequestFactory().get('/'),
+            'block_structure': block_structure,
+            'requested_fields': [
+                'children', 'display_name', 'type', 'due', 'graded', 'format', 'block_counts',
+                'student_view_data', 'student_view_multi_device', 'lti_url',
+            ],
+        }
+
+        timings = {}
+        for name, serialize in (
+                ('BlockDictSerializer', lambda: BlockDictSerializer(block_structure, context=context).data),
+                ('BlockStructureSerializer', lambda: BlockStructureSerializer(block_structure, context).dict_data),
+                ('BlockStructureSerializer JSON', lambda: u''.join(BlockStructureSerializer(
+                    block_structure, context,
+                ).iter_json())),
+        ):
+            start = time.time()
+            for __ in xrange(self.NUM_RUNS):
+                serialize()
+            timings[name] = (time.time() - start) / self.NUM_RUNS
+
+        print u'\nSerialized {} blocks:'.format(len(block_structure))
+        for name, timing in sorted(timings.iteritems()):
+            print u'    {:<30}{:.4f}s'.format(name, timing)
@@ -0,0 +1,100 @@
+"""
+Reads the state of users in the library_content blocks of a course, which
+records the children selected for them, as used by the
+ContentLibraryTransformer.
+
+The states of a user in every library_content block of a course are read in
+a single query, either for a single user or in bulk for many users, and are
+cached for the rest of the request per (user, course).
+"""
+import json
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+import request_cache
+from courseware.models import StudentModule
+
+LIBRARY_STATES_CACHE_NAMESPACE = u'course_blocks.library_states'
+
+
+def get_library_states(user, course_key, library_block_keys):
+    """
+    Returns the state of the user in each of the given library_content
+    blocks of the course.
+
+    Arguments:
+        user (User)
+        course_key (CourseKey)
+        library_block_keys (list[UsageKey])
+
+    Returns:
+        dict[UsageKey: dict]: The (possibly empty) state of the user in
+            each block.
+    """
+    library_block_keys = list(library_block_keys)
+    if not library_block_keys or not user.id:
+        return {block_key: {} for block_key in library_block_keys}
+
+    cache = request_cache.get_cache(LIBRARY_STATES_CACHE_NAMESPACE)
+    cache_key = _cache_key(user.id, course_key)
+    states = cache.get(cache_key)
+    if states is None or not all(block_key in states for block_key in library_block_keys):
+        states = _read_library_states(course_key, library_block_keys, [user.id])[user.id]
+        cache[cache_key] = states
+    return {block_key: states[block_key] for block_key in library_block_keys}
+
+
+def bulk_cache_library_states(course_key, library_block_keys, users):
+    """
+    Reads and caches the state of each of the given users in the given
+    library_content blocks of the course, for later fast retrieval by
+    get_library_states.
+
+    Arguments:
+        course_key (CourseKey)
+        library_block_keys (list[UsageKey])
+        users (list[User])
+    """
+    library_block_keys = list(library_block_keys)
+    user_ids = [user.id for user in users]
+    if not library_block_keys or not user_ids:
+        return
+
+    cache = request_cache.get_cache(LIBRARY_STATES_CACHE_NAMESPACE)
+    for user_id, states in _read_library_states(course_key, library_block_keys, user_ids).iteritems():
+        cache[_cache_key(user_id, course_key)] = states
+
+
+def _read_library_states(course_key, library_block_keys, user_ids):
+    """
+    Returns a dict of the states of each user in each of the given blocks,
+    keyed by user id and then by block key, read in a single query.
+    """
+    states_by_user = {user_id: {block_key: {} for block_key in library_block_keys} for user_id in user_ids}
+    student_modules = StudentModule.objects.filter(
+        course_id=course_key,
+        module_state_key__in=library_block_keys,
+        student_id__in=user_ids,
+    ).only('student_id', 'module_state_key', 'state')
+    for student_module in student_modules:
+        block_key = student_module.module_state_key.map_into_course(course_key)
+        states_by_user[student_module.student_id][block_key] = json.loads(student_module.state or '{}')
+    return states_by_user
+
+
+def _cache_key(user_id, course_key):
+    """
+    Returns the cache key of the states of the user in the course.
+    """
+    return user_id, unicode(course_key)
+
+
+@receiver(post_save, sender=StudentModule)
+def _clear_library_states_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Clears the cached states of a user in a course when one of their states
+    in the course changes during the request.
+    """
+    cache = request_cache.get_cache(LIBRARY_STATES_CACHE_NAMESPACE)
+    cache.pop(_cache_key(instance.student_id, instance.course_id), None)
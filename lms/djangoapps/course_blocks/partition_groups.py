@@ -0,0 +1,172 @@
+"""
+Resolves the groups to which users belong in the user partitions of a
+course, as enforced by the UserPartitionTransformer.
+
+Each partition scheme looks up a user's group on its own, so resolving
+the groups of a user in every partition of a course may take a query per
+partition. The functions in this module resolve them in a constant number
+of queries, either for a single user or in bulk for many users, and cache
+the result for the rest of the request per (user, course).
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+import request_cache
+from courseware.masquerade import get_course_masquerade
+from openedx.core.djangoapps.course_groups.cohorts import bulk_cache_cohorts
+from openedx.core.djangoapps.course_groups.models import (
+    CohortMembership,
+    CourseCohortsSettings,
+    CourseUserGroupPartitionGroup
+)
+from openedx.core.djangoapps.user_api.course_tag.api import BulkCourseTags
+from openedx.core.djangoapps.user_api.models import UserCourseTag
+from openedx.core.djangoapps.user_api.partition_schemes import RandomUserPartitionScheme
+from student.models import CourseEnrollment
+from xmodule.partitions.partitions import NoSuchUserPartitionGroupError
+
+PARTITION_GROUPS_CACHE_NAMESPACE = u'course_blocks.partition_groups'
+
+
+def get_user_partition_groups(course_key, user_partitions, user):
+    """
+    Collect group ID for each partition in this course for this user.
+
+    The result is cached for the rest of the request, unless the user is
+    masquerading in the course.
+
+    Arguments:
+        course_key (CourseKey)
+        user_partitions (list[UserPartition])
+        user (User)
+
+    Returns:
+        dict[int: Group]: Mapping from user partitions to the group to
+            which the user belongs in each partition. If the user isn't
+            in a group for a particular partition, then that partition's
+            ID will not be in the dict.
+    """
+    if get_course_masquerade(user, course_key):
+        return _get_user_partition_groups(course_key, user_partitions, user)
+
+    cache = request_cache.get_cache(PARTITION_GROUPS_CACHE_NAMESPACE)
+    cache_key = _cache_key(course_key, user_partitions, user.id)
+    if cache_key not in cache:
+        cache[cache_key] = _get_user_partition_groups(
+            course_key, user_partitions, user, _get_random_partition_tags(course_key, user_partitions, user),
+        )
+    return cache[cache_key]
+
+
+def bulk_cache_user_partition_groups(course_key, user_partitions, users):
+    """
+    Resolves and caches the groups of each of the given users in the user
+    partitions of the course, for later fast retrieval by
+    get_user_partition_groups.
+
+    To do so, the cohorts, enrollment states and course tags of the users
+    in the course are fetched in bulk and cached for the request as well.
+    As in other bulk operations, users are not assigned to cohorts or
+    random groups they don't belong to yet.
+
+    Arguments:
+        course_key (CourseKey)
+        user_partitions (list[UserPartition])
+        users (list[User])
+    """
+    users = list(users)
+    bulk_cache_cohorts(course_key, users)
+    CourseEnrollment.bulk_fetch_enrollment_states(users, course_key)
+    BulkCourseTags.prefetch(course_key, users)
+
+    cache = request_cache.get_cache(PARTITION_GROUPS_CACHE_NAMESPACE)
+    for user in users:
+        cache[_cache_key(course_key, user_partitions, user.id)] = _get_user_partition_groups(
+            course_key, user_partitions, user
+        )
+
+
+def _get_user_partition_groups(course_key, user_partitions, user, random_partition_tags=None):
+    """
+    Returns the mapping from user partition IDs to the group of the user
+    in each partition, as returned by get_user_partition_groups.
+
+    If given, random_partition_tags are the course tags of the user that
+    record their group in RandomUserPartitionScheme partitions.
+    """
+    partition_groups = {}
+    for partition in user_partitions:
+        group = None
+        if random_partition_tags is not None and partition.scheme is RandomUserPartitionScheme:
+            group = _get_random_partition_group(partition, random_partition_tags)
+        if group is None:
+            group = partition.scheme.get_group_for_user(
+                course_key,
+                user,
+                partition,
+            )
+        if group is not None:
+            partition_groups[partition.id] = group
+    return partition_groups
+
+
+def _get_random_partition_tags(course_key, user_partitions, user):
+    """
+    Returns a dict of the course tags of the user that record their group
+    in the RandomUserPartitionScheme partitions of the course, read in a
+    single query.
+
+    Returns None when the scheme reads them from the prefetched course tags
+    instead, or when there is no such partition.
+    """
+    keys = [
+        RandomUserPartitionScheme.key_for_partition(partition)
+        for partition in user_partitions
+        if partition.scheme is RandomUserPartitionScheme
+    ]
+    if not keys or BulkCourseTags.is_prefetched(course_key) or not user.id:
+        return None
+    return dict(
+        UserCourseTag.objects.filter(user_id=user.id, course_id=course_key, key__in=keys).values_list('key', 'value')
+    )
+
+
+def _get_random_partition_group(partition, random_partition_tags):
+    """
+    Returns the group of a RandomUserPartitionScheme partition recorded in
+    the given course tags, or None if it isn't recorded or is invalid, in
+    which case the scheme should assign the group.
+    """
+    group_id = random_partition_tags.get(RandomUserPartitionScheme.key_for_partition(partition))
+    if group_id is None:
+        return None
+    try:
+        return partition.get_group(int(group_id))
+    except NoSuchUserPartitionGroupError:
+        return None
+
+
+def _cache_key(course_key, user_partitions, user_id):
+    """
+    Returns the cache key of the groups of the user in the given partitions.
+    """
+    return (
+        user_id,
+        unicode(course_key),
+        tuple((partition.id, tuple(group.id for group in partition.groups)) for partition in user_partitions),
+    )
+
+
+@receiver(post_save, sender=CohortMembership)
+@receiver(post_delete, sender=CohortMembership)
+@receiver(post_save, sender=CourseUserGroupPartitionGroup)
+@receiver(post_delete, sender=CourseUserGroupPartitionGroup)
+@receiver(post_save, sender=CourseCohortsSettings)
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_save, sender=UserCourseTag)
+def _clear_partition_groups_cache(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Clears the cached partition groups when a change may move a user to
+    another group during the request.
+    """
+    request_cache.clear_cache(PARTITION_GROUPS_CACHE_NAMESPACE)
@@ -0,0 +1,82 @@
+"""
+Tests for reading users' states in library_content blocks.
+"""
+import json
+
+from django.test import TestCase
+from nose.plugins.attrib import attr
+from opaque_keys.edx.locator import CourseLocator
+
+from courseware.tests.factories import StudentModuleFactory
+from student.tests.factories import UserFactory
+
+from ..library_selections import bulk_cache_library_states, get_library_states
+
+
+@attr(shard=3)
+class LibraryStatesTestCase(TestCase):
+    """
+    Tests for get_library_states and bulk_cache_library_states.
+    """
+    def setUp(self):
+        super(LibraryStatesTestCase, self).setUp()
+        self.course_key = CourseLocator('org', 'course', 'run')
+        self.library_block_keys = [
+            self.course_key.make_usage_key('library_content', 'library_content_{}'.format(index))
+            for index in range(3)
+        ]
+        self.users = [UserFactory.create() for __ in range(3)]
+        for user in self.users:
+            for block_key in self.library_block_keys[:2]:
+                self.create_state(user, block_key, [['problem', user.username]])
+
+    def create_state(self, user, block_key, selected):
+        """
+        Creates the state of the user in the block, with the given selected children.
+        """
+        return StudentModuleFactory.create(
+            student=user,
+            course_id=self.course_key,
+            module_state_key=block_key,
+            module_type='library_content',
+            state=json.dumps({'selected': selected}),
+        )
+
+    def assert_states(self, states, user):
+        """
+        Asserts that the states are those set up for the user.
+        """
+        self.assertEqual(
+            states,
+            {
+                self.library_block_keys[0]: {'selected': [['problem', user.username]]},
+                self.library_block_keys[1]: {'selected': [['problem', user.username]]},
+                self.library_block_keys[2]: {},
+            }
+        )
+
+    def test_get_library_states(self):
+        user = self.users[0]
+        with self.assertNumQueries(1):
+            self.assert_states(get_library_states(user, self.course_key, self.library_block_keys), user)
+
+        # The states are cached for the rest of the request.
+        with self.assertNumQueries(0):
+            self.assert_states(get_library_states(user, self.course_key, self.library_block_keys), user)
+
+    def test_cache_cleared_on_change(self):
+        user = self.users[0]
+        get_library_states(user, self.course_key, self.library_block_keys)
+
+        self.create_state(user, self.library_block_keys[2], [['html', 'new']])
+
+        states = get_library_states(user, self.course_key, self.library_block_keys)
+        self.assertEqual(states[self.library_block_keys[2]], {'selected': [['html', 'new']]})
+
+    def test_bulk_cache_library_states(self):
+        with self.assertNumQueries(1):
+            bulk_cache_library_states(self.course_key, self.library_block_keys, self.users)
+
+        with self.assertNumQueries(0):
+            for user in self.users:
+                self.assert_states(get_library_states(user, self.course_key, self.library_block_keys), user)
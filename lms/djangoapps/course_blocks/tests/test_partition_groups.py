@@ -0,0 +1,113 @@
+"""
+Tests for the resolution of users' partition groups.
+"""
+from nose.plugins.attrib import attr
+
+from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort
+from openedx.core.djangoapps.course_groups.partition_scheme import CohortPartitionScheme
+from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory, config_course_cohorts
+from openedx.core.djangoapps.course_groups.views import link_cohort_to_partition_group
+from openedx.core.djangoapps.user_api.course_tag.api import get_course_tag, set_course_tag
+from openedx.core.djangoapps.user_api.partition_schemes import RandomUserPartitionScheme
+from student.tests.factories import CourseEnrollmentFactory, UserFactory
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.partitions.partitions import Group, UserPartition
+
+from ..partition_groups import bulk_cache_user_partition_groups, get_user_partition_groups
+
+
+@attr(shard=3)
+class PartitionGroupsTestCase(SharedModuleStoreTestCase):
+    """
+    Tests for get_user_partition_groups and bulk_cache_user_partition_groups.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(PartitionGroupsTestCase, cls).setUpClass()
+        cls.groups = [Group(1, 'Group 1'), Group(2, 'Group 2')]
+        cls.cohort_partition = UserPartition(0, 'Cohorts', 'Cohort partition', cls.groups, scheme=CohortPartitionScheme)
+        cls.random_partitions = [
+            UserPartition(partition_id, 'Experiment', 'Random partition', cls.groups, scheme=RandomUserPartitionScheme)
+            for partition_id in (1, 2)
+        ]
+        cls.user_partitions = [cls.cohort_partition] + cls.random_partitions
+        cls.course = CourseFactory.create()
+
+    def setUp(self):
+        super(PartitionGroupsTestCase, self).setUp()
+        config_course_cohorts(self.course, is_cohorted=True)
+        self.cohorts = []
+        for group in self.groups:
+            cohort = CohortFactory(course_id=self.course.id)
+            link_cohort_to_partition_group(cohort, self.cohort_partition.id, group.id)
+            self.cohorts.append(cohort)
+
+        self.users = [UserFactory.create() for __ in range(3)]
+        for user in self.users:
+            CourseEnrollmentFactory.create(user=user, course_id=self.course.id)
+            add_user_to_cohort(self.cohorts[0], user.username)
+            for partition in self.random_partitions:
+                set_course_tag(user, self.course.id, RandomUserPartitionScheme.key_for_partition(partition), 2)
+
+    def assert_partition_groups(self, partition_groups, cohort_group):
+        """
+        Asserts that the given partition groups hold the given cohort group and
+        the random groups set up for the users.
+        """
+        self.assertEqual(
+            partition_groups,
+            {0: cohort_group, 1: self.groups[1], 2: self.groups[1]},
+        )
+
+    def test_get_user_partition_groups(self):
+        user = self.users[0]
+        self.assert_partition_groups(
+            get_user_partition_groups(self.course.id, self.user_partitions, user),
+            self.groups[0],
+        )
+
+        # The groups are cached for the rest of the request.
+        with self.assertNumQueries(0):
+            self.assert_partition_groups(
+                get_user_partition_groups(self.course.id, self.user_partitions, user),
+                self.groups[0],
+            )
+
+    def test_cache_cleared_on_change(self):
+        user = self.users[0]
+        get_user_partition_groups(self.course.id, self.user_partitions, user)
+
+        add_user_to_cohort(self.cohorts[1], user.username)
+        self.assert_partition_groups(
+            get_user_partition_groups(self.course.id, self.user_partitions, user),
+            self.groups[1],
+        )
+
+    def test_missing_random_group_assigned(self):
+        user = UserFactory.create()
+        CourseEnrollmentFactory.create(user=user, course_id=self.course.id)
+
+        partition_groups = get_user_partition_groups(self.course.id, self.random_partitions, user)
+
+        for partition in self.random_partitions:
+            self.assertIn(partition_groups[partition.id], self.groups)
+            self.assertEqual(
+                get_course_tag(user, self.course.id, RandomUserPartitionScheme.key_for_partition(partition)),
+                unicode(partition_groups[partition.id].id),
+            )
+
+    def test_bulk_cache_user_partition_groups(self):
+        unassigned_user = UserFactory.create()
+        CourseEnrollmentFactory.create(user=unassigned_user, course_id=self.course.id)
+
+        bulk_cache_user_partition_groups(self.course.id, self.user_partitions, self.users + [unassigned_user])
+
+        with self.assertNumQueries(0):
+            for user in self.users:
+                self.assert_partition_groups(
+                    get_user_partition_groups(self.course.id, self.user_partitions, user),
+                    self.groups[0],
+                )
+            # Users are not assigned to groups in bulk.
+            self.assertEqual(get_user_partition_groups(self.course.id, self.user_partitions, unassigned_user), {})
@@ -13,7 +13,7 @@ from track import contexts
 from xmodule.library_content_module import LibraryContentModule
 from xmodule.modulestore.django import modulestore
 
-from ..utils import get_student_module_as_dict
+from ..library_selections import get_library_states
 
 
 class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransformer):
@@ -67,12 +67,21 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
                 summary = summarize_block(child_key)
                 block_structure.set_transformer_block_field(child_key, cls, 'block_analytics_summary', summary)
 
+    @classmethod
+    def get_library_block_keys(cls, block_structure):
+        """
+        Returns the keys of the library_content blocks of the block structure,
+        e.g. to bulk_cache_library_states of many users before transforming it.
+        """
+        return [block_key for block_key in block_structure if block_key.block_type == 'library_content']
+
     def transform_block_filters(self, usage_info, block_structure):
         all_library_children = set()
         all_selected_children = set()
-        for block_key in block_structure:
-            if block_key.block_type != 'library_content':
-                continue
+        library_block_keys = self.get_library_block_keys(block_structure)
+        # Retrieve the "selected" json of every library_content block from LMS MySQL database at once.
+        states = get_library_states(usage_info.user, usage_info.course_key, library_block_keys)
+        for block_key in library_block_keys:
             library_children = block_structure.get_children(block_key)
             if library_children:
                 all_library_children.update(library_children)
@@ -80,8 +89,7 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
                 mode = block_structure.get_xblock_field(block_key, 'mode')
                 max_count = block_structure.get_xblock_field(block_key, 'max_count')
 
-                # Retrieve "selected" json from LMS MySQL database.
-                state_dict = get_student_module_as_dict(usage_info.user, usage_info.course_key, block_key)
+                state_dict = dict(states[block_key])
                 for selected_block in state_dict.get('selected', []):
                     # Add all selected entries for this user for this
                     # library module to the selected list.
@@ -11,7 +11,8 @@ from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.partitions.partitions import Group, UserPartition
 
 from ...api import get_course_blocks
-from ..user_partitions import UserPartitionTransformer, _get_user_partition_groups
+from ...partition_groups import get_user_partition_groups
+from ..user_partitions import UserPartitionTransformer
 from .helpers import CourseStructureTestCase, create_location
 
 
@@ -203,7 +204,7 @@ class SplitTestTransformerTestCase(CourseStructureTestCase):
 
     def test_user_randomly_assigned(self):
         # user was randomly assigned to one of the groups
-        user_groups = _get_user_partition_groups(
+        user_groups = get_user_partition_groups(
             self.course.id, [self.split_test_user_partition], self.user
         )
         self.assertEquals(len(user_groups), 1)
@@ -0,0 +1,19 @@
+"""
+This module contains various configuration settings via
+waffle switches for the Courseware app.
+"""
+from openedx.core.djangoapps.waffle_utils import WaffleSwitchNamespace
+
+# Namespace
+WAFFLE_NAMESPACE = u'courseware'
+
+# Switches
+LAZY_LOAD_SEQUENCE_UNITS = u'lazy_load_sequence_units'
+CACHE_SEQUENCE_UNIT_FRAGMENTS = u'cache_sequence_unit_fragments'
+
+
+def waffle():
+    """
+    Returns the namespaced, cached, audited Waffle class for Courseware.
+    """
+    return WaffleSwitchNamespace(name=WAFFLE_NAMESPACE, log_prefix=u'Courseware: ')
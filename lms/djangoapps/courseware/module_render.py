@@ -35,8 +35,9 @@ from xblock.reference.plugins import FSService
 from xblock.runtime import KvsFieldData
 
 import static_replace
-from capa.xqueue_interface import XQueueInterface
+from capa.xqueue_interface import AsyncXQueueDispatcher, XQueueInterface
 from courseware.access import get_user_role, has_access
+from courseware.config.waffle import CACHE_SEQUENCE_UNIT_FRAGMENTS, waffle as courseware_waffle
 from courseware.entrance_exams import user_can_skip_entrance_exam, user_has_passed_entrance_exam
 from courseware.masquerade import (
     MasqueradingKeyValueStore,
@@ -99,6 +100,9 @@ XQUEUE_INTERFACE = XQueueInterface(
     settings.XQUEUE_INTERFACE['django_auth'],
     REQUESTS_AUTH,
 )
+# Send submissions without files to xqueue in the background, so learners don't wait on it.
+if settings.XQUEUE_INTERFACE.get('async_dispatch'):
+    XQUEUE_INTERFACE = AsyncXQueueDispatcher(XQUEUE_INTERFACE)
 
 # TODO: course_id and course_key are used interchangeably in this file, which is wrong.
 # Some brave person should make the variable names consistently someday, but the code's
@@ -764,6 +768,7 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
     system.set(u'user_is_admin', bool(has_access(user, u'staff', 'global')))
     system.set(u'user_is_beta_tester', CourseBetaTesterRole(course_id).has_user(user))
     system.set(u'days_early_for_beta', descriptor.days_early_for_beta)
+    system.set(u'cache_unit_fragments', courseware_waffle().is_enabled(CACHE_SEQUENCE_UNIT_FRAGMENTS))
 
     # make an ErrorDescriptor -- assuming that the descriptor's system is ok
     if has_access(user, u'staff', descriptor.location, course_id):
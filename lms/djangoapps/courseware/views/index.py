@@ -42,6 +42,7 @@ from xmodule.x_module import STUDENT_VIEW
 
 from ..access import has_access
 from ..access_utils import in_preview_mode, is_course_open_for_learner
+from ..config.waffle import LAZY_LOAD_SEQUENCE_UNITS, waffle as courseware_waffle
 from ..courses import get_course_with_access, get_current_child, get_studio_url
 from ..entrance_exams import (
     course_has_entrance_exam,
@@ -457,6 +458,7 @@ class CoursewareIndex(View):
             section_context['next_url'] = _compute_section_url(next_of_active_section, 'first')
         # sections can hide data that masquerading staff should see when debugging issues with specific students
         section_context['specific_masquerade'] = self._is_masquerading_as_specific_student()
+        section_context['lazy_load_units'] = courseware_waffle().is_enabled(LAZY_LOAD_SEQUENCE_UNITS)
         return section_context
 
 
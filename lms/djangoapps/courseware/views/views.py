@@ -57,7 +57,7 @@ from courseware.courses import (
     sort_by_start_date
 )
 from courseware.date_summary import VerifiedUpgradeDeadlineDate
-from courseware.masquerade import setup_masquerade
+from courseware.masquerade import is_masquerading_as_student, setup_masquerade
 from courseware.model_data import FieldDataCache
 from courseware.models import BaseStudentModuleHistory, StudentModule
 from courseware.url_helpers import get_redirect_url
@@ -68,7 +68,9 @@ from eventtracking import tracker
 from lms.djangoapps.ccx.custom_exception import CCXLocatorValidationException
 from lms.djangoapps.ccx.utils import prep_course_for_grading
 from lms.djangoapps.courseware.exceptions import CourseAccessRedirect, Redirect
+from lms.djangoapps.grades.config.waffle import CACHE_PROGRESS_SUMMARY, waffle as grades_waffle
 from lms.djangoapps.grades.new.course_grade_factory import CourseGradeFactory
+from lms.djangoapps.grades.new.progress_summary import ProgressSummary
 from lms.djangoapps.instructor.enrollment import uses_shib
 from lms.djangoapps.instructor.views.api import require_global_staff
 from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification
@@ -920,9 +922,20 @@ def _progress(request, course_key, student_id):
     # NOTE: To make sure impersonation by instructor works, use
     # student instead of request.user in the rest of the function.
 
-    course_grade = CourseGradeFactory().create(student, course)
-    courseware_summary = course_grade.chapter_grades.values()
-    grade_summary = course_grade.summary
+    progress_summary = None
+    masquerading_as_student = is_masquerading_as_student(request.user, course_key)
+    if grades_waffle().is_enabled(CACHE_PROGRESS_SUMMARY) and not masquerading_as_student:
+        # Masquerading changes the course structure seen by the student, so
+        # the cached summary is only used for the student's own view.
+        progress_summary = ProgressSummary.get(student, course)
+
+    if progress_summary is not None:
+        courseware_summary = progress_summary.chapter_grades
+        grade_summary = progress_summary.summary
+    else:
+        course_grade = CourseGradeFactory().create(student, course)
+        courseware_summary = course_grade.chapter_grades.values()
+        grade_summary = course_grade.summary
 
     studio_url = get_studio_url(course, 'settings/grading')
 
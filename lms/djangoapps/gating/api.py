@@ -22,21 +22,33 @@ def evaluate_prerequisite(course, subsection_grade, user):
     by dependent subsections, the related milestone will be marked
     fulfilled for the user.
     """
-    prereq_milestone = gating_api.get_gating_milestone(course.id, subsection_grade.location, 'fulfills')
+    user_milestones = milestones_helpers.get_user_course_milestones(course.id, user.id)
+    prereq_milestone = next(
+        (
+            milestone for milestone in user_milestones.content_milestones('fulfills', subsection_grade.location)
+            if gating_api.GATING_NAMESPACE_QUALIFIER in milestone.get('namespace')
+        ),
+        None
+    )
     if prereq_milestone:
         gated_content_milestones = defaultdict(list)
-        for milestone in gating_api.find_gating_milestones(course.id, content_key=None, relationship='requires'):
-            gated_content_milestones[milestone['id']].append(milestone)
+        for milestone in user_milestones.content_milestones('requires'):
+            if gating_api.GATING_NAMESPACE_QUALIFIER in milestone.get('namespace'):
+                gated_content_milestones[milestone['id']].append(milestone)
 
         gated_content = gated_content_milestones.get(prereq_milestone['id'])
         if gated_content:
+            is_fulfilled = prereq_milestone['id'] in user_milestones.fulfilled_milestone_ids
             for milestone in gated_content:
                 min_percentage = _get_minimum_required_percentage(milestone)
                 subsection_percentage = _get_subsection_percentage(subsection_grade)
-                if subsection_percentage >= min_percentage:
+                # The user's milestone is only written when it changes.
+                if subsection_percentage >= min_percentage and not is_fulfilled:
                     milestones_helpers.add_user_milestone({'id': user.id}, prereq_milestone)
-                else:
+                    is_fulfilled = True
+                elif subsection_percentage < min_percentage and is_fulfilled:
                     milestones_helpers.remove_user_milestone({'id': user.id}, prereq_milestone)
+                    is_fulfilled = False
 
 
 def _get_minimum_required_percentage(milestone):
@@ -11,6 +11,8 @@ WAFFLE_NAMESPACE = u'grades'
 WRITE_ONLY_IF_ENGAGED = u'write_only_if_engaged'
 ASSUME_ZERO_GRADE_IF_ABSENT = u'assume_zero_grade_if_absent'
 ESTIMATE_FIRST_ATTEMPTED = u'estimate_first_attempted'
+CACHE_PROGRESS_SUMMARY = u'cache_progress_summary'
+COALESCE_SUBSECTION_RECALCULATIONS = u'coalesce_subsection_recalculations'
 
 
 def waffle():
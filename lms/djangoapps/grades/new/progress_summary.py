@@ -0,0 +1,130 @@
+"""
+ProgressSummary Class
+"""
+from collections import OrderedDict
+from logging import getLogger
+
+from django.core.cache import cache
+
+from util.date_utils import to_timestamp
+from xmodule.graders import ShowCorrectness
+
+from ..config import should_persist_grades
+from ..models import PersistentCourseGrade
+from .course_data import CourseData
+from .course_grade import CourseGrade
+
+log = getLogger(__name__)
+
+
+class SubsectionSummary(object):
+    """
+    The parts of a subsection grade that are displayed on the progress page.
+    Unlike SubsectionGrade, it holds no reference to the course structure
+    and so can be cached.
+    """
+    def __init__(self, subsection_grade):
+        self.location = subsection_grade.location
+        self.display_name = subsection_grade.display_name
+        self.url_name = subsection_grade.url_name
+        self.format = subsection_grade.format
+        self.due = subsection_grade.due
+        self.graded = subsection_grade.graded
+        self.show_correctness = subsection_grade.show_correctness
+        self.graded_total = subsection_grade.graded_total
+        self.all_total = subsection_grade.all_total
+        self.problem_scores = OrderedDict(subsection_grade.problem_scores)
+
+    def show_grades(self, has_staff_access):
+        """
+        Returns whether subsection scores are currently available to users with or without staff access.
+        """
+        return ShowCorrectness.correctness_available(self.show_correctness, self.due, has_staff_access)
+
+
+class ProgressSummary(object):
+    """
+    Summary of a user's persisted grade in a course, as displayed on the
+    progress page.
+
+    The summary is built from the persisted course and subsection grades and
+    cached until the course grade is next modified or the course is next
+    published, so reloading the progress page does not regrade the course.
+    """
+    CACHE_KEY_PREFIX = u'grades.progress_summary'
+    CACHE_TIMEOUT = 60 * 60
+
+    def __init__(self, course_grade):
+        self.percent = course_grade.percent
+        self.letter_grade = course_grade.letter_grade
+        self.passed = course_grade.passed
+        self.chapter_grades = [
+            {
+                'display_name': chapter['display_name'],
+                'url_name': chapter['url_name'],
+                'sections': [SubsectionSummary(subsection_grade) for subsection_grade in chapter['sections']],
+            }
+            for chapter in course_grade.chapter_grades.itervalues()
+        ]
+        self.summary = course_grade.summary
+
+    @classmethod
+    def get(cls, user, course):
+        """
+        Returns the ProgressSummary of the given user in the given course,
+        or None if the user's course grade is not persisted or was computed
+        with a different grading policy.
+        """
+        if not should_persist_grades(course.id):
+            return None
+
+        try:
+            persistent_grade = PersistentCourseGrade.read(user.id, course.id)
+        except PersistentCourseGrade.DoesNotExist:
+            return None
+
+        course_data = CourseData(user, course=course)
+        if persistent_grade.grading_policy_hash != course_data.grading_policy_hash:
+            return None
+
+        cache_key = cls._cache_key(user.id, course.id)
+        cache_version = (to_timestamp(persistent_grade.modified), cls._course_version(course))
+        cached_value = cache.get(cache_key)
+        if cached_value is not None:
+            cached_version, progress_summary = cached_value
+            if cached_version == cache_version:
+                return progress_summary
+
+        course_grade = CourseGrade(
+            user,
+            course_data,
+            persistent_grade.percent_grade,
+            persistent_grade.letter_grade,
+            persistent_grade.passed_timestamp is not None,
+        )
+        progress_summary = cls(course_grade)
+        cache.set(cache_key, (cache_version, progress_summary), cls.CACHE_TIMEOUT)
+        log.info(u'Grades: ProgressSummary cached, %s, User: %s', unicode(course_data), user.id)
+        return progress_summary
+
+    @classmethod
+    def invalidate(cls, user_id, course_key):
+        """
+        Removes the cached ProgressSummary of the given user in the given course.
+        """
+        cache.delete(cls._cache_key(user_id, course_key))
+
+    @classmethod
+    def _cache_key(cls, user_id, course_key):
+        return u'{}.{}.{}'.format(cls.CACHE_KEY_PREFIX, user_id, course_key)
+
+    @staticmethod
+    def _course_version(course):
+        """
+        Returns the version of the published course, as recorded for its
+        collected block structure.
+        """
+        return (
+            unicode(getattr(course, 'course_version', None)),
+            to_timestamp(course.subtree_edited_on) if getattr(course, 'subtree_edited_on', None) else None,
+        )
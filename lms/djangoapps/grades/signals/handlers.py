@@ -10,6 +10,7 @@ from xblock.scorable import ScorableXBlockMixin, Score
 
 from courseware.model_data import get_score, set_score
 from eventtracking import tracker
+from openedx.core.djangoapps.signals.signals import COURSE_GRADE_CHANGED
 from openedx.core.lib.grade_utils import is_score_higher_or_equal
 from student.models import user_by_anonymous_id
 from submissions.models import score_reset, score_set
@@ -21,10 +22,16 @@ from track.event_transaction_utils import (
 )
 from util.date_utils import to_timestamp
 
+from ..config.waffle import COALESCE_SUBSECTION_RECALCULATIONS, waffle
 from ..constants import ScoreDatabaseTableEnum
 from ..new.course_grade_factory import CourseGradeFactory
+from ..new.progress_summary import ProgressSummary
 from ..scores import weighted_score
-from ..tasks import RECALCULATE_GRADE_DELAY, recalculate_subsection_grade_v3
+from ..tasks import (
+    RECALCULATE_GRADE_DELAY,
+    enqueue_coalesced_subsection_recalculation,
+    recalculate_subsection_grade_v3
+)
 from .signals import (
     PROBLEM_RAW_SCORE_CHANGED,
     PROBLEM_WEIGHTED_SCORE_CHANGED,
@@ -212,21 +219,36 @@ def enqueue_subsection_update(sender, **kwargs):  # pylint: disable=unused-argum
     """
     Handles the PROBLEM_WEIGHTED_SCORE_CHANGED signal by
     enqueueing a subsection update operation to occur asynchronously.
+
+    If the COALESCE_SUBSECTION_RECALCULATIONS switch is enabled, the update
+    is coalesced with the other updates of the user's grades in the course
+    requested within a short delay.
     """
     _emit_event(kwargs)
+    ProgressSummary.invalidate(kwargs['user_id'], kwargs['course_id'])
+    task_kwargs = dict(
+        user_id=kwargs['user_id'],
+        anonymous_user_id=kwargs.get('anonymous_user_id'),
+        course_id=kwargs['course_id'],
+        usage_id=kwargs['usage_id'],
+        only_if_higher=kwargs.get('only_if_higher'),
+        expected_modified_time=to_timestamp(kwargs['modified']),
+        score_deleted=kwargs.get('score_deleted', False),
+        event_transaction_id=unicode(get_event_transaction_id()),
+        event_transaction_type=unicode(get_event_transaction_type()),
+        score_db_table=kwargs['score_db_table'],
+    )
+    if waffle().is_enabled(COALESCE_SUBSECTION_RECALCULATIONS):
+        if enqueue_coalesced_subsection_recalculation(task_kwargs):
+            log.info(
+                u'Grades: Coalesced async calculation of subsection grades with args: {}'.format(
+                    ', '.join('{}:{}'.format(arg, kwargs[arg]) for arg in sorted(kwargs)),
+                )
+            )
+            return
+
     result = recalculate_subsection_grade_v3.apply_async(
-        kwargs=dict(
-            user_id=kwargs['user_id'],
-            anonymous_user_id=kwargs.get('anonymous_user_id'),
-            course_id=kwargs['course_id'],
-            usage_id=kwargs['usage_id'],
-            only_if_higher=kwargs.get('only_if_higher'),
-            expected_modified_time=to_timestamp(kwargs['modified']),
-            score_deleted=kwargs.get('score_deleted', False),
-            event_transaction_id=unicode(get_event_transaction_id()),
-            event_transaction_type=unicode(get_event_transaction_type()),
-            score_db_table=kwargs['score_db_table'],
-        ),
+        kwargs=task_kwargs,
         countdown=RECALCULATE_GRADE_DELAY,
     )
     log.info(
@@ -245,6 +267,14 @@ def recalculate_course_grade(sender, course, course_structure, user, **kwargs):
     CourseGradeFactory().update(user, course=course, course_structure=course_structure)
 
 
+@receiver(COURSE_GRADE_CHANGED)
+def invalidate_progress_summary(sender, user, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Removes the cached progress summary of the user whose course grade changed.
+    """
+    ProgressSummary.invalidate(user.id, course_key)
+
+
 def _emit_event(kwargs):
     """
     Emits a problem submitted event only if there is no current event
@@ -2,6 +2,8 @@
 This module contains tasks for asynchronous execution of grade updates.
 """
 
+import time
+from contextlib import contextmanager
 from logging import getLogger
 
 import six
@@ -10,6 +12,7 @@ from celery_utils.logged_task import LoggedTask
 from celery_utils.persist_on_failure import PersistOnFailureTask
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db.utils import DatabaseError
 from opaque_keys.edx.keys import CourseKey, UsageKey
@@ -43,6 +46,15 @@ KNOWN_RETRY_ERRORS = (  # Errors we expect occasionally, should be resolved on r
 )
 RECALCULATE_GRADE_DELAY = 2  # in seconds, to prevent excessive _has_db_updated failures. See TNL-6424.
 
+# Recalculations of a user's subsection grades in a course that are requested
+# within this many seconds of each other are coalesced into a single task.
+COALESCED_RECALCULATION_DELAY = 10
+PENDING_RECALCULATIONS_CACHE_KEY = u'grades.pending_recalculations.{user_id}.{course_id}'
+PENDING_RECALCULATIONS_TIMEOUT = 60 * 60  # in seconds
+PENDING_RECALCULATIONS_LOCK_TIMEOUT = 10  # in seconds
+PENDING_RECALCULATIONS_LOCK_ATTEMPTS = 10
+PENDING_RECALCULATIONS_LOCK_WAIT = 0.05  # in seconds, between attempts to acquire the lock
+
 
 class _BaseTask(PersistOnFailureTask, LoggedTask):  # pylint: disable=abstract-method
     """
@@ -180,8 +192,7 @@ def _recalculate_subsection_grade(self, **kwargs):
 
         _update_subsection_grades(
             course_key,
-            scored_block_usage_key,
-            kwargs['only_if_higher'],
+            {scored_block_usage_key: kwargs['only_if_higher']},
             kwargs['user_id'],
         )
     except Exception as exc:   # pylint: disable=broad-except
@@ -194,6 +205,138 @@ def _recalculate_subsection_grade(self, **kwargs):
         raise self.retry(kwargs=kwargs, exc=exc)
 
 
+def enqueue_coalesced_subsection_recalculation(recalculation):
+    """
+    Adds a recalculation of subsection grades, given as the keyword arguments of
+    recalculate_subsection_grade_v3, to the pending recalculations of the user
+    in the course, and enqueues a recalculate_coalesced_subsection_grades task
+    if there weren't any.
+
+    Recalculations requested for the same problem are merged, so that a user
+    answering many problems in quick succession causes a single task to
+    update each affected subsection grade once.
+
+    Returns False if the pending recalculations could not be updated, in which
+    case the caller should enqueue the recalculation by itself.
+    """
+    user_id = recalculation['user_id']
+    course_id = unicode(recalculation['course_id'])
+    with _pending_recalculations_lock(user_id, course_id, attempts=1) as locked:
+        if not locked:
+            return False
+        cache_key = PENDING_RECALCULATIONS_CACHE_KEY.format(user_id=user_id, course_id=course_id)
+        pending_recalculations = cache.get(cache_key)
+        is_new_batch = pending_recalculations is None
+        if is_new_batch:
+            pending_recalculations = {}
+        usage_id = recalculation['usage_id']
+        pending_recalculations[usage_id] = _merge_recalculations(pending_recalculations.get(usage_id), recalculation)
+        cache.set(cache_key, pending_recalculations, PENDING_RECALCULATIONS_TIMEOUT)
+
+    if is_new_batch:
+        recalculate_coalesced_subsection_grades.apply_async(
+            kwargs=dict(user_id=user_id, course_id=course_id),
+            countdown=COALESCED_RECALCULATION_DELAY,
+        )
+    return True
+
+
+@task(bind=True, base=_BaseTask, default_retry_delay=30, routing_key=settings.RECALCULATE_GRADES_ROUTING_KEY)
+def recalculate_coalesced_subsection_grades(self, **kwargs):
+    """
+    Updates the saved subsection grades of a user in a course for all of the
+    recalculations coalesced by enqueue_coalesced_subsection_recalculation,
+    loading the course structure only once.
+
+    Keyword Arguments:
+        user_id (int): id of applicable User object
+        course_id (string): identifying the course
+        recalculations (list, OPTIONAL): the keyword arguments of
+            recalculate_subsection_grade_v3 for each recalculation. Taken
+            from the pending recalculations of the user in the course if
+            not given, which is the case until the task is retried.
+    """
+    if kwargs.get('recalculations') is None:
+        with _pending_recalculations_lock(kwargs['user_id'], kwargs['course_id']) as locked:
+            if not locked:
+                raise self.retry(kwargs=kwargs, countdown=RECALCULATE_GRADE_DELAY)
+            cache_key = PENDING_RECALCULATIONS_CACHE_KEY.format(**kwargs)
+            pending_recalculations = cache.get(cache_key)
+            cache.delete(cache_key)
+        if not pending_recalculations:
+            log.warning(u'Grades: No pending recalculations found with args: {}'.format(kwargs))
+            return
+        kwargs['recalculations'] = sorted(
+            pending_recalculations.itervalues(),
+            key=lambda recalculation: recalculation['expected_modified_time'],
+        )
+
+    try:
+        course_key = CourseLocator.from_string(kwargs['course_id'])
+        set_custom_metrics_for_course_key(course_key)
+        set_custom_metric('coalesced_recalculations', len(kwargs['recalculations']))
+
+        # Correlate the grading events with the most recent score change.
+        set_event_transaction_id(kwargs['recalculations'][-1].get('event_transaction_id'))
+        set_event_transaction_type(kwargs['recalculations'][-1].get('event_transaction_type'))
+
+        only_if_higher_by_scored_block = {}
+        for recalculation in kwargs['recalculations']:
+            scored_block_usage_key = UsageKey.from_string(recalculation['usage_id']).replace(course_key=course_key)
+            if not _has_db_updated_with_new_score(self, scored_block_usage_key, **recalculation):
+                raise DatabaseNotReadyError
+            only_if_higher_by_scored_block[scored_block_usage_key] = recalculation['only_if_higher']
+
+        _update_subsection_grades(course_key, only_if_higher_by_scored_block, kwargs['user_id'])
+    except Exception as exc:   # pylint: disable=broad-except
+        if not isinstance(exc, KNOWN_RETRY_ERRORS):
+            log.info("Grades: coalesced recalculation unexpected failure: {}. task id: {}. kwargs={}".format(
+                repr(exc),
+                self.request.id,
+                kwargs,
+            ))
+        raise self.retry(kwargs=kwargs, exc=exc)
+
+
+@contextmanager
+def _pending_recalculations_lock(user_id, course_id, attempts=PENDING_RECALCULATIONS_LOCK_ATTEMPTS):
+    """
+    Context manager that acquires the lock on the pending recalculations of
+    the given user in the given course, yielding whether it was acquired.
+    """
+    lock_key = PENDING_RECALCULATIONS_CACHE_KEY.format(user_id=user_id, course_id=course_id) + u'.lock'
+    locked = False
+    for attempt in range(attempts):
+        if attempt:
+            time.sleep(PENDING_RECALCULATIONS_LOCK_WAIT)
+        locked = cache.add(lock_key, True, PENDING_RECALCULATIONS_LOCK_TIMEOUT)
+        if locked:
+            break
+    try:
+        yield locked
+    finally:
+        if locked:
+            cache.delete(lock_key)
+
+
+def _merge_recalculations(pending_recalculation, recalculation):
+    """
+    Returns the recalculation of a problem's subsection grades that covers
+    both of the given ones, the first of which may be None.
+    """
+    if pending_recalculation is None:
+        return recalculation
+    merged_recalculation = dict(max(
+        pending_recalculation,
+        recalculation,
+        key=lambda value: value['expected_modified_time'],
+    ))
+    merged_recalculation['only_if_higher'] = (
+        pending_recalculation['only_if_higher'] and recalculation['only_if_higher']
+    )
+    return merged_recalculation
+
+
 def _has_db_updated_with_new_score(self, scored_block_usage_key, **kwargs):
     """
     Returns whether the database has been updated with the
@@ -235,27 +378,38 @@ def _has_db_updated_with_new_score(self, scored_block_usage_key, **kwargs):
     return db_is_updated
 
 
-def _update_subsection_grades(course_key, scored_block_usage_key, only_if_higher, user_id):
+def _update_subsection_grades(course_key, only_if_higher_by_scored_block, user_id):
     """
     A helper function to update subsection grades in the database
-    for each subsection containing the given block, and to signal
+    for each subsection containing any of the given blocks, and to signal
     that those subsection grades were updated.
+
+    only_if_higher_by_scored_block maps the usage key of each scored block
+    to whether the grades of its subsections should be updated only if
+    they are higher. A subsection containing several of the blocks is
+    updated once, unconditionally unless all of them say otherwise.
     """
     student = User.objects.get(id=user_id)
     store = modulestore()
     with store.bulk_operations(course_key):
         course_structure = get_course_blocks(student, store.make_course_usage_key(course_key))
-        subsections_to_update = course_structure.get_transformer_block_field(
-            scored_block_usage_key,
-            GradesTransformer,
-            'subsections',
-            set(),
-        )
+        only_if_higher_by_subsection = {}
+        for scored_block_usage_key, only_if_higher in only_if_higher_by_scored_block.iteritems():
+            subsections_to_update = course_structure.get_transformer_block_field(
+                scored_block_usage_key,
+                GradesTransformer,
+                'subsections',
+                set(),
+            )
+            for subsection_usage_key in subsections_to_update:
+                only_if_higher_by_subsection[subsection_usage_key] = (
+                    only_if_higher_by_subsection.get(subsection_usage_key, True) and only_if_higher
+                )
 
         course = store.get_course(course_key, depth=0)
         subsection_grade_factory = SubsectionGradeFactory(student, course, course_structure)
 
-        for subsection_usage_key in subsections_to_update:
+        for subsection_usage_key, only_if_higher in only_if_higher_by_subsection.iteritems():
             if subsection_usage_key in course_structure:
                 subsection_grade = subsection_grade_factory.update(
                     course_structure[subsection_usage_key],
@@ -9,6 +9,7 @@ import itertools
 import ddt
 import pytz
 from django.conf import settings
+from django.core.cache import cache
 from mock import patch
 
 from capa.tests.response_xml_factory import MultipleChoiceResponseXMLFactory
@@ -29,6 +30,7 @@ from ..models import PersistentSubsectionGrade
 from ..new.course_data import CourseData
 from ..new.course_grade import CourseGrade, ZeroCourseGrade
 from ..new.course_grade_factory import CourseGradeFactory
+from ..new.progress_summary import ProgressSummary
 from ..new.subsection_grade import SubsectionGrade, ZeroSubsectionGrade
 from ..new.subsection_grade_factory import SubsectionGradeFactory
 from .utils import mock_get_score, mock_get_submissions_score
@@ -446,6 +448,66 @@ class SubsectionGradeTest(GradeTestBase):
         self.assertEqual(input_grade.all_total, loaded_grade.all_total)
 
 
+class ProgressSummaryTest(GradeTestBase):
+    """
+    Tests ProgressSummary functionality.
+    """
+    def test_no_persisted_grade(self):
+        self.assertIsNone(ProgressSummary.get(self.request.user, self.course))
+
+    def test_get(self):
+        with mock_get_score(1, 2):
+            CourseGradeFactory().update(self.request.user, self.course)
+            progress_summary = ProgressSummary.get(self.request.user, self.course)
+
+        self.assertEqual(progress_summary.percent, 0.5)
+        self.assertEqual(progress_summary.letter_grade, u'Pass')
+        self.assertEqual(progress_summary.summary['percent'], 0.5)
+        self.assertEqual(
+            [chapter['display_name'] for chapter in progress_summary.chapter_grades],
+            [u'Test Chapter', u'Test Chapter 2'],
+        )
+        section = progress_summary.chapter_grades[0]['sections'][0]
+        self.assertEqual(section.location, self.sequence.location)
+        self.assertEqual((section.all_total.earned, section.all_total.possible), (1, 2))
+        self.assertEqual(section.problem_scores.keys(), [self.problem.location])
+        self.assertTrue(section.show_grades(has_staff_access=False))
+
+        # Only the persisted course grade is read while the cached summary is current.
+        with self.assertNumQueries(1):
+            cached_summary = ProgressSummary.get(self.request.user, self.course)
+        self.assertEqual(cached_summary.chapter_grades[0]['sections'][0].location, self.sequence.location)
+
+    def test_invalidated_by_grade_update(self):
+        with mock_get_score(1, 2):
+            CourseGradeFactory().update(self.request.user, self.course)
+            ProgressSummary.get(self.request.user, self.course)
+        cache_key = ProgressSummary._cache_key(self.request.user.id, self.course.id)
+        self.assertIsNotNone(cache.get(cache_key))
+
+        with mock_get_score(2, 2):
+            CourseGradeFactory().update(self.request.user, self.course)
+            self.assertIsNone(cache.get(cache_key))
+            progress_summary = ProgressSummary.get(self.request.user, self.course)
+        self.assertEqual(progress_summary.percent, 1.0)
+
+    def test_invalidated_by_course_publish(self):
+        with mock_get_score(1, 2):
+            CourseGradeFactory().update(self.request.user, self.course)
+            ProgressSummary.get(self.request.user, self.course)
+
+        with patch.object(ProgressSummary, '_course_version', return_value=(u'published_version', None)):
+            with patch('lms.djangoapps.grades.new.progress_summary.CourseGrade', wraps=CourseGrade) as mock_grade:
+                self.assertIsNotNone(ProgressSummary.get(self.request.user, self.course))
+        self.assertTrue(mock_grade.called)
+
+    def test_grading_policy_changed(self):
+        with mock_get_score(1, 2):
+            CourseGradeFactory().update(self.request.user, self.course)
+        self._update_grading_policy(passing=0.9)
+        self.assertIsNone(ProgressSummary.get(self.request.user, self.course))
+
+
 @ddt.ddt
 class TestMultipleProblemTypesSubsectionScores(SharedModuleStoreTestCase):
     """
@@ -11,18 +11,23 @@ import ddt
 import pytz
 import six
 from django.conf import settings
+from django.core.cache import cache
 from django.db.utils import IntegrityError
 from mock import MagicMock, patch
 
 from lms.djangoapps.grades.config.models import PersistentGradesEnabledFlag
+from lms.djangoapps.grades.config.waffle import COALESCE_SUBSECTION_RECALCULATIONS, waffle
 from lms.djangoapps.grades.constants import ScoreDatabaseTableEnum
 from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsectionGrade
 from lms.djangoapps.grades.signals.signals import PROBLEM_WEIGHTED_SCORE_CHANGED
 from lms.djangoapps.grades.tasks import (
+    COALESCED_RECALCULATION_DELAY,
+    PENDING_RECALCULATIONS_CACHE_KEY,
     RECALCULATE_GRADE_DELAY,
     _course_task_args,
     compute_all_grades_for_course,
     compute_grades_for_course_v2,
+    recalculate_coalesced_subsection_grades,
     recalculate_subsection_grade_v3
 )
 from openedx.core.djangoapps.content.block_structure.exceptions import BlockStructureNotFound
@@ -374,6 +379,131 @@ class RecalculateSubsectionGradeTest(HasCourseWithProblemsMixin, ModuleStoreTest
         self.assertFalse(mock_retry.called)
 
 
+@patch.dict(settings.FEATURES, {'PERSISTENT_GRADES_ENABLED_FOR_ALL_TESTS': False})
+class CoalescedSubsectionGradeRecalculationTest(HasCourseWithProblemsMixin, ModuleStoreTestCase):
+    """
+    Ensures that recalculations of a user's subsection grades are coalesced
+    when the COALESCE_SUBSECTION_RECALCULATIONS switch is enabled.
+    """
+    ENABLED_SIGNALS = ['course_published', 'pre_publish']
+
+    def setUp(self):
+        super(CoalescedSubsectionGradeRecalculationTest, self).setUp()
+        self.user = UserFactory()
+        PersistentGradesEnabledFlag.objects.create(enabled_for_all_courses=True, enabled=True)
+        self.set_up_course(create_multiple_subsections=True)
+        self.problem2 = ItemFactory.create(parent=self.sequential, category='problem', display_name='Problem 2')
+        self.pending_recalculations_key = PENDING_RECALCULATIONS_CACHE_KEY.format(
+            user_id=self.user.id,
+            course_id=unicode(self.course.id),
+        )
+
+    @contextmanager
+    def coalesce_recalculations(self):
+        """
+        Enables coalescing with the tasks mocked, yielding the mocks of the
+        coalesced and per-problem tasks' apply_async.
+        """
+        with waffle().override(COALESCE_SUBSECTION_RECALCULATIONS, active=True):
+            with patch(
+                'lms.djangoapps.grades.tasks.recalculate_coalesced_subsection_grades.apply_async'
+            ) as mock_coalesced_apply:
+                with patch(
+                    'lms.djangoapps.grades.tasks.recalculate_subsection_grade_v3.apply_async'
+                ) as mock_task_apply:
+                    yield mock_coalesced_apply, mock_task_apply
+
+    def send_score_changed(self, problem, modified):
+        """
+        Sends the PROBLEM_WEIGHTED_SCORE_CHANGED signal for the given problem.
+        """
+        send_args = self.problem_weighted_score_changed_kwargs.copy()
+        send_args['usage_id'] = unicode(problem.location)
+        send_args['modified'] = modified
+        PROBLEM_WEIGHTED_SCORE_CHANGED.send(sender=None, **send_args)
+
+    def test_score_changes_coalesced(self):
+        later_datetime = self.frozen_now_datetime + timedelta(seconds=5)
+        with self.coalesce_recalculations() as (mock_coalesced_apply, mock_task_apply):
+            self.send_score_changed(self.problem, self.frozen_now_datetime)
+            self.send_score_changed(self.problem2, self.frozen_now_datetime)
+            self.send_score_changed(self.problem, later_datetime)
+
+        self.assertFalse(mock_task_apply.called)
+        mock_coalesced_apply.assert_called_once_with(
+            countdown=COALESCED_RECALCULATION_DELAY,
+            kwargs=dict(user_id=self.user.id, course_id=unicode(self.course.id)),
+        )
+        pending_recalculations = cache.get(self.pending_recalculations_key)
+        self.assertEqual(
+            set(pending_recalculations),
+            {unicode(self.problem.location), unicode(self.problem2.location)},
+        )
+        self.assertEqual(
+            pending_recalculations[unicode(self.problem.location)]['expected_modified_time'],
+            to_timestamp(later_datetime),
+        )
+
+    def test_falls_back_to_task_when_locked(self):
+        cache.add(self.pending_recalculations_key + u'.lock', True)
+        with self.coalesce_recalculations() as (mock_coalesced_apply, mock_task_apply):
+            self.send_score_changed(self.problem, self.frozen_now_datetime)
+
+        self.assertFalse(mock_coalesced_apply.called)
+        mock_task_apply.assert_called_once_with(
+            countdown=RECALCULATE_GRADE_DELAY,
+            kwargs=self.recalculate_subsection_grade_kwargs,
+        )
+
+    @patch('lms.djangoapps.grades.signals.signals.SUBSECTION_SCORE_CHANGED.send')
+    def test_subsections_updated_once(self, mock_subsection_signal):
+        with self.coalesce_recalculations():
+            self.send_score_changed(self.problem, self.frozen_now_datetime)
+            self.send_score_changed(self.problem2, self.frozen_now_datetime)
+
+        with patch(
+            'lms.djangoapps.grades.tasks.get_score',
+            return_value=MagicMock(modified=self.frozen_now_datetime + timedelta(days=1)),
+        ):
+            with patch(
+                'openedx.core.djangoapps.content.block_structure.factory.BlockStructureFactory.create_from_store',
+                side_effect=BlockStructureNotFound(self.course.location),
+            ) as mock_block_structure_create:
+                recalculate_coalesced_subsection_grades.apply(
+                    kwargs=dict(user_id=self.user.id, course_id=unicode(self.course.id)),
+                )
+                self.assertEqual(mock_block_structure_create.call_count, 1)
+
+        # Both problems are in the same subsection.
+        self.assertEqual(mock_subsection_signal.call_count, 1)
+        self.assertEqual(
+            mock_subsection_signal.call_args[1]['subsection_grade'].location,
+            self.sequential.location,
+        )
+        self.assertIsNone(cache.get(self.pending_recalculations_key))
+
+    @patch('lms.djangoapps.grades.tasks.recalculate_coalesced_subsection_grades.retry')
+    def test_retry_when_db_not_updated(self, mock_retry):
+        with self.coalesce_recalculations():
+            self.send_score_changed(self.problem, self.frozen_now_datetime)
+
+        with patch(
+            'lms.djangoapps.grades.tasks.get_score',
+            return_value=MagicMock(modified=self.frozen_now_datetime - timedelta(days=1)),
+        ):
+            recalculate_coalesced_subsection_grades.apply(
+                kwargs=dict(user_id=self.user.id, course_id=unicode(self.course.id)),
+            )
+
+        # The retried task recalculates the grades popped from the pending recalculations.
+        self.assertTrue(mock_retry.called)
+        self.assertEqual(
+            mock_retry.call_args[1]['kwargs']['recalculations'],
+            [self.recalculate_subsection_grade_kwargs],
+        )
+        self.assertIsNone(cache.get(self.pending_recalculations_key))
+
+
 @ddt.ddt
 class ComputeGradesForCourseTest(HasCourseWithProblemsMixin, ModuleStoreTestCase):
     """
@@ -6,7 +6,7 @@ from time import time
 from django.contrib.auth.models import User
 from django.db.models import Q
 
-from certificates.api import generate_user_certificates
+from certificates.api import generate_user_certificates_in_bulk
 from certificates.models import CertificateStatuses, GeneratedCertificate
 from student.models import CourseEnrollment
 from xmodule.modulestore.django import modulestore
@@ -71,16 +71,11 @@ def generate_students_certificates(
     task_progress.update_task_state(extra_meta=current_step)
 
     course = modulestore().get_course(course_id, depth=0)
-    # Generate certificate for each student
+    # Generate certificates for the students in bulk
+    statuses = generate_user_certificates_in_bulk(students_require_certs, course_id, course=course)
     for student in students_require_certs:
         task_progress.attempted += 1
-        status = generate_user_certificates(
-            student,
-            course_id,
-            course=course
-        )
-
-        if CertificateStatuses.is_passing_status(status):
+        if CertificateStatuses.is_passing_status(statuses.get(student.id)):
             task_progress.succeeded += 1
         else:
             task_progress.failed += 1
@@ -15,14 +15,17 @@ from certificates.models import CertificateWhitelist, GeneratedCertificate, cert
 from courseware.courses import get_course_by_id
 from instructor_analytics.basic import list_problem_responses
 from instructor_analytics.csvs import format_dictlist
+from lms.djangoapps.course_blocks.library_selections import bulk_cache_library_states
+from lms.djangoapps.course_blocks.partition_groups import bulk_cache_user_partition_groups
+from lms.djangoapps.course_blocks.transformers.library_content import ContentLibraryTransformer
+from lms.djangoapps.course_blocks.transformers.user_partitions import UserPartitionTransformer
 from lms.djangoapps.grades.context import grading_context, grading_context_for_course
 from lms.djangoapps.grades.models import PersistentCourseGrade
 from lms.djangoapps.grades.new.course_grade_factory import CourseGradeFactory
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification
 from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
-from openedx.core.djangoapps.course_groups.cohorts import bulk_cache_cohorts, get_cohort, is_course_cohorted
-from openedx.core.djangoapps.user_api.course_tag.api import BulkCourseTags
+from openedx.core.djangoapps.course_groups.cohorts import get_cohort, is_course_cohorted
 from student.models import CourseEnrollment
 from student.roles import BulkRoleCache
 from xmodule.modulestore.django import modulestore
@@ -166,7 +169,6 @@ class _TeamBulkContext(object):
 
 class _EnrollmentBulkContext(object):
     def __init__(self, context, users):
-        CourseEnrollment.bulk_fetch_enrollment_states(users, context.course_id)
         self.verified_users = [
             verified.user.id for verified in
             SoftwareSecurePhotoVerification.verified_query().filter(user__in=users).select_related('user__id')
@@ -175,13 +177,23 @@ class _EnrollmentBulkContext(object):
 
 class _CourseGradeBulkContext(object):
     def __init__(self, context, users):
+        # Also caches the cohorts, enrollment states and course tags of the users.
+        bulk_cache_user_partition_groups(
+            context.course_id,
+            context.course_structure.get_transformer_data(UserPartitionTransformer, 'user_partitions', []),
+            users,
+        )
+        # Also caches the children selected for the users in randomized content blocks.
+        bulk_cache_library_states(
+            context.course_id,
+            ContentLibraryTransformer.get_library_block_keys(context.course_structure),
+            users,
+        )
         self.certs = _CertificateBulkContext(context, users)
         self.teams = _TeamBulkContext(context, users)
         self.enrollments = _EnrollmentBulkContext(context, users)
-        bulk_cache_cohorts(context.course_id, users)
         BulkRoleCache.prefetch(users)
         PersistentCourseGrade.prefetch(context.course_id, users)
-        BulkCourseTags.prefetch(context.course_id, users)
 
 
 class CourseGradeReport(object):
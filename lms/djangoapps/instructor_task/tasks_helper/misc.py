@@ -9,15 +9,19 @@ from datetime import datetime
 from time import time
 
 import unicodecsv
-from django.contrib.auth.models import User
-from django.core.exceptions import ValidationError
 from django.core.files.storage import DefaultStorage
 from openassessment.data import OraAggregateData
 from pytz import UTC
 
 from instructor_analytics.basic import get_proctored_exam_results
 from instructor_analytics.csvs import format_dictlist
-from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort
+from openedx.core.djangoapps.course_groups.cohorts import (
+    COHORT_ASSIGNMENT_ADDED,
+    COHORT_ASSIGNMENT_INVALID_EMAIL,
+    COHORT_ASSIGNMENT_NOT_FOUND,
+    COHORT_ASSIGNMENT_PREASSIGNED,
+    bulk_add_users_to_cohorts
+)
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from survey.models import SurveyAnswer
 from util.file import UniversalNewlineIterator, course_filename_prefix_generator
@@ -28,6 +32,9 @@ from .utils import UPDATE_STATUS_FAILED, UPDATE_STATUS_SUCCEEDED, upload_csv_to_
 # define different loggers for use within tasks and on client side
 TASK_LOG = logging.getLogger('edx.celery.task')
 
+# Number of CSV rows applied per call to bulk_add_users_to_cohorts
+COHORT_ASSIGNMENT_BATCH_SIZE = 1000
+
 
 def upload_course_survey_report(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
     """
@@ -143,6 +150,10 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
     # to prevent redundant cohort queries.
     cohorts_status = {}
 
+    # Assignments to existing cohorts are collected into batches of
+    # (username_or_email, cohort_name) pairs, which are applied in bulk.
+    assignments = []
+
     with DefaultStorage().open(task_input['file_name']) as f:
         for row in unicodecsv.DictReader(UniversalNewlineIterator(f), encoding='utf-8'):
             # Try to use the 'email' field to identify the user.  If it's not present, use 'username'.
@@ -172,32 +183,13 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
                 task_progress.failed += 1
                 continue
 
-            try:
-                # If add_user_to_cohort successfully adds a user, a user object is returned.
-                # If a user is preassigned to a cohort, no user object is returned (we already have the email address).
-                (user, previous_cohort, preassigned) = add_user_to_cohort(cohorts_status[cohort_name]['cohort'], username_or_email)
-                if preassigned:
-                    cohorts_status[cohort_name]['Preassigned Learners'].add(username_or_email)
-                    task_progress.preassigned += 1
-                else:
-                    cohorts_status[cohort_name]['Learners Added'] += 1
-                    task_progress.succeeded += 1
-            except User.DoesNotExist:
-                # Raised when a user with the username could not be found, and the email is not valid
-                cohorts_status[cohort_name]['Learners Not Found'].add(username_or_email)
-                task_progress.failed += 1
-            except ValidationError:
-                # Raised when a user with the username could not be found, and the email is not valid,
-                # but the entered string contains an "@"
-                # Since there is no way to know if the entered string is an invalid username or an invalid email,
-                # assume that a string with the "@" symbol in it is an attempt at entering an email
-                cohorts_status[cohort_name]['Invalid Email Addresses'].add(username_or_email)
-                task_progress.failed += 1
-            except ValueError:
-                # Raised when the user is already in the given cohort
-                task_progress.skipped += 1
+            assignments.append((username_or_email, cohort_name))
+            if len(assignments) >= COHORT_ASSIGNMENT_BATCH_SIZE:
+                _apply_cohort_assignments(course_id, assignments, cohorts_status, task_progress)
+                task_progress.update_task_state(extra_meta=current_step)
+                assignments = []
 
-            task_progress.update_task_state(extra_meta=current_step)
+    _apply_cohort_assignments(course_id, assignments, cohorts_status, task_progress)
 
     current_step['step'] = 'Uploading CSV'
     task_progress.update_task_state(extra_meta=current_step)
@@ -220,6 +212,42 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+def _apply_cohort_assignments(course_id, assignments, cohorts_status, task_progress):
+    """
+    Applies a batch of (username_or_email, cohort_name) assignments in bulk,
+    and records their outcome in `cohorts_status` and `task_progress`.
+    """
+    if not assignments:
+        return
+
+    results = bulk_add_users_to_cohorts(
+        course_id,
+        [(username_or_email, cohorts_status[cohort_name]['cohort']) for username_or_email, cohort_name in assignments]
+    )
+    for (__, cohort_name), result in zip(assignments, results):
+        status = cohorts_status[cohort_name]
+        if result.status == COHORT_ASSIGNMENT_ADDED:
+            status['Learners Added'] += 1
+            task_progress.succeeded += 1
+        elif result.status == COHORT_ASSIGNMENT_PREASSIGNED:
+            status['Preassigned Learners'].add(result.username_or_email)
+            task_progress.preassigned += 1
+        elif result.status == COHORT_ASSIGNMENT_NOT_FOUND:
+            # A user with the username could not be found, and the email is not valid
+            status['Learners Not Found'].add(result.username_or_email)
+            task_progress.failed += 1
+        elif result.status == COHORT_ASSIGNMENT_INVALID_EMAIL:
+            # A user with the username could not be found, and the email is not valid,
+            # but the entered string contains an "@"
+            # Since there is no way to know if the entered string is an invalid username or an invalid email,
+            # assume that a string with the "@" symbol in it is an attempt at entering an email
+            status['Invalid Email Addresses'].add(result.username_or_email)
+            task_progress.failed += 1
+        else:
+            # The user is already in the given cohort
+            task_progress.skipped += 1
+
+
 def upload_ora2_data(
         _xmodule_instance_args, _entry_id, course_id, _task_input, action_name
 ):
@@ -1975,7 +1975,7 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
             'failed': 3,
             'skipped': 2
         }
-        with self.assertNumQueries(171):
+        with self.assertNumQueries(88):
             self.assertCertificatesGenerated(task_input, expected_results)
 
         expected_results = {
@@ -2468,8 +2468,8 @@ class TestCertificateGeneration(InstructorTaskModuleTestCase):
 
         with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task') as mock_current_task:
             mock_current_task.return_value = current_task
-            with patch('capa.xqueue_interface.XQueueInterface.send_to_queue') as mock_queue:
-                mock_queue.return_value = (0, "Successfully queued")
+            with patch('capa.xqueue_interface.XQueueInterface.send_batch_to_queue') as mock_queue:
+                mock_queue.side_effect = lambda submissions: [(0, "Successfully queued")] * len(submissions)
                 result = generate_students_certificates(
                     None, None, self.course.id, task_input, 'certificates generated'
                 )
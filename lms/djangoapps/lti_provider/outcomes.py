@@ -10,12 +10,35 @@ import requests
 import requests_oauthlib
 from lxml import etree
 from lxml.builder import ElementMaker
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 
+import dogstats_wrapper as dog_stats_api
 from lti_provider.models import GradedAssignment, OutcomeService
 
 log = logging.getLogger("edx.lti_provider")
 
+# Maximum number of open connections kept to each host of the outcome
+# services of an LTI consumer.
+OUTCOME_SERVICE_POOL_SIZE = 10
+
+# Number of seconds to wait for the outcome service of an LTI consumer to
+# respond to a score update.
+OUTCOME_SERVICE_TIMEOUT = 30
+
+# HTTP sessions used to send score updates to the outcome services of each
+# LTI consumer, by consumer id. They keep their connections open between
+# updates.
+_sessions = {}
+
+
+class OutcomeServiceUnavailable(Exception):
+    """
+    Raised when the outcome service of an LTI consumer can't be reached, or
+    fails with a server error, so that the score update may be retried.
+    """
+    pass
+
 
 def store_outcome_parameters(request_params, user, lti_consumer):
     """
@@ -123,6 +146,9 @@ def send_score_update(assignment, score):
     """
     Create and send the XML message to the campus LMS system to update the grade
     for a single graded assignment.
+
+    Returns whether the score was updated. Raises OutcomeServiceUnavailable
+    if the update failed in a way that may succeed when retried.
     """
     xml = generate_replace_result_xml(
         assignment.lis_result_sourcedid, score
@@ -135,20 +161,27 @@ def send_score_update(assignment, score):
         response = None
         log.exception("Outcome Service: Error when sending result.")
 
+    if response is not None and check_replace_result_response(response):
+        dog_stats_api.increment('lti_provider.outcome.sent')
+        return True
+
     # If something went wrong, make sure that we have a complete log record.
     # That way we can manually fix things up on the campus system later if
     # necessary.
-    if not (response and check_replace_result_response(response)):
-        log.error(
-            "Outcome Service: Failed to update score on LTI consumer. "
-            "User: %s, course: %s, usage: %s, score: %s, status: %s, body: %s",
-            assignment.user,
-            assignment.course_key,
-            assignment.usage_key,
-            score,
-            response,
-            response.text if response else 'Unknown'
-        )
+    log.error(
+        "Outcome Service: Failed to update score on LTI consumer. "
+        "User: %s, course: %s, usage: %s, score: %s, status: %s, body: %s",
+        assignment.user,
+        assignment.course_key,
+        assignment.usage_key,
+        score,
+        response,
+        response.text if response is not None else 'Unknown'
+    )
+    dog_stats_api.increment('lti_provider.outcome.failed')
+    if response is None or response.status_code >= 500:
+        raise OutcomeServiceUnavailable(assignment.outcome_service.lis_outcome_service_url)
+    return False
 
 
 def sign_and_send_replace_result(assignment, xml):
@@ -171,16 +204,33 @@ def sign_and_send_replace_result(assignment, xml):
     )
 
     headers = {'content-type': 'application/xml'}
-    response = requests.post(
-        assignment.outcome_service.lis_outcome_service_url,
-        data=xml,
-        auth=oauth,
-        headers=headers
-    )
+    with dog_stats_api.timer('lti_provider.outcome.send_time', tags=[u'consumer:{}'.format(consumer.consumer_name)]):
+        response = _get_session(consumer).post(
+            assignment.outcome_service.lis_outcome_service_url,
+            data=xml,
+            auth=oauth,
+            headers=headers,
+            timeout=OUTCOME_SERVICE_TIMEOUT
+        )
 
     return response
 
 
+def _get_session(consumer):
+    """
+    Returns the HTTP session used to send score updates to the outcome
+    services of the given LTI consumer.
+    """
+    session = _sessions.get(consumer.id)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=OUTCOME_SERVICE_POOL_SIZE)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _sessions[consumer.id] = session
+    return session
+
+
 def check_replace_result_response(response):
     """
     Parse the response sent by the LTI consumer after an score update message
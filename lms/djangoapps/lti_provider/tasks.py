@@ -3,12 +3,14 @@ Asynchronous tasks for the LTI provider app.
 """
 
 import logging
+import time
 
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.dispatch import receiver
 from opaque_keys.edx.keys import CourseKey
 
+import dogstats_wrapper as dog_stats_api
 import lti_provider.outcomes as outcomes
 from lms import CELERY_APP
 from lms.djangoapps.grades.new.course_grade_factory import CourseGradeFactory
@@ -37,12 +39,14 @@ def score_changed_handler(sender, **kwargs):  # pylint: disable=unused-argument
         assignments = increment_assignment_versions(course_key, usage_key, user_id)
         for assignment in assignments:
             if assignment.usage_key == usage_key:
-                send_leaf_outcome.delay(
-                    assignment.id, points_earned, points_possible
+                send_leaf_outcome.apply_async(
+                    (assignment.id, points_earned, points_possible),
+                    {'version': assignment.version_number, 'scheduled_at': time.time()},
                 )
             else:
                 send_composite_outcome.apply_async(
                     (user_id, course_id, assignment.id, assignment.version_number),
+                    {'scheduled_at': time.time() + settings.LTI_AGGREGATE_SCORE_PASSBACK_DELAY},
                     countdown=settings.LTI_AGGREGATE_SCORE_PASSBACK_DELAY
                 )
     else:
@@ -59,6 +63,11 @@ def increment_assignment_versions(course_key, usage_key, user_id):
     Update the version numbers for all assignments that are affected by a score
     change event. Returns a list of all affected assignments.
     """
+    # Most learners aren't taking the course through an LTI consumer, so don't
+    # look for their assignments in the ancestors of the problem.
+    if not GradedAssignment.objects.filter(user=user_id, course_key=course_key).exists():
+        return []
+
     problem_descriptor = modulestore().get_item(usage_key)
     # Get all assignments involving the current problem for which the campus LMS
     # is expecting a grade. There may be many possible graded assignments, if
@@ -73,8 +82,40 @@ def increment_assignment_versions(course_key, usage_key, user_id):
     return assignments
 
 
-@CELERY_APP.task(name='lti_provider.tasks.send_composite_outcome')
-def send_composite_outcome(user_id, course_id, assignment_id, version):
+def _record_queue_delay(outcome_type, scheduled_at):
+    """
+    Records the number of seconds a score update task waited in the queue
+    after it was scheduled to run, which grows with the backlog of score
+    updates.
+    """
+    if scheduled_at is not None:
+        dog_stats_api.histogram(
+            'lti_provider.outcome.queue_delay',
+            max(0, time.time() - scheduled_at),
+            tags=[u'type:{}'.format(outcome_type)],
+        )
+
+
+def _send_score_update(task, assignment, weighted_score):
+    """
+    Sends the score of the assignment to the LTI consumer, retrying the task
+    with an exponential backoff when the outcome service is unavailable.
+    """
+    try:
+        outcomes.send_score_update(assignment, weighted_score)
+    except outcomes.OutcomeServiceUnavailable as exc:
+        dog_stats_api.increment('lti_provider.outcome.retried')
+        raise task.retry(
+            exc=exc,
+            countdown=settings.LTI_SCORE_PASSBACK_RETRY_DELAY * 2 ** task.request.retries,
+            max_retries=settings.LTI_SCORE_PASSBACK_MAX_RETRIES,
+        )
+
+
+@CELERY_APP.task(
+    name='lti_provider.tasks.send_composite_outcome', bind=True, routing_key=settings.LTI_SCORE_PASSBACK_ROUTING_KEY
+)
+def send_composite_outcome(self, user_id, course_id, assignment_id, version, scheduled_at=None):
     """
     Calculate and transmit the score for a composite module (such as a
     vertical).
@@ -99,12 +140,14 @@ def send_composite_outcome(user_id, course_id, assignment_id, version):
     scores for a single assignment, and may potentially update the campus LMS
     in the wrong order.
     """
+    _record_queue_delay('composite', scheduled_at)
     assignment = GradedAssignment.objects.get(id=assignment_id)
     if version != assignment.version_number:
         log.info(
             "Score passback for GradedAssignment %s skipped. More recent score available.",
             assignment.id
         )
+        dog_stats_api.increment('lti_provider.outcome.coalesced', tags=[u'type:composite'])
         return
     course_key = CourseKey.from_string(course_id)
     mapped_usage_key = assignment.usage_key.map_into_course(course_key)
@@ -119,21 +162,36 @@ def send_composite_outcome(user_id, course_id, assignment_id, version):
 
     assignment = GradedAssignment.objects.get(id=assignment_id)
     if assignment.version_number == version:
-        outcomes.send_score_update(assignment, weighted_score)
+        _send_score_update(self, assignment, weighted_score)
 
 
-@CELERY_APP.task
-def send_leaf_outcome(assignment_id, points_earned, points_possible):
+@CELERY_APP.task(bind=True, routing_key=settings.LTI_SCORE_PASSBACK_ROUTING_KEY)
+def send_leaf_outcome(self, assignment_id, points_earned, points_possible, version=None, scheduled_at=None):
     """
     Calculate and transmit the score for a single problem. This method assumes
     that the individual problem was the source of a score update, and so it
     directly takes the points earned and possible values. As such it does not
     have to calculate the scores for the course, making this method far faster
     than send_outcome_for_composite_assignment.
+
+    When the score of the problem changes again before this task runs, for
+    instance while score updates are backlogged, the task exits, since the
+    task of the latest change sends the latest score. Unlike for composite
+    assignments, the task still sends its score when the version number of
+    the assignment is older than the given one, since the view that changed
+    the score may not have committed its transaction yet.
     """
+    _record_queue_delay('leaf', scheduled_at)
     assignment = GradedAssignment.objects.get(id=assignment_id)
+    if version is not None and assignment.version_number > version:
+        log.info(
+            "Score passback for GradedAssignment %s skipped. More recent score available.",
+            assignment.id
+        )
+        dog_stats_api.increment('lti_provider.outcome.coalesced', tags=[u'type:leaf'])
+        return
     if points_possible == 0:
         weighted_score = 0
     else:
         weighted_score = float(points_earned) / float(points_possible)
-    outcomes.send_score_update(assignment, weighted_score)
+    _send_score_update(self, assignment, weighted_score)
@@ -169,17 +169,48 @@ class SignAndSendReplaceResultTest(TestCase):
         )
         self.assignment.save()
 
-    @patch('requests.post', return_value='response')
+    @patch('requests.Session.post', return_value='response')
     def test_sign_and_send_replace_result(self, post_mock):
         response = outcomes.sign_and_send_replace_result(self.assignment, 'xml')
         post_mock.assert_called_with(
             'http://example.com/service_url',
             data='xml',
             auth=ANY,
-            headers={'content-type': 'application/xml'}
+            headers={'content-type': 'application/xml'},
+            timeout=outcomes.OUTCOME_SERVICE_TIMEOUT
         )
         self.assertEqual(response, 'response')
 
+    @patch('requests.Session.post', return_value='response')
+    def test_session_reused_for_consumer(self, _post_mock):
+        consumer = self.assignment.outcome_service.lti_consumer
+        outcomes.sign_and_send_replace_result(self.assignment, 'xml')
+        session = outcomes._get_session(consumer)  # pylint: disable=protected-access
+        outcomes.sign_and_send_replace_result(self.assignment, 'xml')
+        self.assertIs(outcomes._get_session(consumer), session)  # pylint: disable=protected-access
+
+    @patch('lti_provider.outcomes.check_replace_result_response', return_value=True)
+    @patch('lti_provider.outcomes.sign_and_send_replace_result')
+    def test_send_score_update(self, send_mock, _check_mock):
+        send_mock.return_value = MagicMock(status_code=200)
+        self.assertTrue(outcomes.send_score_update(self.assignment, 0.5))
+
+    @patch('lti_provider.outcomes.sign_and_send_replace_result')
+    def test_send_score_update_rejected(self, send_mock):
+        send_mock.return_value = MagicMock(status_code=400)
+        self.assertFalse(outcomes.send_score_update(self.assignment, 0.5))
+
+    @patch('lti_provider.outcomes.sign_and_send_replace_result')
+    def test_send_score_update_server_error(self, send_mock):
+        send_mock.return_value = MagicMock(status_code=503)
+        with self.assertRaises(outcomes.OutcomeServiceUnavailable):
+            outcomes.send_score_update(self.assignment, 0.5)
+
+    @patch('lti_provider.outcomes.sign_and_send_replace_result', side_effect=requests.exceptions.ConnectionError)
+    def test_send_score_update_connection_error(self, _send_mock):
+        with self.assertRaises(outcomes.OutcomeServiceUnavailable):
+            outcomes.send_score_update(self.assignment, 0.5)
+
 
 class XmlHandlingTest(TestCase):
     """
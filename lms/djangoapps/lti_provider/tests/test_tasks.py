@@ -7,6 +7,7 @@ from django.test import TestCase
 from mock import MagicMock, patch
 from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
 
+import lti_provider.outcomes as outcomes
 import lti_provider.tasks as tasks
 from lti_provider.models import GradedAssignment, LtiConsumer, OutcomeService
 from student.tests.factories import UserFactory
@@ -85,6 +86,27 @@ class SendLeafOutcomeTest(BaseOutcomeTest):
         )
         self.send_score_update_mock.assert_called_once_with(self.assignment, expected)
 
+    def test_outcome_with_outdated_version(self):
+        self.assignment.version_number = 2
+        self.assignment.save()
+        tasks.send_leaf_outcome(self.assignment.id, 1, 2, version=1)
+        self.assertEqual(self.send_score_update_mock.call_count, 0)
+
+    def test_outcome_with_uncommitted_version(self):
+        # The version of the assignment isn't committed yet when the task runs
+        # before the view that changed the score has returned.
+        tasks.send_leaf_outcome(self.assignment.id, 1, 2, version=2)
+        self.send_score_update_mock.assert_called_once_with(self.assignment, 0.5)
+
+    @ddt.data(0, 2)
+    @patch('lti_provider.tasks.send_leaf_outcome.retry')
+    def test_retry_when_outcome_service_unavailable(self, retries, mock_retry):
+        self.send_score_update_mock.side_effect = outcomes.OutcomeServiceUnavailable
+        tasks.send_leaf_outcome.apply(args=(self.assignment.id, 1, 2), retries=retries)
+        self.assertTrue(mock_retry.called)
+        self.assertEqual(mock_retry.call_args[1]['countdown'], 60 * 2 ** retries)
+        self.assertEqual(mock_retry.call_args[1]['max_retries'], 5)
+
 
 @ddt.ddt
 class SendCompositeOutcomeTest(BaseOutcomeTest):
@@ -130,3 +152,14 @@ class SendCompositeOutcomeTest(BaseOutcomeTest):
             self.user.id, unicode(self.course_key), self.assignment.id, 1
         )
         self.assertEqual(self.course_grade_mock.call_count, 0)
+
+
+class IncrementAssignmentVersionsTest(BaseOutcomeTest):
+    """
+    Tests for the increment_assignment_versions method in tasks.py
+    """
+    @patch('lti_provider.tasks.modulestore')
+    def test_no_assignments_in_course(self, mock_modulestore):
+        other_user = UserFactory.create()
+        self.assertEqual(tasks.increment_assignment_versions(self.course_key, self.usage_key, other_user.id), [])
+        self.assertFalse(mock_modulestore.called)
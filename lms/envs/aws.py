@@ -563,6 +563,7 @@ XQUEUE_INTERFACE = AUTH_TOKENS['XQUEUE_INTERFACE']
 # use the one from common.py
 MODULESTORE = convert_module_store_setting_if_needed(AUTH_TOKENS.get('MODULESTORE', MODULESTORE))
 CONTENTSTORE = AUTH_TOKENS.get('CONTENTSTORE', CONTENTSTORE)
+CONTENTSERVER_DISK_CACHE = ENV_TOKENS.get('CONTENTSERVER_DISK_CACHE', CONTENTSERVER_DISK_CACHE)
 DOC_STORE_CONFIG = AUTH_TOKENS.get('DOC_STORE_CONFIG', DOC_STORE_CONFIG)
 MONGODB_LOG = AUTH_TOKENS.get('MONGODB_LOG', {})
 
@@ -961,6 +962,9 @@ LTI_USER_EMAIL_DOMAIN = ENV_TOKENS.get('LTI_USER_EMAIL_DOMAIN', 'lti.example.com
 LTI_AGGREGATE_SCORE_PASSBACK_DELAY = ENV_TOKENS.get(
     'LTI_AGGREGATE_SCORE_PASSBACK_DELAY', LTI_AGGREGATE_SCORE_PASSBACK_DELAY
 )
+LTI_SCORE_PASSBACK_ROUTING_KEY = ENV_TOKENS.get('LTI_SCORE_PASSBACK_ROUTING_KEY', DEFAULT_PRIORITY_QUEUE)
+LTI_SCORE_PASSBACK_MAX_RETRIES = ENV_TOKENS.get('LTI_SCORE_PASSBACK_MAX_RETRIES', LTI_SCORE_PASSBACK_MAX_RETRIES)
+LTI_SCORE_PASSBACK_RETRY_DELAY = ENV_TOKENS.get('LTI_SCORE_PASSBACK_RETRY_DELAY', LTI_SCORE_PASSBACK_RETRY_DELAY)
 
 ##################### Credit Provider help link ####################
 CREDIT_HELP_LINK_URL = ENV_TOKENS.get('CREDIT_HELP_LINK_URL', CREDIT_HELP_LINK_URL)
@@ -797,6 +797,12 @@ XBLOCK_FIELD_DATA_WRAPPERS = ()
 
 MODULESTORE_BRANCH = 'published-only'
 CONTENTSTORE = None
+
+# Local disk cache in which the contentserver keeps course assets too large for memcached,
+# e.g. {'DIRECTORY': '/edx/var/edxapp/asset_cache', 'MAX_SIZE': 10 * 1024 ** 3}
+# Assets larger than the optional 'MAX_PUT_SIZE' (20MB by default) are cached while their first full response is sent.
+CONTENTSERVER_DISK_CACHE = None
+
 DOC_STORE_CONFIG = {
     'host': 'localhost',
     'db': 'xmodule',
@@ -3103,6 +3109,16 @@ LTI_USER_EMAIL_DOMAIN = 'lti.example.com'
 # The time value is in seconds.
 LTI_AGGREGATE_SCORE_PASSBACK_DELAY = 15 * 60
 
+# Queue to use for sending scores to LTI consumers. Routing it to a dedicated
+# queue bounds the number of workers sending scores at the same time.
+LTI_SCORE_PASSBACK_ROUTING_KEY = DEFAULT_PRIORITY_QUEUE
+
+# Score updates that fail because the outcome service of the LTI consumer is
+# unreachable, or fails with a server error, are retried up to this number of
+# times, after a delay that doubles with each retry. The delay is in seconds.
+LTI_SCORE_PASSBACK_MAX_RETRIES = 5
+LTI_SCORE_PASSBACK_RETRY_DELAY = 60
+
 
 # For help generating a key pair import and run `openedx.core.lib.rsa_key_utils.generate_rsa_key_pair()`
 JWT_PRIVATE_SIGNING_KEY = None
@@ -4,15 +4,20 @@ Tasks for bookmarks.
 import logging
 
 from celery.task import task  # pylint: disable=import-error,no-name-in-module
-from django.db import transaction
+from django.db import IntegrityError, connection, models, transaction
+from django.utils.timezone import now
 from opaque_keys.edx.keys import CourseKey
 
+from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
 from xmodule.modulestore.django import modulestore
 
 from . import PathItem
 
 log = logging.getLogger('edx.celery.task')
 
+# Maximum number of XBlockCache rows updated by a single query.
+XBLOCK_CACHE_UPDATE_BATCH_SIZE = 100
+
 
 def _calculate_course_xblocks_data(course_key):
     """
@@ -20,45 +25,29 @@ def _calculate_course_xblocks_data(course_key):
 
     This data consists of the display_name and path of the block.
     """
-    with modulestore().bulk_operations(course_key):
-
-        course = modulestore().get_course(course_key, depth=None)
+    store = modulestore()
+    with store.bulk_operations(course_key):
+        # Only the display names are needed, which don't require the blocks' definitions.
+        block_structure = BlockStructureFactory.create_from_modulestore(
+            store.make_course_usage_key(course_key),
+            store,
+            lazy=True,
+        )
+
+        # Parents are visited before their children, so the paths of each
+        # block are built from the already calculated paths of its parents.
         blocks_info_dict = {}
-
-        # Collect display_name and children usage keys.
-        blocks_stack = [course]
-        while blocks_stack:
-            current_block = blocks_stack.pop()
-            children = current_block.get_children() if current_block.has_children else []
-            usage_id = unicode(current_block.scope_ids.usage_id)
-            block_info = {
-                'usage_key': current_block.scope_ids.usage_id,
-                'display_name': current_block.display_name_with_default,
-                'children_ids': [unicode(child.scope_ids.usage_id) for child in children]
+        for usage_key in block_structure.topological_traversal():
+            paths = []
+            for parent_key in block_structure.get_parents(usage_key):
+                parent_info = blocks_info_dict[unicode(parent_key)]
+                paths.extend(parent_path + [parent_info] for parent_path in parent_info['paths'])
+
+            blocks_info_dict[unicode(usage_key)] = {
+                'usage_key': usage_key,
+                'display_name': block_structure.get_xblock(usage_key).display_name_with_default,
+                'paths': paths or [[]],
             }
-            blocks_info_dict[usage_id] = block_info
-
-            # Add this blocks children to the stack so that we can traverse them as well.
-            blocks_stack.extend(children)
-
-    # Set children
-    for block in blocks_info_dict.values():
-        block.setdefault('children', [])
-        for child_id in block['children_ids']:
-            block['children'].append(blocks_info_dict[child_id])
-        block.pop('children_ids', None)
-
-    # Calculate paths
-    def add_path_info(block_info, current_path):
-        """Do a DFS and add paths info to each block_info."""
-
-        block_info.setdefault('paths', [])
-        block_info['paths'].append(current_path)
-
-        for child_block_info in block_info['children']:
-            add_path_info(child_block_info, current_path + [block_info])
-
-    add_path_info(blocks_info_dict[unicode(course.scope_ids.usage_id)], [])
 
     return blocks_info_dict
 
@@ -107,38 +96,99 @@ def paths_equal(paths_1, paths_2):
 def _update_xblocks_cache(course_key):
     """
     Calculate the XBlock cache data for a course and update the XBlockCache table.
+
+    The existing rows of the course are compared with the calculated data in
+    memory, so only the rows whose display name or paths changed are
+    updated, in batches, and the missing rows are created in bulk.
     """
     from .models import XBlockCache
     blocks_data = _calculate_course_xblocks_data(course_key)
 
-    def update_block_cache_if_needed(block_cache, block_data):
-        """ Compare block_cache object with data and update if there are differences. """
-        paths = _paths_from_data(block_data['paths'])
-        if block_cache.display_name != block_data['display_name'] or not paths_equal(block_cache.paths, paths):
-            log.info(u'Updating XBlockCache with usage_key: %s', unicode(block_cache.usage_key))
-            block_cache.display_name = block_data['display_name']
-            block_cache.paths = paths
-            block_cache.save()
-
     with transaction.atomic():
-        block_caches = XBlockCache.objects.filter(course_key=course_key)
-        for block_cache in block_caches:
+        block_caches_to_update = []
+        for block_cache in XBlockCache.objects.filter(course_key=course_key):
             block_data = blocks_data.pop(unicode(block_cache.usage_key), None)
-            if block_data:
-                update_block_cache_if_needed(block_cache, block_data)
+            if block_data and _update_block_cache_if_needed(block_cache, block_data):
+                block_caches_to_update.append(block_cache)
+
+        for start in xrange(0, len(block_caches_to_update), XBLOCK_CACHE_UPDATE_BATCH_SIZE):
+            _bulk_update_block_caches(block_caches_to_update[start:start + XBLOCK_CACHE_UPDATE_BATCH_SIZE])
 
+    if not blocks_data:
+        return
+
+    block_caches_to_create = []
     for block_data in blocks_data.values():
+        log.info(u'Creating XBlockCache with usage_key: %s', unicode(block_data['usage_key']))
+        block_cache = XBlockCache(
+            course_key=course_key,
+            usage_key=block_data['usage_key'],
+            display_name=block_data['display_name'],
+        )
+        block_cache.paths = _paths_from_data(block_data['paths'])
+        block_caches_to_create.append(block_cache)
+
+    try:
         with transaction.atomic():
-            paths = _paths_from_data(block_data['paths'])
-            log.info(u'Creating XBlockCache with usage_key: %s', unicode(block_data['usage_key']))
-            block_cache, created = XBlockCache.objects.get_or_create(usage_key=block_data['usage_key'], defaults={
-                'course_key': course_key,
-                'display_name': block_data['display_name'],
-                'paths': paths,
-            })
-
-            if not created:
-                update_block_cache_if_needed(block_cache, block_data)
+            XBlockCache.objects.bulk_create(block_caches_to_create)
+    except IntegrityError:
+        # Some of the rows were created concurrently, e.g. by a user bookmarking a block.
+        for block_data in blocks_data.values():
+            with transaction.atomic():
+                block_cache, created = XBlockCache.objects.get_or_create(
+                    usage_key=block_data['usage_key'],
+                    defaults={
+                        'course_key': course_key,
+                        'display_name': block_data['display_name'],
+                        'paths': _paths_from_data(block_data['paths']),
+                    },
+                )
+                if not created and _update_block_cache_if_needed(block_cache, block_data):
+                    block_cache.save()
+
+
+def _update_block_cache_if_needed(block_cache, block_data):
+    """
+    Updates the given XBlockCache object, without saving it, if it differs
+    from the given block data. Returns whether it was updated.
+    """
+    paths = _paths_from_data(block_data['paths'])
+    if block_cache.display_name == block_data['display_name'] and paths_equal(block_cache.paths, paths):
+        return False
+
+    log.info(u'Updating XBlockCache with usage_key: %s', unicode(block_cache.usage_key))
+    block_cache.display_name = block_data['display_name']
+    block_cache.paths = paths
+    return True
+
+
+def _bulk_update_block_caches(block_caches):
+    """
+    Saves the display names and paths of the given XBlockCache objects with a single query.
+    """
+    from .models import XBlockCache
+    paths_field = XBlockCache._meta.get_field('_paths')  # pylint: disable=protected-access
+    XBlockCache.objects.filter(id__in=[block_cache.id for block_cache in block_caches]).update(
+        display_name=models.Case(
+            *[
+                models.When(id=block_cache.id, then=models.Value(block_cache.display_name))
+                for block_cache in block_caches
+            ],
+            output_field=models.CharField()
+        ),
+        _paths=models.Case(
+            *[
+                models.When(
+                    id=block_cache.id,
+                    # pylint: disable=protected-access
+                    then=models.Value(paths_field.get_db_prep_save(block_cache._paths, connection=connection)),
+                )
+                for block_cache in block_caches
+            ],
+            output_field=models.TextField()
+        ),
+        modified=now(),
+    )
 
 
 @task(name=u'openedx.core.djangoapps.bookmarks.tasks.update_xblock_cache')
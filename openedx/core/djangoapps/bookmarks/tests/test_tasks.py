@@ -5,6 +5,8 @@ import ddt
 from nose.plugins.attrib import attr
 
 from django.conf import settings
+from django.db import IntegrityError
+from mock import patch
 
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.factories import check_mongo_calls, ItemFactory
@@ -148,8 +150,8 @@ class XBlockCacheTaskTests(BookmarksTestsBase):
                     )
 
     @ddt.data(
-        ('course', 47),
-        ('other_course', 34)
+        ('course', 7),
+        ('other_course', 7)
     )
     @ddt.unpack
     def test_update_xblocks_cache(self, course_attr, expected_sql_queries):
@@ -173,6 +175,42 @@ class XBlockCacheTaskTests(BookmarksTestsBase):
         with self.assertNumQueries(3):
             _update_xblocks_cache(course.id)
 
+    def test_update_xblocks_cache_changed_blocks(self):
+        """
+        Test that only the blocks whose display name or paths changed are updated.
+        """
+        _update_xblocks_cache(self.course.id)
+        unchanged_modified = XBlockCache.objects.get(usage_key=self.vertical_1.location).modified
+
+        self.sequential_2.display_name = 'Renamed Lesson 2'
+        self.store.update_item(self.sequential_2, self.admin.id)
+
+        # One query to read the rows and one to update them, between the savepoint queries.
+        with self.assertNumQueries(4):
+            _update_xblocks_cache(self.course.id)
+
+        self.assertEqual(XBlockCache.objects.get(usage_key=self.sequential_2.location).display_name, 'Renamed Lesson 2')
+        for usage_key in (self.vertical_2.location, self.vertical_3.location):
+            xblock_cache = XBlockCache.objects.get(usage_key=usage_key)
+            self.assertEqual(xblock_cache.paths[0][-1].display_name, 'Renamed Lesson 2')
+        self.assertEqual(XBlockCache.objects.get(usage_key=self.vertical_1.location).modified, unchanged_modified)
+
+    def test_update_xblocks_cache_concurrently_created(self):
+        """
+        Test that rows created while the data was calculated are updated instead.
+        """
+        _update_xblocks_cache(self.course.id)
+        XBlockCache.objects.filter(usage_key=self.vertical_1.location).delete()
+
+        with patch.object(XBlockCache.objects, 'bulk_create', side_effect=IntegrityError):
+            _update_xblocks_cache(self.course.id)
+
+        xblock_cache = XBlockCache.objects.get(usage_key=self.vertical_1.location)
+        self.assertEqual(
+            [path_item.usage_key for path_item in xblock_cache.paths[0]],
+            [self.chapter_1.location, self.sequential_1.location],
+        )
+
     def test_update_xblocks_cache_with_display_name_none(self):
         """
         Test that the xblocks data is persisted correctly with display_name=None.
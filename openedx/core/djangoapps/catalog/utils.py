@@ -15,11 +15,14 @@ from openedx.core.djangoapps.catalog.cache import (
 )
 from openedx.core.djangoapps.catalog.models import CatalogIntegration
 from openedx.core.djangoapps.theming.helpers import get_current_site
-from openedx.core.lib.edx_api_utils import get_edx_api_data
+from openedx.core.lib.edx_api_utils import get_edx_api_data, increment_cache_metric
 from openedx.core.lib.token_utils import JwtBuilder
 
 logger = logging.getLogger(__name__)
 
+# Name under which cache metrics are recorded for the programs read by get_programs.
+PROGRAMS_METRIC_API_NAME = 'catalog.programs'
+
 
 def create_catalog_api_client(user, site=None):
     """Returns an API client which can be used to make Catalog API requests."""
@@ -53,6 +56,7 @@ def get_programs(uuid=None):
         program = cache.get(PROGRAM_CACHE_KEY_TPL.format(uuid=uuid))
         if not program:
             logger.warning(missing_details_msg_tpl.format(uuid=uuid))
+        increment_cache_metric(PROGRAMS_METRIC_API_NAME, 'hit' if program else 'miss')
 
         return program
     if waffle.switch_is_active('get-multitenant-programs'):
@@ -74,6 +78,7 @@ def get_programs(uuid=None):
     # behavior can be mitigated by trying again for the missing keys, which is
     # what we do here. Splitting the get_many into smaller chunks may also help.
     missing_uuids = set(uuids) - set(program['uuid'] for program in programs)
+    still_missing_uuids = set()
     if missing_uuids:
         logger.info(
             'Failed to get details for {count} programs. Retrying.'.format(count=len(missing_uuids))
@@ -86,6 +91,11 @@ def get_programs(uuid=None):
         for uuid in still_missing_uuids:
             logger.warning(missing_details_msg_tpl.format(uuid=uuid))
 
+    if programs:
+        increment_cache_metric(PROGRAMS_METRIC_API_NAME, 'hit', value=len(programs))
+    if still_missing_uuids:
+        increment_cache_metric(PROGRAMS_METRIC_API_NAME, 'miss', value=len(still_missing_uuids))
+
     return programs
 
 
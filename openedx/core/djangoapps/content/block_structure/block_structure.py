@@ -6,7 +6,8 @@ Module with family of classes for block structures.
 
 The following internal data structures are implemented:
     _BlockRelations - Data structure for a single block's relations.
-    _BlockData - Data structure for a single block's data.
+    _BlockDataTable - Data structure for the data of all blocks, stored
+        in per-field columns.
 """
 from copy import deepcopy
 from functools import partial
@@ -30,6 +31,8 @@ class _BlockRelations(object):
     Data structure to encapsulate relationships for a single block,
     including its children and parents.
     """
+    __slots__ = ('parents', 'children')
+
     def __init__(self):
 
         # List of usage keys of this block's parents.
@@ -346,6 +349,9 @@ class TransformerDataMap(dict):
     The map can be accessed by the Transformer's name or the
     Transformer's class type.
     """
+    # The type of the data created by get_or_create.
+    data_type = TransformerData
+
     def __getitem__(self, key):
         key = self._translate_key(key)
         return dict.__getitem__(self, key)
@@ -367,7 +373,7 @@ class TransformerDataMap(dict):
         try:
             return self[key]
         except KeyError:
-            new_transformer_data = TransformerData()
+            new_transformer_data = self.data_type()
             self[key] = new_transformer_data
             return new_transformer_data
 
@@ -386,21 +392,272 @@ class TransformerDataMap(dict):
             return key
 
 
-class BlockData(FieldData):
+class _MissingValue(object):
+    """
+    Type of the _MISSING placeholder, which is pickled and copied by
+    reference so that its identity is preserved.
+    """
+    __slots__ = ()
+
+    def __reduce__(self):
+        return '_MISSING'
+
+
+# Placeholder in a field column for the blocks on which the field is not set.
+_MISSING = _MissingValue()
+
+
+class _FieldColumns(object):
+    """
+    Data structure to compactly store the values of a set of fields for
+    all blocks in a block structure.
+
+    Rather than in a dict per block, the values of each field are stored
+    in a single list (column) indexed by the position of the block in
+    the structure.
+    """
+    __slots__ = ('columns', 'rows')
+
+    def __init__(self):
+        # Map of field name to the field's value for each block, indexed
+        # by block position. Blocks on which the field is not set have
+        # the _MISSING value.
+        # dict {string: list [any picklable type]}
+        self.columns = {}
+
+        # Flag for each block position of whether data was created for
+        # the block, even if none of its fields are set.
+        # bytearray
+        self.rows = bytearray()
+
+    def has_row(self, position):
+        """
+        Returns whether data was created for the block at the given position.
+        """
+        return position < len(self.rows) and bool(self.rows[position])
+
+    def add_row(self, position):
+        """
+        Records that data was created for the block at the given position.
+        """
+        if position >= len(self.rows):
+            self.rows.extend(bytearray(position + 1 - len(self.rows)))
+        self.rows[position] = 1
+
+    def get(self, position, field_name):
+        """
+        Returns the value of the given field for the block at the given
+        position, or _MISSING if it's not set.
+        """
+        column = self.columns.get(field_name)
+        if column is None or position >= len(column):
+            return _MISSING
+        return column[position]
+
+    def set(self, position, field_name, value):
+        """
+        Sets the value of the given field for the block at the given position.
+        """
+        column = self.columns.get(field_name)
+        if column is None:
+            column = self.columns[field_name] = []
+        if position >= len(column):
+            column.extend([_MISSING] * (position + 1 - len(column)))
+        column[position] = value
+
+    def delete(self, position, field_name):
+        """
+        Unsets the given field for the block at the given position.
+
+        Raises KeyError if the field is not set.
+        """
+        if self.get(position, field_name) is _MISSING:
+            raise KeyError(field_name)
+        self.columns[field_name][position] = _MISSING
+
+    def get_row(self, position):
+        """
+        Returns a dict of the fields set for the block at the given position.
+        """
+        return {
+            field_name: column[position]
+            for field_name, column in self.columns.iteritems()
+            if position < len(column) and column[position] is not _MISSING
+        }
+
+
+class _TransformerFieldColumnsMap(TransformerDataMap):
+    """
+    A map of Transformer name to the _FieldColumns of its block-specific
+    data.
+    """
+    data_type = _FieldColumns
+
+
+class _BlockDataTable(object):
+    """
+    Data structure to encapsulate collected data for all blocks in a
+    block structure, including their xBlock fields and block-specific
+    transformer data.
+
+    Each block is assigned a position in the table, by which its values
+    are indexed in the table's field columns.
+    """
+    __slots__ = ('positions', 'next_position', 'xblock_fields', 'transformer_fields')
+
+    def __init__(self):
+        # Map of a block's usage key to its position.
+        # dict {UsageKey: int}
+        self.positions = {}
+
+        # Position of the next block added to the table. Positions of
+        # removed blocks are not reused, since their values are left in
+        # the field columns.
+        # int
+        self.next_position = 0
+
+        # Columns of the xBlock fields of the blocks.
+        # _FieldColumns
+        self.xblock_fields = _FieldColumns()
+
+        # Map of transformer name to the columns of its block-specific data.
+        # _TransformerFieldColumnsMap {string: _FieldColumns}
+        self.transformer_fields = _TransformerFieldColumnsMap()
+
+    def get_or_add_position(self, usage_key):
+        """
+        Returns the position of the given block, assigning it the next
+        position if it isn't in the table yet.
+        """
+        position = self.positions.get(usage_key)
+        if position is None:
+            position = self.positions[usage_key] = self.next_position
+            self.next_position += 1
+        return position
+
+    def remove(self, usage_key):
+        """
+        Removes the given block from the table. Its values are left in the
+        field columns, where they are no longer reachable.
+        """
+        self.positions.pop(usage_key, None)
+
+    def get_block(self, usage_key):
+        """
+        Returns the BlockData of the given block.
+
+        Raises KeyError if the block is not in the table.
+        """
+        return BlockData(usage_key, self, self.positions[usage_key])
+
+
+class _FieldColumnsRow(object):
+    """
+    Data structure to encapsulate the fields of a single block that are
+    stored in _FieldColumns. Fields are accessed as attributes.
+    """
+    __slots__ = ('_field_columns', '_position')
+
+    def __init__(self, field_columns, position):
+        object.__setattr__(self, '_field_columns', field_columns)
+        object.__setattr__(self, '_position', position)
+
+    @property
+    def fields(self):
+        """
+        Map of field name to the field's value for this block.
+        dict {string: any picklable type}
+        """
+        return self._field_columns.get_row(self._position)
+
+    def __getattr__(self, field_name):
+        if field_name in _FieldColumnsRow.__slots__:
+            # The row is not initialized, e.g. while being unpickled.
+            raise AttributeError(field_name)
+        value = self._field_columns.get(self._position, field_name)
+        if value is _MISSING:
+            raise AttributeError("Field {0} does not exist".format(field_name))
+        return value
+
+    def __setattr__(self, field_name, field_value):
+        self._field_columns.set(self._position, field_name, field_value)
+
+    def __delattr__(self, field_name):
+        # pylint: disable=fixme
+        # FIXME: Bug with Course Blocks API and student_view_data fixed by
+        #  https://github.com/edx/edx-platform/pull/15905/commits/ae15e69a0ad52fec2f146176e418eb2e37f0ecb2
+        # Will be brought in once McKinsey's apps have been updated.
+        # For now, only deployed where settings.FEATURES['ENABLE_STUDENT_VIEW_DATA_BUGFIX']=True, so QA can test.
+        # See lms/djangoapps/course_api/blocks/transformers/tests/test_student_view.py
+        #   TestStudentViewTransformer for affected tests.
+        if settings.FEATURES.get('ENABLE_STUDENT_VIEW_DATA_BUGFIX', False):
+            self._field_columns.delete(self._position, field_name)
+        else:
+            raise AttributeError("Field {0} cannot be deleted".format(field_name))
+
+
+class _BlockTransformerDataMap(object):
+    """
+    A map of Transformer name to the data of a single block for the
+    transformer, as a _FieldColumnsRow. The map can be accessed by the
+    Transformer's name or the Transformer's class type.
+    """
+    __slots__ = ('_transformer_fields', '_position')
+
+    def __init__(self, transformer_fields, position):
+        self._transformer_fields = transformer_fields
+        self._position = position
+
+    def __getitem__(self, key):
+        field_columns = self._transformer_fields[key]
+        if not field_columns.has_row(self._position):
+            raise KeyError(key)
+        return _FieldColumnsRow(field_columns, self._position)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get_or_create(self, key):
+        """
+        Returns the data of the block for the given transformer, creating
+        it if not found.
+        """
+        field_columns = self._transformer_fields.get_or_create(key)
+        field_columns.add_row(self._position)
+        return _FieldColumnsRow(field_columns, self._position)
+
+
+class BlockData(_FieldColumnsRow):
     """
     Data structure to encapsulate collected data for a single block.
+
+    The data is stored in the _BlockDataTable of the block structure,
+    which is created for the block if not given.
     """
-    def class_field_names(self):
-        return super(BlockData, self).class_field_names() + ['location', 'transformer_data']
+    __slots__ = ('location', '_table')
 
-    def __init__(self, usage_key):
-        super(BlockData, self).__init__()
+    def __init__(self, usage_key, table=None, position=None):
+        if table is None:
+            table = _BlockDataTable()
+        if position is None:
+            position = table.get_or_add_position(usage_key)
+        super(BlockData, self).__init__(table.xblock_fields, position)
 
         # Location (or usage key) of the block.
-        self.location = usage_key
+        object.__setattr__(self, 'location', usage_key)
+        object.__setattr__(self, '_table', table)
 
-        # Map of transformer name to its block-specific data.
-        self.transformer_data = TransformerDataMap()
+    @property
+    def transformer_data(self):
+        """
+        Map of transformer name to its block-specific data.
+        _BlockTransformerDataMap {string: _FieldColumnsRow}
+        """
+        return _BlockTransformerDataMap(self._table.transformer_fields, self._position)
 
 
 class BlockStructureBlockData(BlockStructure):
@@ -412,15 +669,15 @@ class BlockStructureBlockData(BlockStructure):
     # update this value whenever the data structure changes. Dependent storage
     # layers can then use this value when serializing/deserializing block
     # structures, and invalidating any previously cached/stored data.
-    VERSION = 2
+    VERSION = 3
 
     def __init__(self, root_block_usage_key):
         super(BlockStructureBlockData, self).__init__(root_block_usage_key)
 
-        # Map of a block's usage key to its collected data, including
-        # its xBlock fields and block-specific transformer data.
-        # dict {UsageKey: BlockData}
-        self._block_data_map = {}
+        # Collected data of the blocks, including their xBlock fields
+        # and block-specific transformer data.
+        # _BlockDataTable
+        self._block_data = _BlockDataTable()
 
         # Map of a transformer's name to its non-block-specific data.
         self.transformer_data = TransformerDataMap()
@@ -435,7 +692,7 @@ class BlockStructureBlockData(BlockStructure):
             self.root_block_usage_key,
             deepcopy(self._block_relations),
             deepcopy(self.transformer_data),
-            deepcopy(self._block_data_map),
+            deepcopy(self._block_data),
         )
 
     def iteritems(self):
@@ -443,20 +700,24 @@ class BlockStructureBlockData(BlockStructure):
         Returns iterator of (UsageKey, BlockData) pairs for all
         blocks in the BlockStructure.
         """
-        return self._block_data_map.iteritems()
+        block_data = self._block_data
+        return (
+            (usage_key, BlockData(usage_key, block_data, position))
+            for usage_key, position in block_data.positions.iteritems()
+        )
 
     def itervalues(self):
         """
         Returns iterator of BlockData for all blocks in the
         BlockStructure.
         """
-        return self._block_data_map.itervalues()
+        return (block_data for __, block_data in self.iteritems())
 
     def __getitem__(self, usage_key):
         """
         Returns the BlockData associated with the given key.
         """
-        return self._block_data_map[usage_key]
+        return self._block_data.get_block(usage_key)
 
     def get_xblock_field(self, usage_key, field_name, default=None):
         """
@@ -474,8 +735,11 @@ class BlockStructureBlockData(BlockStructure):
             default (any type) - The value to return if a field value is
                 not found.
         """
-        block_data = self._block_data_map.get(usage_key)
-        return getattr(block_data, field_name, default) if block_data else default
+        position = self._block_data.positions.get(usage_key)
+        if position is None:
+            return default
+        value = self._block_data.xblock_fields.get(position, field_name)
+        return default if value is _MISSING else value
 
     def get_transformer_data(self, transformer, key, default=None):
         """
@@ -524,7 +788,7 @@ class BlockStructureBlockData(BlockStructure):
             transformer (BlockStructureTransformer) - The transformer
                 whose dictionary data is requested.
         """
-        return self._block_data_map[usage_key].transformer_data[transformer]
+        return self._block_data.get_block(usage_key).transformer_data[transformer]
 
     def get_transformer_block_field(self, usage_key, transformer, key, default=None):
         """
@@ -545,11 +809,15 @@ class BlockStructureBlockData(BlockStructure):
             default (any type) - The value to return if a dictionary
                 entry is not found.
         """
+        position = self._block_data.positions.get(usage_key)
+        if position is None:
+            return default
         try:
-            transformer_data = self.get_transformer_block_data(usage_key, transformer)
+            field_columns = self._block_data.transformer_fields[transformer]
         except KeyError:
             return default
-        return getattr(transformer_data, key, default)
+        value = field_columns.get(position, key)
+        return default if value is _MISSING else value
 
     def set_transformer_block_field(self, usage_key, transformer, key, value):
         """
@@ -569,11 +837,10 @@ class BlockStructureBlockData(BlockStructure):
                 given key for the given transformer's data for the
                 requested block.
         """
-        setattr(
-            self._get_or_create_block(usage_key).transformer_data.get_or_create(transformer),
-            key,
-            value,
-        )
+        position = self._block_data.get_or_add_position(usage_key)
+        field_columns = self._block_data.transformer_fields.get_or_create(transformer)
+        field_columns.add_row(position)
+        field_columns.set(position, key, value)
 
     def remove_transformer_block_field(self, usage_key, transformer, key):
         """
@@ -626,7 +893,7 @@ class BlockStructureBlockData(BlockStructure):
 
         # Remove block.
         self._block_relations.pop(usage_key, None)
-        self._block_data_map.pop(usage_key, None)
+        self._block_data.remove(usage_key)
 
         # Recreate the graph connections if descendants are to be kept.
         if keep_descendants:
@@ -751,12 +1018,7 @@ class BlockStructureBlockData(BlockStructure):
         If not found, creates and returns a new BlockData and
         maps it to the given key.
         """
-        try:
-            return self._block_data_map[usage_key]
-        except KeyError:
-            block_data = BlockData(usage_key)
-            self._block_data_map[usage_key] = block_data
-            return block_data
+        return BlockData(usage_key, self._block_data)
 
 
 class BlockStructureModulestoreData(BlockStructureBlockData):
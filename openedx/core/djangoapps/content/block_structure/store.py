@@ -195,7 +195,7 @@ class BlockStructureStore(object):
         data_to_cache = (
             block_structure._block_relations,
             block_structure.transformer_data,
-            block_structure._block_data_map,
+            block_structure._block_data,
         )
         return zpickle(data_to_cache)
 
@@ -203,12 +203,18 @@ class BlockStructureStore(object):
         """
         Deserializes the given data and returns the parsed block_structure.
         """
-        block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+        try:
+            block_relations, transformer_data, block_data = zunpickle(serialized_data)
+        except (AttributeError, TypeError):
+            # The data was stored by an earlier version of the block
+            # structure classes, which can no longer be loaded.
+            logger.info("BlockStructure: Outdated data found in store; %s.", root_block_usage_key)
+            raise BlockStructureNotFound(root_block_usage_key)
         return BlockStructureFactory.create_new(
             root_block_usage_key,
             block_relations,
             transformer_data,
-            block_data_map,
+            block_data,
         )
 
     @staticmethod
@@ -2,16 +2,25 @@
 Tests for block_structure.py
 """
 # pylint: disable=protected-access
+import os
+import sys
+import time
 from collections import namedtuple
 from copy import deepcopy
 import ddt
 import itertools
 from nose.plugins.attrib import attr
-from unittest import TestCase
+from unittest import TestCase, skipUnless
 
+from openedx.core.lib.cache_utils import zpickle, zunpickle
 from openedx.core.lib.graph_traversals import traverse_post_order
 
-from ..block_structure import BlockStructure, BlockStructureModulestoreData
+from ..block_structure import (
+    BlockStructure,
+    BlockStructureBlockData,
+    BlockStructureModulestoreData,
+    TransformerDataMap
+)
 from ..exceptions import TransformerException
 from .helpers import MockXBlock, MockTransformer, ChildrenMapTestMixin
 
@@ -118,6 +127,50 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
                         val,
                     )
 
+    def test_transformer_block_data_not_set(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP)
+        block_structure.set_transformer_block_field(1, MockTransformer, 'key', None)
+        block_structure._get_or_create_block(2).transformer_data.get_or_create(MockTransformer)
+
+        self.assertIsNone(block_structure.get_transformer_block_field(1, MockTransformer, 'key', 'default'))
+        self.assertEquals(block_structure.get_transformer_block_data(1, MockTransformer).fields, {'key': None})
+        self.assertEquals(block_structure.get_transformer_block_field(2, MockTransformer, 'key', 'default'), 'default')
+        self.assertEquals(block_structure.get_transformer_block_data(2, MockTransformer).fields, {})
+        with self.assertRaises(KeyError):
+            block_structure.get_transformer_block_data(3, MockTransformer)
+        with self.assertRaises(KeyError):
+            block_structure.get_transformer_block_data(1, 'other_transformer')
+
+    def test_block_added_after_removal(self):
+        children_map = ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP
+        block_structure = self.create_block_structure(children_map)
+        for block in range(len(children_map)):
+            block_structure.set_transformer_block_field(block, MockTransformer, 'key', block)
+
+        block_structure.remove_block(1, keep_descendants=True)
+        block_structure.set_transformer_block_field('new_block', MockTransformer, 'key', 'new_block')
+
+        # The new block doesn't take the place of any remaining block.
+        for block in range(len(children_map)):
+            if block != 1:
+                self.assertEquals(block_structure.get_transformer_block_field(block, MockTransformer, 'key'), block)
+        self.assertEquals(
+            block_structure.get_transformer_block_field('new_block', MockTransformer, 'key'), 'new_block'
+        )
+
+    def test_pickled_block_data(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP)
+        block_structure.set_transformer_block_field(1, MockTransformer, 'key', 'value')
+        block_structure.set_transformer_block_field(3, MockTransformer, 'other_key', 'other_value')
+
+        block_data = zunpickle(zpickle(block_structure._block_data))
+        block_structure._block_data = block_data
+
+        self.assertEquals(block_structure.get_transformer_block_field(1, MockTransformer, 'key'), 'value')
+        self.assertIsNone(block_structure.get_transformer_block_field(1, MockTransformer, 'other_key'))
+        self.assertIsNone(block_structure.get_transformer_block_field(3, MockTransformer, 'key'))
+        self.assertEquals(block_structure.get_transformer_block_field(3, MockTransformer, 'other_key'), 'other_value')
+
     def test_xblock_data(self):
         # block test cases
         blocks = [
@@ -268,3 +321,186 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         _set_value(new_copy, 'edit2')
         self.assertEquals(_get_value(block_structure), 'edit1')
         self.assertEquals(_get_value(new_copy), 'edit2')
+
+
+class _LegacyFieldData(object):
+    """
+    The layout of the collected data of a block before BlockStructureBlockData
+    stored it in per-field columns: a dict of fields per block and per
+    transformer of the block.
+    """
+    def class_field_names(self):
+        """
+        Returns the names of the fields defined directly on the class.
+        """
+        return ['fields']
+
+    def __init__(self):
+        self.fields = {}
+
+    def __getattr__(self, field_name):
+        if self._is_own_field(field_name):
+            return super(_LegacyFieldData, self).__getattr__(field_name)
+        try:
+            return self.fields[field_name]
+        except KeyError:
+            raise AttributeError("Field {0} does not exist".format(field_name))
+
+    def __setattr__(self, field_name, field_value):
+        if self._is_own_field(field_name):
+            return super(_LegacyFieldData, self).__setattr__(field_name, field_value)
+        else:
+            self.fields[field_name] = field_value
+
+    def _is_own_field(self, field_name):
+        """
+        Returns whether the given field_name is the name of an actual field of this class.
+        """
+        return field_name in self.class_field_names()
+
+
+class _LegacyTransformerDataMap(TransformerDataMap):
+    """
+    The legacy map of transformer name to the data of a block for the transformer.
+    """
+    data_type = _LegacyFieldData
+
+
+class _LegacyBlockData(_LegacyFieldData):
+    """
+    The legacy layout of a block's xBlock fields and transformer data.
+    """
+    def class_field_names(self):
+        return super(_LegacyBlockData, self).class_field_names() + ['location', 'transformer_data']
+
+    def __init__(self, usage_key):
+        super(_LegacyBlockData, self).__init__()
+        self.location = usage_key
+        self.transformer_data = _LegacyTransformerDataMap()
+
+
+def _deep_size(obj, seen=None):
+    """
+    Returns the approximate number of bytes used by the given object and
+    all of the objects it references.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(key, seen) + _deep_size(value, seen) for key, value in obj.iteritems())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    if hasattr(obj, '__dict__'):
+        size += _deep_size(obj.__dict__, seen)
+    for slot in getattr(type(obj), '__slots__', ()):
+        size += _deep_size(getattr(obj, slot, None), seen)
+    return size
+
+
+@skipUnless(os.environ.get('BENCHMARK_BLOCK_STRUCTURE'), 'Set BENCHMARK_BLOCK_STRUCTURE to run the benchmark.')
+class BlockDataBenchmark(TestCase):
+    """
+    Compares the memory, pickle size and access time of the collected data
+    of a large course in BlockStructureBlockData with the legacy layout of
+    a dict of fields per block.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_BLOCKS = 10000
+    XBLOCK_FIELDS = ['display_name', 'category', 'graded', 'format', 'due', 'start', 'visible_to_staff_only']
+    TRANSFORMER_FIELDS = {
+        'transformer{}'.format(index): ['field{}'.format(field_index) for field_index in xrange(3)]
+        for index in xrange(8)
+    }
+
+    def _build_columns(self):
+        """
+        Returns a BlockStructureBlockData with the benchmark's data.
+        """
+        block_structure = BlockStructureBlockData(root_block_usage_key=0)
+        for block_key in xrange(self.NUM_BLOCKS):
+            block_data = block_structure._get_or_create_block(block_key)
+            for field_name in self.XBLOCK_FIELDS:
+                setattr(block_data, field_name, block_key)
+            for transformer, field_names in self.TRANSFORMER_FIELDS.iteritems():
+                for field_name in field_names:
+                    block_structure.set_transformer_block_field(block_key, transformer, field_name, block_key)
+        return block_structure._block_data
+
+    def _build_legacy(self):
+        """
+        Returns the benchmark's data in the legacy layout.
+        """
+        block_data_map = {}
+        for block_key in xrange(self.NUM_BLOCKS):
+            block_data = block_data_map[block_key] = _LegacyBlockData(block_key)
+            for field_name in self.XBLOCK_FIELDS:
+                setattr(block_data, field_name, block_key)
+            for transformer, field_names in self.TRANSFORMER_FIELDS.iteritems():
+                transformer_data = block_data.transformer_data.get_or_create(transformer)
+                for field_name in field_names:
+                    setattr(transformer_data, field_name, block_key)
+        return block_data_map
+
+    def _read_columns(self, block_data):
+        """
+        Reads all of the benchmark's data from the given BlockStructureBlockData data.
+        """
+        block_structure = BlockStructureBlockData(root_block_usage_key=0)
+        block_structure._block_data = block_data
+        for block_key in xrange(self.NUM_BLOCKS):
+            for field_name in self.XBLOCK_FIELDS:
+                block_structure.get_xblock_field(block_key, field_name)
+            for transformer, field_names in self.TRANSFORMER_FIELDS.iteritems():
+                for field_name in field_names:
+                    block_structure.get_transformer_block_field(block_key, transformer, field_name)
+
+    def _read_legacy(self, block_data_map):
+        """
+        Reads all of the benchmark's data from the given data in the legacy
+        layout, as BlockStructureBlockData did.
+        """
+        for block_key in xrange(self.NUM_BLOCKS):
+            for field_name in self.XBLOCK_FIELDS:
+                block_data = block_data_map.get(block_key)
+                getattr(block_data, field_name, None)
+            for transformer, field_names in self.TRANSFORMER_FIELDS.iteritems():
+                for field_name in field_names:
+                    try:
+                        transformer_data = block_data_map[block_key].transformer_data[transformer]
+                    except KeyError:
+                        continue
+                    getattr(transformer_data, field_name, None)
+
+    def test_benchmark(self):
+        results = {}
+        for name, build, read in (
+                ('Legacy', self._build_legacy, self._read_legacy),
+                ('Columns', self._build_columns, self._read_columns),
+        ):
+            start = time.time()
+            data = build()
+            build_time = time.time() - start
+
+            start = time.time()
+            pickled_data = zpickle(data)
+            data = zunpickle(pickled_data)
+            pickle_time = time.time() - start
+
+            start = time.time()
+            read(data)
+            read_time = time.time() - start
+
+            results[name] = (_deep_size(data), len(pickled_data), build_time, pickle_time, read_time)
+
+        print u'\nCollected data of {} blocks:'.format(self.NUM_BLOCKS)
+        print u'    {:<10}{:>12}{:>12}{:>10}{:>10}{:>10}'.format('', 'memory', 'pickled', 'build', 'pickle', 'read')
+        for name, (memory, pickled, build_time, pickle_time, read_time) in sorted(results.iteritems()):
+            print u'    {:<10}{:>12}{:>12}{:>9.3f}s{:>9.3f}s{:>9.3f}s'.format(
+                name, memory, pickled, build_time, pickle_time, read_time,
+            )
@@ -62,6 +62,6 @@ class TestBlockStructureFactory(TestCase, ChildrenMapTestMixin):
             block_structure.root_block_usage_key,
             block_structure._block_relations,  # pylint: disable=protected-access
             block_structure.transformer_data,
-            block_structure._block_data_map,  # pylint: disable=protected-access
+            block_structure._block_data,  # pylint: disable=protected-access
         )
         self.assert_block_structure(new_structure, self.children_map)
@@ -1,11 +1,14 @@
 """
 Helper functions for caching course assets.
 """
+from uuid import uuid4
+
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
 
 from xmodule.contentstore.content import STATIC_CONTENT_VERSION
+from xmodule.contentstore.django import contentstore
 
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
@@ -14,6 +17,17 @@ try:
 except InvalidCacheBackendError:
     pass
 
+ASSET_INDEX_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Maximum number of course asset indexes kept in the memory of each process.
+ASSET_INDEX_PROCESS_CACHE_SIZE = 100
+
+# Course asset indexes loaded by this process, keyed by course key. Each
+# value is a (version, asset index) tuple, and is only used while its version
+# matches the one in CONTENT_CACHE, which changes whenever the index is
+# invalidated by any process.
+_ASSET_INDEXES = {}
+
 
 def set_cached_content(content):
     """
@@ -48,3 +62,53 @@ def del_cached_content(location):
         pass
 
     CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+    del_cached_asset_index(location.course_key)
+
+
+def _asset_index_version_key(course_key):
+    """Returns the cache key of the version of the asset index of the given course."""
+    return u'asset_index.version.{}'.format(course_key).encode('utf-8')
+
+
+def _asset_index_key(course_key, version):
+    """Returns the cache key of the given version of the asset index of the given course."""
+    return u'asset_index.{}.{}'.format(course_key, version).encode('utf-8')
+
+
+def get_cached_asset_index(course_key):
+    """
+    Returns the index of the static assets of the given course, as returned by
+    ContentStore.get_asset_index_for_course. The index is cached both in the
+    memory of this process and in CONTENT_CACHE, so it is only read from the
+    contentstore once after each invalidation.
+    """
+    version_key = _asset_index_version_key(course_key)
+    version = CONTENT_CACHE.get(version_key, version=STATIC_CONTENT_VERSION)
+    asset_index = None
+    if version is None:
+        version = uuid4().hex
+        CONTENT_CACHE.set(version_key, version, ASSET_INDEX_CACHE_TIMEOUT, version=STATIC_CONTENT_VERSION)
+    else:
+        cached_version, asset_index = _ASSET_INDEXES.get(course_key, (None, None))
+        if cached_version == version:
+            return asset_index
+        asset_index = CONTENT_CACHE.get(_asset_index_key(course_key, version), version=STATIC_CONTENT_VERSION)
+
+    if asset_index is None:
+        asset_index = contentstore().get_asset_index_for_course(course_key)
+        CONTENT_CACHE.set(
+            _asset_index_key(course_key, version), asset_index, ASSET_INDEX_CACHE_TIMEOUT,
+            version=STATIC_CONTENT_VERSION,
+        )
+
+    if len(_ASSET_INDEXES) >= ASSET_INDEX_PROCESS_CACHE_SIZE:
+        _ASSET_INDEXES.clear()
+    _ASSET_INDEXES[course_key] = (version, asset_index)
+    return asset_index
+
+
+def del_cached_asset_index(course_key):
+    """
+    Invalidates the cached asset index of the given course, in all processes.
+    """
+    CONTENT_CACHE.delete(_asset_index_version_key(course_key), version=STATIC_CONTENT_VERSION)
@@ -0,0 +1,286 @@
+"""
+Local disk cache for course assets that are too large to be cached in memcached.
+"""
+import errno
+import fcntl
+import hashlib
+import logging
+import os
+import tempfile
+import time
+
+import dogstats_wrapper as dog_stats_api
+from django.conf import settings
+
+log = logging.getLogger(__name__)
+
+# Prefix of the files that assets are written to before being added to the cache.
+TEMP_FILE_PREFIX = '.tmp-'
+
+# Files being written for longer than this many seconds are assumed to be left over by a crashed process.
+TEMP_FILE_MAX_AGE = 60 * 60
+
+# Name of the file locked by the process evicting files from the cache.
+LOCK_FILE_NAME = '.evict.lock'
+
+# Assets larger than this many bytes are added to the cache while they are
+# streamed to the client, rather than before their first response.
+DEFAULT_MAX_PUT_SIZE = 20 * 1024 ** 2
+
+# The size of the cache is estimated from the assets added by this process,
+# and measured again after this many seconds to account for those added by
+# other processes.
+SIZE_CHECK_INTERVAL = 5 * 60
+
+# Once the cache is larger than its maximum size, files are evicted until it is
+# no larger than this fraction of it, so that the following puts don't evict.
+EVICTION_TARGET_RATIO = 0.9
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+# (estimated size in bytes, time it was measured) of each cache directory.
+_cache_sizes = {}
+
+
+class AssetDiskCache(object):
+    """
+    LRU cache of course asset files in a local directory, keyed by the asset
+    location and content digest. A new version of an asset never overwrites
+    the cached file of an older version, which is evicted once it is the least
+    recently used.
+
+    The directory may be shared by every process on the app server. The
+    modification time of each file records when it was last served. Files
+    are only evicted when the estimated size of the cache exceeds its maximum
+    size, by one process at a time, down to EVICTION_TARGET_RATIO of it.
+
+    Configured with the CONTENTSERVER_DISK_CACHE setting, e.g.:
+        CONTENTSERVER_DISK_CACHE = {
+            'DIRECTORY': '/edx/var/edxapp/asset_cache',
+            'MAX_SIZE': 10 * 1024 ** 3,  # bytes
+            'MAX_PUT_SIZE': 20 * 1024 ** 2,  # bytes, optional
+        }
+    """
+    def __init__(self, directory, max_size, max_put_size=DEFAULT_MAX_PUT_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self.max_put_size = max_put_size
+
+    @classmethod
+    def from_settings(cls):
+        """
+        Returns the AssetDiskCache configured in settings, or None if there isn't one.
+        """
+        config = getattr(settings, 'CONTENTSERVER_DISK_CACHE', None)
+        if not config:
+            return None
+        return cls(config['DIRECTORY'], config['MAX_SIZE'], config.get('MAX_PUT_SIZE', DEFAULT_MAX_PUT_SIZE))
+
+    def get(self, location, digest):
+        """
+        Returns the cached file of the given asset version opened for reading,
+        or None if it isn't cached.
+        """
+        path = self._path(location, digest)
+        try:
+            asset_file = open(path, 'rb')
+        except IOError as error:
+            if error.errno != errno.ENOENT:
+                raise
+            dog_stats_api.increment('contentserver.disk_cache.requests', tags=['result:miss'])
+            return None
+
+        try:
+            os.utime(path, None)
+        except OSError:
+            # The file was evicted by another process, which doesn't affect the open file.
+            pass
+        dog_stats_api.increment('contentserver.disk_cache.requests', tags=['result:hit'])
+        return asset_file
+
+    def can_put(self, content):
+        """
+        Returns whether the given StaticContentStream is small enough to be
+        added to the cache before it is served.
+        """
+        return content.length <= self.max_put_size
+
+    def put(self, content):
+        """
+        Writes the data of the given StaticContentStream to the cache, evicting
+        the least recently used files if the cache grows over its maximum size.
+        Returns the cached file opened for reading.
+        """
+        path = self._path(content.location, content.content_digest)
+        temp_file = self._open_temp_file(path)
+        try:
+            with temp_file:
+                for chunk in content.stream_data_in_range(0, content.length - 1):
+                    temp_file.write(chunk)
+            os.rename(temp_file.name, path)
+        except Exception:
+            os.remove(temp_file.name)
+            raise
+
+        asset_file = open(path, 'rb')
+        self._added(content.length)
+        return asset_file
+
+    def stream_and_put(self, content):
+        """
+        Yields the data of the given StaticContentStream while writing it to
+        the cache, which it is added to once all of its data has been yielded.
+        Failing to write the data doesn't interrupt the stream.
+        """
+        path = self._path(content.location, content.content_digest)
+        try:
+            temp_file = self._open_temp_file(path)
+        except (IOError, OSError):
+            log.exception(u"Unable to add asset to the disk cache: %s", unicode(content.location))
+            temp_file = None
+
+        try:
+            for chunk in content.stream_data():
+                if temp_file is not None:
+                    try:
+                        temp_file.write(chunk)
+                    except (IOError, OSError):
+                        log.exception(u"Unable to add asset to the disk cache: %s", unicode(content.location))
+                        temp_file.close()
+                        self._remove(temp_file.name)
+                        temp_file = None
+                yield chunk
+
+            if temp_file is not None:
+                temp_file.close()
+                try:
+                    os.rename(temp_file.name, path)
+                    self._added(content.length)
+                except (IOError, OSError):
+                    log.exception(u"Unable to add asset to the disk cache: %s", unicode(content.location))
+                    self._remove(temp_file.name)
+                temp_file = None
+        finally:
+            # The stream wasn't completed, e.g. the client closed the connection.
+            if temp_file is not None:
+                temp_file.close()
+                self._remove(temp_file.name)
+
+    def evict(self):
+        """
+        Removes the least recently used files if the cache is larger than its
+        maximum size, unless another process is already evicting files.
+        """
+        with open(os.path.join(self.directory, LOCK_FILE_NAME), 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except IOError as error:
+                if error.errno not in (errno.EAGAIN, errno.EACCES):
+                    raise
+                return
+            try:
+                self._evict()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _evict(self):
+        """
+        Removes the least recently used files if the cache is larger than its
+        maximum size, until it is no larger than EVICTION_TARGET_RATIO of it,
+        and records the resulting size of the cache.
+        """
+        now = time.time()
+        cached_files = []
+        cache_size = 0
+        for dirpath, __, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if filename == LOCK_FILE_NAME:
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if filename.startswith(TEMP_FILE_PREFIX):
+                    if now - stat.st_mtime > TEMP_FILE_MAX_AGE:
+                        self._remove(path)
+                    continue
+                cached_files.append((stat.st_mtime, stat.st_size, path))
+                cache_size += stat.st_size
+
+        evicted_count = 0
+        if cache_size > self.max_size:
+            target_size = self.max_size * EVICTION_TARGET_RATIO
+            for __, size, path in sorted(cached_files):
+                if cache_size <= target_size:
+                    break
+                self._remove(path)
+                cache_size -= size
+                evicted_count += 1
+        _cache_sizes[self.directory] = (cache_size, now)
+
+        dog_stats_api.histogram('contentserver.disk_cache.size', cache_size)
+        dog_stats_api.histogram('contentserver.disk_cache.usage', float(cache_size) / self.max_size)
+        if evicted_count:
+            dog_stats_api.increment('contentserver.disk_cache.evictions', evicted_count)
+            log.info(u'Evicted %d assets from the disk cache in %s', evicted_count, self.directory)
+
+    def _added(self, size):
+        """
+        Records that a file of the given size was added to the cache, evicting
+        files if the cache may now be larger than its maximum size.
+
+        The size of the cache is only measured, by walking its directory, when
+        the estimate is missing, over the maximum size or out of date.
+        """
+        cache_size, measured_at = _cache_sizes.get(self.directory, (None, None))
+        if (cache_size is None or cache_size + size > self.max_size or
+                time.time() - measured_at > SIZE_CHECK_INTERVAL):
+            self.evict()
+        else:
+            _cache_sizes[self.directory] = (cache_size + size, measured_at)
+
+    def _open_temp_file(self, path):
+        """
+        Returns a new temporary file in the directory of the given cache file,
+        opened for writing.
+        """
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory)
+        except OSError as error:
+            if error.errno != errno.EEXIST:
+                raise
+        return tempfile.NamedTemporaryFile(dir=directory, prefix=TEMP_FILE_PREFIX, delete=False)
+
+    def _path(self, location, digest):
+        """
+        Returns the path of the cache file of the given asset version.
+        """
+        key = hashlib.sha1(u'{}@{}'.format(location, digest).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, key[:2], key)
+
+    @staticmethod
+    def _remove(path):
+        """
+        Removes the file at the given path, if another process hasn't already.
+        """
+        try:
+            os.remove(path)
+        except OSError as error:
+            if error.errno != errno.ENOENT:
+                raise
+
+
+def read_file_range(asset_file, first_byte, last_byte):
+    """
+    Yields the data of the given open file between first_byte and last_byte (included).
+    """
+    asset_file.seek(first_byte)
+    remaining = last_byte - first_byte + 1
+    while remaining > 0:
+        chunk = asset_file.read(min(remaining, FILE_CHUNK_SIZE))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield chunk
@@ -4,23 +4,26 @@ Middleware to serve assets.
 
 import logging
 import datetime
+from uuid import uuid4
 log = logging.getLogger(__name__)
 try:
     import newrelic.agent
 except ImportError:
     newrelic = None  # pylint: disable=invalid-name
+import dogstats_wrapper as dog_stats_api
 from django.http import (
-    HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
-    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect)
+    FileResponse, HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
+    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect, StreamingHttpResponse)
 from student.models import CourseEnrollment
 
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
+from xmodule.contentstore.content import StaticContent, StaticContentStream, XASSET_LOCATION_TAG
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
 from openedx.core.djangoapps.header_control import force_header_for_response
 from .caching import get_cached_content, set_cached_content
+from .disk_cache import AssetDiskCache, read_file_range
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.exceptions import NotFoundError
 
@@ -31,6 +34,14 @@ from .models import CourseAssetCacheTtlConfig, CdnUserAgentsConfig
 
 HTTP_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
 
+# Assets smaller than this are cached in memcached, which by default doesn't
+# store larger values. Larger assets are cached on disk, if that is configured.
+MAX_MEMCACHED_ASSET_SIZE = 1048576
+
+# Requests for more ranges than this are answered with the full content, so
+# that a few bytes of request can't be used to build enormous responses.
+MAX_BYTE_RANGES = 20
+
 
 class StaticContentServer(object):
     """
@@ -114,18 +125,37 @@ class StaticContentServer(object):
                 if if_modified_since == last_modified_at_str:
                     return HttpResponseNotModified()
 
-            # *** File streaming within a byte range ***
+            # Assets that are too large for memcached are served from the local disk cache, if
+            # there is one, so they are only streamed from the contentstore once per app server.
+            # Assets too large to be cached before they are served are cached while they are
+            # streamed in a full response instead.
+            asset_file = None
+            stream_to_disk_cache = None
+            if isinstance(content, StaticContentStream) and content.content_digest:
+                disk_cache = AssetDiskCache.from_settings()
+                if disk_cache is not None:
+                    asset_file = disk_cache.get(content.location, content.content_digest)
+                    if newrelic:
+                        newrelic.agent.add_custom_parameter('contentserver.disk_cache_hit', asset_file is not None)
+                    if asset_file is None:
+                        if disk_cache.can_put(content):
+                            asset_file = self.put_asset_file(disk_cache, content)
+                            if asset_file is None:
+                                # The stream may have been partly read before caching failed.
+                                content = AssetManager.find(loc, as_stream=True)
+                        else:
+                            stream_to_disk_cache = disk_cache
+            disk_cached = asset_file is not None
+
+            # *** File streaming within byte ranges ***
             # If a Range is provided, parse Range attribute of the request
             # Add Content-Range in the response if Range is structurally correct
-            # Request -> Range attribute structure: "Range: bytes=first-[last]"
+            # Request -> Range attribute structure: "Range: bytes=first-[last][, first-[last]]"
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
+            multipart = False
             if request.META.get('HTTP_RANGE'):
-                # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-                if isinstance(content, StaticContent):
-                    content = AssetManager.find(loc, as_stream=True)
-
                 header_value = request.META['HTTP_RANGE']
                 try:
                     unit, ranges = parse_range_header(header_value, content.length)
@@ -138,45 +168,72 @@ class StaticContentServer(object):
                     if unit != 'bytes':
                         # Only accept ranges in bytes
                         log.warning(u"Unknown unit in Range header: %s for content: %s", header_value, unicode(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
+                    elif len(ranges) > MAX_BYTE_RANGES:
                         log.warning(
-                            u"More than 1 ranges in Range header: %s for content: %s", header_value, unicode(loc)
+                            u"Too many ranges in Range header: %s for content: %s", header_value, unicode(loc)
                         )
                     else:
-                        first, last = ranges[0]
+                        satisfiable_ranges = [
+                            (first, last) for first, last in ranges if 0 <= first <= last < content.length
+                        ]
+                        if not satisfiable_ranges:
+                            log.warning(
+                                u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
+                            )
+                            if asset_file is not None:
+                                asset_file.close()
+                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
 
-                        if 0 <= first <= last < content.length:
-                            # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
+                        if len(satisfiable_ranges) == 1:
+                            first, last = satisfiable_ranges[0]
+                            response = StreamingHttpResponse(
+                                self.stream_content_range(content, asset_file, first, last)
+                            )
                             response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
                             )
                             response['Content-Length'] = str(last - first + 1)
-                            response.status_code = 206  # Partial Content
-
-                            if newrelic:
-                                newrelic.agent.add_custom_parameter('contentserver.ranged', True)
                         else:
-                            log.warning(
-                                u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
-                            )
-                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                            # According to Http/1.1 spec content for multiple ranges should be sent as a
+                            # multipart message. http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
+                            response = self.get_multipart_byteranges_response(content, asset_file, satisfiable_ranges)
+                            multipart = True
+                        response.status_code = 206  # Partial Content
+
+                        if newrelic:
+                            newrelic.agent.add_custom_parameter('contentserver.ranged', True)
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                if asset_file is not None:
+                    # Lets the server send the file with sendfile, where it is supported.
+                    response = FileResponse(asset_file)
+                    asset_file = None
+                elif stream_to_disk_cache is not None:
+                    response = StreamingHttpResponse(stream_to_disk_cache.stream_and_put(content))
+                else:
+                    response = HttpResponse(content.stream_data())
                 response['Content-Length'] = content.length
 
+            if asset_file is not None:
+                # The file is read by a generator of the response, which closes the response's iterables only.
+                response._closable_objects.append(asset_file)  # pylint: disable=protected-access
+
             if newrelic:
                 newrelic.agent.add_custom_parameter('contentserver.content_len', content.length)
                 newrelic.agent.add_custom_parameter('contentserver.content_type', content.content_type)
 
+            dog_stats_api.increment(
+                'contentserver.bytes_served',
+                int(response['Content-Length'] or 0),
+                tags=['status_code:{}'.format(response.status_code), 'disk_cached:{}'.format(disk_cached)],
+            )
+
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
-            response['Content-Type'] = content.content_type
+            if not multipart:
+                # Multipart responses give the content type of each part instead.
+                response['Content-Type'] = content.content_type
 
             # Set any caching headers, and do any response cleanup needed.  Based on how much
             # middleware we have in place, there's no easy way to use the built-in Django
@@ -283,12 +340,78 @@ class StaticContentServer(object):
             # Now that we fetched it, let's go ahead and try to cache it. We cap this at 1MB
             # because it's the default for memcached and also we don't want to do too much
             # buffering in memory when we're serving an actual request.
-            if content.length is not None and content.length < 1048576:
+            if content.length is not None and content.length < MAX_MEMCACHED_ASSET_SIZE:
                 content = content.copy_to_in_mem()
                 set_cached_content(content)
 
         return content
 
+    def put_asset_file(self, disk_cache, content):
+        """
+        Adds the given StaticContentStream to the disk cache, and returns its
+        file opened for reading. Returns None if the content couldn't be added
+        to the cache.
+        """
+        try:
+            return disk_cache.put(content)
+        except (IOError, OSError):
+            log.exception(u"Unable to add asset to the disk cache: %s", unicode(content.location))
+            return None
+
+    @staticmethod
+    def stream_content_range(content, asset_file, first_byte, last_byte):
+        """
+        Returns an iterable of the data of the given content between first_byte and
+        last_byte (included), read from asset_file if the content is disk cached.
+        """
+        if asset_file is not None:
+            return read_file_range(asset_file, first_byte, last_byte)
+        elif isinstance(content, StaticContentStream):
+            return content.stream_data_in_range(first_byte, last_byte)
+        else:
+            return [content.data[first_byte:last_byte + 1]]
+
+    def get_multipart_byteranges_response(self, content, asset_file, ranges):
+        """
+        Returns a multipart/byteranges response with a part for each of the given (first, last) ranges.
+        See https://tools.ietf.org/html/rfc7233#appendix-A
+        """
+        boundary = uuid4().hex
+        content_type = content.content_type.encode('utf-8') if content.content_type else 'application/octet-stream'
+        part_headers = [
+            '{separator}--{boundary}\r\nContent-Type: {content_type}\r\n'
+            'Content-Range: bytes {first}-{last}/{length}\r\n\r\n'.format(
+                separator='\r\n' if index > 0 else '',
+                boundary=boundary,
+                content_type=content_type,
+                first=first,
+                last=last,
+                length=content.length,
+            )
+            for index, (first, last) in enumerate(ranges)
+        ]
+        closing_boundary = '\r\n--{boundary}--\r\n'.format(boundary=boundary)
+
+        def multipart_data():
+            """
+            Yields the parts of the response.
+            """
+            for part_header, (first, last) in zip(part_headers, ranges):
+                yield part_header
+                for chunk in self.stream_content_range(content, asset_file, first, last):
+                    yield chunk
+            yield closing_boundary
+
+        response = StreamingHttpResponse(
+            multipart_data(), content_type='multipart/byteranges; boundary={}'.format(boundary)
+        )
+        response['Content-Length'] = str(
+            sum(len(part_header) for part_header in part_headers) +
+            sum(last - first + 1 for first, last in ranges) +
+            len(closing_boundary)
+        )
+        return response
+
 
 def parse_range_header(header_value, content_length):
     """
@@ -6,10 +6,14 @@ import copy
 import datetime
 import ddt
 import logging
+import os
+import shutil
 import unittest
+from tempfile import mkdtemp
 from uuid import uuid4
 
 from django.conf import settings
+from django.http import FileResponse
 from django.test import RequestFactory
 from django.test.client import Client
 from django.test.utils import override_settings
@@ -242,17 +246,96 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
 
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request outputs a multipart/byteranges partial content response.
         """
         first_byte = self.length_unlocked / 4
         last_byte = self.length_unlocked / 2
         resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}, -100'.format(
             first=first_byte, last=last_byte))
 
-        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.status_code, 206)
         self.assertNotIn('Content-Range', resp)
+        self.assert_multipart_byteranges(resp, [(first_byte, last_byte), (self.length_unlocked - 100, None)])
+
+    def test_range_request_too_many_ranges(self):
+        """
+        Test that a request for too many ranges outputs the full content.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=' + ', '.join(['0-1'] * 21))
+
+        self.assertEqual(resp.status_code, 200)
         self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
 
+    def assert_multipart_byteranges(self, resp, ranges):
+        """
+        Asserts that the given response is a multipart/byteranges response with a part
+        for each of the given (first, last) ranges of the unlocked asset.
+        """
+        data = ''.join(resp.streaming_content)
+        self.assertEqual(resp['Content-Length'], str(len(data)))
+        content_type, boundary = resp['Content-Type'].split('; boundary=')
+        self.assertEqual(content_type, 'multipart/byteranges')
+
+        full_data = self.contentstore.find(self.unlocked_asset).data
+        parts = data.split('--' + boundary)
+        self.assertEqual(parts[-1], '--\r\n')
+        self.assertEqual(len(parts[1:-1]), len(ranges))
+        for part, (first, last) in zip(parts[1:-1], ranges):
+            last = self.length_unlocked - 1 if last is None else last
+            headers, part_data = part[2:-2].split('\r\n\r\n', 1)
+            self.assertIn('Content-Range: bytes {}-{}/{}'.format(first, last, self.length_unlocked), headers)
+            self.assertEqual(part_data, full_data[first:last + 1])
+
+    def test_disk_cached_asset(self):
+        """
+        Test that assets too large for memcached are served from the disk cache,
+        which is filled on the first request.
+        """
+        cache_dir = mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        full_data = self.contentstore.find(self.unlocked_asset).data
+
+        with override_settings(CONTENTSERVER_DISK_CACHE={'DIRECTORY': cache_dir, 'MAX_SIZE': 1024 ** 2}):
+            with patch('openedx.core.djangoapps.contentserver.middleware.MAX_MEMCACHED_ASSET_SIZE', 0):
+                resp = self.client.get(self.url_unlocked)
+                self.assertEqual(resp.status_code, 200)
+                self.assertEqual(''.join(resp.streaming_content), full_data)
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+                with patch('openedx.core.djangoapps.contentserver.middleware.AssetDiskCache.put') as mock_put:
+                    resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=1-3, 5-')
+                    self.assertFalse(mock_put.called)
+                self.assertEqual(resp.status_code, 206)
+                self.assert_multipart_byteranges(resp, [(1, 3), (5, None)])
+
+    def test_disk_cached_while_streamed(self):
+        """
+        Test that assets too large to be disk cached before they are served are
+        disk cached while their full content is streamed.
+        """
+        cache_dir = mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        full_data = self.contentstore.find(self.unlocked_asset).data
+        disk_cache_settings = {'DIRECTORY': cache_dir, 'MAX_SIZE': 1024 ** 2, 'MAX_PUT_SIZE': 0}
+
+        with override_settings(CONTENTSERVER_DISK_CACHE=disk_cache_settings):
+            with patch('openedx.core.djangoapps.contentserver.middleware.MAX_MEMCACHED_ASSET_SIZE', 0):
+                # Range requests are served from the contentstore until the asset is cached.
+                resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=1-3')
+                self.assertEqual(resp.status_code, 206)
+                self.assertEqual(''.join(resp.streaming_content), full_data[1:4])
+                self.assertEqual(os.listdir(cache_dir), [])
+
+                resp = self.client.get(self.url_unlocked)
+                self.assertEqual(resp.status_code, 200)
+                self.assertEqual(''.join(resp.streaming_content), full_data)
+                self.assertEqual(len(os.listdir(cache_dir)), 2)  # The asset's directory and the lock file.
+
+                # The cached file is then served.
+                resp = self.client.get(self.url_unlocked)
+                self.assertIsInstance(resp, FileResponse)
+                self.assertEqual(''.join(resp.streaming_content), full_data)
+
     @ddt.data(
         'bytes 0-',
         'bits=0-',
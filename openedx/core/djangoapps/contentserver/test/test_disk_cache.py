@@ -0,0 +1,125 @@
+"""
+Tests for the contentserver's disk cache.
+"""
+import fcntl
+import os
+import shutil
+import unittest
+from tempfile import mkdtemp
+
+from mock import Mock, patch
+
+from ..disk_cache import LOCK_FILE_NAME, AssetDiskCache, read_file_range
+
+
+def make_content(name, data, digest='digest'):
+    """
+    Returns a mock StaticContentStream with the given data.
+    """
+    return Mock(
+        location=u'/c4x/org/course/asset/{}'.format(name),
+        content_digest=digest,
+        length=len(data),
+        stream_data_in_range=lambda first, last: iter([data[first:last + 1]]),
+        stream_data=lambda: iter([data[index:index + 2] for index in range(0, len(data), 2)]),
+    )
+
+
+class AssetDiskCacheTestCase(unittest.TestCase):
+    """
+    Tests for AssetDiskCache.
+    """
+    def setUp(self):
+        super(AssetDiskCacheTestCase, self).setUp()
+        self.directory = mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.disk_cache = AssetDiskCache(self.directory, max_size=10)
+
+    def test_put_and_get(self):
+        content = make_content('a.pdf', 'abcdef')
+        self.assertIsNone(self.disk_cache.get(content.location, content.content_digest))
+
+        with self.disk_cache.put(content) as asset_file:
+            self.assertEqual(asset_file.read(), 'abcdef')
+        with self.disk_cache.get(content.location, content.content_digest) as asset_file:
+            self.assertEqual(''.join(read_file_range(asset_file, 1, 3)), 'bcd')
+
+        # Another version of the asset is cached separately.
+        self.assertIsNone(self.disk_cache.get(content.location, 'new_digest'))
+
+    def test_evicts_least_recently_used(self):
+        old_content = make_content('old.pdf', 'abcd')
+        used_content = make_content('used.pdf', 'efgh')
+        self.disk_cache.put(old_content).close()
+        self.disk_cache.put(used_content).close()
+
+        # Make the first file the least recently used, even within the resolution of file times.
+        for content, mtime in ((old_content, 1000), (used_content, 2000)):
+            path = self.disk_cache._path(content.location, content.content_digest)  # pylint: disable=protected-access
+            os.utime(path, (mtime, mtime))
+
+        self.disk_cache.put(make_content('new.pdf', 'ijkl')).close()
+
+        self.assertIsNone(self.disk_cache.get(old_content.location, old_content.content_digest))
+        self.assertIsNotNone(self.disk_cache.get(used_content.location, used_content.content_digest))
+
+    def cached_paths(self):
+        """
+        Returns the paths of all the files in the cache directory, besides its lock file.
+        """
+        return [
+            os.path.join(dirpath, filename)
+            for dirpath, __, filenames in os.walk(self.directory)
+            for filename in filenames
+            if filename != LOCK_FILE_NAME
+        ]
+
+    def test_size_measured_when_over_estimate(self):
+        # pylint: disable=protected-access
+        with patch.object(self.disk_cache, '_evict', wraps=self.disk_cache._evict) as mock_evict:
+            self.disk_cache.put(make_content('a.pdf', 'abc')).close()
+            self.disk_cache.put(make_content('b.pdf', 'def')).close()
+            self.disk_cache.put(make_content('c.pdf', 'ghi')).close()
+            # Only the first put measures the cache, whose estimated size is then below its maximum.
+            self.assertEqual(mock_evict.call_count, 1)
+
+            self.disk_cache.put(make_content('d.pdf', 'jkl')).close()
+            self.assertEqual(mock_evict.call_count, 2)
+
+    def test_full_cache_measured_once_per_eviction(self):
+        # pylint: disable=protected-access
+        disk_cache = AssetDiskCache(self.directory, max_size=100)
+        for index in range(20):
+            disk_cache.put(make_content('{}.pdf'.format(index), 'abcde')).close()
+
+        with patch.object(disk_cache, '_evict', wraps=disk_cache._evict) as mock_evict:
+            for index in range(20, 23):
+                disk_cache.put(make_content('{}.pdf'.format(index), 'abcde')).close()
+            # The first put evicts files down to 90% of the maximum size, leaving room for the others.
+            self.assertEqual(mock_evict.call_count, 1)
+        self.assertEqual(len(self.cached_paths()), 20)
+
+    def test_evict_skipped_while_locked(self):
+        self.disk_cache.put(make_content('a.pdf', 'abcdef')).close()
+        self.disk_cache.put(make_content('b.pdf', 'ghijkl')).close()
+        self.assertEqual(len(self.cached_paths()), 1)
+
+        with open(os.path.join(self.directory, LOCK_FILE_NAME), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self.disk_cache.put(make_content('c.pdf', 'mnopqr')).close()
+            self.assertEqual(len(self.cached_paths()), 2)
+
+    def test_stream_and_put(self):
+        content = make_content('a.pdf', 'abcdef')
+        self.assertEqual(list(self.disk_cache.stream_and_put(content)), ['ab', 'cd', 'ef'])
+        with self.disk_cache.get(content.location, content.content_digest) as asset_file:
+            self.assertEqual(asset_file.read(), 'abcdef')
+
+    def test_stream_and_put_interrupted(self):
+        content = make_content('a.pdf', 'abcdef')
+        stream = self.disk_cache.stream_and_put(content)
+        self.assertEqual(next(stream), 'ab')
+        stream.close()
+
+        self.assertIsNone(self.disk_cache.get(content.location, content.content_digest))
+        self.assertEqual(self.cached_paths(), [])
@@ -5,6 +5,7 @@ forums, and to the cohort admin views.
 
 import logging
 import random
+from collections import namedtuple
 
 import request_cache
 from courseware import courses
@@ -19,6 +20,7 @@ from django.utils.translation import ugettext as _
 from eventtracking import tracker
 from request_cache.middleware import request_cached
 from student.models import get_user_by_username_or_email
+from util.query import chunks
 
 from .models import (
     CohortMembership,
@@ -175,30 +177,63 @@ def _cohort_cache_key(user_id, course_key):
     return u"{}.{}".format(user_id, course_key)
 
 
-def bulk_cache_cohorts(course_key, users):
+GROUP_INFO_CACHE_NAMESPACE = u"cohorts.get_group_info_for_cohort"
+
+# Number of users resolved or written per query by the bulk cohort APIs.
+BULK_COHORT_BATCH_SIZE = 500
+
+
+def bulk_cache_cohorts(course_key, users, assign=False):
     """
     Pre-fetches and caches the cohort assignments for the
     given users, for later fast retrieval by get_cohort.
+
+    The partition group linked to each of the fetched cohorts is cached
+    as well, for later fast retrieval by get_group_info_for_cohort.
+
+    Arguments:
+        course_key: CourseKey
+        users: list of Django User objects
+        assign (bool): if True, users without a cohort in a cohorted course
+            are assigned one in bulk (see bulk_assign_cohorts) before caching.
     """
     # before populating the cache with another bulk set of data,
     # remove previously cached entries to keep memory usage low.
     request_cache.clear_cache(COHORT_CACHE_NAMESPACE)
     cache = request_cache.get_cache(COHORT_CACHE_NAMESPACE)
+    users = list(users)
 
     if is_course_cohorted(course_key):
-        cohorts_by_user = {
-            membership.user: membership
-            for membership in
-            CohortMembership.objects.filter(user__in=users, course_id=course_key).select_related('user__id')
-        }
-        for user, membership in cohorts_by_user.iteritems():
-            cache[_cohort_cache_key(user.id, course_key)] = membership.course_user_group
-        uncohorted_users = filter(lambda u: u not in cohorts_by_user, users)
+        cohorts_by_user_id = {}
+        for user_ids in chunks([user.id for user in users], BULK_COHORT_BATCH_SIZE):
+            for membership in CohortMembership.objects.filter(
+                    user_id__in=user_ids, course_id=course_key
+            ).select_related('course_user_group'):
+                cohorts_by_user_id[membership.user_id] = membership.course_user_group
+
+        if assign:
+            unassigned = [user for user in users if user.id not in cohorts_by_user_id]
+            cohorts_by_user_id.update(bulk_assign_cohorts(course_key, unassigned))
+
+        _bulk_cache_group_info(set(cohorts_by_user_id.itervalues()))
+        for user in users:
+            cache[_cohort_cache_key(user.id, course_key)] = cohorts_by_user_id.get(user.id)
     else:
-        uncohorted_users = users
+        for user in users:
+            cache[_cohort_cache_key(user.id, course_key)] = None
+
 
-    for user in uncohorted_users:
-        cache[_cohort_cache_key(user.id, course_key)] = None
+def _bulk_cache_group_info(cohorts):
+    """
+    Caches the (group_id, partition_id) linked to each of the given cohorts,
+    for later fast retrieval by get_group_info_for_cohort.
+    """
+    cache = request_cache.get_cache(GROUP_INFO_CACHE_NAMESPACE)
+    group_info = {cohort.id: (None, None) for cohort in cohorts}
+    for partition_group in CourseUserGroupPartitionGroup.objects.filter(course_user_group_id__in=list(group_info)):
+        group_info[partition_group.course_user_group_id] = (partition_group.group_id, partition_group.partition_id)
+    for cohort_id, info in group_info.iteritems():
+        cache[unicode(cohort_id)] = info
 
 
 def get_cohort(user, course_key, assign=True, use_cached=False):
@@ -287,17 +322,25 @@ def get_random_cohort(course_key):
     If there are multiple cohorts of type RANDOM in the course, one of them will be randomly selected.
     If there are no existing cohorts of type RANDOM in the course, one will be created.
     """
+    return local_random().choice(_get_random_cohorts(course_key))
+
+
+def _get_random_cohorts(course_key):
+    """
+    Returns the list of cohorts of type RANDOM in the course, creating the
+    default cohort if there are none.
+    """
     course = courses.get_course(course_key)
     cohorts = get_course_cohorts(course, assignment_type=CourseCohort.RANDOM)
-    if cohorts:
-        cohort = local_random().choice(cohorts)
-    else:
-        cohort = CourseCohort.create(
-            cohort_name=DEFAULT_COHORT_NAME,
-            course_id=course_key,
-            assignment_type=CourseCohort.RANDOM
-        ).course_user_group
-    return cohort
+    if not cohorts:
+        cohorts = [
+            CourseCohort.create(
+                cohort_name=DEFAULT_COHORT_NAME,
+                course_id=course_key,
+                assignment_type=CourseCohort.RANDOM
+            ).course_user_group
+        ]
+    return cohorts
 
 
 def migrate_cohort_settings(course):
@@ -507,6 +550,323 @@ def add_user_to_cohort(cohort, username_or_email):
                 raise ex
 
 
+# Outcomes reported by bulk_add_users_to_cohorts for each requested assignment.
+COHORT_ASSIGNMENT_ADDED = 'added'
+COHORT_ASSIGNMENT_PREASSIGNED = 'preassigned'
+COHORT_ASSIGNMENT_ALREADY_PRESENT = 'already_present'
+COHORT_ASSIGNMENT_NOT_FOUND = 'not_found'
+COHORT_ASSIGNMENT_INVALID_EMAIL = 'invalid_email'
+
+CohortAssignmentResult = namedtuple(
+    'CohortAssignmentResult', ['username_or_email', 'cohort', 'status', 'user', 'previous_cohort']
+)
+
+
+def bulk_add_users_to_cohorts(course_key, assignments):
+    """
+    Bulk equivalent of add_user_to_cohort, for large uploads of cohort
+    assignments.
+
+    Users are resolved in batches, the resulting cohort moves are computed in
+    memory and then applied with a handful of bulk writes inside a single
+    transaction. Assignments are evaluated in order, so if a user appears
+    more than once the last assignment wins, exactly as if add_user_to_cohort
+    had been called for each of them in turn. The tracking events emitted by
+    add_user_to_cohort are emitted for each assignment once the writes have
+    been committed. If another worker changes the memberships of the users
+    concurrently, the assignments fall back to add_user_to_cohort.
+
+    Arguments:
+        course_key: CourseKey of the course all of the cohorts belong to
+        assignments: iterable of (username_or_email, CourseUserGroup) pairs.
+            Treated as email if username_or_email has an '@'.
+
+    Returns:
+        A list of CohortAssignmentResult, one per assignment and in the same
+        order, whose status is one of the COHORT_ASSIGNMENT_* values.
+
+    Raises:
+        ValueError if one of the cohorts does not belong to the course.
+    """
+    assignments = list(assignments)
+    for __, cohort in assignments:
+        if cohort.course_id != course_key or cohort.group_type != CourseUserGroup.COHORT:
+            raise ValueError("Cohort {} does not belong to course {}".format(cohort, course_key))
+
+    users = _bulk_get_users_by_username_or_email(set(username_or_email for username_or_email, __ in assignments))
+    original_cohorts = _bulk_get_cohorts_by_user_id(course_key, set(user.id for user in users.itervalues()))
+    cohorts_by_user_id = dict(original_cohorts)
+    preassigned_cohorts = {}
+    results = []
+    events = []
+
+    for username_or_email, cohort in assignments:
+        user = users.get(username_or_email)
+        if user is None:
+            try:
+                validate_email(username_or_email)
+            except ValidationError:
+                status = COHORT_ASSIGNMENT_INVALID_EMAIL if '@' in username_or_email else COHORT_ASSIGNMENT_NOT_FOUND
+                results.append(CohortAssignmentResult(username_or_email, cohort, status, None, None))
+                continue
+            preassigned_cohorts[username_or_email] = cohort
+            results.append(
+                CohortAssignmentResult(username_or_email, cohort, COHORT_ASSIGNMENT_PREASSIGNED, None, None)
+            )
+            events.append((
+                "edx.cohort.email_address_preassigned",
+                {"user_email": username_or_email, "cohort_id": cohort.id, "cohort_name": cohort.name}
+            ))
+            continue
+
+        previous_cohort = cohorts_by_user_id.get(user.id)
+        if previous_cohort is not None and previous_cohort.id == cohort.id:
+            results.append(
+                CohortAssignmentResult(username_or_email, cohort, COHORT_ASSIGNMENT_ALREADY_PRESENT, user, None)
+            )
+            continue
+
+        cohorts_by_user_id[user.id] = cohort
+        results.append(
+            CohortAssignmentResult(username_or_email, cohort, COHORT_ASSIGNMENT_ADDED, user, previous_cohort)
+        )
+        events.append((
+            "edx.cohort.user_add_requested",
+            {
+                "user_id": user.id,
+                "cohort_id": cohort.id,
+                "cohort_name": cohort.name,
+                "previous_cohort_id": previous_cohort.id if previous_cohort else None,
+                "previous_cohort_name": previous_cohort.name if previous_cohort else None,
+            }
+        ))
+
+    try:
+        with transaction.atomic():
+            membership_events = _bulk_apply_cohort_memberships(course_key, original_cohorts, cohorts_by_user_id)
+            _bulk_apply_preassignments(course_key, preassigned_cohorts)
+    except IntegrityError as integrity_error:
+        # Another worker changed the memberships of some of the users
+        # concurrently, so add each user in turn instead.
+        log.info(
+            "HANDLING_INTEGRITY_ERROR: IntegrityError encountered during bulk cohort assignment for course '%s': %s",
+            course_key, unicode(integrity_error)
+        )
+        request_cache.clear_cache(COHORT_CACHE_NAMESPACE)
+        return [
+            _add_user_to_cohort_with_result(course_key, username_or_email, cohort)
+            for username_or_email, cohort in assignments
+        ]
+
+    for event_name, event in membership_events + events:
+        tracker.emit(event_name, event)
+
+    request_cache.clear_cache(COHORT_CACHE_NAMESPACE)
+    return results
+
+
+def _add_user_to_cohort_with_result(course_key, username_or_email, cohort):
+    """
+    Adds the user to the cohort with add_user_to_cohort, and returns the
+    CohortAssignmentResult of the assignment.
+    """
+    try:
+        user = get_user_by_username_or_email(username_or_email)
+        previous_cohort = _bulk_get_cohorts_by_user_id(course_key, [user.id]).get(user.id)
+    except User.DoesNotExist:
+        user, previous_cohort = None, None
+
+    try:
+        __, __, preassigned = add_user_to_cohort(cohort, username_or_email)
+    except ValueError:
+        return CohortAssignmentResult(username_or_email, cohort, COHORT_ASSIGNMENT_ALREADY_PRESENT, user, None)
+    except User.DoesNotExist:
+        return CohortAssignmentResult(username_or_email, cohort, COHORT_ASSIGNMENT_NOT_FOUND, None, None)
+    except ValidationError:
+        return CohortAssignmentResult(username_or_email, cohort, COHORT_ASSIGNMENT_INVALID_EMAIL, None, None)
+
+    if preassigned:
+        return CohortAssignmentResult(username_or_email, cohort, COHORT_ASSIGNMENT_PREASSIGNED, None, None)
+    return CohortAssignmentResult(username_or_email, cohort, COHORT_ASSIGNMENT_ADDED, user, previous_cohort)
+
+
+def bulk_assign_cohorts(course_key, users):
+    """
+    Bulk equivalent of get_cohort(assign=True) for users who are not yet in a
+    cohort of a cohorted course.
+
+    Learners that were pre-registered in a cohort are added to that cohort,
+    and the others are spread across the course's random cohorts. If another
+    worker assigns one of the users concurrently, the whole batch falls back
+    to get_cohort for each user.
+
+    Arguments:
+        course_key: CourseKey
+        users: list of Django User objects that have no cohort in the course
+
+    Returns:
+        A dict mapping user ids to their new CourseUserGroup.
+    """
+    if not users:
+        return {}
+
+    preassignments = {}
+    for emails in chunks([user.email for user in users], BULK_COHORT_BATCH_SIZE):
+        for assignment in UnregisteredLearnerCohortAssignments.objects.filter(
+                course_id=course_key, email__in=emails
+        ).select_related('course_user_group'):
+            preassignments[assignment.email] = assignment
+
+    random_cohorts = None
+    cohorts_by_user_id = {}
+    for user in users:
+        if user.email in preassignments:
+            cohorts_by_user_id[user.id] = preassignments[user.email].course_user_group
+        else:
+            if random_cohorts is None:
+                random_cohorts = _get_random_cohorts(course_key)
+            cohorts_by_user_id[user.id] = local_random().choice(random_cohorts)
+
+    try:
+        with transaction.atomic():
+            events = _bulk_apply_cohort_memberships(course_key, {}, cohorts_by_user_id)
+            UnregisteredLearnerCohortAssignments.objects.filter(
+                id__in=[assignment.id for assignment in preassignments.itervalues()]
+            ).delete()
+    except IntegrityError as integrity_error:
+        log.info(
+            "HANDLING_INTEGRITY_ERROR: IntegrityError encountered during bulk assignment for course '%s': %s",
+            course_key, unicode(integrity_error)
+        )
+        return {user.id: get_cohort(user, course_key) for user in users}
+
+    for event_name, event in events:
+        tracker.emit(event_name, event)
+    return cohorts_by_user_id
+
+
+def _bulk_get_users_by_username_or_email(usernames_or_emails):
+    """
+    Returns a dict mapping each of the given usernames or emails to its User,
+    looked up in batches. Values that do not match a user are omitted.
+    """
+    users = {}
+    emails = [value for value in usernames_or_emails if '@' in value]
+    usernames = [value for value in usernames_or_emails if '@' not in value]
+    for field, values in (('email', emails), ('username', usernames)):
+        # Lookups are case-insensitive on MySQL, so match on the lowercased
+        # value when the exact value isn't found.
+        lowercased = {value.lower(): value for value in values}
+        for batch in chunks(values, BULK_COHORT_BATCH_SIZE):
+            for user in User.objects.filter(**{field + '__in': batch}):
+                key = getattr(user, field)
+                users[key if key in usernames_or_emails else lowercased.get(key.lower(), key)] = user
+    return users
+
+
+def _bulk_get_cohorts_by_user_id(course_key, user_ids):
+    """
+    Returns a dict mapping the ids of the given users that are in a cohort of
+    the course to that CourseUserGroup.
+    """
+    cohorts_by_user_id = {}
+    for batch in chunks(user_ids, BULK_COHORT_BATCH_SIZE):
+        for membership in CohortMembership.objects.filter(
+                course_id=course_key, user_id__in=batch
+        ).select_related('course_user_group'):
+            cohorts_by_user_id[membership.user_id] = membership.course_user_group
+    return cohorts_by_user_id
+
+
+def _bulk_apply_cohort_memberships(course_key, original_cohorts, cohorts_by_user_id):
+    """
+    Writes the difference between two {user_id: CourseUserGroup} mappings of
+    cohort memberships in the course, keeping the CourseUserGroup users in
+    sync with the CohortMembership rows.
+
+    Since the bulk writes bypass the m2m_changed signal, returns the list of
+    (event_name, event) membership tracking events that it would have emitted.
+    """
+    through_model = CourseUserGroup.users.through
+    created_user_ids = []
+    moved_user_ids_by_cohort = {}
+    removed_user_ids_by_cohort = {}
+    events = []
+
+    for user_id, cohort in cohorts_by_user_id.iteritems():
+        previous_cohort = original_cohorts.get(user_id)
+        if previous_cohort is None:
+            created_user_ids.append(user_id)
+        elif previous_cohort.id != cohort.id:
+            moved_user_ids_by_cohort.setdefault(cohort, []).append(user_id)
+            removed_user_ids_by_cohort.setdefault(previous_cohort, []).append(user_id)
+        else:
+            continue
+        events.append((
+            "edx.cohort.user_added",
+            {"cohort_id": cohort.id, "cohort_name": cohort.name, "user_id": user_id}
+        ))
+
+    for cohort, user_ids in removed_user_ids_by_cohort.iteritems():
+        for batch in chunks(user_ids, BULK_COHORT_BATCH_SIZE):
+            through_model.objects.filter(courseusergroup_id=cohort.id, user_id__in=batch).delete()
+        events.extend(
+            ("edx.cohort.user_removed", {"cohort_id": cohort.id, "cohort_name": cohort.name, "user_id": user_id})
+            for user_id in user_ids
+        )
+
+    for cohort, user_ids in moved_user_ids_by_cohort.iteritems():
+        for batch in chunks(user_ids, BULK_COHORT_BATCH_SIZE):
+            CohortMembership.objects.filter(course_id=course_key, user_id__in=batch).update(course_user_group=cohort)
+
+    CohortMembership.objects.bulk_create(
+        [
+            CohortMembership(user_id=user_id, course_user_group=cohorts_by_user_id[user_id], course_id=course_key)
+            for user_id in created_user_ids
+        ],
+        batch_size=BULK_COHORT_BATCH_SIZE,
+    )
+    added_user_ids = created_user_ids + [
+        user_id for user_ids in moved_user_ids_by_cohort.itervalues() for user_id in user_ids
+    ]
+    through_model.objects.bulk_create(
+        [
+            through_model(courseusergroup_id=cohorts_by_user_id[user_id].id, user_id=user_id)
+            for user_id in added_user_ids
+        ],
+        batch_size=BULK_COHORT_BATCH_SIZE,
+    )
+
+    # Report removals before additions, as the m2m_changed signal does.
+    return sorted(events, key=lambda event: event[0] != "edx.cohort.user_removed")
+
+
+def _bulk_apply_preassignments(course_key, preassigned_cohorts):
+    """
+    Creates or updates the UnregisteredLearnerCohortAssignments for the given
+    {email: CourseUserGroup} mapping.
+    """
+    preassigned_cohorts = dict(preassigned_cohorts)
+    existing_ids_by_cohort = {}
+    for batch in chunks(preassigned_cohorts.keys(), BULK_COHORT_BATCH_SIZE):
+        for assignment_id, email in UnregisteredLearnerCohortAssignments.objects.filter(
+                course_id=course_key, email__in=batch
+        ).values_list('id', 'email'):
+            existing_ids_by_cohort.setdefault(preassigned_cohorts.pop(email), []).append(assignment_id)
+
+    for cohort, assignment_ids in existing_ids_by_cohort.iteritems():
+        for batch in chunks(assignment_ids, BULK_COHORT_BATCH_SIZE):
+            UnregisteredLearnerCohortAssignments.objects.filter(id__in=batch).update(course_user_group=cohort)
+
+    UnregisteredLearnerCohortAssignments.objects.bulk_create(
+        [
+            UnregisteredLearnerCohortAssignments(course_user_group=cohort, email=email, course_id=course_key)
+            for email, cohort in preassigned_cohorts.iteritems()
+        ],
+        batch_size=BULK_COHORT_BATCH_SIZE,
+    )
+
+
 def is_user_in_cohort(cohort, user_id, group_type=CourseUserGroup.COHORT):
     """
     Returns True or False if a user is in a cohort
@@ -529,7 +889,7 @@ def get_group_info_for_cohort(cohort, use_cached=False):
     use_cached=True to use the cached value instead of fetching from the
     database.
     """
-    cache = request_cache.get_cache(u"cohorts.get_group_info_for_cohort")
+    cache = request_cache.get_cache(GROUP_INFO_CACHE_NAMESPACE)
     cache_key = unicode(cohort.id)
 
     if use_cached and cache_key in cache:
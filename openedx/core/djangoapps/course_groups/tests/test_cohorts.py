@@ -19,7 +19,13 @@ from xmodule.modulestore.tests.django_utils import TEST_DATA_MIXED_MODULESTORE,
 from xmodule.modulestore.tests.factories import ToyCourseFactory
 
 from .. import cohorts
-from ..models import CourseCohort, CourseUserGroup, CourseUserGroupPartitionGroup
+from ..models import (
+    CohortMembership,
+    CourseCohort,
+    CourseUserGroup,
+    CourseUserGroupPartitionGroup,
+    UnregisteredLearnerCohortAssignments
+)
 from ..tests.helpers import CohortFactory, CourseCohortFactory, config_course_cohorts, config_course_cohorts_legacy
 
 
@@ -662,6 +668,157 @@ class TestCohorts(ModuleStoreTestCase):
             lambda: cohorts.add_user_to_cohort(first_cohort, "non_existent_username")
         )
 
+    @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
+    def test_bulk_add_users_to_cohorts(self, mock_tracker):
+        """
+        Make sure cohorts.bulk_add_users_to_cohorts() reports the same outcomes
+        and emits the same events as repeated calls to add_user_to_cohort().
+        """
+        course_user = UserFactory(username="Username", email="a@b.com")
+        other_user = UserFactory(username="OtherUsername", email="b@b.com")
+        course = modulestore().get_course(self.toy_course_key)
+        first_cohort = CohortFactory(course_id=course.id, name="FirstCohort", users=[other_user])
+        second_cohort = CohortFactory(course_id=course.id, name="SecondCohort")
+
+        results = cohorts.bulk_add_users_to_cohorts(course.id, [
+            ("Username", first_cohort),
+            ("b@b.com", first_cohort),
+            ("a@b.com", second_cohort),
+            ("new_email@example.com", first_cohort),
+            ("non_existent_username", first_cohort),
+            ("invalid@email", first_cohort),
+        ])
+        self.assertEqual(
+            [(result.status, result.user, result.previous_cohort) for result in results],
+            [
+                (cohorts.COHORT_ASSIGNMENT_ADDED, course_user, None),
+                (cohorts.COHORT_ASSIGNMENT_ALREADY_PRESENT, other_user, None),
+                (cohorts.COHORT_ASSIGNMENT_ADDED, course_user, first_cohort),
+                (cohorts.COHORT_ASSIGNMENT_PREASSIGNED, None, None),
+                (cohorts.COHORT_ASSIGNMENT_NOT_FOUND, None, None),
+                (cohorts.COHORT_ASSIGNMENT_INVALID_EMAIL, None, None),
+            ]
+        )
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.user_add_requested",
+            {
+                "user_id": course_user.id,
+                "cohort_id": second_cohort.id,
+                "cohort_name": second_cohort.name,
+                "previous_cohort_id": first_cohort.id,
+                "previous_cohort_name": first_cohort.name,
+            }
+        )
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.user_added",
+            {"cohort_id": second_cohort.id, "cohort_name": second_cohort.name, "user_id": course_user.id}
+        )
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.email_address_preassigned",
+            {
+                "user_email": "new_email@example.com",
+                "cohort_id": first_cohort.id,
+                "cohort_name": first_cohort.name,
+            }
+        )
+
+        # Only the last assignment of a user is written
+        self.assertEqual(cohorts.get_cohort(course_user, course.id, assign=False), second_cohort)
+        self.assertEqual(list(second_cohort.users.all()), [course_user])
+        self.assertEqual(list(first_cohort.users.all()), [other_user])
+        self.assertTrue(
+            UnregisteredLearnerCohortAssignments.objects.filter(
+                email="new_email@example.com", course_user_group=first_cohort
+            ).exists()
+        )
+
+        # Moving the user back updates the existing membership
+        results = cohorts.bulk_add_users_to_cohorts(course.id, [("Username", first_cohort)])
+        self.assertEqual(results[0].previous_cohort, second_cohort)
+        self.assertEqual(CohortMembership.objects.get(user=course_user).course_user_group, first_cohort)
+        self.assertEqual(set(first_cohort.users.all()), {course_user, other_user})
+        self.assertFalse(second_cohort.users.exists())
+
+    def test_bulk_add_users_to_cohorts_wrong_course(self):
+        """
+        Make sure cohorts.bulk_add_users_to_cohorts() refuses cohorts from other courses.
+        """
+        cohort = CohortFactory(name="OtherCourseCohort")
+        with self.assertRaises(ValueError):
+            cohorts.bulk_add_users_to_cohorts(self.toy_course_key, [("Username", cohort)])
+
+    def test_bulk_add_users_to_cohorts_integrity_error(self):
+        """
+        Make sure cohorts.bulk_add_users_to_cohorts() falls back to
+        add_user_to_cohort() when the memberships are changed concurrently.
+        """
+        course_user = UserFactory(username="Username", email="a@b.com")
+        course = modulestore().get_course(self.toy_course_key)
+        first_cohort = CohortFactory(course_id=course.id, name="FirstCohort", users=[course_user])
+        second_cohort = CohortFactory(course_id=course.id, name="SecondCohort")
+
+        with patch(
+            "openedx.core.djangoapps.course_groups.cohorts._bulk_apply_cohort_memberships",
+            side_effect=IntegrityError,
+        ):
+            results = cohorts.bulk_add_users_to_cohorts(course.id, [
+                ("Username", second_cohort),
+                ("a@b.com", second_cohort),
+                ("new_email@example.com", first_cohort),
+                ("non_existent_username", first_cohort),
+            ])
+
+        self.assertEqual(
+            [(result.status, result.user, result.previous_cohort) for result in results],
+            [
+                (cohorts.COHORT_ASSIGNMENT_ADDED, course_user, first_cohort),
+                (cohorts.COHORT_ASSIGNMENT_ALREADY_PRESENT, course_user, None),
+                (cohorts.COHORT_ASSIGNMENT_PREASSIGNED, None, None),
+                (cohorts.COHORT_ASSIGNMENT_NOT_FOUND, None, None),
+            ]
+        )
+        self.assertEqual(cohorts.get_cohort(course_user, course.id, assign=False), second_cohort)
+
+    def test_bulk_add_users_to_cohorts_queries(self):
+        """
+        Make sure the number of queries made by cohorts.bulk_add_users_to_cohorts()
+        does not depend on the number of users.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        first_cohort = CohortFactory(course_id=course.id, name="FirstCohort")
+        second_cohort = CohortFactory(course_id=course.id, name="SecondCohort")
+        users = [UserFactory() for __ in range(10)]
+        cohorts.bulk_add_users_to_cohorts(course.id, [(user.username, first_cohort) for user in users[:5]])
+
+        with self.assertNumQueries(8):
+            cohorts.bulk_add_users_to_cohorts(course.id, [(user.username, second_cohort) for user in users])
+
+        self.assertEqual(set(second_cohort.users.all()), set(users))
+        self.assertEqual(CohortMembership.objects.filter(course_user_group=second_cohort).count(), 10)
+
+    def test_bulk_cache_cohorts_with_assign(self):
+        """
+        Make sure cohorts.bulk_cache_cohorts() assigns users to their
+        preassigned or random cohort in bulk, and caches the assignments.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True, auto_cohorts=["AutoGroup"])
+        manual_cohort = CohortFactory(course_id=course.id, name="ManualCohort")
+        cohorts.add_user_to_cohort(manual_cohort, "preassigned@example.com")
+        preassigned_user = UserFactory(email="preassigned@example.com")
+        other_users = [UserFactory() for __ in range(3)]
+
+        cohorts.bulk_cache_cohorts(course.id, [preassigned_user] + other_users, assign=True)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(cohorts.get_cohort(preassigned_user, course.id, use_cached=True), manual_cohort)
+            for user in other_users:
+                self.assertEqual(cohorts.get_cohort(user, course.id, use_cached=True).name, "AutoGroup")
+            self.assertEqual(cohorts.get_group_info_for_cohort(manual_cohort, use_cached=True), (None, None))
+
+        self.assertEqual(set(CourseUserGroup.objects.get(name="AutoGroup").users.all()), set(other_users))
+        self.assertFalse(UnregisteredLearnerCohortAssignments.objects.filter(email="preassigned@example.com").exists())
+
     @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
     def add_user_to_cohorts_race_condition(self, mock_tracker):
         """
@@ -6,6 +6,7 @@ from django.core.cache import cache
 from django.core.urlresolvers import reverse
 
 import pygeoip
+from openedx.core.djangoapps.geoinfo.api import clear_cache as clear_geoinfo_cache
 
 from .models import Country, CountryAccessRule, RestrictedCourse
 
@@ -44,6 +45,7 @@ def restrict_course(course_key, access_point="enrollment", disable_access_check=
     # Clear the cache to ensure that previous tests don't interfere
     # with this test.
     cache.clear()
+    clear_geoinfo_cache()
 
     with mock.patch.object(pygeoip.GeoIP, 'country_code_by_addr') as mock_ip:
 
@@ -81,4 +83,8 @@ def restrict_course(course_key, access_point="enrollment", disable_access_check=
                 'message_key': 'default'
             }
         )
-        yield redirect_url
+        try:
+            yield redirect_url
+        finally:
+            # Don't keep the mocked country of the IP address for later lookups.
+            clear_geoinfo_cache()
@@ -13,6 +13,7 @@ from django.test.utils import override_settings
 from django.core.cache import cache
 from django.db import connection
 
+from openedx.core.djangoapps.geoinfo.api import clear_cache as clear_geoinfo_cache
 from openedx.core.djangolib.testing.utils import skip_unless_lms
 from student.tests.factories import UserFactory
 from xmodule.modulestore.tests.factories import CourseFactory
@@ -232,9 +233,13 @@ class EmbargoCheckAccessApiTests(ModuleStoreTestCase):
         """
         Mock for the GeoIP module.
         """
+        clear_geoinfo_cache()
         with mock.patch.object(pygeoip.GeoIP, 'country_code_by_addr') as mock_ip:
             mock_ip.return_value = country_code
-            yield
+            try:
+                yield
+            finally:
+                clear_geoinfo_cache()
 
 
 @ddt.ddt
@@ -0,0 +1,178 @@
+"""
+Country lookups of IP addresses, shared by every thread of the process.
+
+The GeoIP databases configured by the GEOIP_PATH and GEOIPV6_PATH settings
+are opened once per process with memory-mapped access, instead of on every
+lookup, and are reopened when the database files are replaced. The country
+of recently looked up addresses is kept in a bounded LRU cache.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import dogstats_wrapper as dog_stats_api
+from django.conf import settings
+
+import pygeoip
+
+log = logging.getLogger(__name__)
+
+# Maximum number of IP addresses whose country is cached.
+LOOKUP_CACHE_SIZE = 10000
+
+# Minimum number of seconds between checks that a database file was replaced.
+RELOAD_CHECK_INTERVAL = 60
+
+
+def country_code_by_addr(ip_addr):
+    """
+    Return the country code associated with an IP address.
+    Handles both IPv4 and IPv6 addresses.
+
+    Args:
+        ip_addr (str): The IP address to look up.
+
+    Returns:
+        str: A 2-letter country code, or an empty string if the country is unknown.
+    """
+    country_code = _lookup_cache.get(ip_addr)
+    if country_code is not None:
+        dog_stats_api.increment('geoinfo.lookups', tags=['result:hit'])
+        return country_code
+
+    dog_stats_api.increment('geoinfo.lookups', tags=['result:miss'])
+    path = settings.GEOIPV6_PATH if ip_addr.find(':') >= 0 else settings.GEOIP_PATH
+    start_time = time.time()
+    country_code = _get_database(path).country_code_by_addr(ip_addr)
+    dog_stats_api.histogram('geoinfo.lookup_time', time.time() - start_time)
+
+    _lookup_cache.set(ip_addr, country_code)
+    return country_code
+
+
+def clear_cache():
+    """
+    Clear the cached countries of IP addresses, e.g. when the database lookups are mocked in tests.
+    """
+    _lookup_cache.clear()
+
+
+class _LRUCache(object):
+    """
+    Thread-safe mapping holding at most max_size items, evicting the least recently used.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the value cached for the key, or None if it isn't cached.
+        """
+        with self._lock:
+            value = self._items.pop(key, None)
+            if value is not None:
+                self._items[key] = value
+            return value
+
+    def set(self, key, value):
+        """
+        Cache the value of the key, evicting the least recently used item if the cache is full.
+        """
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = value
+            if len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove every item from the cache.
+        """
+        with self._lock:
+            self._items.clear()
+
+
+class _GeoIPDatabase(object):
+    """
+    A GeoIP database file opened with memory-mapped access, which is reopened
+    when the file is replaced, as checked every RELOAD_CHECK_INTERVAL seconds.
+
+    Lookups are safe from any thread. The file should be replaced atomically
+    (e.g. renamed over), since the previous version stays mapped until every
+    lookup in progress completes.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._reader = None
+        self._mtime = None
+        self._checked_at = 0
+        self._load()
+
+    def country_code_by_addr(self, ip_addr):
+        """
+        Return the country code associated with an IP address of the database's version.
+        """
+        if time.time() - self._checked_at > RELOAD_CHECK_INTERVAL:
+            self._reload_if_changed()
+        return self._reader.country_code_by_addr(ip_addr)
+
+    def _load(self):
+        """
+        Open the database file.
+        """
+        mtime = os.stat(self.path).st_mtime
+        # Bypass pygeoip's own instance cache, which would return the reader of the replaced file.
+        self._reader = pygeoip.GeoIP(self.path, pygeoip.MMAP_CACHE, cache=False)
+        self._mtime = mtime
+        self._checked_at = time.time()
+
+    def _reload_if_changed(self):
+        """
+        Reopen the database file if it was replaced since it was opened.
+        """
+        with self._lock:
+            if time.time() - self._checked_at <= RELOAD_CHECK_INTERVAL:
+                # Another thread just checked.
+                return
+            self._checked_at = time.time()
+            try:
+                changed = os.stat(self.path).st_mtime != self._mtime
+            except OSError:
+                log.exception(u'Could not check the GeoIP database %s, keeping the opened one.', self.path)
+                return
+            if not changed:
+                return
+            try:
+                self._load()
+            except Exception:  # pylint: disable=broad-except
+                log.exception(u'Could not reload the GeoIP database %s, keeping the opened one.', self.path)
+                return
+
+        # The countries of addresses may have changed.
+        _lookup_cache.clear()
+        dog_stats_api.increment('geoinfo.database_reloads')
+        log.info(u'Reloaded the GeoIP database %s', self.path)
+
+
+def _get_database(path):
+    """
+    Return the _GeoIPDatabase of the file at the given path, opening it on first use.
+    """
+    path = unicode(path)
+    database = _databases.get(path)
+    if database is None:
+        with _databases_lock:
+            database = _databases.get(path)
+            if database is None:
+                database = _databases[path] = _GeoIPDatabase(path)
+    return database
+
+
+_lookup_cache = _LRUCache(LOOKUP_CACHE_SIZE)
+_databases = {}
+_databases_lock = threading.Lock()
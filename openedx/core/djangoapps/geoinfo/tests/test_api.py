@@ -0,0 +1,64 @@
+"""
+Tests for the country lookups of IP addresses.
+"""
+import os
+import shutil
+from tempfile import mkdtemp
+
+import pygeoip
+from django.conf import settings
+from django.test import TestCase
+from django.test.utils import override_settings
+from mock import patch
+
+from openedx.core.djangoapps.geoinfo import api
+
+
+class CountryCodeByAddrTests(TestCase):
+    """
+    Tests of country_code_by_addr.
+    """
+    def setUp(self):
+        super(CountryCodeByAddrTests, self).setUp()
+        api.clear_cache()
+        self.addCleanup(api.clear_cache)
+
+    def test_lookups_cached(self):
+        with patch.object(pygeoip.GeoIP, 'country_code_by_addr', return_value='CN') as mock_ip:
+            self.assertEqual(api.country_code_by_addr('117.79.83.1'), 'CN')
+            self.assertEqual(api.country_code_by_addr('117.79.83.1'), 'CN')
+            self.assertEqual(api.country_code_by_addr('2001:da8:20f:1502:edcf:550b:4a9c:207d'), 'CN')
+
+        self.assertEqual(mock_ip.call_count, 2)
+
+    def test_least_recently_used_evicted(self):
+        with patch.object(api._lookup_cache, 'max_size', 2):  # pylint: disable=protected-access
+            with patch.object(pygeoip.GeoIP, 'country_code_by_addr', return_value='CN') as mock_ip:
+                for ip_addr in ('1.0.0.1', '1.0.0.2', '1.0.0.1', '1.0.0.3', '1.0.0.1', '1.0.0.2'):
+                    api.country_code_by_addr(ip_addr)
+
+        self.assertEqual(
+            [call[0][0] for call in mock_ip.call_args_list],
+            ['1.0.0.1', '1.0.0.2', '1.0.0.3', '1.0.0.2'],
+        )
+
+    def test_database_reloaded_when_replaced(self):
+        directory = mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'GeoIP.dat')
+        shutil.copy(settings.GEOIP_PATH, path)
+        self.addCleanup(api._databases.pop, path, None)  # pylint: disable=protected-access
+
+        with override_settings(GEOIP_PATH=path):
+            database = api._get_database(path)  # pylint: disable=protected-access
+            reader = database._reader  # pylint: disable=protected-access
+            self.assertIsNotNone(api.country_code_by_addr('117.79.83.1'))
+
+            # Replace the database file, which is checked once the reload interval elapses.
+            os.utime(path, (1000, 1000))
+            with patch.object(api, 'RELOAD_CHECK_INTERVAL', -1):
+                api.country_code_by_addr('117.79.83.2')
+
+            self.assertIsNot(database._reader, reader)  # pylint: disable=protected-access
+            # The cached countries of addresses are cleared.
+            self.assertIsNone(api._lookup_cache.get('117.79.83.1'))  # pylint: disable=protected-access
@@ -9,6 +9,7 @@ from django.contrib.sessions.middleware import SessionMiddleware
 from django.test import TestCase
 from django.test.client import RequestFactory
 
+from openedx.core.djangoapps.geoinfo.api import clear_cache
 from openedx.core.djangoapps.geoinfo.middleware import CountryMiddleware
 from student.tests.factories import UserFactory, AnonymousUserFactory
 
@@ -27,6 +28,9 @@ class CountryMiddlewareTests(TestCase):
         self.patcher = patch.object(pygeoip.GeoIP, 'country_code_by_addr', self.mock_country_code_by_addr)
         self.patcher.start()
         self.addCleanup(self.patcher.stop)
+        # Don't look up countries mocked by other tests, nor leave mocked ones behind.
+        clear_cache()
+        self.addCleanup(clear_cache)
 
     def mock_country_code_by_addr(self, ip_addr):
         """
@@ -15,6 +15,12 @@ from request_cache.middleware import RequestCache
 
 logger = getLogger(__name__)  # pylint: disable=invalid-name
 
+# Per-process caches of the theme paths resolved on the filesystem, which do
+# not change while the process runs. They are bypassed when settings.DEBUG is
+# True, so that templates added to a theme during development are picked up.
+_THEMED_TEMPLATE_PATHS = {}
+_THEME_BASE_DIRS = {}
+
 
 def get_template_path(relative_path, **kwargs):
     """
@@ -71,12 +77,29 @@ def get_template_path_with_theme(relative_path):
     # strip `/` if present at the start of relative_path
     template_name = re.sub(r'^/+', '', relative_path)
 
+    cache_key = (theme.themes_base_dir, theme.theme_dir_name, get_project_root_name(), relative_path)
+    if cache_key in _THEMED_TEMPLATE_PATHS:
+        return _THEMED_TEMPLATE_PATHS[cache_key]
+
     template_path = theme.template_path / template_name
     absolute_path = theme.path / "templates" / template_name
     if absolute_path.exists():
-        return str(template_path)
+        themed_path = str(template_path)
     else:
-        return relative_path
+        themed_path = relative_path
+
+    if not settings.DEBUG:
+        _THEMED_TEMPLATE_PATHS[cache_key] = themed_path
+    return themed_path
+
+
+def clear_theme_path_caches():
+    """
+    Clears the per-process caches of theme paths, e.g. after templates have
+    been added to or removed from a theme.
+    """
+    _THEMED_TEMPLATE_PATHS.clear()
+    _THEME_BASE_DIRS.clear()
 
 
 def get_all_theme_template_dirs():
@@ -218,8 +241,15 @@ def get_theme_base_dir(theme_dir_name, suppress_error=False):
     Returns:
         (str): Base directory that contains the given theme
     """
-    for themes_dir in get_theme_base_dirs():
+    themes_dirs = get_theme_base_dirs()
+    cache_key = (theme_dir_name, tuple(themes_dirs))
+    if cache_key in _THEME_BASE_DIRS:
+        return _THEME_BASE_DIRS[cache_key]
+
+    for themes_dir in themes_dirs:
         if theme_dir_name in get_theme_dirs(themes_dir):
+            if not settings.DEBUG:
+                _THEME_BASE_DIRS[cache_key] = themes_dir
             return themes_dir
 
     if suppress_error:
@@ -221,6 +221,27 @@ class TestHelpersLMS(TestCase):
         template_path = get_template_path_with_theme('course.html')
         self.assertEqual(template_path, 'course.html')
 
+    @with_comprehensive_theme('red-theme')
+    def test_get_template_path_with_theme_cached(self):
+        """
+        Tests themed template paths are only resolved on the filesystem once per process.
+        """
+        theming_helpers.clear_theme_path_caches()
+        self.addCleanup(theming_helpers.clear_theme_path_caches)
+        self.assertEqual(get_template_path_with_theme('header.html'), 'red-theme/lms/templates/header.html')
+        self.assertEqual(get_template_path_with_theme('course.html'), 'course.html')
+
+        with patch('openedx.core.djangoapps.theming.helpers.os.listdir') as mock_listdir:
+            with patch('openedx.core.djangoapps.theming.helpers.Path.exists') as mock_exists:
+                self.assertEqual(get_template_path_with_theme('header.html'), 'red-theme/lms/templates/header.html')
+                self.assertEqual(get_template_path_with_theme('course.html'), 'course.html')
+        self.assertFalse(mock_listdir.called)
+        self.assertFalse(mock_exists.called)
+
+        # Paths with a leading slash are cached separately.
+        self.assertEqual(get_template_path_with_theme('/course.html'), '/course.html')
+        self.assertEqual(get_template_path_with_theme('course.html'), 'course.html')
+
     def test_get_template_path_with_theme_disabled(self):
         """
         Tests default template paths are returned when theme is non theme is enabled.
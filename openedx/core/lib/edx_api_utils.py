@@ -2,10 +2,14 @@
 from __future__ import unicode_literals
 
 import logging
+import math
+import time
+from multiprocessing.pool import ThreadPool
 
 from django.conf import settings
 from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
+from dogapi import dog_stats_api
 from edx_rest_api_client.client import EdxRestApiClient
 from provider.oauth2.models import Client
 
@@ -14,6 +18,33 @@ from openedx.core.lib.token_utils import JwtBuilder
 
 log = logging.getLogger(__name__)
 
+# Number of seconds for which a cached response is kept, and may be served,
+# after its cache_ttl has expired, while a single worker refreshes it.
+DEFAULT_STALE_CACHE_TTL = 60 * 60
+
+# Number of seconds after which the lock taken by the worker refreshing a
+# stale response is released, should that worker die mid-refresh.
+REFRESH_LOCK_TIMEOUT = 60
+
+# Maximum number of pages of a paginated response that are fetched at once.
+MAX_CONCURRENT_PAGE_REQUESTS = 4
+
+CACHE_METRIC_NAME = 'edx_api_data.cache'
+
+
+def increment_cache_metric(api_name, result, value=1):
+    """
+    Records a cache lookup for data retrieved from the given API.
+
+    Arguments:
+        api_name (str): Name of the API, e.g. 'catalog'.
+        result (str): One of 'hit', 'stale', 'miss' or 'refresh'.
+        value (int): Number of lookups to record.
+    """
+    dog_stats_api.increment(
+        CACHE_METRIC_NAME, value=value, tags=['api:{}'.format(api_name), 'result:{}'.format(result)]
+    )
+
 
 def get_edx_api_data(api_config, resource, api, resource_id=None, querystring=None, cache_key=None, many=True,
                      traverse_pagination=True):
@@ -21,6 +52,9 @@ def get_edx_api_data(api_config, resource, api, resource_id=None, querystring=No
 
     DRY utility for handling caching and pagination.
 
+    Cached data is considered fresh for the configured cache_ttl, after which
+    it is served stale while a single worker refreshes it.
+
     Arguments:
         api_config (ConfigurationModel): The configuration model governing interaction with the API.
         resource (str): Name of the API resource being requested.
@@ -45,13 +79,27 @@ def get_edx_api_data(api_config, resource, api, resource_id=None, querystring=No
         log.warning('%s configuration is disabled.', api_config.API_NAME)
         return no_data
 
+    stale_results = None
     if cache_key:
         cache_key = '{}.{}'.format(cache_key, resource_id) if resource_id is not None else cache_key
         cache_key += '.zpickled'
 
         cached = cache.get(cache_key)
-        if cached:
-            return zunpickle(cached)
+        if isinstance(cached, tuple):
+            fresh_until, zdata = cached
+            if time.time() < fresh_until:
+                increment_cache_metric(api_config.API_NAME, 'hit')
+                return zunpickle(zdata)
+
+            # Only the worker holding the lock refreshes stale data; the others serve it as is.
+            if not cache.add(_refresh_lock_key(cache_key), True, REFRESH_LOCK_TIMEOUT):
+                increment_cache_metric(api_config.API_NAME, 'stale')
+                return zunpickle(zdata)
+
+            increment_cache_metric(api_config.API_NAME, 'refresh')
+            stale_results = zunpickle(zdata)
+        else:
+            increment_cache_metric(api_config.API_NAME, 'miss')
 
     try:
         endpoint = getattr(api, resource)
@@ -66,24 +114,44 @@ def get_edx_api_data(api_config, resource, api, resource_id=None, querystring=No
             results = response
     except:  # pylint: disable=bare-except
         log.exception('Failed to retrieve data from the %s API.', api_config.API_NAME)
+        if stale_results is not None:
+            cache.delete(_refresh_lock_key(cache_key))
+            return stale_results
         return no_data
 
     if cache_key:
         zdata = zpickle(results)
-        cache.set(cache_key, zdata, api_config.cache_ttl)
+        stale_ttl = getattr(settings, 'EDX_API_STALE_CACHE_TTL', DEFAULT_STALE_CACHE_TTL)
+        cache.set(cache_key, (time.time() + api_config.cache_ttl, zdata), api_config.cache_ttl + stale_ttl)
+        if stale_results is not None:
+            cache.delete(_refresh_lock_key(cache_key))
 
     return results
 
 
+def _refresh_lock_key(cache_key):
+    """Returns the key of the lock held by the worker refreshing the data cached under cache_key."""
+    return '{}.refresh_lock'.format(cache_key)
+
+
 def _traverse_pagination(response, endpoint, querystring, no_data):
     """Traverse a paginated API response.
 
     Extracts and concatenates "results" (list of dict) returned by DRF-powered APIs.
+
+    When the response includes the total "count" of results, the number of
+    pages is known after the first one, and the remaining pages are fetched
+    concurrently. Otherwise, pages are followed one "next" link at a time.
     """
     results = response.get('results', no_data)
+    next_page = response.get('next')
+
+    count = response.get('count')
+    if next_page and count and results:
+        page_count = int(math.ceil(float(count) / len(results)))
+        return results + _get_pages(endpoint, querystring, range(2, page_count + 1), no_data)
 
     page = 1
-    next_page = response.get('next')
     while next_page:
         page += 1
         querystring['page'] = page
@@ -92,3 +160,25 @@ def _traverse_pagination(response, endpoint, querystring, no_data):
         next_page = response.get('next')
 
     return results
+
+
+def _get_pages(endpoint, querystring, pages, no_data):
+    """Fetches the given pages of a paginated API response concurrently, and concatenates their "results"."""
+    if not pages:
+        return []
+
+    def get_page(page):
+        """Returns the "results" of a single page."""
+        return endpoint.get(**dict(querystring, page=page)).get('results', no_data)
+
+    pool = ThreadPool(min(len(pages), MAX_CONCURRENT_PAGE_REQUESTS))
+    try:
+        page_results = pool.map(get_page, pages)
+    finally:
+        pool.close()
+        pool.join()
+
+    results = []
+    for page_result in page_results:
+        results += page_result
+    return results
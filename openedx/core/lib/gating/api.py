@@ -9,6 +9,7 @@ from opaque_keys.edx.keys import UsageKey
 
 from lms.djangoapps.courseware.access import _has_access_to_course
 from openedx.core.lib.gating.exceptions import GatingValidationError
+from util import milestones_helpers
 from xmodule.modulestore.django import modulestore
 
 log = logging.getLogger(__name__)
@@ -103,10 +104,15 @@ def find_gating_milestones(course_key, content_key=None, relationship=None, user
     Returns:
         list: A list of milestone dicts
     """
-    return [
-        m for m in milestones_api.get_course_content_milestones(course_key, content_key, relationship, user)
-        if GATING_NAMESPACE_QUALIFIER in m.get('namespace')
-    ]
+    if user is not None and relationship is not None:
+        # The user's unfulfilled milestones are found in the milestones of
+        # the course and of the user cached for the request.
+        milestones = milestones_helpers.get_user_course_milestones(course_key, user['id']).unfulfilled_milestones(
+            relationship, content_key
+        )
+    else:
+        milestones = milestones_api.get_course_content_milestones(course_key, content_key, relationship, user)
+    return [m for m in milestones if GATING_NAMESPACE_QUALIFIER in m.get('namespace')]
 
 
 def get_gating_milestone(course_key, content_key, relationship):
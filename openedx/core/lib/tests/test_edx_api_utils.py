@@ -232,6 +232,89 @@ class TestGetEdxApiData(CatalogIntegrationMixin, CredentialsApiConfigMixin, Cach
         # Verify that only two requests were made, not four.
         self._assert_num_requests(2)
 
+    @waffle.testutils.override_switch("populate-multitenant-programs", True)
+    def test_get_paginated_data_concurrently(self):
+        """Verify that the remaining pages are all requested once the number of pages is known."""
+        catalog_integration = self.create_catalog_integration()
+        api = create_catalog_api_client(self.user)
+
+        expected_collection = ['some', 'test', 'data', 'in', 'pages']
+        url = CatalogIntegration.current().get_internal_api_url().strip('/') + '/programs/?page={}'
+
+        def page_body(request, _uri, headers):
+            page = int(request.querystring.get('page', [1])[0])
+            data = {
+                'count': len(expected_collection),
+                'next': url.format(page + 1) if page < len(expected_collection) else None,
+                'results': [expected_collection[page - 1]],
+            }
+            return 200, headers, json.dumps(data)
+
+        httpretty.register_uri(
+            httpretty.GET,
+            CatalogIntegration.current().get_internal_api_url().strip('/') + '/programs/',
+            body=page_body,
+            content_type='application/json'
+        )
+
+        actual_collection = get_edx_api_data(catalog_integration, 'programs', api=api)
+        self.assertEqual(actual_collection, expected_collection)
+
+        self._assert_num_requests(len(expected_collection))
+
+    @waffle.testutils.override_switch("populate-multitenant-programs", True)
+    def test_stale_cache_refresh(self):
+        """Verify that expired data is refreshed by a single worker, while the others serve stale data."""
+        catalog_integration = self.create_catalog_integration(cache_ttl=5)
+        api = create_catalog_api_client(self.user)
+        cache_key = CatalogIntegration.current().CACHE_KEY
+
+        responses = [{'next': None, 'results': [version]} for version in ('stale', 'fresh')]
+        self._mock_catalog_api(
+            [httpretty.Response(body=json.dumps(body), content_type='application/json') for body in responses]
+        )
+
+        with mock.patch(UTILITY_MODULE + '.time.time', return_value=1000):
+            self.assertEqual(get_edx_api_data(catalog_integration, 'programs', api=api, cache_key=cache_key), ['stale'])
+
+        with mock.patch(UTILITY_MODULE + '.time.time', return_value=1010):
+            # Another worker is refreshing the data, so the stale data is served.
+            cache.add(cache_key + '.zpickled.refresh_lock', True)
+            self.assertEqual(get_edx_api_data(catalog_integration, 'programs', api=api, cache_key=cache_key), ['stale'])
+            self._assert_num_requests(1)
+
+            # Once the lock is released, this worker refreshes the data.
+            cache.delete(cache_key + '.zpickled.refresh_lock')
+            self.assertEqual(get_edx_api_data(catalog_integration, 'programs', api=api, cache_key=cache_key), ['fresh'])
+            self._assert_num_requests(2)
+
+            # The refreshed data is fresh, and the lock has been released.
+            self.assertEqual(get_edx_api_data(catalog_integration, 'programs', api=api, cache_key=cache_key), ['fresh'])
+            self._assert_num_requests(2)
+            self.assertIsNone(cache.get(cache_key + '.zpickled.refresh_lock'))
+
+    @mock.patch(UTILITY_MODULE + '.log.exception')
+    def test_stale_cache_refresh_failure(self, mock_exception):
+        """Verify that stale data is served if it can't be refreshed."""
+        catalog_integration = self.create_catalog_integration(cache_ttl=5)
+        api = create_catalog_api_client(self.user)
+        cache_key = CatalogIntegration.current().CACHE_KEY
+
+        self._mock_catalog_api([
+            httpretty.Response(body=json.dumps({'next': None, 'results': ['stale']}), content_type='application/json'),
+            httpretty.Response(body='clunk', content_type='application/json', status_code=500),
+        ])
+
+        with mock.patch(UTILITY_MODULE + '.time.time', return_value=1000):
+            get_edx_api_data(catalog_integration, 'programs', api=api, cache_key=cache_key)
+
+        with mock.patch(UTILITY_MODULE + '.time.time', return_value=1010):
+            actual = get_edx_api_data(catalog_integration, 'programs', api=api, cache_key=cache_key)
+
+        self.assertTrue(mock_exception.called)
+        self.assertEqual(actual, ['stale'])
+        self.assertIsNone(cache.get(cache_key + '.zpickled.refresh_lock'))
+
     @mock.patch(UTILITY_MODULE + '.log.warning')
     def test_api_config_disabled(self, mock_warning):
         """Verify that no data is retrieved if the provided config model is disabled."""
@@ -3,6 +3,8 @@
 Tests for xss_linter.py
 """
 import re
+import shutil
+import tempfile
 import textwrap
 from StringIO import StringIO
 from unittest import TestCase
@@ -13,6 +15,7 @@ from ddt import data, ddt
 from scripts.xss_linter import (
     FileResults,
     JavaScriptLinter,
+    LintResultsCache,
     MakoTemplateLinter,
     ParseString,
     PythonLinter,
@@ -227,6 +230,76 @@ class TestXSSLinter(TestCase):
         self.assertIsNotNone(re.search('{}:\s*{} violations'.format(Rules.python_wrap_html.rule_id, 1), output))
         self.assertIsNotNone(re.search('{} violations total'.format(7), output))
 
+    def _lint_templates(self, **kwargs):
+        """
+        Lints the test templates with default options, and returns the output.
+        """
+        out = StringIO()
+        summary_results = SummaryResults()
+
+        _lint(
+            'scripts/tests/templates',
+            template_linters=[MakoTemplateLinter(), UnderscoreTemplateLinter(), JavaScriptLinter(), PythonLinter()],
+            options={
+                'list_files': False,
+                'verbose': False,
+                'rule_totals': True,
+            },
+            summary_results=summary_results,
+            out=out,
+            **kwargs
+        )
+        return out.getvalue()
+
+    def test_lint_with_jobs(self):
+        """
+        Tests that linting in parallel gives the same output as linting serially.
+        """
+        output = self._lint_templates(jobs=2)
+        self.assertEqual(output, self._lint_templates())
+        self.assertIsNotNone(re.search('{} violations total'.format(7), output))
+
+    def test_lint_with_results_cache(self):
+        """
+        Tests that cached results are used for unchanged files.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        options = {'list_files': False, 'verbose': False}
+
+        output = self._lint_templates(results_cache=LintResultsCache(cache_dir, options))
+        self.assertEqual(output, self._lint_templates())
+
+        with mock.patch('scripts.xss_linter._process_file') as mock_process_file:
+            cached_output = self._lint_templates(results_cache=LintResultsCache(cache_dir, options))
+        self.assertFalse(mock_process_file.called)
+        self.assertEqual(cached_output, output)
+
+        # Results cached with other options are not used
+        with mock.patch('scripts.xss_linter._process_file') as mock_process_file:
+            self._lint_templates(results_cache=LintResultsCache(cache_dir, dict(options, verbose=True)))
+        self.assertTrue(mock_process_file.called)
+
+    @mock.patch('scripts.xss_linter.subprocess.check_output')
+    def test_lint_since(self, mock_check_output):
+        """
+        Tests that only the files changed since a git ref are linted.
+        """
+        mock_check_output.side_effect = [
+            'scripts/tests/templates/test.py\nscripts/tests/templates/deleted.js\nREADME.rst\n',
+            'scripts/tests/templates/test.underscore\n',
+        ]
+        output = self._lint_templates(since='master')
+
+        self.assertEqual(
+            mock_check_output.call_args_list[0],
+            mock.call(['git', 'diff', '--name-only', '--relative', '--diff-filter=d', 'master'])
+        )
+        self.assertIsNotNone(re.search('test\.py.*{}'.format(Rules.python_wrap_html.rule_id), output))
+        self.assertIsNotNone(re.search('test\.underscore.*{}'.format(Rules.underscore_not_escaped.rule_id), output))
+        self.assertIsNone(re.search('test\.html', output))
+        self.assertIsNone(re.search('test\.js', output))
+
     def test_lint_with_list_files(self):
         """
         Tests the top-level linting with list files option.
@@ -6,10 +6,16 @@ from __future__ import print_function
 
 import argparse
 import ast
+import hashlib
+import json
+import multiprocessing
 import os
 import re
+import subprocess
 import sys
+import tempfile
 import textwrap
+from StringIO import StringIO
 
 from enum import Enum
 
@@ -524,6 +530,19 @@ class SummaryResults(object):
         self.total_violations += 1
         self.totals_by_rule[violation.rule.rule_id] += 1
 
+    def merge(self, other):
+        """
+        Adds the violations summarized by another SummaryResults, for example
+        the results of a file linted in a separate process.
+
+        Arguments:
+            other: The SummaryResults to add to this summary.
+
+        """
+        self.total_violations += other.total_violations
+        for rule_id, total in other.totals_by_rule.iteritems():
+            self.totals_by_rule[rule_id] = self.totals_by_rule.get(rule_id, 0) + total
+
     def print_results(self, options, out):
         """
         Prints the results (i.e. violations) in this file.
@@ -2524,66 +2543,253 @@ def is_skip_dir(skip_dirs, directory):
     return False
 
 
-def _process_file(full_path, template_linters, options, summary_results, out):
+# The file extensions checked by at least one of the linters. Other files can
+# never have violations, so they are skipped without being read.
+LINTED_FILE_EXTENSIONS = ('.html', '.xml', '.underscore', '.js', '.coffee', '.py')
+
+
+class LintResultsCache(object):
     """
-    For each linter, lints the provided file.  This means finding and printing
-    violations.
+    An on-disk cache of the results of linting a file, keyed on a hash of the
+    contents of the file, so that unchanged files are not linted again on the
+    next run.
+
+    """
+
+    def __init__(self, cache_dir, options):
+        """
+        Init method.
+
+        Arguments:
+            cache_dir: The directory in which to store the cached results.
+            options: A list of the options. The options that change how the
+                results are printed are part of the cache key.
+
+        """
+        self.cache_dir = cache_dir
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+        # Any change to the linter itself invalidates all of the cached results.
+        linter_hash = hashlib.sha1()
+        with open(os.path.splitext(__file__)[0] + '.py', 'rb') as linter_file:
+            linter_hash.update(linter_file.read())
+        linter_hash.update(json.dumps([options['list_files'], options['verbose']]))
+        self.linter_digest = linter_hash.hexdigest()
+
+    def get_key(self, full_path):
+        """
+        Returns the cache key for the current contents of a file.
+
+        Arguments:
+            full_path: The full path of the file to lint.
+
+        """
+        key_hash = hashlib.sha1(self.linter_digest)
+        key_hash.update(full_path)
+        with open(full_path, 'rb') as input_file:
+            key_hash.update(input_file.read())
+        return key_hash.hexdigest()
+
+    def _get_cache_path(self, key):
+        """
+        Returns the path of the file holding the results for the given key.
+        """
+        return os.path.join(self.cache_dir, key + '.json')
+
+    def get(self, key):
+        """
+        Returns the cached (output, SummaryResults) for the given key, or None
+        if the results are not in the cache.
+        """
+        try:
+            with open(self._get_cache_path(key), 'r') as cache_file:
+                cached = json.load(cache_file)
+        except (IOError, ValueError):
+            return None
+        summary_results = SummaryResults()
+        summary_results.total_violations = cached['total_violations']
+        summary_results.totals_by_rule.update(cached['totals_by_rule'])
+        return cached['output'].encode('utf-8'), summary_results
+
+    def set(self, key, output, summary_results):
+        """
+        Stores the (output, SummaryResults) of linting a file under the given key.
+        """
+        cached = {
+            'output': output,
+            'total_violations': summary_results.total_violations,
+            'totals_by_rule': summary_results.totals_by_rule,
+        }
+        # Write to a temporary file first, so that concurrent processes never
+        # read partial results.
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(file_descriptor, 'w') as cache_file:
+            json.dump(cached, cache_file)
+        os.rename(temp_path, self._get_cache_path(key))
+
+
+def _lint_file(full_path, template_linters, options, results_cache=None):
+    """
+    For each linter, lints the provided file, without printing its violations.
 
     Arguments:
         full_path: The full path of the file to lint.
         template_linters: A list of linting objects.
         options: A list of the options.
-        summary_results: A SummaryResults with a summary of the violations.
-        out: output file
+        results_cache: An optional LintResultsCache.
+
+    Returns:
+        A tuple of the printed output and a SummaryResults for the file, which
+        can be merged into the overall results in any process.
 
     """
-    num_violations = 0
-    directory = os.path.dirname(full_path)
-    file_name = os.path.basename(full_path)
-    for template_linter in template_linters:
-        results = template_linter.process_file(directory, file_name)
-        results.print_results(options, summary_results, out)
+    cache_key = None
+    if results_cache is not None and full_path.lower().endswith(LINTED_FILE_EXTENSIONS):
+        cache_key = results_cache.get_key(full_path)
+        cached = results_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    out = StringIO()
+    summary_results = SummaryResults()
+    _process_file(full_path, template_linters, options, summary_results, out)
+    output = out.getvalue()
+
+    if cache_key is not None:
+        results_cache.set(cache_key, output, summary_results)
+    return output, summary_results
 
 
-def _process_os_dir(directory, files, template_linters, options, summary_results, out):
+# The state of a linting process of the pool used by _lint_files.
+_worker_state = {}
+
+
+def _init_lint_worker(template_linters, options, results_cache):
+    """
+    Initializes a linting process of the pool used by _lint_files.
+    """
+    _worker_state['template_linters'] = template_linters
+    _worker_state['options'] = options
+    _worker_state['results_cache'] = results_cache
+
+
+def _lint_file_in_worker(full_path):
+    """
+    Lints the provided file in a linting process of the pool used by _lint_files.
     """
-    Calls out to lint each file in the passed list of files.
+    return _lint_file(
+        full_path, _worker_state['template_linters'], _worker_state['options'], _worker_state['results_cache']
+    )
+
+
+def _lint_files(full_paths, template_linters, options, summary_results, out, jobs=1, results_cache=None):
+    """
+    Lints the provided files, printing their violations in the same order as
+    the files were provided.
 
     Arguments:
-        directory: Directory being linted.
-        files: All files in the directory to be linted.
+        full_paths: An iterable of the full paths of the files to lint.
         template_linters: A list of linting objects.
         options: A list of the options.
         summary_results: A SummaryResults with a summary of the violations.
         out: output file
+        jobs: The number of processes with which to lint files in parallel.
+        results_cache: An optional LintResultsCache.
 
     """
-    for current_file in sorted(files, key=lambda s: s.lower()):
-        full_path = os.path.join(directory, current_file)
-        _process_file(full_path, template_linters, options, summary_results, out)
+    full_paths = (full_path for full_path in full_paths if full_path.lower().endswith(LINTED_FILE_EXTENSIONS))
+    if jobs > 1:
+        pool = multiprocessing.Pool(
+            processes=jobs,
+            initializer=_init_lint_worker,
+            initargs=(template_linters, options, results_cache),
+        )
+        try:
+            file_results = pool.imap(_lint_file_in_worker, full_paths, chunksize=16)
+            for output, file_summary_results in file_results:
+                out.write(output)
+                summary_results.merge(file_summary_results)
+        finally:
+            pool.terminate()
+            pool.join()
+    else:
+        for full_path in full_paths:
+            output, file_summary_results = _lint_file(full_path, template_linters, options, results_cache)
+            out.write(output)
+            summary_results.merge(file_summary_results)
 
 
-def _process_os_dirs(starting_dir, template_linters, options, summary_results, out):
+def _process_file(full_path, template_linters, options, summary_results, out):
     """
-    For each linter, lints all the directories in the starting directory.
+    For each linter, lints the provided file.  This means finding and printing
+    violations.
 
     Arguments:
-        starting_dir: The initial directory to begin the walk.
+        full_path: The full path of the file to lint.
         template_linters: A list of linting objects.
         options: A list of the options.
         summary_results: A SummaryResults with a summary of the violations.
         out: output file
 
+    """
+    num_violations = 0
+    directory = os.path.dirname(full_path)
+    file_name = os.path.basename(full_path)
+    for template_linter in template_linters:
+        results = template_linter.process_file(directory, file_name)
+        results.print_results(options, summary_results, out)
+
+
+def _walk_os_dirs(starting_dir):
+    """
+    Yields the full path of each file in the starting directory that is not in
+    a skipped directory, in the order in which they are linted.
+
+    Arguments:
+        starting_dir: The initial directory to begin the walk.
+
     """
     for root, dirs, files in os.walk(starting_dir):
         if is_skip_dir(SKIP_DIRS, root):
             del dirs
             continue
         dirs.sort(key=lambda s: s.lower())
-        _process_os_dir(root, files, template_linters, options, summary_results, out)
+        for current_file in sorted(files, key=lambda s: s.lower()):
+            yield os.path.join(root, current_file)
+
+
+def _get_changed_files(file_or_dir, since):
+    """
+    Returns the sorted paths of the files that were changed or added since the
+    given git ref, including uncommitted and untracked files.
+
+    Arguments:
+        file_or_dir: If not None, only the changed files in this file or
+            directory are returned.
+        since: A git ref, e.g. a branch name or a commit.
+
+    """
+    changed_files = subprocess.check_output(
+        ['git', 'diff', '--name-only', '--relative', '--diff-filter=d', since]
+    ).splitlines()
+    changed_files += subprocess.check_output(['git', 'ls-files', '--others', '--exclude-standard']).splitlines()
+
+    prefix = None
+    if file_or_dir is not None:
+        prefix = os.path.normpath(file_or_dir)
+    full_paths = set()
+    for changed_file in changed_files:
+        full_path = os.path.normpath(changed_file)
+        if prefix is not None and full_path != prefix and not full_path.startswith(prefix + os.sep):
+            continue
+        if is_skip_dir(SKIP_DIRS, os.path.dirname(full_path)) or not os.path.isfile(full_path):
+            continue
+        full_paths.add(full_path)
+    return sorted(full_paths, key=lambda s: s.lower())
 
 
-def _lint(file_or_dir, template_linters, options, summary_results, out):
+def _lint(file_or_dir, template_linters, options, summary_results, out, jobs=1, results_cache=None, since=None):
     """
     For each linter, lints the provided file or directory.
 
@@ -2593,19 +2799,29 @@ def _lint(file_or_dir, template_linters, options, summary_results, out):
         options: A list of the options.
         summary_results: A SummaryResults with a summary of the violations.
         out: output file
+        jobs: The number of processes with which to lint files in parallel.
+        results_cache: An optional LintResultsCache of results from previous
+            runs.
+        since: If not None, a git ref. Only the files changed since this ref
+            are linted.
 
     """
 
-    if file_or_dir is not None and os.path.isfile(file_or_dir):
-        _process_file(file_or_dir, template_linters, options, summary_results, out)
+    if file_or_dir is not None and not os.path.exists(file_or_dir):
+        raise ValueError("Path [{}] is not a valid file or directory.".format(file_or_dir))
+
+    if since is not None:
+        full_paths = _get_changed_files(file_or_dir, since)
+    elif file_or_dir is not None and os.path.isfile(file_or_dir):
+        full_paths = [file_or_dir]
     else:
-        directory = "."
-        if file_or_dir is not None:
-            if os.path.exists(file_or_dir):
-                directory = file_or_dir
-            else:
-                raise ValueError("Path [{}] is not a valid file or directory.".format(file_or_dir))
-        _process_os_dirs(directory, template_linters, options, summary_results, out)
+        full_paths = _walk_os_dirs(file_or_dir if file_or_dir is not None else ".")
+
+    if jobs > 1 or results_cache is not None:
+        _lint_files(full_paths, template_linters, options, summary_results, out, jobs, results_cache)
+    else:
+        for full_path in full_paths:
+            _process_file(full_path, template_linters, options, summary_results, out)
 
     summary_results.print_results(options, out)
 
@@ -2639,6 +2855,18 @@ def main():
         '--verbose', dest='verbose', action='store_true',
         help='Print multiple lines where possible for additional context of violations.'
     )
+    parser.add_argument(
+        '--jobs', '-j', dest='jobs', type=int, default=1,
+        help='The number of processes with which to lint files in parallel.'
+    )
+    parser.add_argument(
+        '--cache-dir', dest='cache_dir', default=None,
+        help='A directory in which to cache results, so that unchanged files are skipped on the next run.'
+    )
+    parser.add_argument(
+        '--since', dest='since', default=None,
+        help='Only lint the files changed since this git ref (e.g. a branch or commit).'
+    )
     parser.add_argument('path', nargs="?", default=None, help='A file to lint or directory to recursively lint.')
 
     args = parser.parse_args()
@@ -2650,8 +2878,12 @@ def main():
     }
     template_linters = [MakoTemplateLinter(), UnderscoreTemplateLinter(), JavaScriptLinter(), PythonLinter()]
     summary_results = SummaryResults()
+    results_cache = LintResultsCache(args.cache_dir, options) if args.cache_dir else None
 
-    _lint(args.path, template_linters, options, summary_results, out=sys.stdout)
+    _lint(
+        args.path, template_linters, options, summary_results, out=sys.stdout,
+        jobs=args.jobs, results_cache=results_cache, since=args.since,
+    )
 
 
 if __name__ == "__main__":